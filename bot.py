@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from typing import Optional, Set
 import os
 import sys
+import time
 from pathlib import Path
 import traceback
 import aiohttp
@@ -21,7 +22,27 @@ from config import (
     DATABASE_URL,
     DEVELOPER_IDS,
     COLORS,
-    EMOJIS
+    EMOJIS,
+    AUTO_SHARD,
+    SHARD_COUNT,
+    SHARD_IDS,
+    CLUSTER_ID,
+    CLUSTER_SINGLETON,
+    CLUSTER_HEALTH_PORT,
+    REDIS_URL,
+    MEMORY_PROFILE,
+    MAX_MESSAGES,
+    CHUNK_GUILDS_AT_STARTUP,
+    LOOP_LAG_THRESHOLD_MS,
+    CLUSTER_COUNT,
+    REST_RATE_BUDGET,
+    MODULES_LAZY_LOADING,
+    MODULES_IDLE_TTL,
+    TRACING_EXPORTER,
+    TRACING_SAMPLE_RATE,
+    TRACING_SLOW_MS,
+    TRACING_JSONL_PATH,
+    TRACING_OTLP_ENDPOINT
 )
 from database import setup_database, db
 # Import du nouveau système i18n
@@ -34,11 +55,32 @@ from utils.staff_logger import init_staff_logger
 from modules.module_manager import ModuleManager
 # Import du système de configuration des annonces
 from utils.announcement_setup import setup_announcement_channel
+# Import du pipeline de démarrage
+from utils.startup import StartupPipeline
+# Import des métriques gateway (latence et événements par shard)
+from utils.gateway_metrics import GatewayMetrics
+# Import du cache partagé (L1 local + Redis optionnel)
+from utils.shared_cache import shared_cache
+# Import des profils mémoire (cache des membres et des messages)
+from utils.memory_budget import get_memory_profile, MemberChunker
+# Import du watchdog de la boucle asyncio
+from utils.loop_watchdog import LoopWatchdog
+# Temps de réponse des commandes et composants (d.slow, /metrics)
+from utils.interaction_timing import InteractionTimings, start_timing, timed_stage
+# Rate limits REST Discord (attentes de buckets, 429 par route et par module)
+from utils.ratelimit_telemetry import RateLimitTelemetry
+# Priorités des requêtes sortantes (interactions > relais > logs / tâches de fond)
+from utils.request_scheduler import Priority, request_scheduler, set_request_priority
+# Traces des interactions (base de données, REST Discord, backend, HTTP sortant)
+from utils.tracing import tracer
 
 logger = logging.getLogger('moddy')
 
+# Opt-in sharding: AutoShardedBot opens one gateway connection per shard
+BotBase = commands.AutoShardedBot if AUTO_SHARD else commands.Bot
 
-class ModdyBot(commands.Bot):
+
+class ModdyBot(BotBase):
     """Main Moddy class"""
 
     def __init__(self):
@@ -61,6 +103,20 @@ class ModdyBot(commands.Bot):
         # Get bot status from environment variable
         bot_status = os.getenv("BOT_STATUS", "")
 
+        # Member and message cache settings
+        memory_profile = get_memory_profile(MEMORY_PROFILE, MAX_MESSAGES, CHUNK_GUILDS_AT_STARTUP)
+
+        # Sharding options (only with AUTO_SHARD)
+        shard_options = {}
+        if AUTO_SHARD:
+            if SHARD_COUNT:
+                shard_options['shard_count'] = SHARD_COUNT
+            if SHARD_IDS:
+                shard_options['shard_ids'] = SHARD_IDS
+
+        # Rate limit accounting: the aiohttp trace config sees every response of the bot session
+        ratelimit_telemetry = RateLimitTelemetry()
+
         super().__init__(
             command_prefix=self.get_prefix,
             intents=intents,
@@ -68,8 +124,12 @@ class ModdyBot(commands.Bot):
             activity=discord.CustomActivity(name=bot_status) if bot_status else None,
             status=discord.Status.online,
             case_insensitive=True,
-            max_messages=10000,
-            http_timeout=http_timeout  # Apply custom timeout
+            max_messages=memory_profile.max_messages,
+            member_cache_flags=memory_profile.member_cache_flags(),
+            chunk_guilds_at_startup=memory_profile.chunk_guilds_at_startup,
+            http_timeout=http_timeout,  # Apply custom timeout
+            http_trace=ratelimit_telemetry.trace_config(),
+            **shard_options
         )
 
         # Internal variables
@@ -79,8 +139,12 @@ class ModdyBot(commands.Bot):
         self.maintenance_mode = False
         self.version = None  # Bot version from GitHub releases
 
-        # Cache for server prefixes
-        self.prefix_cache = {}
+        # Memory profile and on-demand member chunking
+        self.memory_profile = memory_profile
+        self.member_chunker = MemberChunker(self)
+
+        # Event loop lag watchdog (started in setup_hook)
+        self.loop_watchdog = LoopWatchdog(self, threshold=LOOP_LAG_THRESHOLD_MS / 1000)
 
         # Gestionnaire de modules
         self.module_manager = None
@@ -90,7 +154,44 @@ class ModdyBot(commands.Bot):
 
         # Serveur HTTP interne pour l'API backend
         self.internal_api_server = None
-        self.internal_api_thread = None
+        self.internal_api_task = None
+
+        # Timings des phases de démarrage (affichés dans d.stats)
+        self.startup_pipeline = StartupPipeline()
+
+        # Shards déjà initialisés (modules + commandes guild-only)
+        self._ready_shards: Set[int] = set()
+        # Shards dont les modules sont chargés (l'écoute des configs démarre après le dernier)
+        self._loaded_shards: Set[int] = set()
+
+        # Latence et événements par shard
+        self.gateway_metrics = GatewayMetrics(self)
+        self.gateway_metrics.install()
+
+        # Attentes de rate limit et 429 (d.ratelimits)
+        self.ratelimit_telemetry = ratelimit_telemetry
+        self.ratelimit_telemetry.install()
+
+        # Background requests yield the REST budget to interactions and relays
+        self.request_scheduler = request_scheduler
+        self.request_scheduler.configure(REST_RATE_BUDGET / max(CLUSTER_COUNT, 1))
+        self.request_scheduler.install(self.http.http_trace)
+
+        # Temps de réponse par commande / custom_id (d.slow)
+        self.interaction_timings = InteractionTimings(self)
+        InteractionTimings.install()
+
+        # Traces (désactivées par défaut, voir TRACING_EXPORTER)
+        tracer.configure(
+            TRACING_EXPORTER,
+            sample_rate=TRACING_SAMPLE_RATE,
+            slow_ms=TRACING_SLOW_MS,
+            jsonl_path=TRACING_JSONL_PATH,
+            otlp_endpoint=TRACING_OTLP_ENDPOINT
+        )
+
+        # Health endpoint polled by main.py in cluster mode
+        self.cluster_health = None
 
         # Configure global error handler
         self.setup_error_handler()
@@ -153,15 +254,16 @@ class ModdyBot(commands.Bot):
             logger.error(f"❌ Error fetching version: {e}")
             self.version = "Unknown"
 
-    def start_internal_api_server(self):
+    async def start_internal_api_server(self, timeout: float = 10):
         """
-        Démarre le serveur HTTP interne dans un thread séparé.
+        Démarre le serveur HTTP interne sur la boucle asyncio du bot.
         Ce serveur écoute sur le port INTERNAL_PORT (3000) pour recevoir
         les requêtes du backend via Railway Private Network.
+
+        Les routes utilisent directement le client Discord et la base de données :
+        le serveur doit tourner sur la même boucle qu'eux (pas de thread séparé).
         """
-        import threading
-        import uvicorn
-        from internal_api.server import app, set_bot
+        from internal_api.server import create_server, set_bot
 
         # Configurer le bot dans le serveur interne
         set_bot(self)
@@ -169,66 +271,143 @@ class ModdyBot(commands.Bot):
         # Port du serveur interne
         internal_port = int(os.getenv("INTERNAL_PORT", 3000))
 
-        # Fonction pour exécuter le serveur dans le thread
-        def run_server():
-            logger.info(f"🌐 Starting internal API server on port {internal_port}")
-            uvicorn.run(
-                app,
-                host="::",  # IPv4 + IPv6
-                port=internal_port,
-                log_level="info",
-                access_log=False  # Désactiver les logs d'accès pour éviter le spam
-            )
-
-        # Créer et démarrer le thread
-        self.internal_api_thread = threading.Thread(
-            target=run_server,
-            daemon=True,
-            name="InternalAPIServer"
-        )
-        self.internal_api_thread.start()
-        logger.info(f"✅ Internal API server started on port {internal_port}")
+        logger.info(f"🌐 Starting internal API server on port {internal_port}")
+        self.internal_api_server = create_server(internal_port)
+        self.internal_api_task = asyncio.create_task(self._serve_internal_api(), name="internal_api:serve")
+
+        # Attendre que le port soit ouvert (ou que le serveur échoue)
+        deadline = time.monotonic() + timeout
+        while not self.internal_api_server.started and not self.internal_api_task.done():
+            if time.monotonic() > deadline:
+                logger.warning(f"⚠️ Internal API server not started after {timeout:.0f}s")
+                return
+            await asyncio.sleep(0.05)
+
+        if self.internal_api_server.started:
+            logger.info(f"✅ Internal API server started on port {internal_port}")
+
+    async def _serve_internal_api(self):
+        try:
+            await self.internal_api_server.serve()
+        except SystemExit:
+            # uvicorn appelle sys.exit(1) si le port ne peut pas être ouvert
+            logger.error("❌ Internal API server failed to start (port unavailable?)")
+        except Exception as e:
+            logger.error(f"❌ Internal API server error: {e}", exc_info=True)
+
+    async def stop_internal_api_server(self, timeout: float = 5):
+        """Arrête le serveur HTTP interne (attend la fin des requêtes en cours)"""
+        if not self.internal_api_task:
+            return
+
+        self.internal_api_server.should_exit = True
+        try:
+            await asyncio.wait_for(self.internal_api_task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Internal API server did not stop in time, cancelling")
+        self.internal_api_task = None
+        logger.info("✅ Internal API server stopped")
 
     async def setup_hook(self):
         """Called once on bot startup"""
         logger.info("🔧 Initial setup...")
 
-        # Fetch bot version from GitHub
-        await self.fetch_version()
+        # Watch the event loop from the very start (startup phases included)
+        self.loop_watchdog.start()
 
         # Configure error handler for slash commands
         self.tree.on_error = self.on_app_command_error
 
-        # Connect the database
-        if DATABASE_URL:
-            await self.setup_database()
+        # Startup phases run as a dependency graph: independent steps run concurrently,
+        # network-only probes (version, backend) stay off the critical path
+        pipeline = self.startup_pipeline
+        pipeline.add_phase("version", self.fetch_version, background=True)
+        pipeline.add_phase("backend_probe", self.test_backend_connection, background=True)
+        pipeline.add_phase("database", self.setup_database)
+        pipeline.add_phase("shared_cache", self.setup_shared_cache)
+        pipeline.add_phase("i18n", self.load_i18n)
+        pipeline.add_phase("staff_systems", self.setup_staff_systems)
+        pipeline.add_phase("module_manager", self.setup_module_manager)
+        pipeline.add_phase("module_migration", self.migrate_module_configs, depends_on=["database", "module_manager"])
+        pipeline.add_phase("interserver_relay", self.setup_interserver_relay, depends_on=["shared_cache"])
+        # The API routes dereference bot.db
+        pipeline.add_phase("internal_api", self.setup_internal_api, depends_on=["database"])
+        if CLUSTER_ID is not None:
+            pipeline.add_phase("cluster_health", self.setup_cluster_health)
+        # Cogs capture `database.db` and `staff_permissions` at import time
+        pipeline.add_phase(
+            "extensions",
+            self.load_extensions,
+            depends_on=["database", "shared_cache", "i18n", "staff_systems", "module_manager"]
+        )
+        pipeline.add_phase("command_sync", self.sync_commands, depends_on=["extensions"])
+        pipeline.add_phase(
+            "staff_extensions",
+            self.load_staff_extensions,
+            depends_on=["extensions"],
+            background=True
+        )
 
-        # Initialize i18n system
+        await pipeline.run()
+
+        # Start background tasks
+        self.status_update.start()
+
+        logger.info(f"✅ Setup complete in {pipeline.setup_duration * 1000:.0f}ms")
+        logger.info("ℹ️ Guild-only commands will be synced in on_ready()")
+
+    async def load_i18n(self):
+        """Initialize i18n system (file reads run off the event loop)"""
         logger.info("🌐 Loading i18n system...")
-        i18n.load_translations()
+        await asyncio.to_thread(i18n.load_translations)
         logger.info(f"✅ i18n loaded with {len(i18n.supported_locales)} languages")
 
-        # Initialize staff permissions system
+    async def setup_staff_systems(self):
+        """Initialize staff permissions and staff logger"""
         logger.info("👥 Initializing staff permissions system...")
         setup_staff_permissions(self)
         logger.info("✅ Staff permissions system ready")
 
-        # Initialize staff logger
         logger.info("📝 Initializing staff logger...")
         init_staff_logger(self)
         logger.info("✅ Staff logger ready")
 
-        # Initialize module manager
+    async def setup_module_manager(self):
+        """Initialize module manager"""
         logger.info("📦 Initializing module manager...")
-        self.module_manager = ModuleManager(self)
+        self.module_manager = ModuleManager(self, lazy=MODULES_LAZY_LOADING, idle_ttl=MODULES_IDLE_TTL)
         self.module_manager.discover_modules()
         logger.info("✅ Module manager ready")
 
-        # Start internal API server
-        logger.info("🌐 Starting internal API server...")
-        self.start_internal_api_server()
+    async def migrate_module_configs(self):
+        """Move module configs still stored in guilds.data to guild_modules (once, before the modules load)"""
+        if self.db:
+            await self.module_manager.migrate_legacy_configs()
+
+    async def setup_internal_api(self):
+        """Start internal API server"""
+        if not self.runs_singleton_tasks:
+            logger.info("⏭️ Internal API server skipped (not the singleton cluster)")
+            return
+        await self.start_internal_api_server()
+
+    async def setup_shared_cache(self):
+        """Connect the shared cache to Redis (local-only cache without REDIS_URL)"""
+        await shared_cache.connect(REDIS_URL)
+
+    async def setup_interserver_relay(self):
+        """Relay interserver messages to the servers of the other clusters (cluster mode only)"""
+        from modules.interserver import interserver_clusters
+        await interserver_clusters.start(self)
 
-        # Test backend connection
+    async def setup_cluster_health(self):
+        """Start the health endpoint of this cluster (cluster mode only)"""
+        from utils.cluster import ClusterHealthServer
+        self.cluster_health = ClusterHealthServer(self, CLUSTER_ID, CLUSTER_HEALTH_PORT + CLUSTER_ID)
+        await self.cluster_health.start()
+
+    async def test_backend_connection(self):
+        """Test backend connection"""
         logger.info("🔍 Testing backend connection...")
         try:
             from services.backend_client import get_backend_client
@@ -238,24 +417,6 @@ class ModdyBot(commands.Bot):
             logger.error(f"⚠️ Backend connection test failed: {e}")
             logger.error("   The bot will start, but backend-dependent features may not work")
 
-        # Load extensions
-        await self.load_extensions()
-
-        # Start background tasks
-        self.status_update.start()
-
-        # Sync slash commands
-        if DEBUG:
-            # In debug mode, sync commands the same way as production
-            # This ensures global commands work in DMs even in debug mode
-            await self.sync_commands()
-            logger.info("✅ Commands synced (debug mode)")
-            logger.info("ℹ️ Guild-only commands will be synced in on_ready()")
-        else:
-            # In production, sync commands properly
-            await self.sync_commands()
-            logger.info("✅ Commands synced")
-
     async def sync_commands(self):
         """
         Synchronise les commandes globales uniquement.
@@ -291,16 +452,21 @@ class ModdyBot(commands.Bot):
                         pass  # Déjà retiré (cas des groupes)
 
             # Synchroniser les commandes globales uniquement (accessibles partout)
+            # En mode cluster, un seul processus publie les commandes globales
+            if not self.runs_singleton_tasks:
+                logger.info(f"⏭️ Global commands sync skipped ({len(self._guild_only_commands)} guild-only will be synced per shard)")
+                return
             await self.tree.sync()
             logger.info(f"✅ Global commands synced ({len(self._guild_only_commands)} guild-only will be synced in on_ready)")
 
         except Exception as e:
             logger.error(f"❌ Error syncing commands: {e}")
 
-    async def sync_all_guild_commands(self):
+    async def sync_all_guild_commands(self, guilds: Optional[list] = None):
         """
-        Synchronise les commandes guild-only pour TOUS les serveurs.
-        Appelé dans on_ready() quand self.guilds est disponible.
+        Synchronise les commandes guild-only pour TOUS les serveurs
+        (ou pour les serveurs donnés, ex: ceux d'un shard).
+        Appelé dans on_ready() / on_shard_ready() quand self.guilds est disponible.
 
         IMPORTANT: Ne PAS copier les commandes globales avec copy_global_to()
         car cela ferait que Discord ignore les commandes globales pour ce serveur.
@@ -309,7 +475,7 @@ class ModdyBot(commands.Bot):
         try:
             # Synchroniser les commandes guild-only dans chaque serveur
             guild_count = 0
-            for guild in self.guilds:
+            for guild in (self.guilds if guilds is None else guilds):
                 try:
                     # IMPORTANT: Clear d'abord toutes les commandes de ce serveur
                     # Cela supprime les anciennes commandes synchronisées avec copy_global_to()
@@ -370,8 +536,20 @@ class ModdyBot(commands.Bot):
         except Exception as e:
             logger.error(f"❌ Error syncing commands for guild {guild.id}: {e}")
 
+    def _record_app_command(self, interaction: discord.Interaction, status: str):
+        """Records the timings and ends the trace of an app command (started in _global_blacklist_check)"""
+        command = interaction.command.qualified_name if interaction.command else 'unknown'
+        self.interaction_timings.record(interaction, 'command', command, status)
+        tracer.end_trace(interaction.extras.get('trace'), status)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        """App command finished without error"""
+        self._record_app_command(interaction, 'ok')
+
     async def on_app_command_error(self, interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
         """Slash command error handling - delegates to ErrorTracker cog"""
+        self._record_app_command(interaction, 'error')
+
         # Use the ErrorTracker cog if it's loaded
         error_cog = self.get_cog("ErrorTracker")
         if error_cog and hasattr(error_cog, 'on_app_command_error'):
@@ -446,6 +624,34 @@ class ModdyBot(commands.Bot):
             if DEVELOPER_IDS:
                 self._dev_team_ids = set(DEVELOPER_IDS)
 
+    @property
+    def is_sharded(self) -> bool:
+        """True when running as an AutoShardedBot"""
+        return isinstance(self, commands.AutoShardedBot)
+
+    @property
+    def runs_singleton_tasks(self) -> bool:
+        """
+        True if this process should run process-wide singleton work
+        (reminder loop, YouTube WebSub server, internal API...).
+        In cluster mode, main.py elects exactly one cluster (CLUSTER_SINGLETON).
+        Otherwise: without sharding, or when this process owns shard 0, it does.
+        """
+        if CLUSTER_ID is not None:
+            return CLUSTER_SINGLETON
+        if not self.is_sharded or not self.shard_ids:
+            return True
+        return 0 in self.shard_ids
+
+    def owns_guild_id(self, guild_id: int) -> bool:
+        """
+        True if the guild belongs to one of this process's shards, even when
+        the bot is no longer in it (shard = (guild_id >> 22) % shard_count)
+        """
+        if not self.is_sharded or not self.shard_ids or not self.shard_count:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+
     def is_developer(self, user_id: int) -> bool:
         """Checks if a user is a developer"""
         return user_id in self._dev_team_ids
@@ -456,14 +662,13 @@ class ModdyBot(commands.Bot):
         if not message.guild:
             return [DEFAULT_PREFIX, f'<@{self.user.id}> ', f'<@!{self.user.id}> ']
 
-        # Check the cache
+        # Check the shared cache, then the DB (or use default)
         guild_id = message.guild.id
-        if guild_id in self.prefix_cache:
-            prefix = self.prefix_cache[guild_id]
-        else:
-            # Fetch from DB or use default
-            prefix = await self.get_guild_prefix(guild_id) or DEFAULT_PREFIX
-            self.prefix_cache[guild_id] = prefix
+
+        async def load():
+            return await self.get_guild_prefix(guild_id) or DEFAULT_PREFIX
+
+        prefix = await shared_cache.get_or_load('prefix', guild_id, load)
 
         # Return the prefix and mentions
         return [prefix, f'<@{self.user.id}> ', f'<@!{self.user.id}> ']
@@ -474,14 +679,18 @@ class ModdyBot(commands.Bot):
             return None
 
         try:
-            guild_data = await self.db.get_guild(guild_id)
-            return guild_data['data'].get('config', {}).get('prefix')
+            guild_data = await self.db.get_guild_data(guild_id)
+            return guild_data.get('config', {}).get('prefix')
         except Exception as e:
             logger.error(f"DB Error (prefix): {e}")
             return None
 
     async def setup_database(self):
         """Initialize the database connection"""
+        if not DATABASE_URL:
+            logger.warning("⚠️ DATABASE_URL not set, running without database")
+            return
+
         try:
             self.db = await setup_database(DATABASE_URL)
             logger.info("✅ Database connected (ModdyDatabase)")
@@ -495,7 +704,7 @@ class ModdyBot(commands.Bot):
             self.db_pool = None
 
     async def load_extensions(self):
-        """Load all cogs and staff commands"""
+        """Load all cogs (staff commands are loaded by load_staff_extensions)"""
         # Load the error system first
         try:
             await self.load_extension("cogs.error_handler")
@@ -543,7 +752,12 @@ class ModdyBot(commands.Bot):
                         error_cog.store_error(error_code, error_details)
                         await error_cog.send_error_log(error_code, error_details, is_fatal=False)
 
-        # Load staff commands
+    async def load_staff_extensions(self):
+        """
+        Load staff commands (prefix commands only, no app commands to sync).
+        Runs in the background once the cogs are loaded so the large staff
+        modules stay off the critical startup path.
+        """
         staff_dir = Path("staff")
         if staff_dir.exists():
             for file in staff_dir.glob("*.py"):
@@ -572,6 +786,11 @@ class ModdyBot(commands.Bot):
     async def on_ready(self):
         """Called when the bot is ready"""
 
+        # Record time-to-ready and print the startup breakdown (first connection only)
+        if self.startup_pipeline.ready_at is None:
+            self.startup_pipeline.mark_ready()
+            self.startup_pipeline.log_breakdown()
+
         # Fetch development team (moved from setup_hook to avoid blocking during connection)
         await self.fetch_dev_team()
 
@@ -633,6 +852,10 @@ class ModdyBot(commands.Bot):
             except:
                 pass
 
+        # In sharded mode, modules and guild commands are handled per shard in on_shard_ready
+        if self.is_sharded:
+            return
+
         # Load modules for all guilds
         if self.module_manager and self.db:
             try:
@@ -640,12 +863,45 @@ class ModdyBot(commands.Bot):
                 logger.info("✅ All guild modules loaded successfully")
             except Exception as e:
                 logger.error(f"❌ Error loading guild modules: {e}", exc_info=True)
+            # Config changes made by other processes reload the module. Started once loaded:
+            # the resync on connect must not reload modules in the middle of the load
+            self.module_manager.start_config_listener()
 
         # Synchronize guild-only commands for all guilds
         # This is done here (not in setup_hook) because self.guilds is only available after connection
         logger.info("🔄 Synchronizing guild-only commands...")
         await self.sync_all_guild_commands()
 
+    async def on_shard_ready(self, shard_id: int):
+        """
+        Called when a shard is ready (AutoShardedBot only).
+        Loads the modules and syncs the guild-only commands of this shard's guilds
+        as soon as the shard is up, without waiting for the other shards.
+        """
+        if shard_id in self._ready_shards:
+            logger.info(f"🔁 Shard {shard_id} ready again (reconnection)")
+            return
+        self._ready_shards.add(shard_id)
+
+        guilds = [guild for guild in self.guilds if guild.shard_id == shard_id]
+        logger.info(f"✅ Shard {shard_id} ready ({len(guilds)} servers)")
+
+        # Load modules for this shard's guilds
+        if self.module_manager and self.db:
+            try:
+                await self.module_manager.load_all_modules(guilds)
+                logger.info(f"✅ Modules loaded for shard {shard_id}")
+            except Exception as e:
+                logger.error(f"❌ Error loading modules for shard {shard_id}: {e}", exc_info=True)
+            # Config listener started once every shard of this process has loaded its modules
+            self._loaded_shards.add(shard_id)
+            if self._loaded_shards >= set(self.shards):
+                self.module_manager.start_config_listener()
+
+        # Synchronize guild-only commands for this shard's guilds
+        logger.info(f"🔄 Synchronizing guild-only commands for shard {shard_id}...")
+        await self.sync_all_guild_commands(guilds)
+
     async def on_guild_join(self, guild: discord.Guild):
         """When the bot joins a server"""
         logger.info(f"➕ New server: {guild.name} ({guild.id})")
@@ -653,7 +909,7 @@ class ModdyBot(commands.Bot):
         # Check if the server owner is blacklisted
         if self.db:
             try:
-                if await self.db.has_attribute('user', guild.owner_id, 'BLACKLISTED'):
+                if await self.db.is_user_blacklisted(guild.owner_id):
                     logger.warning(f"⚠️ Add attempt by blacklisted user: {guild.owner_id}")
 
                     # Send a message to the owner if possible
@@ -724,7 +980,8 @@ class ModdyBot(commands.Bot):
         logger.info(f"➖ Server left: {guild.name} ({guild.id})")
 
         # Clean the cache
-        self.prefix_cache.pop(guild.id, None)
+        await shared_cache.invalidate('prefix', guild.id)
+        await shared_cache.invalidate('guild_data', guild.id)
 
         # Clear commands for this guild to remove guild-only commands
         # This ensures /config is no longer accessible in this server
@@ -741,11 +998,23 @@ class ModdyBot(commands.Bot):
         Appelé automatiquement par discord.py AVANT l'exécution de toute app command.
         Retourne False ou lève une exception pour bloquer l'exécution.
         """
+        # Début du traitement (durées enregistrées à la fin de la commande, voir d.slow)
+        start_timing(interaction)
+        # Les requêtes REST de la commande passent avant les logs et tâches de fond
+        set_request_priority(Priority.INTERACTION)
+        # Span racine : les requêtes DB / REST / backend de la commande s'y rattachent
+        interaction.extras['trace'] = tracer.start_trace(
+            f"/{interaction.command.qualified_name if interaction.command else 'unknown'}",
+            interaction_id=interaction.id,
+            guild_id=interaction.guild_id or 0
+        )
+
         if not self.db or interaction.user.bot:
             return True  # Autorise si pas de DB ou si c'est un bot
 
         try:
-            is_blacklisted = await self.db.has_attribute('user', interaction.user.id, 'BLACKLISTED')
+            async with timed_stage(interaction, 'blacklist_check'):
+                is_blacklisted = await self.db.is_user_blacklisted(interaction.user.id)
 
             if is_blacklisted:
                 # Utilise le système Components V2 pour le message de blacklist
@@ -777,6 +1046,9 @@ class ModdyBot(commands.Bot):
                     except Exception as e:
                         logger.error(f"Error logging blacklist: {e}")
 
+                # Aucun événement de fin n'est envoyé pour une commande bloquée
+                self._record_app_command(interaction, 'blocked')
+
                 # Retourne False pour bloquer l'exécution
                 return False
 
@@ -794,7 +1066,7 @@ class ModdyBot(commands.Bot):
             return False
 
         try:
-            is_blacklisted = await self.db.has_attribute('user', interaction.user.id, 'BLACKLISTED')
+            is_blacklisted = await self.db.is_user_blacklisted(interaction.user.id)
 
             if is_blacklisted:
                 # Utilise le système Components V2 pour le message de blacklist
@@ -855,6 +1127,9 @@ class ModdyBot(commands.Bot):
         INTERCEPTION pour les composants (boutons, selects, modals).
         Les slash commands sont gérées par _global_blacklist_check via tree.interaction_check.
         """
+        # Mesure du temps jusqu'à la première interaction (startup breakdown)
+        self.startup_pipeline.mark_first_interaction()
+
         # Les app commands sont déjà gérées par _global_blacklist_check
         if interaction.type == discord.InteractionType.application_command:
             return
@@ -931,6 +1206,27 @@ class ModdyBot(commands.Bot):
         except Exception as e:
             logger.error(f"❌ Error closing backend client: {e}")
 
+        # Stop the internal API server (same event loop as the bot)
+        await self.stop_internal_api_server()
+
+        # Stop the cluster health endpoint
+        if self.cluster_health:
+            await self.cluster_health.stop()
+
+        # Stop the module background tasks (deferred enable hooks, idle eviction, config listener)
+        if self.module_manager:
+            self.module_manager.stop()
+
+        # Stop the on-demand member chunking and the loop watchdog
+        self.member_chunker.stop()
+        self.loop_watchdog.stop()
+
+        # Close the shared cache (Redis)
+        await shared_cache.close()
+
+        # Flush the pending trace exports
+        await tracer.close()
+
         # Close DB connection
         if self.db:
             await self.db.close()
@@ -939,8 +1235,5 @@ class ModdyBot(commands.Bot):
         if hasattr(self, 'http') and self.http and hasattr(self.http, '_HTTPClient__session'):
             await self.http._HTTPClient__session.close()
 
-        # Note: Le serveur HTTP interne s'arrête automatiquement car il est daemon=True
-        logger.info("🌐 Internal API server will stop automatically")
-
         # Close the bot
         await super().close()
\ No newline at end of file
@@ -7,13 +7,14 @@ maintenant directement dans bot.py via on_interaction() pour une efficacité max
 
 Ce cog gère:
 - Interception des commandes par préfixe (via process_commands override)
-- Cache de blacklist pour performance
+- Cache de blacklist pour performance (cache partagé entre processus)
 - Commandes utilitaires pour les devs
 """
 
 import discord
 from discord.ext import commands
 from utils.components_v2 import create_blacklist_message
+from utils.shared_cache import shared_cache
 
 
 class BlacklistCheck(commands.Cog):
@@ -26,7 +27,6 @@ class BlacklistCheck(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.blacklist_cache = {}  # Cache pour éviter trop de requêtes DB
 
         # Override la méthode process_commands pour bloquer les commandes par préfixe
         original_process_commands = bot.process_commands
@@ -92,25 +92,22 @@ class BlacklistCheck(commands.Cog):
 
     async def is_blacklisted(self, user_id: int) -> bool:
         """Vérifie si un utilisateur est blacklisté (avec cache)"""
-        # Vérifie le cache d'abord
-        if user_id in self.blacklist_cache:
-            return self.blacklist_cache[user_id]
-
-        # Sinon vérifie la DB - check for active GLOBAL_BLACKLIST case
-        if self.bot.db:
-            try:
-                # Check if user has an active global blacklist case
-                from utils.moderation_cases import SanctionType
-                is_bl = await self.bot.db.has_active_sanction(
+        if not self.bot.db:
+            return False
+
+        # Check for active GLOBAL_BLACKLIST case (cache partagé, puis DB)
+        from utils.moderation_cases import SanctionType
+        try:
+            return await shared_cache.get_or_load(
+                'blacklist', user_id,
+                lambda: self.bot.db.has_active_sanction(
                     'user',
                     user_id,
                     SanctionType.GLOBAL_BLACKLIST.value
                 )
-                self.blacklist_cache[user_id] = is_bl
-                return is_bl
-            except:
-                return False
-        return False
+            )
+        except:
+            return False
 
     @commands.command(name="clearcache", aliases=["cc"])
     async def clear_blacklist_cache(self, ctx):
@@ -118,7 +115,8 @@ class BlacklistCheck(commands.Cog):
         if not self.bot.is_developer(ctx.author.id):
             return
 
-        self.blacklist_cache.clear()
+        await shared_cache.invalidate_namespace('blacklist')
+        await shared_cache.invalidate_namespace('user_blacklisted')
         await ctx.send("<:done:1398729525277229066> Cache de blacklist vidé")
 
     @commands.command(name="testbl")
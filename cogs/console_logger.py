@@ -14,6 +14,7 @@ from collections import deque
 import traceback
 
 from config import COLORS
+from utils.request_scheduler import Priority, with_priority
 
 
 class ConsoleColors:
@@ -190,6 +191,7 @@ class ConsoleLogger(commands.Cog):
             pass
 
     @tasks.loop(seconds=5)  # Increased to 5 seconds to reduce spam
+    @with_priority(Priority.BACKGROUND)  # Deferred while interactions need the REST budget
     async def send_logs_task(self):
         """Sends accumulated logs to Discord"""
         if self.log_queue.empty():
@@ -11,6 +11,7 @@ import json
 from typing import Optional, Dict, Any
 
 from config import COLORS
+from utils.request_scheduler import Priority, with_priority
 
 
 class DevCommandLogger(commands.Cog):
@@ -33,6 +34,7 @@ class DevCommandLogger(commands.Cog):
             return cog_module.startswith('staff.')
         return False
 
+    @with_priority(Priority.BACKGROUND)
     async def log_command_execution(
             self,
             ctx: commands.Context,
@@ -209,6 +211,7 @@ class LoggingSystem(commands.Cog):
         self.bot = bot
         self.log_channel_id = 1394323753701212291
 
+    @with_priority(Priority.BACKGROUND)
     async def log_command(self, ctx: commands.Context, action: str, details: Dict[str, Any] = None):
         """Manual log for specific actions"""
         channel = self.bot.get_channel(self.log_channel_id)
@@ -252,6 +255,7 @@ class LoggingSystem(commands.Cog):
         except:
             pass
 
+    @with_priority(Priority.BACKGROUND)
     async def log_critical(self, title: str, description: str, ping_dev: bool = True):
         """Log for critical events"""
         channel = self.bot.get_channel(self.log_channel_id)
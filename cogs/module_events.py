@@ -1,12 +1,21 @@
 """
 Module Events Handler
 Gère tous les événements Discord pour les modules de serveur
+
+Chaque module déclare les événements qu'il gère (ModuleBase.EVENTS) ; le
+ModuleManager tient un index (event, guild_id) -> handlers des modules
+activés, et ce cog ne fait que dispatcher : un serveur sans module concerné
+coûte une recherche dans un dict par événement.
 """
 
+import asyncio
+import time
 import discord
 from discord.ext import commands
 import logging
 
+from utils.metrics import metrics
+
 logger = logging.getLogger('moddy.cogs.module_events')
 
 
@@ -18,223 +27,190 @@ class ModuleEvents(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
+    async def dispatch_to_modules(self, event: str, guild_id: int, *args):
         """
-        Événement déclenché quand un membre rejoint un serveur
-        Transmet l'événement aux modules concernés (Welcome, Auto Restore Roles, etc.)
+        Transmet un événement aux modules activés du serveur qui le gèrent
+        Les handlers tournent en parallèle : l'erreur de l'un n'empêche pas les autres
         """
-        if not self.bot.module_manager:
+        manager = self.bot.module_manager
+        if not manager:
             return
 
-        try:
-            # Récupère l'instance du module Welcome pour ce serveur
-            welcome_module = await self.bot.module_manager.get_module_instance(
-                member.guild.id,
-                'welcome'
-            )
+        handlers = manager.get_event_handlers(event, guild_id)
+        if handlers is None and manager.has_pending_modules(event, guild_id):
+            # Mode lazy : premier événement du serveur qui concerne ses modules
+            await manager.activate_guild(guild_id)
+            handlers = manager.get_event_handlers(event, guild_id)
+        if not handlers:
+            return
 
-            # Si le module est actif, appelle sa méthode
-            if welcome_module and welcome_module.enabled:
-                await welcome_module.on_member_join(member)
+        if len(handlers) == 1:
+            [(module_id, handler)] = handlers.items()
+            await self._run_handler(event, guild_id, module_id, handler, args)
+            return
 
-        except Exception as e:
-            logger.error(f"Error in on_member_join for guild {member.guild.id}: {e}", exc_info=True)
+        await asyncio.gather(*(
+            self._run_handler(event, guild_id, module_id, handler, args)
+            for module_id, handler in list(handlers.items())
+        ))
 
+    async def _run_handler(self, event: str, guild_id: int, module_id: str, handler, args):
+        started = time.perf_counter()
         try:
-            # Récupère l'instance du module Auto Restore Roles pour ce serveur
-            auto_restore_module = await self.bot.module_manager.get_module_instance(
-                member.guild.id,
-                'auto_restore_roles'
-            )
-
-            # Si le module est actif, appelle sa méthode
-            if auto_restore_module and auto_restore_module.enabled:
-                await auto_restore_module.on_member_join(member)
-
+            await handler(*args)
         except Exception as e:
-            logger.error(f"Error in on_member_join (auto_restore_roles) for guild {member.guild.id}: {e}", exc_info=True)
-
-        try:
-            # Récupère l'instance du module Auto Role pour ce serveur
-            auto_role_module = await self.bot.module_manager.get_module_instance(
-                member.guild.id,
-                'auto_role'
-            )
+            metrics.module_event_errors[(event, module_id)] += 1
+            logger.error(f"Error in {event} ({module_id}) for guild {guild_id}: {e}", exc_info=True)
+        finally:
+            metrics.module_event_seconds.observe(time.perf_counter() - started, event, module_id)
 
-            # Si le module est actif, appelle sa méthode
-            if auto_role_module and auto_role_module.enabled:
-                await auto_role_module.on_member_join(member)
-
-        except Exception as e:
-            logger.error(f"Error in on_member_join (auto_role) for guild {member.guild.id}: {e}", exc_info=True)
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        """
+        Événement déclenché quand un membre rejoint un serveur
+        (Welcome Channel, Welcome DM, Auto Role, Auto Restore Roles, etc.)
+        """
+        await self.dispatch_to_modules('member_join', member.guild.id, member)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         """
         Événement déclenché quand un membre quitte un serveur
-        Transmet l'événement aux modules concernés (Auto Restore Roles, etc.)
+        (Auto Restore Roles, etc.)
         """
-        if not self.bot.module_manager:
-            return
+        await self.dispatch_to_modules('member_remove', member.guild.id, member)
 
-        try:
-            # Récupère l'instance du module Auto Restore Roles pour ce serveur
-            auto_restore_module = await self.bot.module_manager.get_module_instance(
-                member.guild.id,
-                'auto_restore_roles'
-            )
-
-            # Si le module est actif, appelle sa méthode
-            if auto_restore_module and auto_restore_module.enabled:
-                await auto_restore_module.on_member_remove(member)
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild: discord.Guild, user: discord.User):
+        """
+        Événement déclenché quand un utilisateur est banni d'un serveur
+        (Inter-Server : cache des bans)
+        """
+        await self.dispatch_to_modules('member_ban', guild.id, guild, user)
 
-        except Exception as e:
-            logger.error(f"Error in on_member_remove (auto_restore_roles) for guild {member.guild.id}: {e}", exc_info=True)
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild: discord.Guild, user: discord.User):
+        """
+        Événement déclenché quand un utilisateur est débanni d'un serveur
+        (Inter-Server : cache des bans)
+        """
+        await self.dispatch_to_modules('member_unban', guild.id, guild, user)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """
         Événement déclenché pour chaque message
-        Peut être utilisé pour les modules de modération, inter-serveur, etc.
+        (Inter-Server, etc.)
         """
-        # Ignore les messages du bot
-        if message.author.bot:
-            return
-
-        # Ignore les DMs
-        if not message.guild:
-            return
-
-        if not self.bot.module_manager:
+        # Ignore les messages du bot et les DMs
+        if message.author.bot or not message.guild:
             return
 
-        try:
-            # Récupère l'instance du module Inter-Server pour ce serveur
-            interserver_module = await self.bot.module_manager.get_module_instance(
-                message.guild.id,
-                'interserver'
-            )
-
-            # Si le module est actif, appelle sa méthode
-            if interserver_module and interserver_module.enabled:
-                await interserver_module.on_message(message)
-
-        except Exception as e:
-            logger.error(f"Error in on_message for guild {message.guild.id}: {e}", exc_info=True)
+        await self.dispatch_to_modules('message', message.guild.id, message)
 
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message):
         """
         Événement déclenché quand un message est supprimé
-        Supprime tous les messages relayés si c'est un message inter-serveur
+        (Inter-Server : suppression des messages relayés, même si le module a été désactivé depuis)
         """
-        # Ignore les messages des bots
-        if message.author.bot:
+        # Ignore les messages des bots et les DMs
+        if message.author.bot or not message.guild:
             return
 
-        # Ignore les DMs
-        if not message.guild:
-            return
-
-        if not self.bot.module_manager or not self.bot.db:
-            return
-
-        try:
-            # Vérifie si c'est un message inter-serveur
-            interserver_msg = await self.bot.db.get_interserver_message_by_original(message.id)
-            if not interserver_msg:
-                return
-
-            # Supprime tous les messages relayés
-            relayed_messages = interserver_msg.get('relayed_messages', [])
-            for relayed in relayed_messages:
-                try:
-                    guild = self.bot.get_guild(relayed['guild_id'])
-                    if not guild:
-                        continue
-
-                    channel = guild.get_channel(relayed['channel_id'])
-                    if not channel:
-                        continue
-
-                    # Supprime le message
-                    msg = await channel.fetch_message(relayed['message_id'])
-                    await msg.delete()
-                except discord.NotFound:
-                    # Message déjà supprimé
-                    pass
-                except Exception as e:
-                    logger.error(f"Error deleting relayed message {relayed['message_id']}: {e}")
-
-            # Marque le message comme supprimé en DB
-            await self.bot.db.delete_interserver_message(interserver_msg['moddy_id'])
-            logger.info(f"Deleted inter-server message {interserver_msg['moddy_id']} and all relayed copies")
+        from modules.interserver import retract_interserver_message
+        await retract_interserver_message(self.bot, message)
 
-        except Exception as e:
-            logger.error(f"Error in on_message_delete for inter-server: {e}", exc_info=True)
+        await self.dispatch_to_modules('message_delete', message.guild.id, message)
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
         """
         Événement déclenché quand une réaction est ajoutée à un message
-        Transmet l'événement au module Starboard si activé
+        (Starboard, etc.)
         """
-        # Ignore les réactions du bot
-        if payload.user_id == self.bot.user.id:
+        # Ignore les DMs et les réactions du bot
+        if not payload.guild_id or payload.user_id == self.bot.user.id:
             return
 
-        # Ignore les DMs
-        if not payload.guild_id:
-            return
+        await self.dispatch_to_modules('raw_reaction_add', payload.guild_id, payload)
 
-        if not self.bot.module_manager:
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        """
+        Événement déclenché quand une réaction est retirée d'un message
+        (Starboard, etc.)
+        """
+        # Ignore les DMs et les réactions du bot
+        if not payload.guild_id or payload.user_id == self.bot.user.id:
             return
 
-        try:
-            # Récupère l'instance du module Starboard pour ce serveur
-            starboard_module = await self.bot.module_manager.get_module_instance(
-                payload.guild_id,
-                'starboard'
-            )
+        await self.dispatch_to_modules('raw_reaction_remove', payload.guild_id, payload)
 
-            # Si le module est actif, appelle sa méthode
-            if starboard_module and starboard_module.enabled:
-                await starboard_module.on_reaction_add(payload)
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        """
+        Événement déclenché quand un salon est modifié (permissions, type...)
+        (Inter-Server : registre des salons)
+        """
+        await self.dispatch_to_modules('guild_channel_update', after.guild.id, before, after)
 
-        except Exception as e:
-            logger.error(f"Error in on_raw_reaction_add for guild {payload.guild_id}: {e}", exc_info=True)
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """
+        Événement déclenché quand un salon est supprimé
+        (Inter-Server : registre des salons)
+        """
+        await self.dispatch_to_modules('guild_channel_delete', channel.guild.id, channel)
 
     @commands.Cog.listener()
-    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
         """
-        Événement déclenché quand une réaction est retirée d'un message
-        Transmet l'événement au module Starboard pour mise à jour
+        Événement déclenché quand un rôle est modifié
+        (Inter-Server : permissions du bot)
         """
-        # Ignore les réactions du bot
-        if payload.user_id == self.bot.user.id:
-            return
+        await self.dispatch_to_modules('guild_role_update', after.guild.id, before, after)
 
-        # Ignore les DMs
-        if not payload.guild_id:
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """
+        Événement déclenché quand un membre est modifié
+        Seules les mises à jour du bot (ses rôles) concernent les modules
+        """
+        if after.id != self.bot.user.id:
             return
 
-        if not self.bot.module_manager:
-            return
+        await self.dispatch_to_modules('member_update', after.guild.id, before, after)
 
-        try:
-            # Récupère l'instance du module Starboard pour ce serveur
-            starboard_module = await self.bot.module_manager.get_module_instance(
-                payload.guild_id,
-                'starboard'
-            )
+    @commands.Cog.listener()
+    async def on_webhooks_update(self, channel: discord.abc.GuildChannel):
+        """
+        Événement déclenché quand les webhooks d'un salon changent
+        (Inter-Server : cache des webhooks)
+        """
+        await self.dispatch_to_modules('webhooks_update', channel.guild.id, channel)
 
-            # Si le module est actif, appelle sa méthode
-            if starboard_module and starboard_module.enabled:
-                await starboard_module.on_reaction_remove(payload)
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        """
+        Événement déclenché quand un serveur (re)devient disponible
+        (Inter-Server : salons recréés après une reconnexion)
+        """
+        # Après une reconnexion le serveur est reconstruit sans ses membres :
+        # les modules déjà chargés qui en ont besoin ne repassent pas par enable()
+        manager = self.bot.module_manager
+        chunker = getattr(self.bot, 'member_chunker', None)
+        if manager and chunker:
+            chunker.request_for_modules(guild.id, manager.active_modules.get(guild.id, {}).values())
+        await self.dispatch_to_modules('guild_available', guild.id, guild)
 
-        except Exception as e:
-            logger.error(f"Error in on_raw_reaction_remove for guild {payload.guild_id}: {e}", exc_info=True)
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        """
+        Événement déclenché quand le bot quitte un serveur
+        (Inter-Server : registre des salons)
+        """
+        await self.dispatch_to_modules('guild_remove', guild.id, guild)
 
 
 async def setup(bot):
@@ -700,6 +700,9 @@ class Reminder(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        # Due reminders not sent yet (exposed on /metrics)
+        self.queue_depth = 0
+        # Every process sends the reminders it owns (see owns_reminder)
         self.check_reminders.start()
 
     def cog_unload(self):
@@ -712,10 +715,12 @@ class Reminder(commands.Cog):
             return
 
         try:
-            pending = await self.bot.db.get_pending_reminders()
+            pending = [reminder for reminder in await self.bot.db.get_pending_reminders() if self.owns_reminder(reminder)]
+            self.queue_depth = len(pending)
 
             for reminder in pending:
                 await self.send_reminder(reminder)
+                self.queue_depth -= 1
         except Exception as e:
             logger.error(f"Error checking reminders: {e}")
 
@@ -730,7 +735,7 @@ class Reminder(commands.Cog):
 
         if self.bot.db and self.bot.db.pool:
             try:
-                pending = await self.bot.db.get_pending_reminders()
+                pending = [reminder for reminder in await self.bot.db.get_pending_reminders() if self.owns_reminder(reminder)]
                 logger.info(f"Found {len(pending)} missed reminders to send")
 
                 for reminder in pending:
@@ -738,6 +743,16 @@ class Reminder(commands.Cog):
             except Exception as e:
                 logger.error(f"Error sending missed reminders: {e}")
 
+    def owns_reminder(self, reminder: Dict) -> bool:
+        """
+        With several shard processes, a channel reminder is sent by the process
+        that owns its guild (the others cannot see the channel), and a DM
+        reminder by the singleton process
+        """
+        if reminder.get('send_in_channel') and reminder.get('channel_id') and reminder.get('guild_id'):
+            return self.bot.owns_guild_id(reminder['guild_id'])
+        return self.bot.runs_singleton_tasks
+
     async def send_reminder(self, reminder: Dict, is_late: bool = False):
         """Send a reminder to the user"""
         user_id = reminder['user_id']
@@ -16,6 +16,7 @@ import io
 
 from utils.i18n import t
 from utils.incognito import get_incognito_setting
+from utils.interaction_timing import timed_stage
 
 logger = logging.getLogger('moddy.saved_messages')
 
@@ -608,8 +609,9 @@ class SavedMessages(commands.Cog):
             ephemeral = incognito if incognito is not None else True
 
         # Get saved messages
-        messages = await self.bot.db.get_saved_messages(interaction.user.id, limit=10, offset=0)
-        total_count = await self.bot.db.count_saved_messages(interaction.user.id)
+        async with timed_stage(interaction, 'db_saved_messages'):
+            messages = await self.bot.db.get_saved_messages(interaction.user.id, limit=10, offset=0)
+            total_count = await self.bot.db.count_saved_messages(interaction.user.id)
 
         # Create view
         view = SavedMessagesLibraryView(
@@ -17,6 +17,7 @@ from utils.embeds import ModdyEmbed, ModdyResponse, ModdyColors
 from utils.incognito import add_incognito_option, get_incognito_setting
 from config import COLORS, DEEPL_API_KEY
 from utils.i18n import i18n
+from utils.interaction_timing import timed_stage
 
 
 class TranslateView(BaseView):
@@ -453,10 +454,12 @@ class Translate(commands.Cog):
         )
 
         # Detect the source language
-        source_lang = await self.detect_language(sanitized_text)
+        async with timed_stage(interaction, 'deepl_detect'):
+            source_lang = await self.detect_language(sanitized_text)
 
         # Translate the text
-        translated = await self.translate_text(sanitized_text, target_lang)
+        async with timed_stage(interaction, 'deepl_translate'):
+            translated = await self.translate_text(sanitized_text, target_lang)
 
         if translated and source_lang:
             # Create the view with the re-translation menu
@@ -8,10 +8,16 @@ from discord.ext import commands
 import logging
 from aiohttp import web
 import asyncio
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from config import CLUSTER_COUNT
+from utils.shared_cache import shared_cache
 
 logger = logging.getLogger('moddy.cogs.youtube_websub')
 
+# Shared cache topic: notifications received by the singleton, for the guilds of the other clusters
+NOTIFICATION_TOPIC = "youtube_notification"
+
 
 class YouTubeWebSubHandler(commands.Cog):
     """
@@ -28,6 +34,15 @@ class YouTubeWebSubHandler(commands.Cog):
 
     async def cog_load(self):
         """Called when the cog is loaded"""
+        # Each cluster notifies its own guilds, whichever process received the notification
+        if CLUSTER_COUNT > 1:
+            await shared_cache.subscribe(NOTIFICATION_TOPIC, self._on_cluster_notification)
+
+        # Only one process listens on the webhook port when the bot is sharded
+        if not self.bot.runs_singleton_tasks:
+            logger.info("⏭️ YouTube WebSub server skipped (not the singleton process)")
+            return
+
         # Start the webhook server
         await self.start_webhook_server()
 
@@ -160,12 +175,24 @@ class YouTubeWebSubHandler(commands.Cog):
 
             logger.info(f"📺 Processing notification for YouTube channel {channel_id}")
 
+            # The other clusters notify their own guilds
+            if CLUSTER_COUNT > 1 and not await shared_cache.publish(
+                NOTIFICATION_TOPIC, {'channel_id': channel_id, 'feed_xml': feed_xml}
+            ):
+                logger.error("❌ YouTube notification not forwarded to the other clusters (REDIS_URL needed)")
+
             # Find all guilds with subscriptions to this channel
             await self.notify_subscribed_guilds(channel_id, feed_xml)
 
         except Exception as e:
             logger.error(f"❌ Error processing YouTube notification: {e}", exc_info=True)
 
+    async def _on_cluster_notification(self, data: Dict[str, Any]):
+        """Notification received by the singleton cluster: notifies this cluster's guilds"""
+        if not self.bot.is_ready():
+            return
+        await self.notify_subscribed_guilds(data['channel_id'], data['feed_xml'])
+
     async def notify_subscribed_guilds(self, youtube_channel_id: str, feed_xml: str):
         """
         Notify all guilds that are subscribed to this YouTube channel
@@ -25,6 +25,78 @@ DEBUG: bool = os.environ.get("DEBUG", "False").lower() in ("true", "1", "yes", "
 dev_ids_str = os.environ.get("DEVELOPER_IDS", "")
 DEVELOPER_IDS: List[int] = [int(id.strip()) for id in dev_ids_str.split(",") if id.strip()]
 
+# =============================================================================
+# SHARDING
+# =============================================================================
+
+# Active le mode AutoShardedBot (plusieurs connexions gateway) - Variable Railway: AUTO_SHARD
+AUTO_SHARD: bool = os.environ.get("AUTO_SHARD", "False").lower() in ("true", "1", "yes", "on")
+
+# Nombre total de shards (vide = nombre recommandé par Discord)
+SHARD_COUNT: Optional[int] = int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None
+
+# IDs des shards gérés par ce processus, séparés par des virgules (vide = tous)
+shard_ids_str = os.environ.get("SHARD_IDS", "")
+SHARD_IDS: Optional[List[int]] = [int(id.strip()) for id in shard_ids_str.split(",") if id.strip()] or None
+
+# Nombre de processus (clusters) lancés par main.py, 1 = un seul processus - Variable Railway: CLUSTER_COUNT
+CLUSTER_COUNT: int = int(os.environ.get("CLUSTER_COUNT", "1"))
+
+# Définis par main.py pour chaque cluster (ne pas configurer à la main)
+CLUSTER_ID: Optional[int] = int(os.environ["CLUSTER_ID"]) if os.environ.get("CLUSTER_ID") else None
+CLUSTER_SINGLETON: bool = os.environ.get("CLUSTER_SINGLETON", "False").lower() in ("true", "1", "yes", "on")
+
+# Port du health check du cluster 0 (cluster N écoute sur CLUSTER_HEALTH_PORT + N)
+CLUSTER_HEALTH_PORT: int = int(os.environ.get("CLUSTER_HEALTH_PORT", "9100"))
+
+# =============================================================================
+# MÉMOIRE
+# =============================================================================
+
+# Profil mémoire des caches discord.py : full, balanced ou minimal - Variable Railway: MEMORY_PROFILE
+MEMORY_PROFILE: str = os.environ.get("MEMORY_PROFILE", "full").lower()
+
+# Taille du cache de messages (vide = valeur du profil, 0 = désactivé) - Variable Railway: MAX_MESSAGES
+MAX_MESSAGES: Optional[int] = int(os.environ["MAX_MESSAGES"]) if os.environ.get("MAX_MESSAGES") else None
+
+# Chunking de tous les serveurs au démarrage (vide = valeur du profil) - Variable Railway: CHUNK_GUILDS_AT_STARTUP
+CHUNK_GUILDS_AT_STARTUP: Optional[bool] = (
+    os.environ["CHUNK_GUILDS_AT_STARTUP"].lower() in ("true", "1", "yes", "on")
+    if os.environ.get("CHUNK_GUILDS_AT_STARTUP") else None
+)
+
+# Seuil de blocage de la boucle asyncio avant capture de la stack (ms) - Variable Railway: LOOP_LAG_THRESHOLD_MS
+LOOP_LAG_THRESHOLD_MS: int = int(os.environ.get("LOOP_LAG_THRESHOLD_MS", "500"))
+
+# Profil de performance : default (asyncio + json) ou fast (uvloop + orjson si installés) - Variable Railway: PERFORMANCE_PROFILE
+PERFORMANCE_PROFILE: str = os.environ.get("PERFORMANCE_PROFILE", "default").lower()
+
+# Budget de requêtes REST Discord par seconde, partagé entre les clusters (limite globale Discord : 50/s) - Variable Railway: REST_RATE_BUDGET
+REST_RATE_BUDGET: float = float(os.environ.get("REST_RATE_BUDGET", "45"))
+
+# Modules de serveur instanciés au premier événement du serveur plutôt qu'au démarrage - Variable Railway: MODULES_LAZY_LOADING
+MODULES_LAZY_LOADING: bool = os.environ.get("MODULES_LAZY_LOADING", "False").lower() in ("true", "1", "yes", "on")
+# Mode lazy : secondes sans événement avant d'évincer les modules d'un serveur - Variable Railway: MODULES_IDLE_TTL
+MODULES_IDLE_TTL: int = int(os.environ.get("MODULES_IDLE_TTL", "1800"))
+
+# Inter-serveur : envois webhook simultanés par message relayé - Variable Railway: INTERSERVER_RELAY_CONCURRENCY
+INTERSERVER_RELAY_CONCURRENCY: int = int(os.environ.get("INTERSERVER_RELAY_CONCURRENCY", "10"))
+# Inter-serveur : délai maximal (secondes) d'un envoi vers un salon - Variable Railway: INTERSERVER_RELAY_TIMEOUT
+INTERSERVER_RELAY_TIMEOUT: float = float(os.environ.get("INTERSERVER_RELAY_TIMEOUT", "10"))
+# Inter-serveur : bans chargés au plus par serveur cible pour le cache des bans - Variable Railway: INTERSERVER_BAN_CACHE_LIMIT
+INTERSERVER_BAN_CACHE_LIMIT: int = int(os.environ.get("INTERSERVER_BAN_CACHE_LIMIT", "5000"))
+
+# Traces des interactions : off, jsonl (fichier local) ou otlp (collecteur OTLP/HTTP) - Variable Railway: TRACING_EXPORTER
+TRACING_EXPORTER: str = os.environ.get("TRACING_EXPORTER", "off").lower()
+# Part des traces exportées (0.0 - 1.0) - Variable Railway: TRACING_SAMPLE_RATE
+TRACING_SAMPLE_RATE: float = float(os.environ.get("TRACING_SAMPLE_RATE", "0.01"))
+# Les traces plus lentes que ce seuil (ms) sont toujours exportées - Variable Railway: TRACING_SLOW_MS
+TRACING_SLOW_MS: int = int(os.environ.get("TRACING_SLOW_MS", "1000"))
+# Fichier JSONL des traces (exporter jsonl) - Variable Railway: TRACING_JSONL_PATH
+TRACING_JSONL_PATH: str = os.environ.get("TRACING_JSONL_PATH", "traces.jsonl")
+# URL du collecteur OTLP/HTTP, sans /v1/traces (exporter otlp) - Variable Railway: TRACING_OTLP_ENDPOINT
+TRACING_OTLP_ENDPOINT: Optional[str] = os.environ.get("TRACING_OTLP_ENDPOINT")
+
 # =============================================================================
 # BASE DE DONNÉES
 # =============================================================================
@@ -32,6 +104,9 @@ DEVELOPER_IDS: List[int] = [int(id.strip()) for id in dev_ids_str.split(",") if
 # URL de connexion Neon PostgreSQL - Variable Railway: DATABASE_URL
 DATABASE_URL: Optional[str] = os.environ.get("DATABASE_URL")
 
+# Cache partagé entre processus (optionnel, sinon cache local uniquement) - Variable Railway: REDIS_URL
+REDIS_URL: Optional[str] = os.environ.get("REDIS_URL")
+
 # Pool de connexions
 DB_POOL_MIN_SIZE: int = int(os.environ.get("DB_POOL_MIN_SIZE", "1"))
 DB_POOL_MAX_SIZE: int = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
@@ -150,6 +225,16 @@ def validate_config():
         STAFF_DIR.mkdir(exist_ok=True)
         print(f"📁 Dossier créé : {STAFF_DIR}")
 
+    # Une liste de shards n'a de sens qu'avec un nombre total de shards
+    if SHARD_IDS and not SHARD_COUNT:
+        errors.append("❌ SHARD_IDS nécessite SHARD_COUNT")
+
+    if CLUSTER_COUNT < 1:
+        errors.append("❌ CLUSTER_COUNT doit être supérieur ou égal à 1")
+
+    if INTERSERVER_RELAY_CONCURRENCY < 1:
+        errors.append("❌ INTERSERVER_RELAY_CONCURRENCY doit être supérieur ou égal à 1")
+
     # Avertissements non bloquants
     if not DATABASE_URL:
         print("⚠️ DATABASE_URL non configurée - Mode sans base de données")
@@ -184,7 +269,16 @@ if __name__ == "__main__":
     print(f"  DISCORD_TOKEN: {'✅ Configuré' if TOKEN else '❌ Manquant'}")
     print(f"  DATABASE_URL: {'✅ Configuré' if DATABASE_URL else '⚠️ Non configuré'}")
     print(f"  DEEPL_API_KEY: {'✅ Configuré' if DEEPL_API_KEY else '⚠️ Non configuré'}")
+    print(f"  REDIS_URL: {'✅ Configuré' if REDIS_URL else '⚠️ Non configuré (cache local)'}")
     print(f"  DEBUG: {DEBUG}")
+    print(f"  AUTO_SHARD: {AUTO_SHARD} (count: {SHARD_COUNT or 'auto'}, ids: {SHARD_IDS or 'all'})")
+    print(f"  CLUSTER_COUNT: {CLUSTER_COUNT}")
+    print(f"  MEMORY_PROFILE: {MEMORY_PROFILE} (max_messages: {MAX_MESSAGES if MAX_MESSAGES is not None else 'profil'})")
+    print(f"  PERFORMANCE_PROFILE: {PERFORMANCE_PROFILE}")
+    print(f"  REST_RATE_BUDGET: {REST_RATE_BUDGET}/s")
+    print(f"  MODULES_LAZY_LOADING: {MODULES_LAZY_LOADING} (idle TTL: {MODULES_IDLE_TTL}s)")
+    print(f"  INTERSERVER_RELAY_CONCURRENCY: {INTERSERVER_RELAY_CONCURRENCY} (timeout: {INTERSERVER_RELAY_TIMEOUT}s, ban cache: {INTERSERVER_BAN_CACHE_LIMIT})")
+    print(f"  TRACING: {TRACING_EXPORTER} (sample rate: {TRACING_SAMPLE_RATE}, slow: {TRACING_SLOW_MS}ms)")
     print(f"  DEFAULT_PREFIX: {DEFAULT_PREFIX}")
     print(f"  DEVELOPER_IDS: {DEVELOPER_IDS or 'Auto-détection'}")
     print(f"\n📁 Chemins :")
@@ -3,16 +3,25 @@ Gestionnaire de base de données PostgreSQL pour Moddy
 Base de données locale sur le VPS
 """
 
+import asyncio
 import asyncpg
-import json
+from utils import json_codec as json
 import copy
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Tuple, Callable, Awaitable
 from enum import Enum
 import logging
 
+from utils.shared_cache import shared_cache
+from utils.metrics import metrics
+
 logger = logging.getLogger('moddy.database')
 
+# Canal NOTIFY des changements de configuration des modules (payload JSON : guild_id, module_id, version, deleted)
+MODULE_CONFIG_CHANNEL = 'moddy_module_config'
+# Verrou consultatif de la migration guilds.data.modules -> guild_modules (clusters démarrés en parallèle)
+LEGACY_MODULES_LOCK = 0x6D6F6464
+
 
 class ModdyDatabase:
     """Gestionnaire principal de la base de données"""
@@ -45,7 +54,8 @@ class ModdyDatabase:
                 server_settings={
                     'application_name': 'Moddy Bot',
                     'jit': 'off'
-                }
+                },
+                init=self._init_connection
             )
             logger.info("✅ PostgreSQL database connected")
 
@@ -56,6 +66,10 @@ class ModdyDatabase:
             logger.error(f"❌ PostgreSQL connection error: {e}")
             raise
 
+    async def _init_connection(self, conn: asyncpg.Connection):
+        """Called for every new pool connection: query timings for /metrics"""
+        conn.add_query_logger(metrics.record_query)
+
     async def close(self):
         """Closes the connection"""
         if self.pool:
@@ -141,6 +155,29 @@ class ModdyDatabase:
                 CREATE INDEX IF NOT EXISTS idx_guilds_attributes ON guilds USING GIN (attributes)
             """)
 
+            # Table des configurations de modules (une ligne par serveur et module)
+            # Les versions viennent d'une séquence commune : elles ne reculent jamais,
+            # même après une suppression puis une nouvelle configuration
+            await conn.execute("CREATE SEQUENCE IF NOT EXISTS guild_modules_version_seq AS BIGINT")
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS guild_modules (
+                    guild_id BIGINT NOT NULL,
+                    module_id VARCHAR(50) NOT NULL,
+                    enabled BOOLEAN NOT NULL DEFAULT FALSE,
+                    config JSONB NOT NULL DEFAULT '{}'::jsonb,
+                    version BIGINT NOT NULL DEFAULT nextval('guild_modules_version_seq'),
+                    updated_at TIMESTAMPTZ DEFAULT NOW(),
+                    PRIMARY KEY (guild_id, module_id)
+                )
+            """)
+
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_guild_modules_enabled ON guild_modules (module_id) WHERE enabled
+            """)
+
+            # Les configs encore dans guilds.data.modules sont migrées par
+            # migrate_legacy_module_configs (le ModuleManager calcule enabled)
+
             # Table d'audit des attributs
             await conn.execute("""
                 CREATE TABLE IF NOT EXISTS attribute_changes (
@@ -272,6 +309,17 @@ class ModdyDatabase:
                 CREATE INDEX IF NOT EXISTS idx_interserver_status ON interserver_messages(status)
             """)
 
+            # Webhook de chaque salon inter-serveur (évite channel.webhooks() à chaque relais)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS interserver_webhooks (
+                    channel_id BIGINT PRIMARY KEY,
+                    guild_id BIGINT NOT NULL,
+                    webhook_id BIGINT NOT NULL,
+                    webhook_token TEXT NOT NULL,
+                    updated_at TIMESTAMPTZ DEFAULT NOW()
+                )
+            """)
+
             # Migration: Add role_permissions column if it doesn't exist
             await conn.execute("""
                 DO $$
@@ -535,6 +583,22 @@ class ModdyDatabase:
                 'updated_at': row.get('updated_at', datetime.now(timezone.utc))
             }
 
+    async def get_guild_data(self, guild_id: int) -> Dict[str, Any]:
+        """Récupère la data d'un serveur (config, modules...) via le cache partagé"""
+        async def load():
+            return (await self.get_guild(guild_id))['data']
+
+        data = await shared_cache.get_or_load('guild_data', guild_id, load)
+        # Copie : les appelants peuvent modifier le dict retourné
+        return copy.deepcopy(data)
+
+    async def is_user_blacklisted(self, user_id: int) -> bool:
+        """Vérifie l'attribut BLACKLISTED d'un utilisateur via le cache partagé"""
+        return await shared_cache.get_or_load(
+            'user_blacklisted', user_id,
+            lambda: self.has_attribute('user', user_id, 'BLACKLISTED')
+        )
+
     # ================ GESTION DES ATTRIBUTS ================
 
     async def set_attribute(self, entity_type: str, entity_id: int,
@@ -604,6 +668,9 @@ class ModdyDatabase:
                 changed_by, reason
             )
 
+        if entity_type == 'user' and attribute == 'BLACKLISTED':
+            await shared_cache.invalidate('user_blacklisted', entity_id)
+
     async def has_attribute(self, entity_type: str, entity_id: int, attribute: str) -> bool:
         """Vérifie si une entité a un attribut spécifique"""
         entity = await self.get_user(entity_id) if entity_type == 'user' else await self.get_guild(entity_id)
@@ -795,6 +862,10 @@ class ModdyDatabase:
                 logger.error(f"[DB] ❌ Verification failed! No data found for guild {guild_id}")
                 raise Exception("Data verification failed: no data in database")
 
+        await shared_cache.invalidate('guild_data', guild_id)
+        if path_parts[0] == 'config':
+            await shared_cache.invalidate('prefix', guild_id)
+
     # ================ REQUÊTES UTILES ================
 
     async def get_users_with_attribute(self, attribute: str, value: Any = None) -> List[int]:
@@ -835,6 +906,249 @@ class ModdyDatabase:
 
             return [row['guild_id'] for row in rows]
 
+    # ================ CONFIGURATIONS DES MODULES ================
+
+    def _module_row(self, row) -> Dict[str, Any]:
+        return {'enabled': row['enabled'], 'config': self._parse_jsonb(row['config']), 'version': row['version']}
+
+    async def get_guild_modules(self, guild_id: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Récupère les modules configurés d'un serveur
+
+        Returns:
+            {module_id: {'enabled': bool, 'config': dict, 'version': int}}
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT module_id, enabled, config, version FROM guild_modules WHERE guild_id = $1",
+                guild_id
+            )
+            return {row['module_id']: self._module_row(row) for row in rows}
+
+    async def get_guild_module(self, guild_id: int, module_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère la ligne d'un module ({'enabled', 'config', 'version'}, None si non configuré)"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT enabled, config, version FROM guild_modules WHERE guild_id = $1 AND module_id = $2",
+                guild_id, module_id
+            )
+            return self._module_row(row) if row else None
+
+    async def get_module_config(self, guild_id: int, module_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère la configuration d'un module (None si non configuré)"""
+        async with self.pool.acquire() as conn:
+            config = await conn.fetchval(
+                "SELECT config FROM guild_modules WHERE guild_id = $1 AND module_id = $2",
+                guild_id, module_id
+            )
+            return self._parse_jsonb(config) if config is not None else None
+
+    async def get_module_versions(self, guild_ids: List[int]) -> Dict[Tuple[int, str], int]:
+        """Versions des configurations de modules des serveurs ((guild_id, module_id) -> version)"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT guild_id, module_id, version FROM guild_modules WHERE guild_id = ANY($1::bigint[])",
+                list(guild_ids)
+            )
+            return {(row['guild_id'], row['module_id']): row['version'] for row in rows}
+
+    async def save_module_config(self, guild_id: int, module_id: str, config: Dict[str, Any], enabled: bool) -> int:
+        """
+        Crée ou remplace la configuration d'un module (une seule ligne réécrite)
+        et notifie les autres process (MODULE_CONFIG_CHANNEL)
+
+        Returns:
+            Nouvelle version de la configuration
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                version = await conn.fetchval("""
+                    INSERT INTO guild_modules (guild_id, module_id, enabled, config)
+                    VALUES ($1, $2, $3, $4::jsonb)
+                    ON CONFLICT (guild_id, module_id) DO UPDATE
+                    SET enabled = EXCLUDED.enabled,
+                        config = EXCLUDED.config,
+                        version = nextval('guild_modules_version_seq'),
+                        updated_at = NOW()
+                    RETURNING version
+                """, guild_id, module_id, enabled, json.dumps(config))
+                # Envoyée au commit : les autres process relisent la ligne déjà à jour
+                await conn.execute("SELECT pg_notify($1, $2)", MODULE_CONFIG_CHANNEL, json.dumps({
+                    'guild_id': guild_id, 'module_id': module_id, 'version': version, 'deleted': False
+                }))
+
+        await shared_cache.invalidate('module_guilds', module_id)
+        return version
+
+    async def migrate_legacy_module_configs(self, resolve_enabled: Callable[[str, Dict[str, Any]], Awaitable[bool]]) -> int:
+        """
+        Migre les configs de modules de guilds.data.modules vers guild_modules (une seule fois)
+
+        Un seul process migre à la fois (verrou consultatif). La source est gardée
+        dans guilds.data.legacy_modules (retour arrière possible) : les démarrages
+        suivants ne trouvent plus de clé 'modules' et ne font rien.
+
+        Args:
+            resolve_enabled: (module_id, config) -> état activé du module pour cette config
+
+        Returns:
+            Nombre de lignes guild_modules créées
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock($1)", LEGACY_MODULES_LOCK)
+                guilds = await conn.fetch("SELECT guild_id, data->'modules' AS modules FROM guilds WHERE data ? 'modules'")
+                if not guilds:
+                    return 0
+
+                rows = []
+                for guild in guilds:
+                    for module_id, config in self._parse_jsonb(guild['modules']).items():
+                        if isinstance(config, dict) and config:
+                            rows.append((guild['guild_id'], module_id, await resolve_enabled(module_id, config), json.dumps(config)))
+
+                before = await conn.fetchval("SELECT COUNT(*) FROM guild_modules")
+                await conn.executemany("""
+                    INSERT INTO guild_modules (guild_id, module_id, enabled, config)
+                    VALUES ($1, $2, $3, $4::jsonb)
+                    ON CONFLICT (guild_id, module_id) DO NOTHING
+                """, rows)
+                migrated = await conn.fetchval("SELECT COUNT(*) FROM guild_modules") - before
+                await conn.execute("""
+                    UPDATE guilds SET data = (data - 'modules') || jsonb_build_object('legacy_modules', data->'modules')
+                    WHERE data ? 'modules'
+                """)
+
+        await shared_cache.invalidate_namespace('module_guilds')
+        logger.info(f"✅ {migrated} module configs migrated to guild_modules ({len(guilds)} guilds, source kept in legacy_modules)")
+        return migrated
+
+    async def set_module_enabled(self, guild_id: int, module_id: str, enabled: bool):
+        """Met à jour l'état activé d'un module sans toucher à sa configuration"""
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE guild_modules SET enabled = $3, updated_at = NOW()
+                WHERE guild_id = $1 AND module_id = $2
+            """, guild_id, module_id, enabled)
+
+        await shared_cache.invalidate('module_guilds', module_id)
+
+    async def delete_module_config(self, guild_id: int, module_id: str) -> int:
+        """
+        Supprime la configuration d'un module et notifie les autres process
+
+        Returns:
+            Version de la suppression (les notifications plus anciennes sont ignorées)
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "DELETE FROM guild_modules WHERE guild_id = $1 AND module_id = $2",
+                    guild_id, module_id
+                )
+                version = await conn.fetchval("SELECT nextval('guild_modules_version_seq')")
+                await conn.execute("SELECT pg_notify($1, $2)", MODULE_CONFIG_CHANNEL, json.dumps({
+                    'guild_id': guild_id, 'module_id': module_id, 'version': version, 'deleted': True
+                }))
+
+        await shared_cache.invalidate('module_guilds', module_id)
+        return version
+
+    def listen(self, channel: str, callback: Callable[[Dict[str, Any]], None],
+               on_connect: Optional[Callable[[], Awaitable[None]]] = None) -> asyncio.Task:
+        """
+        Écoute un canal NOTIFY sur une connexion dédiée (hors pool), reconnectée si elle est perdue
+
+        Args:
+            channel: Canal à écouter
+            callback: Appelée avec chaque payload JSON décodé (dans l'ordre des commits)
+            on_connect: Appelée à chaque (re)connexion ; les notifications émises
+                pendant une coupure sont perdues et doivent être rattrapées ici
+
+        Returns:
+            Tâche d'écoute (à annuler pour arrêter)
+        """
+        return asyncio.create_task(self._listen(channel, callback, on_connect), name=f"moddy-listen-{channel}")
+
+    async def _listen(self, channel: str, callback: Callable[[Dict[str, Any]], None],
+                      on_connect: Optional[Callable[[], Awaitable[None]]]):
+        def on_notification(connection, pid, channel, payload):
+            try:
+                callback(json.loads(payload))
+            except Exception as e:
+                logger.error(f"❌ Error handling {channel} notification: {e}", exc_info=True)
+
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.database_url)
+                await conn.add_listener(channel, on_notification)
+                logger.info(f"✅ Listening to {channel} notifications")
+                if on_connect:
+                    await on_connect()
+                # Keepalive : détecte une connexion perdue (sinon aucune erreur n'est levée)
+                while True:
+                    await asyncio.sleep(30)
+                    await conn.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ LISTEN {channel} error: {e}, reconnecting in 5s")
+                if conn is not None:
+                    conn.terminate()
+                    conn = None
+                await asyncio.sleep(5)
+            finally:
+                if conn is not None:
+                    conn.terminate()
+
+    async def get_guilds_with_module(self, module_id: str) -> List[int]:
+        """Serveurs où un module est activé (index partiel idx_guild_modules_enabled, via le cache partagé)"""
+        async def load():
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT guild_id FROM guild_modules WHERE module_id = $1 AND enabled",
+                    module_id
+                )
+                return [row['guild_id'] for row in rows]
+
+        return await shared_cache.get_or_load('module_guilds', module_id, load)
+
+    async def iter_guild_modules(self, guild_ids: List[int], batch_size: int = 500, with_config: bool = True):
+        """
+        Lit les modules configurés des serveurs par lots (une requête par lot)
+        Utilisé au démarrage à la place d'une requête par serveur
+
+        La connexion est rendue au pool avant chaque yield : le consommateur
+        (chargement des modules, shards en parallèle) peut en reprendre une.
+
+        Args:
+            guild_ids: Serveurs à charger
+            batch_size: Nombre de serveurs par lot
+            with_config: False pour ne lire que les IDs des modules (mode lazy)
+
+        Yields:
+            Listes de (guild_id, {module_id: {'enabled': bool, 'config': dict, 'version': int}}) d'au plus batch_size serveurs
+        """
+        columns = "guild_id, module_id, enabled, config, version" if with_config else "guild_id, module_id, enabled"
+        guild_ids = sorted(guild_ids)
+
+        for index in range(0, len(guild_ids), batch_size):
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(f"""
+                    SELECT {columns} FROM guild_modules
+                    WHERE guild_id = ANY($1::bigint[])
+                    ORDER BY guild_id
+                """, guild_ids[index:index + batch_size])
+
+            batch: Dict[int, Dict[str, Dict[str, Any]]] = {}
+            for row in rows:
+                batch.setdefault(row['guild_id'], {})[row['module_id']] = (
+                    self._module_row(row) if with_config else {'enabled': row['enabled'], 'config': None, 'version': None}
+                )
+            if batch:
+                yield list(batch.items())
+
     async def cleanup_old_errors(self, days: int = 30):
         """Nettoie les erreurs de plus de X jours"""
         async with self.pool.acquire() as conn:
@@ -915,6 +1229,7 @@ class ModdyDatabase:
                 ON CONFLICT (user_id)
                 DO UPDATE SET roles = $2, updated_by = $3, updated_at = NOW()
             """, user_id, json.dumps(roles), updated_by)
+            await shared_cache.invalidate('staff_permissions', user_id)
 
             # Set TEAM attribute automatically
             await self.set_attribute('user', user_id, 'TEAM', True, updated_by, "Added to staff team")
@@ -950,6 +1265,7 @@ class ModdyDatabase:
                 ON CONFLICT (user_id)
                 DO UPDATE SET denied_commands = $2, updated_by = $3, updated_at = NOW()
             """, user_id, json.dumps(denied_commands), updated_by)
+        await shared_cache.invalidate('staff_permissions', user_id)
 
     async def add_denied_command(self, user_id: int, command: str, updated_by: int):
         """Ajoute une commande à la liste des commandes interdites"""
@@ -976,6 +1292,7 @@ class ModdyDatabase:
                 "DELETE FROM staff_permissions WHERE user_id = $1",
                 user_id
             )
+        await shared_cache.invalidate('staff_permissions', user_id)
 
     async def get_all_staff_members(self) -> List[Dict[str, Any]]:
         """Récupère tous les membres du staff"""
@@ -1006,6 +1323,7 @@ class ModdyDatabase:
                 ON CONFLICT (user_id)
                 DO UPDATE SET role_permissions = $2, updated_by = $3, updated_at = NOW()
             """, user_id, json.dumps(role_perms), updated_by)
+        await shared_cache.invalidate('staff_permissions', user_id)
 
     async def get_role_permissions(self, user_id: int, role: str) -> List[str]:
         """Récupère les permissions d'un rôle spécifique"""
@@ -1270,25 +1588,22 @@ class ModdyDatabase:
                 return False
 
     async def add_relayed_message(self, moddy_id: str, guild_id: int, channel_id: int, message_id: int):
-        """Ajoute un message relayé à l'enregistrement"""
+        """
+        Ajoute un message relayé à l'enregistrement
+        Ajout atomique : les envois d'un relais (et des autres clusters) arrivent en parallèle
+        """
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT relayed_messages FROM interserver_messages WHERE moddy_id = $1",
-                moddy_id
-            )
-            if not row:
-                return
-
-            relayed = json.loads(row['relayed_messages']) if row['relayed_messages'] else []
-            relayed.append({
-                'guild_id': guild_id,
-                'channel_id': channel_id,
-                'message_id': message_id
-            })
-
             await conn.execute(
-                "UPDATE interserver_messages SET relayed_messages = $1::jsonb WHERE moddy_id = $2",
-                json.dumps(relayed),
+                """
+                UPDATE interserver_messages
+                SET relayed_messages = COALESCE(relayed_messages, '[]'::jsonb) || $1::jsonb
+                WHERE moddy_id = $2
+                """,
+                json.dumps([{
+                    'guild_id': guild_id,
+                    'channel_id': channel_id,
+                    'message_id': message_id
+                }]),
                 moddy_id
             )
 
@@ -1346,6 +1661,40 @@ class ModdyDatabase:
                 result.append(msg_dict)
             return result
 
+    async def get_interserver_webhook(self, channel_id: int) -> Optional[Tuple[int, str]]:
+        """Récupère le webhook (id, token) enregistré pour un salon inter-serveur"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT webhook_id, webhook_token FROM interserver_webhooks WHERE channel_id = $1",
+                channel_id
+            )
+            return (row['webhook_id'], row['webhook_token']) if row else None
+
+    async def set_interserver_webhook(self, channel_id: int, guild_id: int, webhook_id: int, webhook_token: str):
+        """Enregistre le webhook d'un salon inter-serveur"""
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO interserver_webhooks (channel_id, guild_id, webhook_id, webhook_token)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (channel_id) DO UPDATE
+                SET guild_id = EXCLUDED.guild_id, webhook_id = EXCLUDED.webhook_id,
+                    webhook_token = EXCLUDED.webhook_token, updated_at = NOW()
+            """, channel_id, guild_id, webhook_id, webhook_token)
+
+    async def delete_interserver_webhook(self, channel_id: int, webhook_id: Optional[int] = None):
+        """
+        Oublie le webhook d'un salon inter-serveur
+        Avec webhook_id, seulement s'il n'a pas déjà été remplacé (par un autre process)
+        """
+        async with self.pool.acquire() as conn:
+            if webhook_id is None:
+                await conn.execute("DELETE FROM interserver_webhooks WHERE channel_id = $1", channel_id)
+            else:
+                await conn.execute(
+                    "DELETE FROM interserver_webhooks WHERE channel_id = $1 AND webhook_id = $2",
+                    channel_id, webhook_id
+                )
+
     # ================ GESTION DES CASES DE MODÉRATION ================
 
     async def create_moderation_case(
@@ -1401,7 +1750,10 @@ class ModdyDatabase:
                 case_id, case_type, sanction_type, entity_type, entity_id,
                 reason, evidence, duration, created_by
             )
-            return case_id
+
+        if sanction_type == 'global_blacklist':
+            await shared_cache.invalidate('blacklist', entity_id)
+        return case_id
 
     async def get_moderation_case(self, case_id: str) -> Optional[Dict[str, Any]]:
         """Get a moderation case by ID"""
@@ -1572,7 +1924,11 @@ class ModdyDatabase:
             """
 
             result = await conn.execute(query, *params)
-            return result == "UPDATE 1"
+
+        # Case updates are rare staff actions: drop every cached blacklist status
+        if sanction_type is not None:
+            await shared_cache.invalidate_namespace('blacklist')
+        return result == "UPDATE 1"
 
     async def close_moderation_case(
         self,
@@ -1597,7 +1953,10 @@ class ModdyDatabase:
                 WHERE case_id = $3 AND status = 'open'
             """, closed_by, close_reason, case_id)
 
-            return result == "UPDATE 1"
+        # Closing a global blacklist case lifts it: drop every cached blacklist status
+        if result == "UPDATE 1":
+            await shared_cache.invalidate_namespace('blacklist')
+        return result == "UPDATE 1"
 
     async def add_case_note(
         self,
@@ -0,0 +1,109 @@
+"""
+Clés d'idempotence pour les endpoints internes.
+
+Le backend peut envoyer un en-tête `Idempotency-Key` : la réponse du premier
+appel est gardée dans le cache partagé (namespace 'idempotency', 10 min en
+local, 1 h dans Redis) et renvoyée telle quelle aux appels suivants avec la
+même clé, sans refaire les appels Discord ni les écritures en base.
+Un appel concurrent avec une clé en cours de traitement attend son résultat.
+Un hash du corps de la requête est gardé avec la réponse : une clé réutilisée
+avec un autre corps est rejetée (422) au lieu de rejouer une réponse qui ne
+lui correspond pas.
+Les erreurs (HTTPException, exceptions) ne sont pas mémorisées : un retry
+après une erreur est retraité.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from utils.shared_cache import shared_cache
+
+logger = logging.getLogger('moddy.internal_api.idempotency')
+
+IDEMPOTENCY_NAMESPACE = 'idempotency'
+
+ResponseModel = TypeVar('ResponseModel', bound=BaseModel)
+
+# Traitements en cours, par clé : (hash du corps, résultat)
+_in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+
+def payload_hash(payload: BaseModel) -> str:
+    """Hash du corps de la requête, indépendant de l'ordre des champs"""
+    body = json.dumps(payload.model_dump(mode='json'), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _check_payload(scope: str, key: str, stored_hash: Optional[str], request_hash: str):
+    if stored_hash != request_hash:
+        logger.warning(f"⚠️ Idempotency key {key} reused with a different payload on {scope}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key already used with a different payload"
+        )
+
+
+async def run_idempotent(scope: str, key: Optional[str], payload: BaseModel, model: Type[ResponseModel],
+                         handler: Callable[[], Awaitable[ResponseModel]]) -> ResponseModel:
+    """
+    Exécute handler() une seule fois par clé d'idempotence.
+
+    Args:
+        scope: Nom de l'endpoint (une même clé peut servir sur deux endpoints)
+        key: Valeur de l'en-tête Idempotency-Key (None = pas d'idempotence)
+        payload: Corps de la requête, comparé à celui du premier appel
+        model: Modèle de réponse, pour reconstruire une réponse mémorisée
+        handler: Traitement de la requête
+
+    Returns:
+        La réponse du traitement, ou celle mémorisée pour cette clé
+
+    Raises:
+        HTTPException: 422 si la clé a déjà servi avec un autre corps
+    """
+    if not key:
+        return await handler()
+
+    cache_key = f"{scope}:{key}"
+    request_hash = payload_hash(payload)
+
+    cached = await shared_cache.get(IDEMPOTENCY_NAMESPACE, cache_key)
+    if cached is not None:
+        _check_payload(scope, key, cached.get('payload_hash'), request_hash)
+        logger.info(f"♻️ Idempotent replay for {scope} (key {key})")
+        return model.model_validate(cached['response'])
+
+    in_flight = _in_flight.get(cache_key)
+    if in_flight is not None:
+        pending_hash, pending = in_flight
+        _check_payload(scope, key, pending_hash, request_hash)
+        logger.info(f"⏳ Waiting for in-flight request {scope} (key {key})")
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[cache_key] = (request_hash, future)
+    try:
+        response = await handler()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Marque l'exception comme récupérée s'il n'y a aucun appel en attente
+        future.exception()
+        raise
+    else:
+        await shared_cache.set(IDEMPOTENCY_NAMESPACE, cache_key, {
+            'payload_hash': request_hash,
+            'response': response.model_dump(mode='json'),
+        })
+        future.set_result(response)
+        return response
+    finally:
+        _in_flight.pop(cache_key, None)
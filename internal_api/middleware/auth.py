@@ -13,6 +13,9 @@ logger = logging.getLogger('moddy.internal_api.auth')
 # Récupérer le secret depuis les variables d'environnement
 INTERNAL_API_SECRET = os.getenv("INTERNAL_API_SECRET")
 
+# Chemins protégés par le secret (/metrics : scrape Prometheus avec bearer_token)
+PROTECTED_PREFIXES = ("/internal", "/metrics")
+
 if not INTERNAL_API_SECRET:
     logger.warning("⚠️ INTERNAL_API_SECRET environment variable is not set!")
     logger.warning("⚠️ Internal API authentication is DISABLED (not secure for production)")
@@ -23,7 +26,7 @@ async def verify_internal_auth(request: Request, call_next):
     Middleware global pour vérifier l'authentification des requêtes internes.
 
     Vérifie que le header Authorization contient le bon secret pour toutes
-    les requêtes vers /internal/*.
+    les requêtes vers /internal/* et /metrics.
 
     Args:
         request: Requête FastAPI
@@ -32,8 +35,8 @@ async def verify_internal_auth(request: Request, call_next):
     Returns:
         Réponse HTTP ou erreur d'authentification
     """
-    # Ne vérifier que les endpoints /internal/*
-    if request.url.path.startswith("/internal"):
+    # Ne vérifier que les endpoints /internal/* et /metrics
+    if request.url.path.startswith(PROTECTED_PREFIXES):
 
         # Si le secret n'est pas configuré, refuser toutes les requêtes internes
         if not INTERNAL_API_SECRET:
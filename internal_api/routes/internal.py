@@ -3,22 +3,36 @@ Endpoints internes pour la communication avec le backend.
 Basé sur /documentation/internal-api.md
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, status
+import asyncio
 import logging
-from typing import Optional
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import discord
 
+from internal_api.idempotency import run_idempotent
 from schemas.internal import (
     InternalNotifyUserRequest,
     InternalNotifyUserResponse,
+    InternalNotifyBatchRequest,
+    InternalNotifyBatchItemResult,
+    InternalNotifyBatchResponse,
     InternalUpdateRoleRequest,
     InternalUpdateRoleResponse,
+    InternalUpdateRoleBatchRequest,
+    InternalUpdateRoleBatchItemResult,
+    InternalUpdateRoleBatchResponse,
     InternalHealthResponse,
 )
 
 router = APIRouter(prefix="/internal", tags=["Internal"])
 logger = logging.getLogger('moddy.internal_api.routes')
 
+# Éléments d'un batch traités en parallèle (discord.py gère les rate limits)
+BATCH_CONCURRENCY = 10
+# Nombre maximal d'IDs par requête gateway query_members
+MEMBER_QUERY_LIMIT = 100
+
 # Référence globale au bot Discord (sera définie au démarrage)
 _bot_instance: Optional[discord.Client] = None
 
@@ -65,18 +79,27 @@ async def health_check():
     try:
         bot = get_bot()
 
+        # Latence de la boucle asyncio (watchdog)
+        watchdog = getattr(bot, 'loop_watchdog', None)
+        loop_lag = None
+        if watchdog:
+            stats = watchdog.percentiles()
+            loop_lag = {key: round(stats[key], 1) for key in ('p50', 'p95', 'p99', 'max')}
+
         # Vérifier que le bot est connecté à Discord
         if not bot.is_ready():
             return InternalHealthResponse(
                 status="unhealthy",
                 service="discord-bot",
-                version="1.0.0"
+                version="1.0.0",
+                loop_lag_ms=loop_lag
             )
 
         return InternalHealthResponse(
             status="healthy",
             service="discord-bot",
-            version="1.0.0"
+            version="1.0.0",
+            loop_lag_ms=loop_lag
         )
     except Exception as e:
         logger.error(f"❌ Health check failed: {e}", exc_info=True)
@@ -88,7 +111,7 @@ async def health_check():
 
 
 @router.post("/notify", response_model=InternalNotifyUserResponse)
-async def notify_user(payload: InternalNotifyUserRequest):
+async def notify_user(payload: InternalNotifyUserRequest, idempotency_key: Optional[str] = Header(None)):
     """
     Notifie le bot d'un événement utilisateur.
 
@@ -100,31 +123,78 @@ async def notify_user(payload: InternalNotifyUserRequest):
 
     Args:
         payload: Données de notification (discord_id, action, plan, metadata)
+        idempotency_key: En-tête Idempotency-Key (optionnel, rejoue la première réponse)
 
     Returns:
         InternalNotifyUserResponse avec le statut de l'opération
     """
     logger.info(f"📩 Notification reçue pour discord_id={payload.discord_id}, action={payload.action}")
 
-    try:
+    return await run_idempotent(
+        "notify", idempotency_key, payload, InternalNotifyUserResponse,
+        lambda: _notify_user(get_bot(), payload)
+    )
+
+
+@router.post("/notify/batch", response_model=InternalNotifyBatchResponse)
+async def notify_users_batch(payload: InternalNotifyBatchRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Notifie plusieurs utilisateurs en un seul appel (migrations de plans en masse).
+
+    Chaque élément est traité comme un appel à /internal/notify, en parallèle
+    (BATCH_CONCURRENCY à la fois). Une erreur sur un élément n'interrompt pas
+    les autres : elle est renvoyée dans son résultat.
+
+    Returns:
+        InternalNotifyBatchResponse avec un résultat par élément
+    """
+    logger.info(f"📩 Batch de {len(payload.items)} notifications reçu")
+
+    async def process():
         bot = get_bot()
 
-        # Récupérer l'utilisateur Discord
-        try:
-            user = await bot.fetch_user(int(payload.discord_id))
-        except discord.NotFound:
-            logger.warning(f"⚠️ User {payload.discord_id} not found on Discord")
-            return InternalNotifyUserResponse(
-                success=False,
-                message=f"User {payload.discord_id} not found",
-                notification_sent=False
-            )
-        except discord.HTTPException as e:
-            logger.error(f"❌ Failed to fetch user {payload.discord_id}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to fetch user: {str(e)}"
-            )
+        async def notify(item: InternalNotifyUserRequest):
+            try:
+                response = await _notify_user(bot, item)
+            except HTTPException as e:
+                response = InternalNotifyUserResponse(success=False, message=str(e.detail))
+            return InternalNotifyBatchItemResult(discord_id=item.discord_id, **response.model_dump())
+
+        results = await _run_batch(payload.items, notify)
+        failed = sum(1 for result in results if not result.success)
+        return InternalNotifyBatchResponse(
+            success=failed == 0,
+            processed=len(results),
+            failed=failed,
+            results=results
+        )
+
+    return await run_idempotent("notify_batch", idempotency_key, payload, InternalNotifyBatchResponse, process)
+
+
+async def _notify_user(bot, payload: InternalNotifyUserRequest) -> InternalNotifyUserResponse:
+    """Traitement d'une notification (utilisé par /notify et /notify/batch)"""
+    try:
+        user_id = int(payload.discord_id)
+
+        # Récupérer l'utilisateur Discord (cache d'abord, sinon API)
+        user = bot.get_user(user_id)
+        if user is None:
+            try:
+                user = await bot.fetch_user(user_id)
+            except discord.NotFound:
+                logger.warning(f"⚠️ User {payload.discord_id} not found on Discord")
+                return InternalNotifyUserResponse(
+                    success=False,
+                    message=f"User {payload.discord_id} not found",
+                    notification_sent=False
+                )
+            except discord.HTTPException as e:
+                logger.error(f"❌ Failed to fetch user {payload.discord_id}: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to fetch user: {str(e)}"
+                )
 
         # Mettre à jour l'attribut PREMIUM dans la base de données
         await _update_premium_attribute(bot, payload)
@@ -161,111 +231,235 @@ async def notify_user(payload: InternalNotifyUserRequest):
 
 
 @router.post("/roles/update", response_model=InternalUpdateRoleResponse)
-async def update_user_role(payload: InternalUpdateRoleRequest):
+async def update_user_role(payload: InternalUpdateRoleRequest, idempotency_key: Optional[str] = Header(None)):
     """
     Met à jour les rôles Discord d'un utilisateur.
 
     Cette fonction:
-    1. Récupère le membre du serveur Discord principal (MODDY_GUILD_ID)
+    1. Récupère le membre du serveur Discord principal (MODDY_GUILD_ID), depuis le cache si possible
     2. Ajoute/retire les rôles spécifiés
     3. Retourne le statut
 
     Args:
         payload: Données de mise à jour (discord_id, plan, add_roles, remove_roles)
+        idempotency_key: En-tête Idempotency-Key (optionnel, rejoue la première réponse)
 
     Returns:
         InternalUpdateRoleResponse avec le statut de l'opération
     """
     logger.info(f"📝 Mise à jour des rôles pour discord_id={payload.discord_id}, plan={payload.plan}")
 
-    try:
-        bot = get_bot()
-
-        # Récupérer l'ID du serveur principal depuis les variables d'environnement
-        import os
-        guild_id_str = os.getenv("MODDY_GUILD_ID")
-        if not guild_id_str:
-            logger.error("❌ MODDY_GUILD_ID environment variable not set")
+    async def process():
+        try:
+            guild = _get_main_guild(get_bot())
+
+            # Récupérer le membre
+            try:
+                member = await _get_member(guild, int(payload.discord_id))
+            except discord.HTTPException as e:
+                logger.error(f"❌ Failed to fetch member {payload.discord_id}: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to fetch member: {str(e)}"
+                )
+
+            return await _update_member_roles(guild, member, payload)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de la mise à jour des rôles: {e}", exc_info=True)
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="MODDY_GUILD_ID not configured"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
             )
 
-        guild_id = int(guild_id_str)
+    return await run_idempotent("roles_update", idempotency_key, payload, InternalUpdateRoleResponse, process)
 
-        # Récupérer le serveur Discord
-        guild = bot.get_guild(guild_id)
-        if not guild:
-            logger.error(f"❌ Guild {guild_id} not found")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Guild {guild_id} not found"
-            )
 
-        # Récupérer le membre
-        try:
-            member = await guild.fetch_member(int(payload.discord_id))
-        except discord.NotFound:
-            logger.warning(f"⚠️ Member {payload.discord_id} not found in guild {guild_id}")
-            return InternalUpdateRoleResponse(
-                success=False,
-                message=f"Member {payload.discord_id} not in guild",
-                roles_updated=False,
-                guild_id=str(guild_id)
-            )
-        except discord.HTTPException as e:
-            logger.error(f"❌ Failed to fetch member {payload.discord_id}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to fetch member: {str(e)}"
-            )
+@router.post("/roles/update/batch", response_model=InternalUpdateRoleBatchResponse)
+async def update_user_roles_batch(payload: InternalUpdateRoleBatchRequest, idempotency_key: Optional[str] = Header(None)):
+    """
+    Met à jour les rôles de plusieurs utilisateurs en un seul appel.
 
-        # Ajouter les rôles
-        if payload.add_roles:
-            for role_id_str in payload.add_roles:
-                role = guild.get_role(int(role_id_str))
-                if role:
-                    try:
-                        await member.add_roles(role, reason=f"Plan update: {payload.plan}")
-                        logger.info(f"✅ Added role {role.name} to {member}")
-                    except discord.Forbidden:
-                        logger.error(f"❌ Missing permissions to add role {role.name}")
-                    except discord.HTTPException as e:
-                        logger.error(f"❌ Failed to add role {role.name}: {e}")
-                else:
-                    logger.warning(f"⚠️ Role {role_id_str} not found in guild")
-
-        # Retirer les rôles
-        if payload.remove_roles:
-            for role_id_str in payload.remove_roles:
-                role = guild.get_role(int(role_id_str))
-                if role:
-                    try:
-                        await member.remove_roles(role, reason=f"Plan update: {payload.plan}")
-                        logger.info(f"✅ Removed role {role.name} from {member}")
-                    except discord.Forbidden:
-                        logger.error(f"❌ Missing permissions to remove role {role.name}")
-                    except discord.HTTPException as e:
-                        logger.error(f"❌ Failed to remove role {role.name}: {e}")
-                else:
-                    logger.warning(f"⚠️ Role {role_id_str} not found in guild")
+    Les membres absents du cache sont récupérés en une requête gateway par
+    tranche de 100 (query_members) au lieu d'un fetch_member par utilisateur.
+    Une erreur sur un élément n'interrompt pas les autres.
 
-        return InternalUpdateRoleResponse(
-            success=True,
-            message="Roles updated successfully",
-            roles_updated=True,
-            guild_id=str(guild_id)
+    Returns:
+        InternalUpdateRoleBatchResponse avec un résultat par élément
+    """
+    logger.info(f"📝 Batch de {len(payload.items)} mises à jour de rôles reçu")
+
+    async def process():
+        guild = _get_main_guild(get_bot())
+        members = await _resolve_members(guild, [int(item.discord_id) for item in payload.items])
+
+        async def update(item: InternalUpdateRoleRequest):
+            try:
+                response = await _update_member_roles(guild, members.get(int(item.discord_id)), item)
+            except Exception as e:
+                logger.error(f"❌ Erreur lors de la mise à jour des rôles de {item.discord_id}: {e}", exc_info=True)
+                response = InternalUpdateRoleResponse(success=False, message=str(e), guild_id=str(guild.id))
+            return InternalUpdateRoleBatchItemResult(discord_id=item.discord_id, **response.model_dump())
+
+        results = await _run_batch(payload.items, update)
+        failed = sum(1 for result in results if not result.success)
+        return InternalUpdateRoleBatchResponse(
+            success=failed == 0,
+            processed=len(results),
+            failed=failed,
+            guild_id=str(guild.id),
+            results=results
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"❌ Erreur lors de la mise à jour des rôles: {e}", exc_info=True)
+    return await run_idempotent("roles_update_batch", idempotency_key, payload, InternalUpdateRoleBatchResponse, process)
+
+
+def _get_main_guild(bot) -> discord.Guild:
+    """
+    Récupère le serveur principal (MODDY_GUILD_ID).
+
+    Raises:
+        HTTPException: 503 si MODDY_GUILD_ID n'est pas configuré, 404 si le serveur est introuvable
+    """
+    # Récupérer l'ID du serveur principal depuis les variables d'environnement
+    guild_id_str = os.getenv("MODDY_GUILD_ID")
+    if not guild_id_str:
+        logger.error("❌ MODDY_GUILD_ID environment variable not set")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="MODDY_GUILD_ID not configured"
+        )
+
+    guild_id = int(guild_id_str)
+
+    # Récupérer le serveur Discord
+    guild = bot.get_guild(guild_id)
+    if not guild:
+        logger.error(f"❌ Guild {guild_id} not found")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Guild {guild_id} not found"
+        )
+    return guild
+
+
+async def _get_member(guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+    """
+    Récupère un membre depuis le cache, sinon via l'API.
+
+    Returns:
+        Le membre, ou None s'il n'est pas sur le serveur
+
+    Raises:
+        discord.HTTPException: Si l'appel à l'API échoue
+    """
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+    try:
+        return await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+
+
+async def _resolve_members(guild: discord.Guild, user_ids: List[int]) -> Dict[int, discord.Member]:
+    """
+    Récupère plusieurs membres : cache d'abord, puis query_members par tranche
+    de 100 IDs (une requête gateway), puis fetch_member si la requête échoue.
+
+    Returns:
+        Dict {user_id: membre} (les utilisateurs absents du serveur n'y sont pas)
+    """
+    members: Dict[int, discord.Member] = {}
+    missing = []
+    for user_id in dict.fromkeys(user_ids):
+        member = guild.get_member(user_id)
+        if member is not None:
+            members[user_id] = member
+        else:
+            missing.append(user_id)
+
+    for start in range(0, len(missing), MEMBER_QUERY_LIMIT):
+        chunk = missing[start:start + MEMBER_QUERY_LIMIT]
+        try:
+            found = await guild.query_members(user_ids=chunk, limit=len(chunk), cache=True)
+            members.update((member.id, member) for member in found)
+        except (discord.ClientException, asyncio.TimeoutError) as e:
+            logger.warning(f"⚠️ query_members failed ({e}), falling back to fetch_member")
+            for user_id in chunk:
+                try:
+                    member = await _get_member(guild, user_id)
+                except discord.HTTPException as e:
+                    logger.error(f"❌ Failed to fetch member {user_id}: {e}")
+                    continue
+                if member is not None:
+                    members[user_id] = member
+
+    return members
+
+
+async def _update_member_roles(guild: discord.Guild, member: Optional[discord.Member],
+                               payload: InternalUpdateRoleRequest) -> InternalUpdateRoleResponse:
+    """Ajoute/retire les rôles d'un membre (utilisé par /roles/update et /roles/update/batch)"""
+    if member is None:
+        logger.warning(f"⚠️ Member {payload.discord_id} not found in guild {guild.id}")
+        return InternalUpdateRoleResponse(
+            success=False,
+            message=f"Member {payload.discord_id} not in guild",
+            roles_updated=False,
+            guild_id=str(guild.id)
         )
 
+    # Ajouter les rôles
+    if payload.add_roles:
+        for role_id_str in payload.add_roles:
+            role = guild.get_role(int(role_id_str))
+            if role:
+                try:
+                    await member.add_roles(role, reason=f"Plan update: {payload.plan}")
+                    logger.info(f"✅ Added role {role.name} to {member}")
+                except discord.Forbidden:
+                    logger.error(f"❌ Missing permissions to add role {role.name}")
+                except discord.HTTPException as e:
+                    logger.error(f"❌ Failed to add role {role.name}: {e}")
+            else:
+                logger.warning(f"⚠️ Role {role_id_str} not found in guild")
+
+    # Retirer les rôles
+    if payload.remove_roles:
+        for role_id_str in payload.remove_roles:
+            role = guild.get_role(int(role_id_str))
+            if role:
+                try:
+                    await member.remove_roles(role, reason=f"Plan update: {payload.plan}")
+                    logger.info(f"✅ Removed role {role.name} from {member}")
+                except discord.Forbidden:
+                    logger.error(f"❌ Missing permissions to remove role {role.name}")
+                except discord.HTTPException as e:
+                    logger.error(f"❌ Failed to remove role {role.name}: {e}")
+            else:
+                logger.warning(f"⚠️ Role {role_id_str} not found in guild")
+
+    return InternalUpdateRoleResponse(
+        success=True,
+        message="Roles updated successfully",
+        roles_updated=True,
+        guild_id=str(guild.id)
+    )
+
+
+async def _run_batch(items: list, handler: Callable[[Any], Awaitable[Any]]) -> list:
+    """Exécute handler sur chaque élément, BATCH_CONCURRENCY à la fois, dans l'ordre des éléments"""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(item):
+        async with semaphore:
+            return await handler(item)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
 
 async def _update_premium_attribute(bot, payload: InternalNotifyUserRequest):
     """
@@ -8,21 +8,35 @@ Basé sur /documentation/internal-api.md
 """
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+import contextlib
 import logging
 import os
+from typing import Any
+import uvicorn
+from utils import json_codec
 from internal_api.middleware.auth import verify_internal_auth
-from internal_api.routes.internal import router as internal_router, set_bot_instance
+from internal_api.routes.internal import router as internal_router, set_bot_instance, get_bot
 
 # Configuration du logging
 logger = logging.getLogger('moddy.internal_api')
 
+
+class CodecJSONResponse(JSONResponse):
+    """Réponse JSON encodée par utils.json_codec (orjson avec PERFORMANCE_PROFILE=fast)."""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content).encode("utf-8")
+
+
 # Créer l'application FastAPI
 app = FastAPI(
     title="Moddy Bot Internal API",
     description="API interne pour la communication avec le backend",
     version="1.0.0",
     docs_url=None,  # Désactiver la documentation Swagger publique
-    redoc_url=None  # Désactiver ReDoc
+    redoc_url=None,  # Désactiver ReDoc
+    default_response_class=CodecJSONResponse
 )
 
 # Ajouter le middleware d'authentification
@@ -67,6 +81,45 @@ async def ping():
     return {"ping": "pong"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Métriques au format texte Prometheus (protégé par verify_internal_auth)."""
+    from utils.metrics import render_metrics
+    return PlainTextResponse(render_metrics(get_bot()), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class EmbeddedServer(uvicorn.Server):
+    """
+    Serveur uvicorn servi sur la boucle asyncio du bot (via serve() dans une tâche).
+
+    Les routes appellent directement le client Discord et la base de données,
+    qui sont liés à la boucle du bot : les servir sur cette même boucle évite
+    tout appel cross-loop. Les signaux restent gérés par main.py / le bot.
+    """
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
+
+
+def create_server(port: int, host: str = "::") -> EmbeddedServer:
+    """
+    Crée le serveur uvicorn de l'API interne, à lancer avec `await server.serve()`.
+
+    Args:
+        port: Port d'écoute
+        host: Adresse d'écoute (:: = IPv4 + IPv6)
+    """
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        log_level="info",
+        access_log=False  # Désactiver les logs d'accès pour éviter le spam
+    )
+    return EmbeddedServer(config)
+
+
 def set_bot(bot):
     """
     Définit l'instance du bot Discord pour l'API interne.
@@ -79,8 +132,6 @@ def set_bot(bot):
 
 
 if __name__ == "__main__":
-    import uvicorn
-
     # Lancer le serveur sur :: (IPv4 + IPv6)
     # Port 3000 par défaut (privé, non exposé publiquement)
     port = int(os.getenv("INTERNAL_PORT", 3000))
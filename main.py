@@ -31,6 +31,13 @@ if sys.version_info < (3, 11):
     sys.exit(1)
 
 
+# Cluster restart backoff (seconds)
+RESTART_BACKOFF_BASE = 5
+RESTART_BACKOFF_MAX = 300
+# A cluster running for this long before crashing starts its backoff over
+RESTART_RESET_AFTER = 600
+
+
 class ServiceManager:
     """Moddy Service Manager"""
 
@@ -49,7 +56,9 @@ class ServiceManager:
         self.logger.info("📍 Shutdown signal received, closing services...")
         self.cleanup()
 
-    def start_service(self, name: str, command: list, health_check_url: Optional[str] = None):
+    def start_service(self, name: str, command: list, health_check_url: Optional[str] = None,
+                      env: Optional[Dict[str, str]] = None, health_timeout: int = 10,
+                      restart_on_failure: bool = False):
         """
         Starts a service in a subprocess with log redirection.
 
@@ -57,6 +66,9 @@ class ServiceManager:
             name: Service name
             command: Command to execute
             health_check_url: URL to check if the service is ready
+            env: Extra environment variables for the process
+            health_timeout: Seconds to wait for the health check
+            restart_on_failure: Restart the service with backoff if it crashes (see supervise)
         """
         if name in self.services and self.services[name].get('process'):
             if self.services[name]['process'].poll() is None:
@@ -74,7 +86,8 @@ class ServiceManager:
                 text=True,
                 bufsize=1,
                 universal_newlines=True,
-                cwd=Path(__file__).parent
+                cwd=Path(__file__).parent,
+                env={**os.environ, **env} if env else None
             )
 
             # Thread to read and display logs
@@ -89,17 +102,27 @@ class ServiceManager:
                 'process': process,
                 'command': command,
                 'log_thread': log_thread,
-                'health_check_url': health_check_url
+                'health_check_url': health_check_url,
+                'env': env,
+                'health_timeout': health_timeout,
+                'restart_on_failure': restart_on_failure,
+                'started_at': time.time(),
+                'failures': 0,
+                'next_restart_at': None
             }
 
             # Waiting for the service to be ready
             if health_check_url:
-                if self._wait_for_service(name, health_check_url):
+                if self._wait_for_service(name, health_check_url, timeout=health_timeout):
                     self.logger.info(f"✅ {name} is operational")
                     return True
                 else:
                     self.logger.error(f"❌ {name} did not start correctly")
-                    self.stop_service(name)
+                    if restart_on_failure:
+                        # Left to supervise(), which restarts it with backoff
+                        self._terminate(name)
+                    else:
+                        self.stop_service(name)
                     return False
             else:
                 # No health check, assuming it's okay after a delay
@@ -175,30 +198,30 @@ class ServiceManager:
 
         return False
 
+    def _terminate(self, name: str):
+        """Terminates the process of a service, keeping its entry."""
+        process = self.services[name].get('process')
+        if process and process.poll() is None:
+            self.logger.info(f"⏹️  Stopping service {name}...")
+
+            # Trying to stop cleanly
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+                self.logger.info(f"✅ {name} stopped cleanly")
+            except subprocess.TimeoutExpired:
+                # Forcing stop
+                self.logger.warning(f"⚠️ Forcing stop of {name}")
+                process.kill()
+                process.wait()
+
     def stop_service(self, name: str):
         """Stops a service cleanly."""
         if name not in self.services:
             return
 
-        service = self.services[name]
-        if service.get('process'):
-            process = service['process']
-
-            if process.poll() is None:
-                self.logger.info(f"⏹️  Stopping service {name}...")
-
-                # Trying to stop cleanly
-                process.terminate()
-                try:
-                    process.wait(timeout=5)
-                    self.logger.info(f"✅ {name} stopped cleanly")
-                except subprocess.TimeoutExpired:
-                    # Forcing stop
-                    self.logger.warning(f"⚠️ Forcing stop of {name}")
-                    process.kill()
-                    process.wait()
-
-            del self.services[name]
+        self._terminate(name)
+        del self.services[name]
 
     def restart_service(self, name: str):
         """Restarts a service."""
@@ -209,8 +232,78 @@ class ServiceManager:
             self.start_service(
                 name,
                 service_info['command'],
-                service_info.get('health_check_url')
+                service_info.get('health_check_url'),
+                env=service_info.get('env'),
+                health_timeout=service_info.get('health_timeout', 10),
+                restart_on_failure=service_info.get('restart_on_failure', False)
             )
+            # Keeps the crash count for the backoff
+            if name in self.services:
+                self.services[name]['failures'] = service_info.get('failures', 0)
+
+    def restart_delay(self, failures: int) -> float:
+        """Backoff before restarting a service that crashed `failures` times in a row."""
+        return min(RESTART_BACKOFF_MAX, RESTART_BACKOFF_BASE * 2 ** max(0, failures - 1))
+
+    def supervise(self) -> list:
+        """
+        Checks the services started with restart_on_failure.
+
+        Crashed services are scheduled for a restart with exponential backoff;
+        a service that stayed up for RESTART_RESET_AFTER seconds has its failure
+        count reset. Returns the names of the services due for a restart now.
+        """
+        due = []
+        now = time.time()
+        for name, service in self.services.items():
+            if not service.get('restart_on_failure'):
+                continue
+            process = service.get('process')
+            if not process or process.poll() is None:
+                continue
+
+            if service['next_restart_at'] is None:
+                # Newly detected crash
+                if now - service['started_at'] >= RESTART_RESET_AFTER:
+                    service['failures'] = 0
+                service['failures'] += 1
+                delay = self.restart_delay(service['failures'])
+                service['next_restart_at'] = now + delay
+                self.logger.warning(
+                    f"⚠️ {name} crashed (code: {process.returncode}), "
+                    f"restart #{service['failures']} in {delay:.0f}s"
+                )
+            elif now >= service['next_restart_at']:
+                due.append(name)
+        return due
+
+    def get_health(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetches the JSON health report of every service with a health check URL (None if unreachable)."""
+        import json
+        import urllib.request
+        import urllib.error
+
+        reports = {}
+        for name, service in self.services.items():
+            url = service.get('health_check_url')
+            if not url:
+                continue
+            process = service.get('process')
+            if not process or process.poll() is not None:
+                reports[name] = None
+                continue
+            try:
+                with urllib.request.urlopen(url, timeout=2) as response:
+                    reports[name] = json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                # 503 = alive but not ready yet
+                try:
+                    reports[name] = json.loads(e.read())
+                except Exception:
+                    reports[name] = None
+            except Exception:
+                reports[name] = None
+        return reports
 
     def cleanup(self):
         """Stops all services."""
@@ -296,8 +389,10 @@ def setup_logging():
     log_dir = Path(__file__).parent / 'logs'
     log_dir.mkdir(exist_ok=True)
 
+    # Each cluster process writes its own file
+    cluster_suffix = f'_cluster{os.environ["CLUSTER_ID"]}' if os.environ.get("CLUSTER_ID") else ''
     file_handler = logging.FileHandler(
-        log_dir / f'moddy_{time.strftime("%Y%m%d")}.log',
+        log_dir / f'moddy_{time.strftime("%Y%m%d")}{cluster_suffix}.log',
         encoding='utf-8'
     )
     file_handler.setLevel(logging.DEBUG)
@@ -332,6 +427,80 @@ async def start_services():
             logger.info(f"  • {name}: {state}")
 
 
+def fetch_recommended_shard_count(token: str) -> int:
+    """Asks Discord for the recommended number of shards (GET /gateway/bot)."""
+    import json
+    import urllib.request
+
+    request = urllib.request.Request(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {token}", "User-Agent": "DiscordBot (moddy, 1.0)"}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return int(json.loads(response.read())["shards"])
+
+
+async def run_clusters(cluster_count: int):
+    """
+    Cluster mode: one bot process per contiguous shard range.
+
+    Clusters are started one after the other (each one waits for its shards
+    to be ready, so identifies are not sent concurrently), crashed clusters
+    are restarted with backoff and the aggregated health is logged regularly.
+    Exactly one cluster is elected to run the singleton work.
+    """
+    from config import TOKEN, SHARD_COUNT, CLUSTER_HEALTH_PORT
+    from utils.cluster import shard_ranges, elect_singleton_cluster, aggregate_health
+
+    logger = logging.getLogger('moddy.cluster')
+
+    shard_count = SHARD_COUNT or await asyncio.to_thread(fetch_recommended_shard_count, TOKEN)
+    ranges = shard_ranges(shard_count, cluster_count)
+    # The internal API needs the main guild in its gateway cache
+    main_guild_id = int(os.getenv("MODDY_GUILD_ID")) if os.getenv("MODDY_GUILD_ID") else None
+    singleton = elect_singleton_cluster(ranges, shard_count, main_guild_id)
+    logger.info(f"🧩 Cluster mode: {shard_count} shards on {len(ranges)} processes (singleton: cluster {singleton})")
+
+    for cluster_id, shards in enumerate(ranges):
+        name = f"cluster-{cluster_id}"
+        logger.info(f"🧩 {name}: shards {shards[0]}-{shards[-1]}")
+        await asyncio.to_thread(
+            service_manager.start_service,
+            name,
+            [sys.executable, str(Path(__file__).resolve())],
+            f"http://127.0.0.1:{CLUSTER_HEALTH_PORT + cluster_id}/health",
+            env={
+                "AUTO_SHARD": "true",
+                "SHARD_COUNT": str(shard_count),
+                "SHARD_IDS": ",".join(str(shard) for shard in shards),
+                "CLUSTER_ID": str(cluster_id),
+                "CLUSTER_SINGLETON": "true" if cluster_id == singleton else "false",
+            },
+            # Shards identify one every ~5 seconds
+            health_timeout=60 + 6 * len(shards),
+            restart_on_failure=True
+        )
+
+    last_health_log = 0.0
+    while service_manager.running:
+        for name in service_manager.supervise():
+            logger.info(f"🔄 Restarting {name}...")
+            await asyncio.to_thread(service_manager.restart_service, name)
+
+        if time.time() - last_health_log >= 60:
+            last_health_log = time.time()
+            health = aggregate_health(await asyncio.to_thread(service_manager.get_health))
+            latency = f"{health['max_latency_ms']:.0f}ms" if health['max_latency_ms'] is not None else "n/a"
+            logger.info(
+                f"📊 Clusters: {health['ready']}/{health['clusters']} ready • {health['shards']} shards • "
+                f"{health['guilds']:,} guilds • max latency {latency} • singleton: {health['singleton'] or 'none'}"
+            )
+            if health['down']:
+                logger.warning(f"⚠️ Clusters down: {', '.join(health['down'])}")
+
+        await asyncio.sleep(5)
+
+
 async def main():
     """Launches the bot and all services."""
 
@@ -339,6 +508,22 @@ async def main():
     logger = setup_logging()
     logger.info("🔧 Initializing Moddy...")
 
+    from utils.performance import ACTIVE as performance
+    logger.info(f"⚡ Performance profile: {performance['profile']} (loop: {performance['loop']}, json: {performance['json']})")
+
+    # Cluster supervisor: the bot runs in child processes
+    from config import CLUSTER_COUNT, CLUSTER_ID
+    if CLUSTER_COUNT > 1 and CLUSTER_ID is None:
+        try:
+            await run_clusters(CLUSTER_COUNT)
+        except Exception as e:
+            logger.error(f"❌ Cluster supervisor error: {e}", exc_info=True)
+            sys.exit(1)
+        finally:
+            logger.info("🧹 Cleaning up services...")
+            service_manager.cleanup()
+        return
+
     try:
         # Starting external services
         await start_services()
@@ -475,6 +660,11 @@ if __name__ == "__main__":
         # Imports discord for the services command
         import discord
 
+        # uvloop must be installed before the event loop is created
+        from config import PERFORMANCE_PROFILE
+        from utils.performance import apply_performance_profile
+        apply_performance_profile(PERFORMANCE_PROFILE)
+
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
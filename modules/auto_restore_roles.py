@@ -4,11 +4,11 @@ Sauvegarde les rôles des utilisateurs qui quittent et les restaure automatiquem
 """
 
 import discord
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import logging
 from datetime import datetime
 
-from modules.module_manager import ModuleBase
+from modules.module_manager import ModuleBase, freeze_config
 
 logger = logging.getLogger('moddy.modules.auto_restore_roles')
 
@@ -24,31 +24,36 @@ class AutoRestoreRolesModule(ModuleBase):
     MODULE_NAME = "Auto Restore Roles"
     MODULE_DESCRIPTION = "Restaure automatiquement les rôles des utilisateurs qui reviennent"
     MODULE_EMOJI = "<:history:1401600464587456512>"
+    # on_member_remove n'est déclenché que pour les membres en cache
+    REQUIRES_MEMBERS = True
+    EVENTS = {'member_join': 'on_member_join', 'member_remove': 'on_member_remove'}
 
     # Modes de sauvegarde
     MODE_ALL = "all"  # Tous les rôles
     MODE_EXCEPT = "except"  # Tous les rôles sauf certains
     MODE_ONLY = "only"  # Uniquement les rôles sélectionnés
 
+    __slots__ = ('mode', 'excluded_roles', 'included_roles', 'log_channel_id')
+
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
 
         # Configuration
         self.mode: Optional[str] = None
-        self.excluded_roles: List[int] = []  # Pour mode EXCEPT
-        self.included_roles: List[int] = []  # Pour mode ONLY
+        self.excluded_roles: Tuple[int, ...] = ()  # Pour mode EXCEPT
+        self.included_roles: Tuple[int, ...] = ()  # Pour mode ONLY
         self.log_channel_id: Optional[int] = None
 
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Charge la configuration depuis la DB"""
         try:
-            self.config = config_data
+            self.config = config = freeze_config(config_data)
 
             # Configuration du mode
-            self.mode = config_data.get('mode')
-            self.excluded_roles = config_data.get('excluded_roles', [])
-            self.included_roles = config_data.get('included_roles', [])
-            self.log_channel_id = config_data.get('log_channel_id')
+            self.mode = config.get('mode')
+            self.excluded_roles = config.get('excluded_roles', ())
+            self.included_roles = config.get('included_roles', ())
+            self.log_channel_id = config.get('log_channel_id')
 
             # Module is enabled only if mode is configured
             self.enabled = self.mode is not None
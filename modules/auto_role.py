@@ -4,10 +4,10 @@ Attribue automatiquement des rôles aux nouveaux membres et aux bots qui rejoign
 """
 
 import discord
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import logging
 
-from modules.module_manager import ModuleBase
+from modules.module_manager import ModuleBase, freeze_config
 
 logger = logging.getLogger('moddy.modules.auto_role')
 
@@ -22,22 +22,25 @@ class AutoRoleModule(ModuleBase):
     MODULE_NAME = "Auto Role"
     MODULE_DESCRIPTION = "Attribue automatiquement des rôles aux nouveaux membres"
     MODULE_EMOJI = "<:manageuser:1398729745293774919>"
+    EVENTS = {'member_join': 'on_member_join'}
+
+    __slots__ = ('member_roles', 'bot_roles')
 
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
 
         # Configuration
-        self.member_roles: List[int] = []  # Rôles pour les utilisateurs normaux
-        self.bot_roles: List[int] = []     # Rôles pour les bots
+        self.member_roles: Tuple[int, ...] = ()  # Rôles pour les utilisateurs normaux
+        self.bot_roles: Tuple[int, ...] = ()     # Rôles pour les bots
 
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Charge la configuration depuis la DB"""
         try:
-            self.config = config_data
+            self.config = config = freeze_config(config_data)
 
             # Charge les rôles
-            self.member_roles = config_data.get('member_roles', [])
-            self.bot_roles = config_data.get('bot_roles', [])
+            self.member_roles = config.get('member_roles', ())
+            self.bot_roles = config.get('bot_roles', ())
 
             # Le module est activé si au moins un rôle est configuré
             self.enabled = len(self.member_roles) > 0 or len(self.bot_roles) > 0
@@ -1,10 +1,27 @@
 """
 Configurations UI pour les modules de serveur
 Ce package contient les interfaces de configuration pour chaque module
+
+Les vues sont importées à la demande (PEP 562) : importer un sous-module
+de configuration ne charge plus toutes les autres interfaces.
 """
 
-from .welcome_channel_config import WelcomeChannelConfigView
-from .welcome_dm_config import WelcomeDmConfigView
-from .starboard_config import StarboardConfigView
+import importlib
+
+_LAZY_VIEWS = {
+    'WelcomeChannelConfigView': '.welcome_channel_config',
+    'WelcomeDmConfigView': '.welcome_dm_config',
+    'StarboardConfigView': '.starboard_config',
+}
 
 __all__ = ['WelcomeChannelConfigView', 'WelcomeDmConfigView', 'StarboardConfigView']
+
+
+def __getattr__(name: str):
+    """Importe la vue de configuration demandée au premier accès"""
+    if name in _LAZY_VIEWS:
+        module = importlib.import_module(_LAZY_VIEWS[name], __name__)
+        view = getattr(module, name)
+        globals()[name] = view
+        return view
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
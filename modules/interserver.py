@@ -4,26 +4,559 @@ Permet de connecter plusieurs serveurs Discord via des salons dédiés
 """
 
 import discord
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Mapping, Set, Tuple
 import logging
+import math
 import random
 import string
 import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 import asyncio
 
-from modules.module_manager import ModuleBase
+from config import CLUSTER_COUNT, INTERSERVER_BAN_CACHE_LIMIT, INTERSERVER_RELAY_CONCURRENCY, INTERSERVER_RELAY_TIMEOUT
+from modules.module_manager import EMPTY_MAPPING, ModuleBase, freeze_config
+from utils.metrics import metrics
+from utils.request_scheduler import Priority, with_priority
+from utils.shared_cache import shared_cache
 
 logger = logging.getLogger('moddy.modules.interserver')
 
+# Reactions and welcome DMs launched beside the relay (strong references until they finish)
+_background_tasks: Set[asyncio.Task] = set()
+
 # Regex pour détecter les liens d'invitation Discord
 INVITE_REGEX = re.compile(r'(?:https?://)?(?:www\.)?(?:discord\.gg|discord\.com/invite)/([a-zA-Z0-9-]+)', re.IGNORECASE)
 
+# Nom du webhook utilisé pour les relais
+WEBHOOK_NAME = "Moddy Inter-Server"
+
+# Sujet pub/sub des relais entre clusters
+RELAY_TOPIC = "interserver_relay"
+
 # IDs des salons de logs staff
 ENGLISH_LOG_CHANNEL_ID = 1446555149031047388
 FRENCH_LOG_CHANNEL_ID = 1446555476044284045
 
 
+@dataclass(frozen=True, slots=True)
+class InterServerTarget:
+    """Salon inter-serveur résolu (permissions vérifiées) avec les options d'affichage de son serveur"""
+    guild_id: int
+    channel: discord.TextChannel
+    interserver_type: str
+    show_server_name: bool
+    show_avatar: bool
+    allowed_mentions: bool
+
+
+@dataclass(frozen=True, slots=True)
+class RelaySource:
+    """
+    Message d'origine d'un relais : ce qu'il faut pour l'envoyer ailleurs,
+    sérialisable pour les clusters qui n'ont pas le serveur d'origine
+    """
+    guild_id: int
+    guild_name: str
+    channel_id: int
+    author_id: int
+    author_name: str
+    author_avatar_url: str
+    attachments: Tuple[Tuple[str, str], ...] = ()  # (nom, URL)
+    embeds: Tuple[discord.Embed, ...] = ()
+    reply_to: Optional[int] = None  # ID du message original auquel il répond
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> 'RelaySource':
+        return cls(
+            guild_id=message.guild.id,
+            guild_name=message.guild.name,
+            channel_id=message.channel.id,
+            author_id=message.author.id,
+            author_name=message.author.display_name,
+            author_avatar_url=message.author.display_avatar.url,
+            # Limites Discord : 10 fichiers, 10 embeds
+            attachments=tuple((attachment.filename, attachment.url) for attachment in message.attachments[:10]),
+            embeds=tuple(message.embeds[:10]),
+            reply_to=message.reference.message_id if message.reference else None,
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            'guild_id': self.guild_id, 'guild_name': self.guild_name, 'channel_id': self.channel_id,
+            'author_id': self.author_id, 'author_name': self.author_name, 'author_avatar_url': self.author_avatar_url,
+            'attachments': [list(attachment) for attachment in self.attachments],
+            'embeds': [embed.to_dict() for embed in self.embeds],
+            'reply_to': self.reply_to,
+        }
+
+    @classmethod
+    def from_payload(cls, data: Dict[str, Any]) -> 'RelaySource':
+        return cls(
+            guild_id=data['guild_id'], guild_name=data['guild_name'], channel_id=data['channel_id'],
+            author_id=data['author_id'], author_name=data['author_name'], author_avatar_url=data['author_avatar_url'],
+            attachments=tuple(tuple(attachment) for attachment in data['attachments']),
+            embeds=tuple(discord.Embed.from_dict(embed) for embed in data['embeds']),
+            reply_to=data['reply_to'],
+        )
+
+
+@dataclass(slots=True)
+class RelayReport:
+    """Résultat d'un relais : envois réussis, expirés et latence de chaque envoi depuis le début du relais"""
+    delivered: int = 0
+    timed_out: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def percentile(self, q: float) -> float:
+        """Latence (secondes) au rang q (0 - 1) parmi les envois réussis"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def format_latency(self) -> str:
+        if not self.latencies:
+            return "n/a"
+        return (f"p50 {self.percentile(0.5) * 1000:.0f} ms • p95 {self.percentile(0.95) * 1000:.0f} ms"
+                f" • max {max(self.latencies) * 1000:.0f} ms")
+
+
+class InterServerRegistry:
+    """
+    Salons inter-serveur de ce process, par type d'inter-serveur
+
+    Mis à jour quand un module est activé/désactivé/reconfiguré et quand son
+    salon, les rôles du bot ou le serveur changent : la liste des cibles d'un
+    relais est un tuple déjà construit, sans parcourir les serveurs.
+    """
+
+    def __init__(self):
+        self._by_type: Dict[str, Dict[int, InterServerTarget]] = {}  # type -> {guild_id -> cible}
+        self._targets: Dict[str, Tuple[InterServerTarget, ...]] = {}  # type -> cibles
+        self._guild_types: Dict[int, str] = {}  # guild_id -> type
+        self._primed = False
+
+    def targets(self, interserver_type: str) -> Tuple[InterServerTarget, ...]:
+        """Cibles d'un type d'inter-serveur (tuple partagé, à ne pas modifier)"""
+        return self._targets.get(interserver_type, ())
+
+    def get(self, guild_id: int) -> Optional[InterServerTarget]:
+        interserver_type = self._guild_types.get(guild_id)
+        return self._by_type[interserver_type][guild_id] if interserver_type else None
+
+    def update(self, module: 'InterServerModule'):
+        """(Re)résout le salon d'un module : ajouté, mis à jour ou retiré selon son état"""
+        target = self._resolve(module)
+        previous_type = self._guild_types.get(module.guild_id)
+        if target is None:
+            if previous_type is not None:
+                self.remove(module.guild_id)
+            return
+
+        if previous_type is not None and previous_type != target.interserver_type:
+            self.remove(module.guild_id)
+        self._by_type.setdefault(target.interserver_type, {})[module.guild_id] = target
+        self._guild_types[module.guild_id] = target.interserver_type
+        self._rebuild(target.interserver_type)
+
+    def remove(self, guild_id: int):
+        interserver_type = self._guild_types.pop(guild_id, None)
+        if interserver_type is not None:
+            del self._by_type[interserver_type][guild_id]
+            self._rebuild(interserver_type)
+
+    def _rebuild(self, interserver_type: str):
+        self._targets[interserver_type] = tuple(self._by_type[interserver_type].values())
+
+    @staticmethod
+    def _resolve(module: 'InterServerModule') -> Optional[InterServerTarget]:
+        if not module.enabled or not module.channel_id:
+            return None
+
+        guild = module.bot.get_guild(module.guild_id)
+        if not guild or not guild.me:
+            return None
+
+        channel = guild.get_channel(module.channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            return None
+
+        perms = channel.permissions_for(guild.me)
+        if not perms.send_messages or not perms.manage_webhooks:
+            return None
+
+        return InterServerTarget(
+            module.guild_id, channel, module.interserver_type,
+            module.show_server_name, module.show_avatar, module.allowed_mentions
+        )
+
+    async def prime(self, bot):
+        """
+        Premier relais : instancie les modules inter-serveur pas encore chargés
+        (mode lazy), qui s'enregistrent en s'activant
+        """
+        if self._primed:
+            return
+        self._primed = True
+        for guild_id in await bot.db.get_guilds_with_module(InterServerModule.MODULE_ID):
+            if bot.get_guild(guild_id):
+                await bot.module_manager.get_module_instance(guild_id, InterServerModule.MODULE_ID)
+
+
+interserver_registry = InterServerRegistry()
+
+
+class InterServerWebhookCache:
+    """
+    Webhook de chaque salon inter-serveur, en mémoire et dans la table interserver_webhooks
+
+    Les relais envoient via un Webhook.partial (id + token) sur la session HTTP
+    du bot : pas de channel.webhooks() par salon et par message. Une entrée
+    n'est rafraîchie que sur une erreur 404/401 à l'envoi ou sur un
+    webhooks_update du salon.
+    """
+
+    def __init__(self):
+        self._webhooks: Dict[int, discord.Webhook] = {}  # channel_id -> webhook partiel
+        self._resolving: Dict[int, asyncio.Task] = {}  # channel_id -> résolution en cours
+        self.fetches = 0  # Requêtes channel.webhooks() / create_webhook
+
+    async def get(self, bot, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        webhook = self._webhooks.get(channel.id)
+        if webhook is not None:
+            return webhook
+
+        # Les relais concurrents vers un salon pas encore résolu attendent la même résolution
+        task = self._resolving.get(channel.id)
+        if task is None:
+            task = self._resolving[channel.id] = asyncio.create_task(self._resolve(bot, channel))
+            task.add_done_callback(lambda _: self._resolving.pop(channel.id, None))
+        # shield : le timeout d'un envoi n'annule pas la résolution partagée
+        return await asyncio.shield(task)
+
+    async def _resolve(self, bot, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        # Webhook enregistré (redémarrage, autre process)
+        if bot.db:
+            stored = await bot.db.get_interserver_webhook(channel.id)
+            if stored:
+                return self._store(bot, channel.id, *stored)
+
+        webhook = await self._fetch_or_create(bot, channel)
+        if webhook is None or not webhook.token:
+            return None
+        if bot.db:
+            await bot.db.set_interserver_webhook(channel.id, channel.guild.id, webhook.id, webhook.token)
+        return self._store(bot, channel.id, webhook.id, webhook.token)
+
+    async def stored(self, bot, channel_id: int) -> Optional[discord.Webhook]:
+        """
+        Webhook connu d'un salon (mémoire, sinon table), sans requête REST :
+        le salon peut être sur un autre cluster
+        """
+        webhook = self._webhooks.get(channel_id)
+        if webhook is None and bot.db:
+            stored = await bot.db.get_interserver_webhook(channel_id)
+            if stored:
+                webhook = self._store(bot, channel_id, *stored)
+        return webhook
+
+    def _store(self, bot, channel_id: int, webhook_id: int, webhook_token: str) -> discord.Webhook:
+        # client=bot : session HTTP partagée (comptée par le request scheduler) et état pour les réactions
+        webhook = self._webhooks[channel_id] = discord.Webhook.partial(webhook_id, webhook_token, client=bot)
+        return webhook
+
+    async def _fetch_or_create(self, bot, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        """
+        Récupère ou crée le webhook Moddy du salon (requêtes REST)
+        """
+        self.fetches += 1
+        try:
+            # Cherche un webhook créé par Moddy pour l'inter-serveur
+            for webhook in await channel.webhooks():
+                if webhook.user and webhook.user.id == bot.user.id and webhook.name == WEBHOOK_NAME:
+                    return webhook
+
+            # Si aucun webhook trouvé, en créer un
+            webhook = await channel.create_webhook(
+                name=WEBHOOK_NAME,
+                reason="Webhook for inter-server communication"
+            )
+            logger.info(f"Created webhook for inter-server in channel {channel.id}")
+            return webhook
+
+        except discord.Forbidden:
+            logger.error(f"Missing permissions to manage webhooks in channel {channel.id}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting/creating webhook: {e}", exc_info=True)
+            return None
+
+    async def invalidate(self, bot, channel_id: int, webhook_id: Optional[int] = None):
+        """
+        Oublie le webhook d'un salon (supprimé, token invalide, salon supprimé)
+        Avec webhook_id, seulement si c'est encore ce webhook (un autre relais a pu le remplacer)
+        """
+        cached = self._webhooks.get(channel_id)
+        if cached is not None and (webhook_id is None or cached.id == webhook_id):
+            del self._webhooks[channel_id]
+        if bot.db:
+            await bot.db.delete_interserver_webhook(channel_id, webhook_id)
+
+    @with_priority(Priority.BACKGROUND)
+    async def refresh(self, bot, channel: discord.TextChannel):
+        """
+        webhooks_update : vérifie que le webhook en cache existe toujours
+        (l'événement ne dit pas quel webhook a changé)
+        """
+        cached = self._webhooks.get(channel.id)
+        if cached is None:
+            return
+        self.fetches += 1
+        try:
+            webhooks = await channel.webhooks()
+        except discord.HTTPException as e:
+            logger.debug(f"Could not check webhooks of channel {channel.id}: {e}")
+            return
+        if all(webhook.id != cached.id for webhook in webhooks):
+            logger.info(f"Inter-server webhook of channel {channel.id} was removed, it will be recreated")
+            await self.invalidate(bot, channel.id, cached.id)
+
+
+interserver_webhooks = InterServerWebhookCache()
+
+
+class InterServerBanCache:
+    """
+    Utilisateurs bannis des serveurs inter-serveur de ce process, par serveur
+
+    Chargés au premier relais vers un serveur (guild.bans(), au plus
+    INTERSERVER_BAN_CACHE_LIMIT entrées) puis tenus à jour par
+    on_member_ban / on_member_unban : filtrer un relais est une recherche
+    dans un set au lieu d'un fetch_ban (presque toujours 404) par serveur cible.
+    """
+
+    def __init__(self, limit: int = INTERSERVER_BAN_CACHE_LIMIT):
+        self.limit = limit
+        self._bans: Dict[int, Set[int]] = {}  # guild_id -> IDs des bannis
+        self._incomplete: Set[int] = set()  # Plus de `limit` bans : vérification REST pour les autres utilisateurs
+        self._forbidden: Set[int] = set()  # Bot sans ban_members : rechargé quand ses permissions changent
+        self._loading: Dict[int, asyncio.Task] = {}
+        self._changes: Dict[int, List[Tuple[int, bool]]] = {}  # Bans/débans reçus pendant un chargement
+
+    async def is_banned(self, guild: discord.Guild, user_id: int) -> Optional[bool]:
+        """
+        True/False si l'utilisateur est (ou non) banni du serveur, None si le cache ne permet pas de le dire
+        """
+        banned = self._bans.get(guild.id)
+        if banned is None:
+            task = self._loading.get(guild.id)
+            if task is None:
+                self._changes[guild.id] = []
+                task = self._loading[guild.id] = asyncio.create_task(self._load(guild))
+                task.add_done_callback(lambda _: self._loading.pop(guild.id, None))
+            # shield : le timeout d'un envoi n'annule pas le chargement partagé
+            await asyncio.shield(task)
+            banned = self._bans.get(guild.id)
+            if banned is None:
+                return None
+
+        if user_id in banned:
+            return True
+        return None if guild.id in self._incomplete else False
+
+    async def _load(self, guild: discord.Guild):
+        banned = set()
+        try:
+            async for entry in guild.bans(limit=self.limit):
+                banned.add(entry.user.id)
+        except discord.Forbidden:
+            logger.debug(f"Missing ban_members permission in guild {guild.id}, ban cache left empty")
+            self._forbidden.add(guild.id)
+        except discord.HTTPException as e:
+            # Pas de cache : nouvel essai au prochain relais
+            logger.warning(f"Could not load bans of guild {guild.id}: {e}")
+            self._changes.pop(guild.id, None)
+            return
+
+        for user_id, is_ban in self._changes.pop(guild.id):
+            if is_ban:
+                banned.add(user_id)
+            else:
+                banned.discard(user_id)
+        if len(banned) >= self.limit:
+            self._incomplete.add(guild.id)
+        self._bans[guild.id] = banned
+
+    def on_ban(self, guild_id: int, user_id: int, banned: bool):
+        """on_member_ban / on_member_unban (seulement pour les serveurs chargés ou en cours de chargement)"""
+        changes = self._changes.get(guild_id)
+        if changes is not None:
+            changes.append((user_id, banned))
+        elif guild_id in self._bans:
+            if banned:
+                self._bans[guild_id].add(user_id)
+            else:
+                self._bans[guild_id].discard(user_id)
+
+    def on_permissions_changed(self, guild_id: int):
+        """Les permissions du bot ont changé : recharge un serveur dont les bans étaient inaccessibles"""
+        if guild_id in self._forbidden:
+            self.forget(guild_id)
+
+    def forget(self, guild_id: int):
+        """Serveur quitté, ou événements de ban peut-être manqués (reconnexion) : rechargé au prochain relais"""
+        self._bans.pop(guild_id, None)
+        self._incomplete.discard(guild_id)
+        self._forbidden.discard(guild_id)
+
+
+interserver_bans = InterServerBanCache()
+
+
+class InterServerClusterRelay:
+    """
+    Relais vers les serveurs inter-serveur des autres clusters
+
+    En mode cluster (CLUSTER_COUNT > 1), chaque process ne voit que les
+    serveurs de ses shards. Le cluster d'origine relaie vers les siens et
+    publie le message sur le pub/sub du cache partagé ; chaque autre cluster
+    le relaie vers ses propres serveurs (ses bans, ses permissions, ses
+    webhooks). Sans Redis, l'inter-serveur est refusé en mode cluster plutôt
+    que coupé en un réseau par cluster.
+    """
+
+    def __init__(self, cluster_count: int = CLUSTER_COUNT):
+        self.cluster_count = cluster_count
+        self.bot = None
+
+    @property
+    def clustered(self) -> bool:
+        return self.cluster_count > 1
+
+    @property
+    def available(self) -> bool:
+        """False en mode cluster sans Redis : un relais n'atteindrait qu'une partie du réseau"""
+        return not self.clustered or shared_cache.is_shared
+
+    async def start(self, bot):
+        self.bot = bot
+        if not self.clustered:
+            return
+        if not shared_cache.is_shared:
+            logger.error("❌ Inter-server disabled: cluster mode needs REDIS_URL to relay messages between clusters")
+            return
+        await shared_cache.subscribe(RELAY_TOPIC, self._on_relay)
+
+    async def publish(self, source: RelaySource, interserver_type: str, moddy_id: str, content: str, is_moddy_team: bool):
+        """Transmet un message aux autres clusters (aucun effet hors mode cluster)"""
+        if not self.clustered:
+            return
+        await shared_cache.publish(RELAY_TOPIC, {
+            'source': source.to_payload(),
+            'interserver_type': interserver_type,
+            'moddy_id': moddy_id,
+            'content': content,
+            'is_moddy_team': is_moddy_team,
+        })
+
+    async def _on_relay(self, data: Dict[str, Any]):
+        """Message publié par un autre cluster : relais vers les serveurs de ce cluster"""
+        if not self.bot.is_ready():
+            return
+        await interserver_registry.prime(self.bot)
+        targets = interserver_registry.targets(data['interserver_type'])
+        if not targets:
+            return
+
+        source = RelaySource.from_payload(data['source'])
+        # Instance transitoire (ni activée ni enregistrée) : seul le code d'envoi sert
+        relay = InterServerModule(self.bot, source.guild_id)
+        relay.interserver_type = data['interserver_type']
+        started = time.perf_counter()
+        report = await relay._relay_message(source, targets, data['moddy_id'], data['content'], data['is_moddy_team'])
+        metrics.record_interserver_relay(time.perf_counter() - started, report.delivered, len(targets))
+        logger.info(f"✅ Relayed message {data['moddy_id']} from another cluster to {report.delivered}/{len(targets)} servers ({report.format_latency()})")
+
+
+interserver_clusters = InterServerClusterRelay()
+
+
+async def delete_relayed_messages(bot, relayed_messages: List[Dict[str, Any]]) -> int:
+    """
+    Supprime les copies relayées d'un message, quel que soit le cluster de leur serveur
+
+    Passe par le webhook enregistré du salon (table interserver_webhooks), sinon
+    par le salon s'il est sur ce cluster (message envoyé par un ancien webhook).
+    Returns: Nombre de messages supprimés
+    """
+    deleted = 0
+    for relayed in relayed_messages:
+        try:
+            webhook = await interserver_webhooks.stored(bot, relayed['channel_id'])
+            if webhook is not None:
+                try:
+                    await webhook.delete_message(relayed['message_id'])
+                    deleted += 1
+                    continue
+                except discord.NotFound:
+                    # Envoyé par un webhook remplacé depuis, ou déjà supprimé
+                    pass
+
+            channel = bot.get_channel(relayed['channel_id'])
+            if not channel:
+                continue
+
+            msg = await channel.fetch_message(relayed['message_id'])
+            await msg.delete()
+            deleted += 1
+        except discord.NotFound:
+            # Message déjà supprimé
+            pass
+        except Exception as e:
+            logger.error(f"Error deleting relayed message {relayed['message_id']}: {e}")
+    return deleted
+
+
+async def retract_interserver_message(bot, message: discord.Message) -> bool:
+    """
+    Supprime les copies relayées d'un message inter-serveur supprimé
+
+    Indépendant du module : un serveur qui a désactivé l'inter-serveur ou
+    changé de salon retire quand même ses anciens messages des serveurs partenaires.
+
+    Returns:
+        True si le message était un message inter-serveur
+    """
+    if not bot.db:
+        return False
+
+    try:
+        # Vérifie si c'est un message inter-serveur
+        interserver_msg = await bot.db.get_interserver_message_by_original(message.id)
+        if not interserver_msg:
+            return False
+
+        # Supprime tous les messages relayés (y compris sur les serveurs des autres clusters)
+        await delete_relayed_messages(bot, interserver_msg.get('relayed_messages', []))
+
+        # Marque le message comme supprimé en DB
+        await bot.db.delete_interserver_message(interserver_msg['moddy_id'])
+        logger.info(f"Deleted inter-server message {interserver_msg['moddy_id']} and all relayed copies")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error in on_message_delete for inter-server: {e}", exc_info=True)
+        return False
+
+
+def _background_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Interserver background call failed: {task.exception()}")
+
+
 class InterServerModule(ModuleBase):
     """
     Module de communication inter-serveurs
@@ -34,6 +567,27 @@ class InterServerModule(ModuleBase):
     MODULE_NAME = "Inter-Server"
     MODULE_DESCRIPTION = "Connecte plusieurs serveurs via des salons dédiés"
     MODULE_EMOJI = "<:groups:1446127489842806967>"
+    # Vérifie le timeout de l'auteur sur les serveurs cibles (get_member)
+    REQUIRES_MEMBERS = True
+    # Le registre garde le salon de l'instance : évincée, elle ne suivrait plus les changements de config
+    EVICTABLE = False
+    EVENTS = {
+        'message': 'on_message',
+        # Maintien du registre des salons inter-serveur
+        'guild_channel_update': 'on_guild_channel_update',
+        'guild_channel_delete': 'on_guild_channel_delete',
+        'guild_role_update': 'on_guild_role_update',
+        'member_update': 'on_member_update',
+        'guild_available': 'on_guild_available',
+        'guild_remove': 'on_guild_remove',
+        # Cache des webhooks
+        'webhooks_update': 'on_webhooks_update',
+        # Cache des bans
+        'member_ban': 'on_member_ban',
+        'member_unban': 'on_member_unban',
+    }
+
+    __slots__ = ('channel_id', 'interserver_type', 'show_server_name', 'show_avatar', 'allowed_mentions', 'cooldowns')
 
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
@@ -43,27 +597,22 @@ class InterServerModule(ModuleBase):
         self.show_avatar: bool = True
         self.allowed_mentions: bool = False
 
-        # Cooldown tracking (user_id -> timestamp)
-        self.cooldowns: Dict[int, datetime] = {}
+        # Cooldown tracking (user_id -> timestamp), alloué au premier message
+        self.cooldowns: Mapping[int, datetime] = EMPTY_MAPPING
 
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Charge la configuration depuis la DB"""
         try:
-            self.config = config_data
-            self.channel_id = config_data.get('channel_id')
-            self.interserver_type = config_data.get('interserver_type', 'english')
-            self.show_server_name = config_data.get('show_server_name', True)
-            self.show_avatar = config_data.get('show_avatar', True)
-            self.allowed_mentions = config_data.get('allowed_mentions', False)
+            self.config = config = freeze_config(config_data)
+            self.channel_id = config.get('channel_id')
+            self.interserver_type = config.get('interserver_type', 'english')
+            self.show_server_name = config.get('show_server_name', True)
+            self.show_avatar = config.get('show_avatar', True)
+            self.allowed_mentions = config.get('allowed_mentions', False)
 
             # Le module est activé si un salon est configuré
             self.enabled = self.channel_id is not None
 
-            # Configure le slowmode et la description si le module est activé
-            if self.enabled:
-                await self._setup_slowmode()
-                await self._setup_channel_description()
-
             return True
         except Exception as e:
             logger.error(f"Error loading interserver config: {e}")
@@ -118,6 +667,23 @@ class InterServerModule(ModuleBase):
         """Retourne la liste des champs obligatoires"""
         return ['channel_id', 'interserver_type']
 
+    async def enable(self, defer_hooks: bool = False):
+        await super().enable(defer_hooks=defer_hooks)
+        interserver_registry.update(self)
+
+    async def disable(self):
+        await super().disable()
+        # Une instance remplacée (rechargement) ne retire pas le salon de la nouvelle
+        manager = getattr(self.bot, 'module_manager', None)
+        current = manager.active_modules.get(self.guild_id, {}).get(self.MODULE_ID) if manager else None
+        if current is None or current is self:
+            interserver_registry.update(self)
+
+    async def on_enable(self):
+        """Configure le slowmode et la description du salon (différé au démarrage)"""
+        await self._setup_slowmode()
+        await self._setup_channel_description()
+
     async def _setup_slowmode(self):
         """Configure le slowmode de 3 secondes sur le salon inter-serveur"""
         try:
@@ -180,6 +746,8 @@ class InterServerModule(ModuleBase):
                 return False
 
         # Met à jour le timestamp
+        if self.cooldowns is EMPTY_MAPPING:
+            self.cooldowns = {}
         self.cooldowns[user_id] = now
         return True
 
@@ -187,232 +755,259 @@ class InterServerModule(ModuleBase):
         """Détecte si le texte contient un lien d'invitation Discord"""
         return bool(INVITE_REGEX.search(text))
 
-    async def _get_all_interserver_channels(self) -> List[discord.TextChannel]:
+    async def _get_interserver_targets(self) -> Tuple[InterServerTarget, ...]:
         """
-        Récupère tous les salons inter-serveur actifs du même type
+        Salons inter-serveur actifs du même type (registre, salon actuel inclus)
         """
-        channels = []
-
-        # Parcourt tous les serveurs où le bot est présent
-        for guild in self.bot.guilds:
-            # Récupère le module inter-serveur pour ce serveur
-            module = await self.bot.module_manager.get_module_instance(
-                guild.id,
-                'interserver'
-            )
-
-            # Si le module est actif et configuré, et du même type
-            if module and module.enabled and module.channel_id:
-                # Vérifie que c'est le même type d'inter-serveur
-                if module.interserver_type == self.interserver_type:
-                    channel = guild.get_channel(module.channel_id)
-                    if channel and isinstance(channel, discord.TextChannel):
-                        # Vérifie les permissions
-                        perms = channel.permissions_for(guild.me)
-                        if perms.send_messages and perms.manage_webhooks:
-                            channels.append(channel)
-
-        return channels
-
-    async def _relay_message(self, message: discord.Message, target_channels: List[discord.TextChannel],
-                            moddy_id: str, content: str, is_moddy_team: bool) -> int:
+        await interserver_registry.prime(self.bot)
+        return interserver_registry.targets(self.interserver_type)
+
+    # ================ REGISTRE DES SALONS ================
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        # Permissions du salon (overwrites) ou type modifiés
+        if after.id == self.channel_id:
+            interserver_registry.update(self)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.id == self.channel_id:
+            interserver_registry.update(self)
+            await interserver_webhooks.invalidate(self.bot, channel.id)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        # Les permissions du bot dépendent de ses rôles et de @everyone
+        if after.is_default() or after in after.guild.me.roles:
+            interserver_registry.update(self)
+            interserver_bans.on_permissions_changed(self.guild_id)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # Seules les mises à jour du bot sont dispatchées (cogs/module_events.py)
+        if before.roles != after.roles:
+            interserver_registry.update(self)
+            interserver_bans.on_permissions_changed(self.guild_id)
+
+    async def on_guild_available(self, guild: discord.Guild):
+        # Après une reconnexion complète, le serveur et ses salons sont de nouveaux objets
+        interserver_registry.update(self)
+        # Des bans ont pu être manqués pendant l'indisponibilité
+        interserver_bans.forget(self.guild_id)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        interserver_registry.remove(self.guild_id)
+        interserver_bans.forget(self.guild_id)
+
+    async def on_member_ban(self, guild: discord.Guild, user: discord.abc.User):
+        interserver_bans.on_ban(guild.id, user.id, True)
+
+    async def on_member_unban(self, guild: discord.Guild, user: discord.abc.User):
+        interserver_bans.on_ban(guild.id, user.id, False)
+
+    async def on_webhooks_update(self, channel: discord.abc.GuildChannel):
+        if channel.id == self.channel_id:
+            await interserver_webhooks.refresh(self.bot, channel)
+
+    async def _relay_message(self, source: RelaySource, targets: Tuple[InterServerTarget, ...],
+                            moddy_id: str, content: str, is_moddy_team: bool) -> 'RelayReport':
         """
         Relaie un message vers les salons cibles en utilisant des webhooks
-        Returns: Nombre de messages envoyés avec succès
+
+        Les envois partent en parallèle (au plus INTERSERVER_RELAY_CONCURRENCY à
+        la fois, INTERSERVER_RELAY_TIMEOUT secondes par salon). Le nom, l'avatar
+        et les mentions ne dépendent que des options d'affichage du serveur
+        cible : ils sont préparés une fois par combinaison d'options.
+        Returns: Rapport du relais (envois réussis, expirés, latences)
         """
-        success_count = 0
-
-        # Prépare le contenu de base avec l'ID Moddy
-        base_content = content
-
-        # Prépare les fichiers (pièces jointes)
-        # On ne peut pas réutiliser les mêmes fichiers, on va stocker les URLs
-        attachment_links = []
-        if message.attachments:
-            for attachment in message.attachments[:10]:  # Limite à 10 fichiers
-                attachment_links.append(f"[{attachment.filename}]({attachment.url})")
-
-        # Ajoute les liens de fichiers au contenu si présents
-        if attachment_links:
-            final_content += "\n\n**Attachments:** " + " • ".join(attachment_links)
-
-        # Prépare les embeds
-        embeds = []
-        if message.embeds:
-            # Limite à 10 embeds (limite Discord)
-            embeds = message.embeds[:10]
-
-        # Envoie le message via webhook dans chaque salon cible
-        for channel in target_channels:
+        started = time.perf_counter()
+        report = RelayReport()
+
+        # Contenu commun : pièces jointes (on ne peut pas réutiliser les fichiers, on envoie leurs URLs) et ID Moddy
+        body = content
+        if source.attachments:
+            attachment_links = [f"[{filename}]({url})" for filename, url in source.attachments]
+            body += "\n\n**Attachments:** " + " • ".join(attachment_links)
+        body += f"\n-# ID: `{moddy_id}`"
+
+        # Réponse : une seule recherche en DB, puis le lien du message relayé dans chaque serveur cible
+        reply_links: Dict[int, str] = {}
+        fallback_reply_link = None
+        if source.reply_to:
             try:
-                # Récupère le module inter-serveur du serveur cible pour utiliser ses options d'affichage
-                target_module = await self.bot.module_manager.get_module_instance(
-                    channel.guild.id,
-                    'interserver'
-                )
-
-                if not target_module:
-                    logger.warning(f"No interserver module for guild {channel.guild.id}")
-                    continue
-
-                # Vérifie si l'auteur est banni ou timeout sur ce serveur (sauf pour Moddy Team)
-                if not is_moddy_team:
-                    try:
-                        # Vérifie si l'auteur est membre du serveur cible
-                        target_member = channel.guild.get_member(message.author.id)
-
-                        if target_member:
-                            # Vérifie si le membre est en timeout
-                            if target_member.timed_out_until and target_member.timed_out_until > discord.utils.utcnow():
-                                logger.info(f"Skipping message relay to {channel.guild.name} - Author {message.author.id} is timed out")
-                                continue
-
-                        # Vérifie si l'auteur est banni (coûteux, donc on fait une vérification rapide)
-                        try:
-                            await channel.guild.fetch_ban(discord.Object(id=message.author.id))
-                            # Si pas d'exception, l'utilisateur est banni
-                            logger.info(f"Skipping message relay to {channel.guild.name} - Author {message.author.id} is banned")
-                            continue
-                        except discord.NotFound:
-                            # L'utilisateur n'est pas banni, on continue
-                            pass
-
-                    except Exception as e:
-                        logger.debug(f"Error checking ban/timeout status: {e}")
-
-                # Prépare le nom d'affichage selon les préférences du serveur CIBLE
-                if is_moddy_team:
-                    username = "Moddy Team"
-                    avatar_url = self.bot.user.display_avatar.url
-                else:
-                    if target_module.show_server_name:
-                        username = f"{message.author.display_name} — {message.guild.name}"
-                    else:
-                        username = message.author.display_name
-
-                    # Limite la longueur du nom (max 80 caractères pour Discord)
-                    if len(username) > 80:
-                        username = username[:77] + "..."
-
-                    # Prépare l'avatar selon les préférences du serveur CIBLE
-                    avatar_url = message.author.display_avatar.url if target_module.show_avatar else None
-
-                # Prépare le contenu pour ce serveur spécifique
-                final_content = base_content
-
-                # Ajoute la réponse si c'est une réponse à un message
-                if message.reference and message.reference.message_id:
-                    try:
-                        # Cherche l'ID Moddy du message référencé
-                        replied_moddy_msg = await self.bot.db.get_interserver_message_by_original(message.reference.message_id)
-                        if replied_moddy_msg:
-                            # Cherche le message relayé dans le serveur cible
-                            target_relayed = None
-                            for relayed in replied_moddy_msg.get('relayed_messages', []):
-                                if relayed['guild_id'] == channel.guild.id:
-                                    target_relayed = relayed
-                                    break
-
-                            if target_relayed:
-                                # Lien vers le message dans le serveur cible
-                                reply_link = f"https://discord.com/channels/{target_relayed['guild_id']}/{target_relayed['channel_id']}/{target_relayed['message_id']}"
-                            else:
-                                # Fallback vers le message original si pas trouvé dans ce serveur
-                                reply_link = f"https://discord.com/channels/{message.guild.id}/{message.channel.id}/{message.reference.message_id}"
-
-                            final_content = f"-# <:reply:1444821779444138146> [Reply to message]({reply_link})\n{final_content}"
-                    except Exception as e:
-                        logger.debug(f"Could not add reply link: {e}")
-
-                # Ajoute l'ID Moddy en bas
-                final_content += f"\n-# ID: `{moddy_id}`"
-
-                # Gère les mentions selon les préférences du serveur CIBLE
-                if not target_module.allowed_mentions:
-                    allowed_mentions = discord.AllowedMentions.none()
-                else:
-                    allowed_mentions = discord.AllowedMentions.all()
-
-                # Récupère ou crée un webhook pour ce salon
-                webhook = await self._get_or_create_webhook(channel)
-
-                if not webhook:
-                    logger.warning(f"Could not get webhook for channel {channel.id} in guild {channel.guild.id}")
-                    continue
-
-                # Prépare les kwargs pour le webhook
-                webhook_kwargs = {
-                    'username': username,
-                    'allowed_mentions': allowed_mentions,
-                    'wait': True  # On attend la réponse pour avoir l'ID du message
-                }
-
-                # Ajoute le contenu s'il existe
-                if final_content:
-                    webhook_kwargs['content'] = final_content
-
-                # Ajoute l'avatar s'il existe
-                if avatar_url:
-                    webhook_kwargs['avatar_url'] = avatar_url
-
-                # Ajoute les embeds s'il y en a
-                if embeds:
-                    webhook_kwargs['embeds'] = embeds
-
-                # Envoie le message via le webhook
-                sent_message = await webhook.send(**webhook_kwargs)
+                replied_moddy_msg = await self.bot.db.get_interserver_message_by_original(source.reply_to)
+                if replied_moddy_msg:
+                    for relayed in replied_moddy_msg.get('relayed_messages', []):
+                        reply_links[relayed['guild_id']] = f"https://discord.com/channels/{relayed['guild_id']}/{relayed['channel_id']}/{relayed['message_id']}"
+                    # Fallback vers le message original si pas trouvé dans un serveur
+                    fallback_reply_link = f"https://discord.com/channels/{source.guild_id}/{source.channel_id}/{source.reply_to}"
+            except Exception as e:
+                logger.debug(f"Could not add reply link: {e}")
+
+        # Kwargs du webhook par combinaison d'options d'affichage
+        variants: Dict[Tuple[bool, bool, bool], Dict[str, Any]] = {}
+        semaphore = asyncio.Semaphore(INTERSERVER_RELAY_CONCURRENCY)
+
+        async def deliver(target: InterServerTarget):
+            key = (target.show_server_name, target.show_avatar, target.allowed_mentions)
+            webhook_kwargs = variants.get(key)
+            if webhook_kwargs is None:
+                webhook_kwargs = variants[key] = self._webhook_kwargs(source, target, is_moddy_team)
+
+            final_content = body
+            reply_link = reply_links.get(target.guild_id, fallback_reply_link)
+            if reply_link:
+                final_content = f"-# <:reply:1444821779444138146> [Reply to message]({reply_link})\n{final_content}"
+
+            async with semaphore:
+                try:
+                    sent_message = await asyncio.wait_for(
+                        self._send_to_target(source, target, final_content, webhook_kwargs, is_moddy_team),
+                        INTERSERVER_RELAY_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    report.timed_out += 1
+                    logger.warning(f"Relay to channel {target.channel.id} timed out after {INTERSERVER_RELAY_TIMEOUT}s")
+                    return
+            if sent_message is None:
+                return
 
+            report.delivered += 1
+            report.latencies.append(time.perf_counter() - started)
+            try:
                 # Enregistre le message relayé en DB
-                await self.bot.db.add_relayed_message(moddy_id, channel.guild.id, channel.id, sent_message.id)
+                await self.bot.db.add_relayed_message(moddy_id, target.guild_id, target.channel.id, sent_message.id)
 
                 # Ajoute la réaction verified pour les messages Moddy Team
                 if is_moddy_team:
-                    await sent_message.add_reaction("<:verified:1398729677601902635>")
+                    await self._add_reaction(sent_message, "<:verified:1398729677601902635>")
+            except Exception as e:
+                logger.error(f"Error recording relayed message in channel {target.channel.id}: {e}", exc_info=True)
 
-                success_count += 1
+        # Le serveur d'origine n'est pas une cible
+        await asyncio.gather(*(deliver(target) for target in targets if target.guild_id != source.guild_id))
+        return report
 
-            except discord.Forbidden:
-                logger.warning(f"Missing permissions to send webhook in channel {channel.id}")
-            except discord.HTTPException as e:
-                logger.error(f"HTTP error sending webhook to channel {channel.id}: {e}")
-            except Exception as e:
-                logger.error(f"Error sending webhook to channel {channel.id}: {e}", exc_info=True)
+    def _webhook_kwargs(self, source: RelaySource, target: InterServerTarget, is_moddy_team: bool) -> Dict[str, Any]:
+        """
+        Nom, avatar et mentions du message relayé selon les préférences du serveur CIBLE
+        """
+        if is_moddy_team:
+            username = "Moddy Team"
+            avatar_url = self.bot.user.display_avatar.url
+        else:
+            if target.show_server_name:
+                username = f"{source.author_name} — {source.guild_name}"
+            else:
+                username = source.author_name
 
-        return success_count
+            # Limite la longueur du nom (max 80 caractères pour Discord)
+            if len(username) > 80:
+                username = username[:77] + "..."
 
-    async def _get_or_create_webhook(self, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+            avatar_url = source.author_avatar_url if target.show_avatar else None
+
+        webhook_kwargs = {
+            'username': username,
+            'allowed_mentions': discord.AllowedMentions.all() if target.allowed_mentions else discord.AllowedMentions.none(),
+            'wait': True  # On attend la réponse pour avoir l'ID du message
+        }
+        if avatar_url:
+            webhook_kwargs['avatar_url'] = avatar_url
+        if source.embeds:
+            webhook_kwargs['embeds'] = list(source.embeds)
+        return webhook_kwargs
+
+    async def _send_to_target(self, source: RelaySource, target: InterServerTarget, content: str,
+                              webhook_kwargs: Dict[str, Any], is_moddy_team: bool) -> Optional[discord.WebhookMessage]:
         """
-        Récupère ou crée un webhook pour le salon inter-serveur
+        Envoie le message dans un salon cible
+        Returns: Le message envoyé, ou None si l'auteur est exclu de ce serveur ou si l'envoi a échoué
         """
+        channel = target.channel
         try:
-            # Récupère les webhooks existants
-            webhooks = await channel.webhooks()
+            # Vérifie si l'auteur est banni ou timeout sur ce serveur (sauf pour Moddy Team)
+            if not is_moddy_team:
+                try:
+                    # Vérifie si l'auteur est membre du serveur cible
+                    target_member = channel.guild.get_member(source.author_id)
+
+                    if target_member:
+                        # Vérifie si le membre est en timeout
+                        if target_member.timed_out_until and target_member.timed_out_until > discord.utils.utcnow():
+                            logger.info(f"Skipping message relay to {channel.guild.name} - Author {source.author_id} is timed out")
+                            return None
+
+                    # Vérifie si l'auteur est banni (cache des bans du serveur cible)
+                    banned = await interserver_bans.is_banned(channel.guild, source.author_id)
+                    if banned is None:
+                        # Bans inaccessibles ou trop nombreux pour le cache : vérification REST
+                        try:
+                            await channel.guild.fetch_ban(discord.Object(id=source.author_id))
+                            banned = True
+                        except discord.NotFound:
+                            banned = False
+                    if banned:
+                        logger.info(f"Skipping message relay to {channel.guild.name} - Author {source.author_id} is banned")
+                        return None
 
-            # Cherche un webhook créé par Moddy pour l'inter-serveur
-            moddy_webhook = None
-            for webhook in webhooks:
-                if webhook.user and webhook.user.id == self.bot.user.id:
-                    if webhook.name == "Moddy Inter-Server":
-                        moddy_webhook = webhook
-                        break
+                except Exception as e:
+                    logger.debug(f"Error checking ban/timeout status: {e}")
 
-            # Si aucun webhook trouvé, en créer un
-            if not moddy_webhook:
-                moddy_webhook = await channel.create_webhook(
-                    name="Moddy Inter-Server",
-                    reason="Webhook for inter-server communication"
-                )
-                logger.info(f"Created webhook for inter-server in channel {channel.id}")
+            # Récupère ou crée un webhook pour ce salon
+            webhook = await self._get_or_create_webhook(channel)
+
+            if not webhook:
+                logger.warning(f"Could not get webhook for channel {channel.id} in guild {channel.guild.id}")
+                return None
 
-            return moddy_webhook
+            # Envoie le message via le webhook
+            try:
+                return await webhook.send(content=content, **webhook_kwargs)
+            except discord.HTTPException as e:
+                if e.status not in (401, 404):
+                    raise
+                # Webhook supprimé ou token révoqué : nouvelle résolution et un seul nouvel essai
+                await interserver_webhooks.invalidate(self.bot, channel.id, webhook.id)
+                webhook = await self._get_or_create_webhook(channel)
+                if not webhook:
+                    return None
+                return await webhook.send(content=content, **webhook_kwargs)
 
         except discord.Forbidden:
-            logger.error(f"Missing permissions to manage webhooks in channel {channel.id}")
-            return None
+            logger.warning(f"Missing permissions to send webhook in channel {channel.id}")
+        except discord.HTTPException as e:
+            logger.error(f"HTTP error sending webhook to channel {channel.id}: {e}")
         except Exception as e:
-            logger.error(f"Error getting/creating webhook: {e}", exc_info=True)
-            return None
+            logger.error(f"Error sending webhook to channel {channel.id}: {e}", exc_info=True)
+        return None
 
+    async def _get_or_create_webhook(self, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        """
+        Webhook inter-serveur du salon (cache, sinon table interserver_webhooks, sinon REST)
+        """
+        return await interserver_webhooks.get(self.bot, channel)
+
+    @with_priority(Priority.BACKGROUND)
+    async def _add_reaction(self, message: discord.Message, emoji: str):
+        """Status reactions are cosmetic: sent with background priority"""
+        await message.add_reaction(emoji)
+
+    @with_priority(Priority.BACKGROUND)
+    async def _remove_reaction(self, message: discord.Message, emoji: str):
+        await message.remove_reaction(emoji, self.bot.user)
+
+    def _in_background(self, coro) -> asyncio.Task:
+        """Runs a BACKGROUND call without making the relay wait behind it in the scheduler"""
+        task = asyncio.create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_done)
+        return task
+
+    async def _clear_loading(self, message: discord.Message, loading: Optional[asyncio.Task]):
+        """Removes the loading reaction once it has actually been added"""
+        if loading is not None:
+            await asyncio.gather(loading, return_exceptions=True)
+        await self._remove_reaction(message, "<a:loading:1395047662092550194>")
+
+    @with_priority(Priority.BACKGROUND)
     async def _send_welcome_dm(self, user: discord.User):
         """
         Envoie un DM de bienvenue à l'utilisateur s'il n'en a pas déjà reçu
@@ -481,7 +1076,8 @@ class InterServerModule(ModuleBase):
         except Exception as e:
             logger.error(f"Error sending welcome DM: {e}", exc_info=True)
 
-    async def _send_staff_log(self, message: discord.Message, moddy_id: str, is_moddy_team: bool, success_count: int, total_count: int):
+    @with_priority(Priority.BACKGROUND)
+    async def _send_staff_log(self, message: discord.Message, moddy_id: str, is_moddy_team: bool, report: RelayReport, total_count: int):
         """
         Envoie un log du message au salon staff approprié (sans boutons)
         """
@@ -498,31 +1094,34 @@ class InterServerModule(ModuleBase):
             author_info = f"{message.author.name} (`{message.author.id}`)"
             server_info = f"{message.guild.name} (`{message.guild.id}`)"
             content_preview = message.content[:500] if message.content else "*No content*"
+            relay_info = f"{report.delivered}/{total_count} servers"
+            if report.timed_out:
+                relay_info += f" ({report.timed_out} timed out)"
+            relay_info += f"\n**Latency:** {report.format_latency()}"
 
             # Crée le message de log avec Components V2 (SANS boutons)
             from discord import ui as discord_ui
             from cogs.error_handler import BaseView
 
             class StaffLogView(BaseView):
-                def __init__(self, moddy_id: str, author_info: str, server_info: str, content_preview: str, success_count: int, total_count: int, is_moddy_team: bool):
+                def __init__(self, moddy_id: str, author_info: str, server_info: str, content_preview: str, relay_info: str, is_moddy_team: bool):
                     super().__init__()
                     self.moddy_id = moddy_id
                     self.author_info = author_info
                     self.server_info = server_info
                     self.content_preview = content_preview
-                    self.success_count = success_count
-                    self.total_count = total_count
+                    self.relay_info = relay_info
                     self.is_moddy_team = is_moddy_team
 
                     # Container avec les informations uniquement
                     container = discord_ui.Container(
                         discord_ui.TextDisplay(content=f"### <:groups:1446127489842806967> New Inter-Server Message"),
-                        discord_ui.TextDisplay(content=f"**Moddy ID:** `{self.moddy_id}`\n**Author:** {self.author_info}\n**Server:** {self.server_info}\n**Relayed:** {self.success_count}/{self.total_count} servers\n**Moddy Team:** {'✅ Yes' if self.is_moddy_team else '❌ No'}\n**Time:** <t:{int(datetime.now(timezone.utc).timestamp())}:R>\n\n**Content:**\n{self.content_preview}"),
+                        discord_ui.TextDisplay(content=f"**Moddy ID:** `{self.moddy_id}`\n**Author:** {self.author_info}\n**Server:** {self.server_info}\n**Relayed:** {self.relay_info}\n**Moddy Team:** {'✅ Yes' if self.is_moddy_team else '❌ No'}\n**Time:** <t:{int(datetime.now(timezone.utc).timestamp())}:R>\n\n**Content:**\n{self.content_preview}"),
                     )
                     self.add_item(container)
 
             # Envoie le log
-            log_view = StaffLogView(moddy_id, author_info, server_info, content_preview, success_count, total_count, is_moddy_team)
+            log_view = StaffLogView(moddy_id, author_info, server_info, content_preview, relay_info, is_moddy_team)
             await log_channel.send(view=log_view, allowed_mentions=discord.AllowedMentions.none())
 
         except Exception as e:
@@ -548,6 +1147,12 @@ class InterServerModule(ModuleBase):
         if not message.content and not message.attachments and not message.embeds:
             return
 
+        # Mode cluster sans Redis : le message n'atteindrait que les serveurs de ce cluster
+        if not interserver_clusters.available:
+            await self._add_reaction(message, "<:undone:1398729502028333218>")
+            return
+
+        loading = None
         try:
             # Vérifie si l'utilisateur est blacklisté de l'inter-serveur via le système de cases
             from utils.moderation_cases import SanctionType
@@ -557,7 +1162,7 @@ class InterServerModule(ModuleBase):
                 SanctionType.INTERSERVER_BLACKLIST.value
             )
             if is_blacklisted:
-                await message.add_reaction("<:undone:1398729502028333218>")
+                self._in_background(self._add_reaction(message, "<:undone:1398729502028333218>"))
                 await message.channel.send(
                     f"{message.author.mention} You are blacklisted from using the inter-server system.",
                     delete_after=10
@@ -568,7 +1173,7 @@ class InterServerModule(ModuleBase):
             is_team = await self.bot.db.has_attribute('user', message.author.id, 'TEAM')
             if not is_team:
                 if not self._check_cooldown(message.author.id):
-                    await message.add_reaction("<:undone:1398729502028333218>")
+                    self._in_background(self._add_reaction(message, "<:undone:1398729502028333218>"))
                     await message.channel.send(
                         f"{message.author.mention} Slow down! You can send a message every 3 seconds.",
                         delete_after=5
@@ -584,8 +1189,8 @@ class InterServerModule(ModuleBase):
                 )
                 return
 
-            # Ajoute la réaction loading
-            await message.add_reaction("<a:loading:1395047662092550194>")
+            # Ajoute la réaction loading (en arrière-plan : le relais ne l'attend pas)
+            loading = self._in_background(self._add_reaction(message, "<a:loading:1395047662092550194>"))
 
             # Détecte les messages Moddy Team
             is_moddy_team_message = False
@@ -609,26 +1214,28 @@ class InterServerModule(ModuleBase):
                 is_moddy_team=is_moddy_team_message
             )
 
-            # Récupère tous les autres salons inter-serveur actifs
-            target_channels = await self._get_all_interserver_channels()
+            # Les autres clusters relaient vers leurs propres serveurs
+            source = RelaySource.from_message(message)
+            await interserver_clusters.publish(source, self.interserver_type, moddy_id, content, is_moddy_team_message)
 
-            # Retire le salon actuel de la liste
-            target_channels = [ch for ch in target_channels if ch.id != message.channel.id]
+            # Salons inter-serveur actifs du même type sur ce cluster (registre), hors salon actuel
+            targets = await self._get_interserver_targets()
+            target_count = len(targets) - (interserver_registry.get(self.guild_id) is not None)
 
-            # Envoie le DM de bienvenue si c'est la première fois
-            await self._send_welcome_dm(message.author)
+            # Envoie le DM de bienvenue si c'est la première fois (en arrière-plan)
+            self._in_background(self._send_welcome_dm(message.author))
 
-            if not target_channels:
+            if not target_count:
                 logger.debug(f"No target channels found for interserver relay from guild {self.guild_id}")
                 # Retire la réaction loading et ajoute done quand même
-                await message.remove_reaction("<a:loading:1395047662092550194>", self.bot.user)
-                await message.add_reaction("<:done:1398729525277229066>")
+                await self._clear_loading(message, loading)
+                await self._add_reaction(message, "<:done:1398729525277229066>")
 
                 # Supprime la réaction done après 5 secondes
                 async def remove_done_reaction():
                     await asyncio.sleep(5)
                     try:
-                        await message.remove_reaction("<:done:1398729525277229066>", self.bot.user)
+                        await self._remove_reaction(message, "<:done:1398729525277229066>")
                     except:
                         pass
 
@@ -636,39 +1243,42 @@ class InterServerModule(ModuleBase):
                 return
 
             # Prépare et envoie le message
-            success_count = await self._relay_message(message, target_channels, moddy_id, content, is_moddy_team_message)
+            relay_started = time.perf_counter()
+            report = await self._relay_message(source, targets, moddy_id, content, is_moddy_team_message)
+            success_count = report.delivered
+            metrics.record_interserver_relay(time.perf_counter() - relay_started, success_count, target_count)
 
             # Ajoute la réaction verified pour les messages Moddy Team
             if is_moddy_team_message:
-                await message.add_reaction("<:verified:1398729677601902635>")
+                await self._add_reaction(message, "<:verified:1398729677601902635>")
 
             # Retire loading et ajoute done si majorité de succès
-            await message.remove_reaction("<a:loading:1395047662092550194>", self.bot.user)
-            if success_count >= len(target_channels) // 2:  # Au moins 50% de succès
-                await message.add_reaction("<:done:1398729525277229066>")
+            await self._clear_loading(message, loading)
+            if success_count >= target_count // 2:  # Au moins 50% de succès
+                await self._add_reaction(message, "<:done:1398729525277229066>")
 
                 # Supprime la réaction done après 5 secondes
                 async def remove_done_reaction():
                     await asyncio.sleep(5)
                     try:
-                        await message.remove_reaction("<:done:1398729525277229066>", self.bot.user)
+                        await self._remove_reaction(message, "<:done:1398729525277229066>")
                     except:
                         pass
 
                 asyncio.create_task(remove_done_reaction())
             else:
-                await message.add_reaction("<:undone:1398729502028333218>")
+                await self._add_reaction(message, "<:undone:1398729502028333218>")
 
             # Envoie le log au salon staff approprié
-            await self._send_staff_log(message, moddy_id, is_moddy_team_message, success_count, len(target_channels))
+            await self._send_staff_log(message, moddy_id, is_moddy_team_message, report, target_count)
 
-            logger.info(f"✅ Relayed message {moddy_id} from {message.guild.name} to {success_count}/{len(target_channels)} servers")
+            logger.info(f"✅ Relayed message {moddy_id} from {message.guild.name} to {success_count}/{target_count} servers ({report.format_latency()})")
 
         except Exception as e:
             logger.error(f"Error relaying interserver message: {e}", exc_info=True)
             # Retire loading et ajoute error
             try:
-                await message.remove_reaction("<a:loading:1395047662092550194>", self.bot.user)
-                await message.add_reaction("<:undone:1398729502028333218>")
+                await self._clear_loading(message, loading)
+                await self._add_reaction(message, "<:undone:1398729502028333218>")
             except:
                 pass
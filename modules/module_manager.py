@@ -3,28 +3,76 @@ Module Manager pour Moddy
 Gère le chargement, la configuration et le fonctionnement des modules de serveur
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Type
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, Type, Tuple, Callable, Awaitable
 from abc import ABC, abstractmethod
 import discord
 from pathlib import Path
 import importlib
 import inspect
 
+from utils.request_scheduler import Priority, with_priority
+
 logger = logging.getLogger('moddy.modules')
 
+# Chargement au démarrage : serveurs lus par lot et modules instanciés en parallèle
+LOAD_BATCH_SIZE = 500
+LOAD_CONCURRENCY = 25
+
+# Mapping vide partagé : config par défaut et état alloué au premier usage
+EMPTY_MAPPING = MappingProxyType({})
+
+
+def freeze_config(value: Any) -> Any:
+    """
+    Version figée d'une configuration, lue une fois par les modules
+
+    dict -> mapping en lecture seule, list -> tuple, chaînes internées : les
+    valeurs identiques d'un serveur à l'autre (templates par défaut, types,
+    emojis) ne sont gardées qu'une fois en mémoire
+    """
+    if isinstance(value, dict):
+        if not value:
+            return EMPTY_MAPPING
+        return MappingProxyType({
+            (sys.intern(key) if isinstance(key, str) else key): freeze_config(item)
+            for key, item in value.items()
+        })
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_config(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
 
 class ModuleBase(ABC):
     """
     Classe de base pour tous les modules de serveur
     Chaque module doit hériter de cette classe
+
+    Une instance existe par (serveur, module) : les sous-classes déclarent leurs
+    attributs dans __slots__ et gardent leur config figée (freeze_config)
     """
 
+    __slots__ = ('bot', 'guild_id', 'config', 'enabled')
+
     # Métadonnées du module (à définir dans chaque sous-classe)
     MODULE_ID: str = "base"  # Identifiant unique du module
     MODULE_NAME: str = "Base Module"  # Nom affiché du module
     MODULE_DESCRIPTION: str = "Base module description"  # Description du module
     MODULE_EMOJI: str = "⚙️"  # Emoji représentant le module
+    REQUIRES_MEMBERS: bool = False  # Le module a besoin de la liste des membres en cache (chunking)
+    # Mode lazy : False si l'instance garde un état hors DB (perdu en cas d'éviction)
+    EVICTABLE: bool = True
+    # Événements gateway gérés : nom de l'événement (sans "on_") -> méthode du module appelée
+    # Ex : {'member_join': 'on_member_join'}. Dispatchés par cogs/module_events.py
+    EVENTS: Dict[str, str] = {}
 
     def __init__(self, bot, guild_id: int):
         """
@@ -36,7 +84,7 @@ class ModuleBase(ABC):
         """
         self.bot = bot
         self.guild_id = guild_id
-        self.config: Dict[str, Any] = {}
+        self.config: Mapping[str, Any] = EMPTY_MAPPING
         self.enabled = False
 
     @abstractmethod
@@ -106,18 +154,39 @@ class ModuleBase(ABC):
             # Fallback sur le nom brut du champ
             return field_name.replace('_', ' ').title()
 
-    async def enable(self):
-        """Active le module"""
+    async def enable(self, defer_hooks: bool = False):
+        """
+        Active le module
+
+        Args:
+            defer_hooks: Exécute on_enable en arrière-plan (chargement au démarrage :
+                ses appels Discord ne retardent pas le chargement des autres serveurs)
+        """
         self.enabled = True
-        await self.on_enable()
+        # Sans chunking au démarrage, demande la liste des membres du serveur
+        if self.REQUIRES_MEMBERS and getattr(self.bot, 'member_chunker', None):
+            self.bot.member_chunker.request(self.guild_id)
+        manager = getattr(self.bot, 'module_manager', None)
+        if defer_hooks and manager:
+            manager.defer_enable_hook(self)
+        else:
+            await self.on_enable()
+        self._update_subscriptions()
         logger.info(f"✅ Module {self.MODULE_ID} activé pour le serveur {self.guild_id}")
 
     async def disable(self):
         """Désactive le module"""
         self.enabled = False
+        self._update_subscriptions()
         await self.on_disable()
         logger.info(f"❌ Module {self.MODULE_ID} désactivé pour le serveur {self.guild_id}")
 
+    def _update_subscriptions(self):
+        """Met à jour l'index d'événements du gestionnaire de modules"""
+        manager = getattr(self.bot, 'module_manager', None)
+        if manager:
+            manager.update_subscriptions(self)
+
     async def on_enable(self):
         """Hook appelé quand le module est activé"""
         pass
@@ -126,6 +195,14 @@ class ModuleBase(ABC):
         """Hook appelé quand le module est désactivé"""
         pass
 
+    async def on_evict(self):
+        """
+        Hook appelé quand une instance activée est retirée de la mémoire (éviction
+        en mode lazy) : le module reste activé en DB et sera recréé au prochain événement.
+        Par défaut, libère ce que on_enable a mis en place (on_disable)
+        """
+        await self.on_disable()
+
 
 class ModuleManager:
     """
@@ -133,16 +210,42 @@ class ModuleManager:
     Charge, configure et gère les modules
     """
 
-    def __init__(self, bot):
+    def __init__(self, bot, lazy: bool = False, idle_ttl: float = 1800):
         """
         Initialise le gestionnaire de modules
 
         Args:
             bot: Instance du bot Moddy
+            lazy: Instancie les modules d'un serveur à son premier événement au lieu du démarrage
+            idle_ttl: Mode lazy : secondes sans événement avant d'évincer les modules d'un serveur
         """
         self.bot = bot
         self.registered_modules: Dict[str, Type[ModuleBase]] = {}  # module_id -> Module class
         self.active_modules: Dict[int, Dict[str, ModuleBase]] = {}  # guild_id -> {module_id -> Module instance}
+        # Index des événements : (event, guild_id) -> {module_id -> handler}, seulement les modules activés
+        self.event_handlers: Dict[Tuple[str, int], Dict[str, Callable[..., Awaitable[Any]]]] = {}
+        # Hooks on_enable différés pendant le chargement au démarrage
+        self._deferred_hooks: deque = deque()
+        self._hooks_task: Optional[asyncio.Task] = None
+
+        # Mode lazy : au démarrage, seul un bitmap "modules configurés" est gardé par serveur
+        self.lazy = lazy
+        self.idle_ttl = idle_ttl
+        self._module_bits: Dict[str, int] = {}  # module_id -> bit
+        self._event_masks: Dict[str, int] = {}  # event -> bits des modules qui le gèrent
+        self._pending: Dict[int, int] = {}  # guild_id -> bits des modules configurés non instanciés
+        self._last_used: Dict[int, float] = {}  # guild_id -> dernier accès (time.monotonic)
+        self._activations: Dict[int, asyncio.Task] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+
+        # Rechargement à chaud : versions des configs appliquées, notifications des autres process
+        self._config_versions: Dict[Tuple[int, str], int] = {}  # (guild_id, module_id) -> version
+        self._reloads: deque = deque()
+        self._reloads_task: Optional[asyncio.Task] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        # Sauvegardes locales en cours : leurs notifications (reçues avant la fin) sont retenues
+        self._saving: Dict[Tuple[int, str], int] = {}  # (guild_id, module_id) -> sauvegardes en cours
+        self._held: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
 
     def register_module(self, module_class: Type[ModuleBase]):
         """
@@ -158,7 +261,14 @@ class ModuleManager:
         if module_id in self.registered_modules:
             logger.warning(f"⚠️ Module {module_id} already registered, overwriting")
 
+        for event, method in module_class.EVENTS.items():
+            if not callable(getattr(module_class, method, None)):
+                raise ValueError(f"{module_class.__name__}.EVENTS: {method} is not a method (event {event})")
+
         self.registered_modules[module_id] = module_class
+        bit = self._module_bits.setdefault(module_id, 1 << len(self._module_bits))
+        for event in module_class.EVENTS:
+            self._event_masks[event] = self._event_masks.get(event, 0) | bit
         logger.info(f"✅ Module registered: {module_id} ({module_class.MODULE_NAME})")
 
     def get_available_modules(self) -> List[Dict[str, str]]:
@@ -178,6 +288,156 @@ class ModuleManager:
             for module_class in self.registered_modules.values()
         ]
 
+    def update_subscriptions(self, module: ModuleBase):
+        """
+        Ajoute (module activé) ou retire (module désactivé) les handlers d'un module de l'index des événements
+
+        Args:
+            module: Instance du module
+        """
+        if not module.enabled:
+            self.remove_subscriptions(module)
+            return
+
+        for event, method in module.EVENTS.items():
+            handlers = self.event_handlers.get((event, module.guild_id))
+            if handlers is None:
+                handlers = self.event_handlers[(event, module.guild_id)] = {}
+            handlers[module.MODULE_ID] = getattr(module, method)
+
+    def remove_subscriptions(self, module: ModuleBase):
+        """Retire les handlers d'une instance de module de l'index des événements"""
+        for event in module.EVENTS:
+            key = (event, module.guild_id)
+            handlers = self.event_handlers.get(key)
+            if handlers is None:
+                continue
+            # Seulement ceux de cette instance (une nouvelle a pu la remplacer)
+            handler = handlers.get(module.MODULE_ID)
+            if handler is not None and getattr(handler, '__self__', None) is module:
+                del handlers[module.MODULE_ID]
+            if not handlers:
+                del self.event_handlers[key]
+
+    def get_event_handlers(self, event: str, guild_id: int) -> Optional[Dict[str, Callable[..., Awaitable[Any]]]]:
+        """
+        Handlers des modules activés d'un serveur pour un événement
+
+        Returns:
+            {module_id -> handler} ou None si aucun module du serveur ne gère l'événement
+        """
+        handlers = self.event_handlers.get((event, guild_id))
+        if self.lazy and handlers is not None:
+            self._touch(guild_id)
+        return handlers
+
+    def has_pending_modules(self, event: str, guild_id: int) -> bool:
+        """Mode lazy : le serveur a des modules configurés, pas encore instanciés, qui gèrent l'événement"""
+        return bool(self._pending.get(guild_id, 0) & self._event_masks.get(event, 0))
+
+    def _config_mask(self, modules: Dict[str, Dict[str, Any]]) -> int:
+        """Bits des modules enregistrés configurés sur un serveur"""
+        mask = 0
+        for module_id in modules:
+            mask |= self._module_bits.get(module_id, 0)
+        return mask
+
+    async def activate_guild(self, guild_id: int):
+        """
+        Mode lazy : instancie les modules configurés d'un serveur
+        Les appels concurrents pour le même serveur attendent la même activation
+        """
+        task = self._activations.get(guild_id)
+        if task is None:
+            task = self._activations[guild_id] = asyncio.create_task(self._activate_guild(guild_id))
+            task.add_done_callback(lambda _: self._activations.pop(guild_id, None))
+        await task
+
+    async def _activate_guild(self, guild_id: int):
+        pending = self._pending.get(guild_id, 0)
+        if not pending or not self.bot.db:
+            return
+
+        try:
+            modules = await self.bot.db.get_guild_modules(guild_id)
+        except Exception as e:
+            logger.error(f"❌ Error activating modules for guild {guild_id}: {e}", exc_info=True)
+            return
+
+        modules = {
+            module_id: module for module_id, module in modules.items()
+            if self._module_bits.get(module_id, 0) & pending
+        }
+        await self._load_modules_config(guild_id, modules, defer_hooks=True)
+        self._pending.pop(guild_id, None)
+
+    def _clear_pending(self, guild_id: int, module_id: str):
+        pending = self._pending.get(guild_id, 0) & ~self._module_bits.get(module_id, 0)
+        if pending:
+            self._pending[guild_id] = pending
+        else:
+            self._pending.pop(guild_id, None)
+
+    def _touch(self, guild_id: int):
+        """Mode lazy : note l'accès aux modules d'un serveur (éviction après idle_ttl)"""
+        self._last_used[guild_id] = time.monotonic()
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._evict_idle_loop())
+
+    async def _evict_idle_loop(self):
+        while True:
+            await asyncio.sleep(max(self.idle_ttl / 4, 1))
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"❌ Error evicting idle modules: {e}", exc_info=True)
+
+    async def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Mode lazy : retire les modules des serveurs sans accès depuis idle_ttl secondes
+        Ils seront recréés (depuis la DB) au prochain événement. Les serveurs
+        avec un module activé non évinçable (EVICTABLE = False) restent chargés
+
+        Returns:
+            Nombre de serveurs évincés
+        """
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        for guild_id, last_used in list(self._last_used.items()):
+            if now - last_used < self.idle_ttl or guild_id in self._activations:
+                continue
+
+            if any(module.enabled and not module.EVICTABLE for module in self.active_modules.get(guild_id, {}).values()):
+                continue
+
+            del self._last_used[guild_id]
+            mask = self._pending.get(guild_id, 0)
+            modules = self.active_modules.pop(guild_id, {})
+            for module_id, module in modules.items():
+                self.remove_subscriptions(module)
+                self._config_versions.pop((guild_id, module_id), None)
+                mask |= self._module_bits.get(module_id, 0)
+            if mask:
+                self._pending[guild_id] = mask
+            evicted += 1
+
+            for module in modules.values():
+                if module.enabled:
+                    try:
+                        await module.on_evict()
+                    except Exception as e:
+                        logger.error(f"❌ Error evicting module {module.MODULE_ID} for guild {guild_id}: {e}", exc_info=True)
+
+        if evicted:
+            logger.debug(f"🧹 Evicted idle modules of {evicted} guilds")
+        return evicted
+
+    def stop(self):
+        """Arrête les tâches d'arrière-plan (hooks différés, éviction, rechargement à chaud)"""
+        for task in (self._hooks_task, self._eviction_task, self._reloads_task, self._listener_task):
+            if task and not task.done():
+                task.cancel()
+
     async def get_module_instance(self, guild_id: int, module_id: str) -> Optional[ModuleBase]:
         """
         Récupère l'instance d'un module pour un serveur
@@ -189,9 +449,14 @@ class ModuleManager:
         Returns:
             Instance du module ou None si non trouvé
         """
+        if self._pending.get(guild_id, 0) & self._module_bits.get(module_id, 0):
+            await self.activate_guild(guild_id)
+
         if guild_id not in self.active_modules:
             return None
 
+        if self.lazy:
+            self._touch(guild_id)
         return self.active_modules[guild_id].get(module_id)
 
     async def load_guild_modules(self, guild_id: int):
@@ -206,16 +471,30 @@ class ModuleManager:
             return
 
         try:
-            # Récupère les données du serveur
-            guild_data = await self.bot.db.get_guild(guild_id)
-            modules_config = guild_data.get('data', {}).get('modules', {})
+            # Récupère les modules configurés du serveur
+            modules = await self.bot.db.get_guild_modules(guild_id)
+        except Exception as e:
+            logger.error(f"❌ Error loading modules for guild {guild_id}: {e}", exc_info=True)
+            return
+
+        await self._load_modules_config(guild_id, modules)
+
+    async def _load_modules_config(self, guild_id: int, modules: Dict[str, Dict[str, Any]], defer_hooks: bool = False):
+        """
+        Instancie et active les modules d'un serveur à partir de leur configuration
 
+        Args:
+            guild_id: ID du serveur
+            modules: Lignes guild_modules du serveur (module_id -> {'enabled', 'config', 'version'})
+            defer_hooks: Exécute les hooks on_enable en arrière-plan
+        """
+        try:
             # Initialise le dictionnaire pour ce serveur
             if guild_id not in self.active_modules:
                 self.active_modules[guild_id] = {}
 
             # Charge chaque module configuré
-            for module_id, config_data in modules_config.items():
+            for module_id, stored in modules.items():
                 if module_id not in self.registered_modules:
                     # Ignore silently old/obsolete module configurations
                     # This can happen when modules are renamed or removed
@@ -227,20 +506,51 @@ class ModuleManager:
                 module_instance = module_class(self.bot, guild_id)
 
                 # Charge la configuration
-                if await module_instance.load_config(config_data):
+                if await module_instance.load_config(stored['config']):
+                    previous = self.active_modules[guild_id].get(module_id)
                     self.active_modules[guild_id][module_id] = module_instance
+                    self._config_versions[(guild_id, module_id)] = stored['version']
+                    if previous is not None:
+                        self.remove_subscriptions(previous)
+                        # L'instance remplacée libère ses ressources avant que la nouvelle s'active
+                        if previous.enabled:
+                            await previous.disable()
                     # Active le module si la config est valide (enabled est déterminé dans load_config)
                     if module_instance.enabled:
-                        await module_instance.enable()
+                        await module_instance.enable(defer_hooks=defer_hooks)
+                    # État stocké différent (règle d'activation du module modifiée depuis la sauvegarde)
+                    if stored['enabled'] != module_instance.enabled:
+                        await self.bot.db.set_module_enabled(guild_id, module_id, module_instance.enabled)
                     logger.info(f"✅ Module {module_id} loaded for guild {guild_id} (enabled: {module_instance.enabled})")
                 else:
                     logger.error(f"❌ Failed to load module {module_id} for guild {guild_id}")
 
             logger.info(f"📦 Loaded {len(self.active_modules[guild_id])} modules for guild {guild_id}")
+            if self.lazy:
+                self._touch(guild_id)
 
         except Exception as e:
             logger.error(f"❌ Error loading modules for guild {guild_id}: {e}", exc_info=True)
 
+    def defer_enable_hook(self, module: ModuleBase):
+        """Met le hook on_enable d'un module dans la file d'arrière-plan"""
+        self._deferred_hooks.append(module)
+        if self._hooks_task is None or self._hooks_task.done():
+            self._hooks_task = asyncio.create_task(self._run_deferred_hooks())
+
+    @with_priority(Priority.BACKGROUND)
+    async def _run_deferred_hooks(self):
+        """Exécute les hooks on_enable différés, un par un, en priorité basse"""
+        while self._deferred_hooks:
+            module = self._deferred_hooks.popleft()
+            # Le module a pu être désactivé ou remplacé entre-temps
+            if not module.enabled or self.active_modules.get(module.guild_id, {}).get(module.MODULE_ID) is not module:
+                continue
+            try:
+                await module.on_enable()
+            except Exception as e:
+                logger.error(f"❌ Error in on_enable of module {module.MODULE_ID} for guild {module.guild_id}: {e}", exc_info=True)
+
     async def save_module_config(self, guild_id: int, module_id: str, config_data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         """
         Sauvegarde la configuration d'un module dans la DB
@@ -296,38 +606,17 @@ class ModuleManager:
             if not is_valid:
                 return False, error_msg
 
-            # S'assure que le serveur existe dans la DB
-            await self.bot.db.get_guild(guild_id)
-
-            # Sauvegarde dans la DB
-            await self.bot.db.update_guild_data(
-                guild_id,
-                f"modules.{module_id}",
-                config_data
-            )
-
-            logger.info(f"📝 Config saved to DB for module {module_id} in guild {guild_id}: {config_data}")
+            # Détermine l'état activé (enabled est déterminé dans load_config)
+            await temp_instance.load_config(config_data)
 
-            # Met à jour ou crée l'instance active
-            if guild_id not in self.active_modules:
-                self.active_modules[guild_id] = {}
+            with self._saving_locally(guild_id, module_id):
+                # Sauvegarde dans la DB (une seule ligne de guild_modules, notifie les autres process)
+                version = await self.bot.db.save_module_config(guild_id, module_id, config_data, temp_instance.enabled)
+                self._config_versions[(guild_id, module_id)] = version
 
-            # Crée ou met à jour l'instance
-            if module_id in self.active_modules[guild_id]:
-                # Met à jour l'instance existante
-                module_instance = self.active_modules[guild_id][module_id]
-                await module_instance.load_config(config_data)
-            else:
-                # Crée une nouvelle instance
-                module_instance = module_class(self.bot, guild_id)
-                await module_instance.load_config(config_data)
-                self.active_modules[guild_id][module_id] = module_instance
+                logger.info(f"📝 Config saved to DB for module {module_id} in guild {guild_id}: {config_data}")
 
-            # Active/désactive selon la validité de la config (enabled est déterminé dans load_config)
-            if module_instance.enabled:
-                await module_instance.enable()
-            else:
-                await module_instance.disable()
+                module_instance = await self._apply_config(guild_id, module_id, config_data)
 
             logger.info(f"✅ Configuration saved for module {module_id} in guild {guild_id} (enabled: {module_instance.enabled})")
             return True, None
@@ -336,6 +625,39 @@ class ModuleManager:
             logger.error(f"❌ Error saving module config: {e}", exc_info=True)
             return False, f"Internal error: {str(e)}"
 
+    async def _apply_config(self, guild_id: int, module_id: str, config_data: Dict[str, Any]) -> ModuleBase:
+        """Met à jour (ou crée) l'instance active d'un module avec une nouvelle configuration"""
+        if guild_id not in self.active_modules:
+            self.active_modules[guild_id] = {}
+
+        # Crée ou met à jour l'instance
+        if module_id in self.active_modules[guild_id]:
+            # Met à jour l'instance existante
+            module_instance = self.active_modules[guild_id][module_id]
+            await module_instance.load_config(config_data)
+        else:
+            # Crée une nouvelle instance
+            module_instance = self.registered_modules[module_id](self.bot, guild_id)
+            await module_instance.load_config(config_data)
+            self.active_modules[guild_id][module_id] = module_instance
+        self._clear_pending(guild_id, module_id)
+        if self.lazy:
+            self._touch(guild_id)
+
+        # Active/désactive selon la validité de la config (enabled est déterminé dans load_config)
+        if module_instance.enabled:
+            await module_instance.enable()
+        else:
+            await module_instance.disable()
+        return module_instance
+
+    async def _remove_module(self, guild_id: int, module_id: str):
+        """Désactive et retire l'instance active d'un module"""
+        module_instance = self.active_modules.get(guild_id, {}).pop(module_id, None)
+        if module_instance is not None:
+            await module_instance.disable()
+        self._clear_pending(guild_id, module_id)
+
     async def delete_module_config(self, guild_id: int, module_id: str) -> bool:
         """
         Supprime la configuration d'un module
@@ -351,18 +673,13 @@ class ModuleManager:
             return False
 
         try:
-            # Désactive le module s'il est actif
-            if guild_id in self.active_modules and module_id in self.active_modules[guild_id]:
-                module_instance = self.active_modules[guild_id][module_id]
-                await module_instance.disable()
-                del self.active_modules[guild_id][module_id]
-
-            # Supprime de la DB en mettant un objet vide
-            await self.bot.db.update_guild_data(
-                guild_id,
-                f"modules.{module_id}",
-                {}
-            )
+            with self._saving_locally(guild_id, module_id):
+                # Désactive le module s'il est actif
+                await self._remove_module(guild_id, module_id)
+
+                # Supprime de la DB (notifie les autres process)
+                version = await self.bot.db.delete_module_config(guild_id, module_id)
+                self._config_versions[(guild_id, module_id)] = version
 
             logger.info(f"🗑️ Configuration deleted for module {module_id} in guild {guild_id}")
             return True
@@ -386,29 +703,223 @@ class ModuleManager:
             return None
 
         try:
-            guild_data = await self.bot.db.get_guild(guild_id)
-            modules_config = guild_data.get('data', {}).get('modules', {})
-            return modules_config.get(module_id)
+            return await self.bot.db.get_module_config(guild_id, module_id)
         except Exception as e:
             logger.error(f"❌ Error getting module config: {e}", exc_info=True)
             return None
 
-    async def load_all_modules(self):
+    # ================ RECHARGEMENT À CHAUD ================
+
+    def start_config_listener(self):
+        """
+        Écoute les changements de configuration faits par les autres process
+        (autres clusters, dashboard) : seul le module concerné est rechargé
+        """
+        if self._listener_task is None and self.bot.db:
+            from database import MODULE_CONFIG_CHANNEL
+            self._listener_task = self.bot.db.listen(
+                MODULE_CONFIG_CHANNEL, self.on_config_notification, on_connect=self.resync_configs
+            )
+
+    def on_config_notification(self, payload: Dict[str, Any]):
+        """
+        Notification d'un changement de configuration (payload : guild_id, module_id, version, deleted)
+        Les versions déjà appliquées (nos propres sauvegardes, notifications en retard) sont ignorées
+        """
+        guild_id, module_id, version = int(payload['guild_id']), payload['module_id'], int(payload['version'])
+        if version <= self._config_versions.get((guild_id, module_id), 0):
+            return
+        if (guild_id, module_id) in self._saving:
+            # Sans doute notre propre sauvegarde, dont la version n'est pas encore connue
+            self._held.setdefault((guild_id, module_id), []).append(payload)
+            return
+        self._reloads.append((guild_id, module_id, version, bool(payload.get('deleted'))))
+        if self._reloads_task is None or self._reloads_task.done():
+            self._reloads_task = asyncio.create_task(self._run_reloads())
+
+    @contextmanager
+    def _saving_locally(self, guild_id: int, module_id: str):
+        """
+        Marque une sauvegarde locale : la notification NOTIFY peut arriver avant que
+        sa version soit enregistrée. Retenue jusqu'à la fin, elle est alors ignorée
+        (version déjà appliquée) ou rejouée (changement plus récent d'un autre process)
+        """
+        key = (guild_id, module_id)
+        self._saving[key] = self._saving.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self._saving[key] -= 1
+            if not self._saving[key]:
+                del self._saving[key]
+                for payload in self._held.pop(key, ()):
+                    self.on_config_notification(payload)
+
+    async def _run_reloads(self):
+        """Applique les notifications une par une, dans leur ordre d'arrivée"""
+        while self._reloads:
+            guild_id, module_id, version, deleted = self._reloads.popleft()
+            if (guild_id, module_id) in self._saving:
+                self._held.setdefault((guild_id, module_id), []).append(
+                    {'guild_id': guild_id, 'module_id': module_id, 'version': version, 'deleted': deleted}
+                )
+                continue
+            try:
+                await self.reload_module(guild_id, module_id, version, deleted)
+            except Exception as e:
+                logger.error(f"❌ Error reloading module {module_id} for guild {guild_id}: {e}", exc_info=True)
+
+    async def reload_module(self, guild_id: int, module_id: str, version: int, deleted: bool = False) -> bool:
+        """
+        Recharge (ou retire) l'instance d'un module après un changement fait par un autre process
+
+        Args:
+            guild_id: ID du serveur
+            module_id: ID du module
+            version: Version notifiée
+            deleted: La configuration a été supprimée
+
+        Returns:
+            True si l'état local a changé
+        """
+        key = (guild_id, module_id)
+        if version <= self._config_versions.get(key, 0):
+            return False
+        # Serveur d'un autre cluster ou module inconnu de ce process
+        if module_id not in self.registered_modules or self.bot.get_guild(guild_id) is None:
+            return False
+
+        # Mode lazy, serveur non instancié : seul le bitmap des modules configurés change
+        if self.lazy and guild_id not in self.active_modules:
+            if deleted:
+                self._clear_pending(guild_id, module_id)
+            else:
+                self._pending[guild_id] = self._pending.get(guild_id, 0) | self._module_bits.get(module_id, 0)
+                # Un module non évinçable reste instancié : il l'est dès qu'il est configuré
+                if not self.registered_modules[module_id].EVICTABLE:
+                    await self.activate_guild(guild_id)
+            return True
+
+        if deleted:
+            self._config_versions[key] = version
+            await self._remove_module(guild_id, module_id)
+            logger.info(f"🔄 Module {module_id} removed for guild {guild_id} (deleted by another process)")
+            return True
+
+        # La notification ne porte pas la config : la ligne est relue (toujours la plus récente)
+        row = await self.bot.db.get_guild_module(guild_id, module_id)
+        if row is None:
+            # Supprimée depuis : sa propre notification suit
+            return False
+        self._config_versions[key] = max(version, row['version'])
+        module_instance = await self._apply_config(guild_id, module_id, row['config'])
+        logger.info(f"🔄 Module {module_id} reloaded for guild {guild_id} (version {row['version']}, enabled: {module_instance.enabled})")
+        return True
+
+    async def resync_configs(self):
+        """
+        Rattrape les notifications perdues pendant une coupure de l'écoute :
+        compare les versions des modules de tous les serveurs de ce process
+        (instanciés, en attente en mode lazy, ou sans module) à celles de la DB
+        """
+        guild_ids = [guild.id for guild in self.bot.guilds]
+        if not guild_ids:
+            return
+        try:
+            versions = await self.bot.db.get_module_versions(guild_ids)
+        except Exception as e:
+            logger.error(f"❌ Error resyncing module configs: {e}", exc_info=True)
+            return
+
+        # Modules connus ici (instanciés ou en attente) dont la ligne a disparu
+        known_modules = {
+            guild_id: list(modules) for guild_id, modules in self.active_modules.items()
+        }
+        for guild_id, pending in self._pending.items():
+            known_modules.setdefault(guild_id, []).extend(
+                module_id for module_id, bit in self._module_bits.items() if bit & pending
+            )
+        for guild_id, module_ids in known_modules.items():
+            for module_id in module_ids:
+                known = self._config_versions.get((guild_id, module_id), 0)
+                if (guild_id, module_id) not in versions:
+                    self.on_config_notification({'guild_id': guild_id, 'module_id': module_id, 'version': known + 1, 'deleted': True})
+        for (guild_id, module_id), version in versions.items():
+            self.on_config_notification({'guild_id': guild_id, 'module_id': module_id, 'version': version})
+
+    async def migrate_legacy_configs(self) -> int:
+        """
+        Migre les configs de guilds.data.modules vers guild_modules, avec l'état
+        activé calculé par chaque module (load_config), comme save_module_config
+
+        Returns:
+            Nombre de configs migrées
+        """
+        async def resolve_enabled(module_id: str, config: Dict[str, Any]) -> bool:
+            module_class = self.registered_modules.get(module_id)
+            if module_class is None:
+                return False
+            instance = module_class(self.bot, 0)
+            return await instance.load_config(config) and instance.enabled
+
+        if not self.bot.db:
+            return 0
+        try:
+            return await self.bot.db.migrate_legacy_module_configs(resolve_enabled)
+        except Exception as e:
+            logger.error(f"❌ Error migrating legacy module configs: {e}", exc_info=True)
+            return 0
+
+    async def load_all_modules(self, guilds: Optional[list] = None):
         """
         Charge tous les modules pour tous les serveurs
-        Appelé au démarrage du bot
+        Appelé au démarrage du bot (ou par shard, avec les serveurs du shard)
+
+        Une seule requête lit la config des serveurs qui ont des modules ; les
+        modules sont instanciés par lots, en parallèle, et leurs hooks on_enable
+        (appels Discord) s'exécutent ensuite en arrière-plan.
+
+        En mode lazy, seul le bitmap des modules configurés est gardé : les
+        modules d'un serveur sont instanciés à son premier événement.
         """
         if not self.bot.db:
             logger.warning("⚠️ No database connection, cannot load modules")
             return
 
         logger.info("📦 Loading modules for all guilds...")
+        started = time.perf_counter()
+
+        guild_ids = [guild.id for guild in (self.bot.guilds if guilds is None else guilds)]
+        semaphore = asyncio.Semaphore(LOAD_CONCURRENCY)
+        loaded = 0
+
+        async def load(guild_id: int, modules: Dict[str, Dict[str, Any]]):
+            async with semaphore:
+                await self._load_modules_config(guild_id, modules, defer_hooks=True)
+
+        # En mode lazy, seuls les IDs des modules configurés sont lus
+        async for batch in self.bot.db.iter_guild_modules(guild_ids, LOAD_BATCH_SIZE, with_config=not self.lazy):
+            if self.lazy:
+                # Les modules seront instanciés au premier événement du serveur
+                for guild_id, modules in batch:
+                    mask = self._config_mask(modules)
+                    if mask:
+                        self._pending[guild_id] = mask
+            else:
+                await asyncio.gather(*(load(guild_id, modules) for guild_id, modules in batch))
+            loaded += len(batch)
 
-        # Récupère tous les serveurs
-        for guild in self.bot.guilds:
-            await self.load_guild_modules(guild.id)
+        if self.lazy:
+            logger.info(
+                f"✅ Module configs indexed for {len(self._pending)}/{len(guild_ids)} guilds in "
+                f"{time.perf_counter() - started:.2f}s (lazy activation, idle TTL {self.idle_ttl:.0f}s)"
+            )
+            return
 
-        logger.info("✅ All guild modules loaded")
+        logger.info(
+            f"✅ Modules loaded for {loaded}/{len(guild_ids)} guilds in {time.perf_counter() - started:.2f}s "
+            f"({len(self._deferred_hooks)} enable hooks queued)"
+        )
 
     def discover_modules(self):
         """
@@ -3,13 +3,17 @@ Module Starboard - Système de tableau d'honneur pour messages populaires
 """
 
 import discord
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Mapping
 import logging
 
-from modules.module_manager import ModuleBase
+from modules.module_manager import EMPTY_MAPPING, ModuleBase, freeze_config
+from utils.request_scheduler import request_scheduler
 
 logger = logging.getLogger('moddy.modules.starboard')
 
+# Reactions received within this window (seconds) produce a single starboard update
+REFRESH_DELAY = 2.0
+
 
 class StarboardModule(ModuleBase):
     """
@@ -22,6 +26,11 @@ class StarboardModule(ModuleBase):
     MODULE_NAME = "Starboard"
     MODULE_DESCRIPTION = "Tableau d'honneur des messages populaires"
     MODULE_EMOJI = "<:star:1446267438671859832>"
+    EVENTS = {'raw_reaction_add': 'on_reaction_add', 'raw_reaction_remove': 'on_reaction_remove'}
+    # starboard_messages only lives in memory: after an eviction, stars would post duplicates
+    EVICTABLE = False
+
+    __slots__ = ('channel_id', 'reaction_count', 'emoji', 'starboard_messages')
 
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
@@ -34,20 +43,20 @@ class StarboardModule(ModuleBase):
         self.emoji: str = "⭐"  # Star emoji
 
         # Track sent starboard messages to update them in real-time
-        # Format: {original_message_id: starboard_message_id}
-        self.starboard_messages: Dict[int, int] = {}
+        # Format: {original_message_id: starboard_message_id}, allocated on first use
+        self.starboard_messages: Mapping[int, int] = EMPTY_MAPPING
 
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Load configuration from DB"""
         try:
-            self.config = config_data
+            self.config = config = freeze_config(config_data)
 
             # Channel configuration
-            self.channel_id = config_data.get('channel_id')
+            self.channel_id = config.get('channel_id')
 
             # Starboard configuration
-            self.reaction_count = config_data.get('reaction_count', 5)
-            self.emoji = config_data.get('emoji', "⭐")
+            self.reaction_count = config.get('reaction_count', 5)
+            self.emoji = config.get('emoji', "⭐")
 
             # Module is enabled if channel is configured
             self.enabled = self.channel_id is not None
@@ -114,42 +123,11 @@ class StarboardModule(ModuleBase):
         if str(payload.emoji) != self.emoji:
             return
 
-        try:
-            guild = self.bot.get_guild(self.guild_id)
-            if not guild:
-                return
-
-            # Get the channel where the reaction was added
-            channel = guild.get_channel(payload.channel_id)
-            if not channel or not isinstance(channel, discord.TextChannel):
-                return
-
-            # Don't track reactions in the starboard channel itself
-            if payload.channel_id == self.channel_id:
-                return
-
-            # Get the message
-            try:
-                message = await channel.fetch_message(payload.message_id)
-            except discord.NotFound:
-                logger.warning(f"Message {payload.message_id} not found")
-                return
-
-            # Count star reactions
-            star_count = 0
-            for reaction in message.reactions:
-                if str(reaction.emoji) == self.emoji:
-                    star_count = reaction.count
-                    break
+        # Don't track reactions in the starboard channel itself
+        if payload.channel_id == self.channel_id:
+            return
 
-            # Check if we should send/update starboard entry
-            if star_count >= self.reaction_count:
-                await self._update_starboard(message, star_count)
-
-        except discord.Forbidden:
-            logger.warning(f"Missing permissions for starboard in guild {self.guild_id}")
-        except Exception as e:
-            logger.error(f"Error processing starboard reaction: {e}", exc_info=True)
+        self._schedule_refresh(payload)
 
     async def on_reaction_remove(self, payload: discord.RawReactionActionEvent):
         """
@@ -167,20 +145,36 @@ class StarboardModule(ModuleBase):
         if payload.message_id not in self.starboard_messages:
             return
 
+        self._schedule_refresh(payload)
+
+    def _schedule_refresh(self, payload: discord.RawReactionActionEvent):
+        """
+        Coalesces the reactions of a burst: a single fetch + edit per message,
+        sent with background priority
+        """
+        request_scheduler.coalesce(
+            ('starboard', self.guild_id, payload.message_id),
+            lambda: self._refresh_entry(payload.channel_id, payload.message_id),
+            delay=REFRESH_DELAY
+        )
+
+    async def _refresh_entry(self, channel_id: int, message_id: int):
+        """Counts the stars of a message and creates, updates or removes its starboard entry"""
         try:
             guild = self.bot.get_guild(self.guild_id)
             if not guild:
                 return
 
-            # Get the channel where the reaction was removed
-            channel = guild.get_channel(payload.channel_id)
+            # Get the channel where the reaction was added or removed
+            channel = guild.get_channel(channel_id)
             if not channel or not isinstance(channel, discord.TextChannel):
                 return
 
             # Get the message
             try:
-                message = await channel.fetch_message(payload.message_id)
+                message = await channel.fetch_message(message_id)
             except discord.NotFound:
+                logger.warning(f"Message {message_id} not found")
                 return
 
             # Count star reactions
@@ -190,15 +184,17 @@ class StarboardModule(ModuleBase):
                     star_count = reaction.count
                     break
 
-            # Update or remove starboard entry
+            # Create, update or remove the starboard entry
             if star_count >= self.reaction_count:
                 await self._update_starboard(message, star_count)
-            else:
+            elif message.id in self.starboard_messages:
                 # Remove from starboard if below threshold
                 await self._remove_starboard(message)
 
+        except discord.Forbidden:
+            logger.warning(f"Missing permissions for starboard in guild {self.guild_id}")
         except Exception as e:
-            logger.error(f"Error updating starboard on reaction remove: {e}", exc_info=True)
+            logger.error(f"Error processing starboard reaction: {e}", exc_info=True)
 
     async def _update_starboard(self, message: discord.Message, star_count: int):
         """
@@ -220,9 +216,9 @@ class StarboardModule(ModuleBase):
         if message.id in self.starboard_messages:
             # Update existing message
             try:
+                # Partial message: edited without fetching it first
                 starboard_msg_id = self.starboard_messages[message.id]
-                starboard_msg = await starboard_channel.fetch_message(starboard_msg_id)
-                await starboard_msg.edit(embed=embed)
+                await starboard_channel.get_partial_message(starboard_msg_id).edit(embed=embed)
                 logger.info(f"Updated starboard message for {message.id} (stars: {star_count})")
             except discord.NotFound:
                 # Message was deleted, create a new one
@@ -240,6 +236,8 @@ class StarboardModule(ModuleBase):
             starboard_msg = await channel.send(embed=embed)
 
             # Track it for future updates
+            if self.starboard_messages is EMPTY_MAPPING:
+                self.starboard_messages = {}
             self.starboard_messages[original_message.id] = starboard_msg.id
 
             logger.info(f"Created starboard message for {original_message.id}")
@@ -263,8 +261,7 @@ class StarboardModule(ModuleBase):
 
         try:
             starboard_msg_id = self.starboard_messages[message.id]
-            starboard_msg = await starboard_channel.fetch_message(starboard_msg_id)
-            await starboard_msg.delete()
+            await starboard_channel.get_partial_message(starboard_msg_id).delete()
             del self.starboard_messages[message.id]
             logger.info(f"Removed starboard message for {message.id}")
         except discord.NotFound:
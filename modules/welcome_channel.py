@@ -6,7 +6,7 @@ import discord
 from typing import Dict, Any, Optional
 import logging
 
-from modules.module_manager import ModuleBase
+from modules.module_manager import ModuleBase, freeze_config
 
 logger = logging.getLogger('moddy.modules.welcome_channel')
 
@@ -21,6 +21,10 @@ class WelcomeChannelModule(ModuleBase):
     MODULE_NAME = "Welcome Channel"
     MODULE_DESCRIPTION = "Message de bienvenue dans un salon public"
     MODULE_EMOJI = "<:waving_hand:1446127491004760184>"
+    EVENTS = {'member_join': 'on_member_join'}
+
+    __slots__ = ('channel_id', 'message_template', 'mention_user', 'embed_enabled', 'embed_title', 'embed_description',
+                 'embed_color', 'embed_footer', 'embed_image_url', 'embed_thumbnail_enabled', 'embed_author_enabled')
 
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
@@ -45,24 +49,24 @@ class WelcomeChannelModule(ModuleBase):
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Charge la configuration depuis la DB"""
         try:
-            self.config = config_data
+            self.config = config = freeze_config(config_data)
 
             # Channel configuration
-            self.channel_id = config_data.get('channel_id')
+            self.channel_id = config.get('channel_id')
 
             # Message configuration
-            self.message_template = config_data.get('message_template', "Bienvenue {user} sur le serveur !")
-            self.mention_user = config_data.get('mention_user', True)
+            self.message_template = config.get('message_template', "Bienvenue {user} sur le serveur !")
+            self.mention_user = config.get('mention_user', True)
 
             # Embed configuration
-            self.embed_enabled = config_data.get('embed_enabled', False)
-            self.embed_title = config_data.get('embed_title', "Bienvenue !")
-            self.embed_description = config_data.get('embed_description')
-            self.embed_color = config_data.get('embed_color', 0x5865F2)
-            self.embed_footer = config_data.get('embed_footer')
-            self.embed_image_url = config_data.get('embed_image_url')
-            self.embed_thumbnail_enabled = config_data.get('embed_thumbnail_enabled', True)
-            self.embed_author_enabled = config_data.get('embed_author_enabled', False)
+            self.embed_enabled = config.get('embed_enabled', False)
+            self.embed_title = config.get('embed_title', "Bienvenue !")
+            self.embed_description = config.get('embed_description')
+            self.embed_color = config.get('embed_color', 0x5865F2)
+            self.embed_footer = config.get('embed_footer')
+            self.embed_image_url = config.get('embed_image_url')
+            self.embed_thumbnail_enabled = config.get('embed_thumbnail_enabled', True)
+            self.embed_author_enabled = config.get('embed_author_enabled', False)
 
             # Module is enabled if channel is configured
             self.enabled = self.channel_id is not None
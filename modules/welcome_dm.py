@@ -6,7 +6,7 @@ import discord
 from typing import Dict, Any, Optional
 import logging
 
-from modules.module_manager import ModuleBase
+from modules.module_manager import ModuleBase, freeze_config
 
 logger = logging.getLogger('moddy.modules.welcome_dm')
 
@@ -21,6 +21,10 @@ class WelcomeDmModule(ModuleBase):
     MODULE_NAME = "Welcome DM"
     MODULE_DESCRIPTION = "Message de bienvenue en message privé"
     MODULE_EMOJI = "<:waving_hand:1446127491004760184>"
+    EVENTS = {'member_join': 'on_member_join'}
+
+    __slots__ = ('message_template', 'embed_enabled', 'embed_title', 'embed_description', 'embed_color', 'embed_footer',
+                 'embed_image_url', 'embed_thumbnail_enabled', 'embed_author_enabled')
 
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
@@ -41,20 +45,20 @@ class WelcomeDmModule(ModuleBase):
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Charge la configuration depuis la DB"""
         try:
-            self.config = config_data
+            self.config = config = freeze_config(config_data)
 
             # Message configuration
-            self.message_template = config_data.get('message_template', "Bienvenue sur le serveur {server} !")
+            self.message_template = config.get('message_template', "Bienvenue sur le serveur {server} !")
 
             # Embed configuration
-            self.embed_enabled = config_data.get('embed_enabled', False)
-            self.embed_title = config_data.get('embed_title', "Bienvenue !")
-            self.embed_description = config_data.get('embed_description')
-            self.embed_color = config_data.get('embed_color', 0x5865F2)
-            self.embed_footer = config_data.get('embed_footer')
-            self.embed_image_url = config_data.get('embed_image_url')
-            self.embed_thumbnail_enabled = config_data.get('embed_thumbnail_enabled', True)
-            self.embed_author_enabled = config_data.get('embed_author_enabled', False)
+            self.embed_enabled = config.get('embed_enabled', False)
+            self.embed_title = config.get('embed_title', "Bienvenue !")
+            self.embed_description = config.get('embed_description')
+            self.embed_color = config.get('embed_color', 0x5865F2)
+            self.embed_footer = config.get('embed_footer')
+            self.embed_image_url = config.get('embed_image_url')
+            self.embed_thumbnail_enabled = config.get('embed_thumbnail_enabled', True)
+            self.embed_author_enabled = config.get('embed_author_enabled', False)
 
             # Module is always enabled if configured
             self.enabled = True
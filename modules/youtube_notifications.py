@@ -4,13 +4,13 @@ Utilise WebSub (PubSubHubbub) pour recevoir des notifications instantanées
 """
 
 import discord
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Mapping, Tuple
 import logging
 import aiohttp
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 
-from modules.module_manager import ModuleBase
+from modules.module_manager import ModuleBase, freeze_config
 
 logger = logging.getLogger('moddy.modules.youtube_notifications')
 
@@ -29,20 +29,22 @@ class YoutubeNotificationsModule(ModuleBase):
     # WebSub Hub URL for YouTube
     WEBSUB_HUB = "https://pubsubhubbub.appspot.com/"
 
+    __slots__ = ('subscriptions',)
+
     def __init__(self, bot, guild_id: int):
         super().__init__(bot, guild_id)
 
-        # List of channel subscriptions
-        # Format: [{"channel_id": "...", "channel_username": "...", "discord_channel_id": ..., "message": "...", "roles": [...]}]
-        self.subscriptions: List[Dict[str, Any]] = []
+        # Channel subscriptions (frozen config)
+        # Format: ({"channel_id": "...", "channel_username": "...", "discord_channel_id": ..., "message": "...", "roles": (...)},)
+        self.subscriptions: Tuple[Mapping[str, Any], ...] = ()
 
     async def load_config(self, config_data: Dict[str, Any]) -> bool:
         """Charge la configuration depuis la DB"""
         try:
-            self.config = config_data
+            self.config = config = freeze_config(config_data)
 
             # Load subscriptions
-            self.subscriptions = config_data.get('subscriptions', [])
+            self.subscriptions = config.get('subscriptions', ())
 
             # Module is enabled if there are subscriptions
             self.enabled = len(self.subscriptions) > 0
@@ -4,7 +4,7 @@ Basé sur /documentation/internal-api.md
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Optional, Literal, Dict
 from enum import Enum
 
 
@@ -65,11 +65,49 @@ class InternalUpdateRoleResponse(BaseModel):
     guild_id: Optional[str] = Field(None, description="ID du serveur Discord")
 
 
+class InternalNotifyBatchRequest(BaseModel):
+    """Requête pour notifier plusieurs utilisateurs en un seul appel"""
+    items: list[InternalNotifyUserRequest] = Field(..., min_length=1, max_length=500, description="Notifications à traiter (500 max)")
+
+
+class InternalNotifyBatchItemResult(InternalNotifyUserResponse):
+    """Résultat d'une notification dans un batch"""
+    discord_id: str = Field(..., description="Discord ID de l'utilisateur")
+
+
+class InternalNotifyBatchResponse(BaseModel):
+    """Réponse après notification de plusieurs utilisateurs"""
+    success: bool = Field(..., description="Si toutes les notifications ont réussi")
+    processed: int = Field(..., description="Nombre d'éléments traités")
+    failed: int = Field(..., description="Nombre d'éléments en échec")
+    results: list[InternalNotifyBatchItemResult] = Field(..., description="Résultat par élément (même ordre que la requête)")
+
+
+class InternalUpdateRoleBatchRequest(BaseModel):
+    """Requête pour mettre à jour les rôles de plusieurs utilisateurs en un seul appel"""
+    items: list[InternalUpdateRoleRequest] = Field(..., min_length=1, max_length=500, description="Mises à jour à traiter (500 max)")
+
+
+class InternalUpdateRoleBatchItemResult(InternalUpdateRoleResponse):
+    """Résultat d'une mise à jour de rôles dans un batch"""
+    discord_id: str = Field(..., description="Discord ID de l'utilisateur")
+
+
+class InternalUpdateRoleBatchResponse(BaseModel):
+    """Réponse après mise à jour des rôles de plusieurs utilisateurs"""
+    success: bool = Field(..., description="Si toutes les mises à jour ont réussi")
+    processed: int = Field(..., description="Nombre d'éléments traités")
+    failed: int = Field(..., description="Nombre d'éléments en échec")
+    guild_id: Optional[str] = Field(None, description="ID du serveur Discord")
+    results: list[InternalUpdateRoleBatchItemResult] = Field(..., description="Résultat par élément (même ordre que la requête)")
+
+
 class InternalHealthResponse(BaseModel):
     """Réponse du health check"""
     status: Literal["healthy", "unhealthy"] = Field(..., description="État de santé du service")
     service: str = Field(..., description="Nom du service")
     version: Optional[str] = Field(None, description="Version du service")
+    loop_lag_ms: Optional[Dict[str, float]] = Field(None, description="Latence de la boucle asyncio (p50, p95, p99, max)")
 
 
 # =====================
@@ -19,9 +19,6 @@ from utils.moderation_cases import (
     CaseType, SanctionType, CaseStatus, EntityType, ModerationCase,
     get_sanction_name, get_sanction_emoji
 )
-from utils.case_management_views import (
-    CaseSelectionView, EditCaseModal, AddCaseNoteModal, CloseCaseModal
-)
 
 logger = logging.getLogger('moddy.case_commands')
 
@@ -187,7 +184,8 @@ class CaseCommands(StaffCommandsCog):
                 await message.reply(view=view, mention_author=False)
                 return
 
-        # Show case selection view
+        # Show case selection view (UI module imported on first use)
+        from utils.case_management_views import CaseSelectionView
         selection_view = CaseSelectionView(
             bot=self.bot,
             staff_id=message.author.id,
@@ -450,6 +448,7 @@ class CaseCommands(StaffCommandsCog):
                 ephemeral=True
             )
 
+        from utils.case_management_views import EditCaseModal
         modal = EditCaseModal(
             case_id=case.case_id,
             current_reason=case.reason,
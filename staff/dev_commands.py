@@ -181,6 +181,10 @@ class DeveloperCommands(StaffCommandsCog):
             await self.handle_shutdown_command(message, args)
         elif command_name == "stats":
             await self.handle_stats_command(message, args)
+        elif command_name == "slow":
+            await self.handle_slow_command(message, args)
+        elif command_name == "ratelimits":
+            await self.handle_ratelimits_command(message, args)
         elif command_name == "sql":
             await self.handle_sql_command(message, args)
         elif command_name == "jsk":
@@ -357,6 +361,41 @@ class DeveloperCommands(StaffCommandsCog):
             'value': f"**Loaded:** {len(self.bot.extensions)}\n**Cogs:** {len(self.bot.cogs)}"
         })
 
+        # Startup breakdown
+        pipeline = getattr(self.bot, 'startup_pipeline', None)
+        if pipeline and pipeline.phases:
+            fields.append({
+                'name': "Startup",
+                'value': pipeline.format_breakdown()[:1024]
+            })
+
+        # Event loop lag
+        loop_watchdog = getattr(self.bot, 'loop_watchdog', None)
+        if loop_watchdog:
+            from utils.performance import ACTIVE as performance
+            fields.append({
+                'name': "Event Loop",
+                'value': (
+                    f"**Profile:** {performance['profile']} ({performance['loop']}, {performance['json']})\n"
+                    f"{loop_watchdog.format_summary()}"
+                )[:1024]
+            })
+
+        # Member / message caches (memory profile)
+        from utils.memory_budget import memory_report, format_memory_report
+        fields.append({
+            'name': "Caches",
+            'value': format_memory_report(memory_report(self.bot))[:1024]
+        })
+
+        # Gateway shards
+        gateway_metrics = getattr(self.bot, 'gateway_metrics', None)
+        if gateway_metrics:
+            fields.append({
+                'name': f"Shards ({self.bot.shard_count or 1})",
+                'value': gateway_metrics.format_summary()[:1024] or "n/a"
+            })
+
         view = create_info_message(
             f"{EMOJIS['info']} MODDY Statistics",
             "Statistiques actuelles du bot",
@@ -366,6 +405,91 @@ class DeveloperCommands(StaffCommandsCog):
 
         await self.reply_with_tracking(message, view)
 
+    async def handle_slow_command(self, message: discord.Message, args: str):
+        """
+        Handle d.slow command - Show the slowest commands and interactions
+        Usage: <@1373916203814490194> d.slow
+        """
+        # Log the command
+        if staff_logger:
+            await staff_logger.log_command("d", "slow", message.author)
+
+        timings = self.bot.interaction_timings
+        if not timings.stats:
+            view = create_info_message("Slow Interactions", "No interaction recorded since startup.")
+            await self.reply_with_tracking(message, view)
+            return
+
+        fields = [
+            {
+                'name': f"{EMOJIS['time']} Worst commands (p99)",
+                'value': timings.format_worst()[:1024]
+            },
+            {
+                'name': f"{EMOJIS['history']} Slowest recent invocations",
+                'value': timings.format_slowest()[:1024]
+            }
+        ]
+
+        view = create_info_message(
+            f"{EMOJIS['info']} Slow Interactions",
+            f"Handler time and time to first response (TTFR) over the last {timings.samples} calls per command",
+            fields=fields,
+            footer=f"Requested by {message.author}"
+        )
+
+        await self.reply_with_tracking(message, view)
+
+    async def handle_ratelimits_command(self, message: discord.Message, args: str):
+        """
+        Handle d.ratelimits command - Show Discord REST rate limit waits and 429s
+        Usage: <@1373916203814490194> d.ratelimits
+        """
+        # Log the command
+        if staff_logger:
+            await staff_logger.log_command("d", "ratelimits", message.author)
+
+        telemetry = self.bot.ratelimit_telemetry
+        totals = telemetry.totals()
+        hits = ", ".join(f"{scope}: {count}" for scope, count in sorted(totals['hits'].items())) or "none"
+
+        fields = [
+            {
+                'name': f"{EMOJIS['web']} Since startup",
+                'value': (
+                    f"**Requests:** {totals['requests']:,}\n"
+                    f"**Bucket waits:** {totals['waits']:,} ({totals['wait_seconds']:.1f}s)\n"
+                    f"**429s:** {hits}"
+                )
+            },
+            {
+                'name': f"{EMOJIS['code']} By module",
+                'value': telemetry.format_summary('subsystem')[:1024] or "No request yet"
+            },
+            {
+                'name': f"{EMOJIS['commands']} By route",
+                'value': telemetry.format_summary('route')[:1024] or "No request yet"
+            }
+        ]
+        if telemetry.recent_hits:
+            fields.append({
+                'name': f"{EMOJIS['history']} Recent 429s",
+                'value': telemetry.format_recent_hits()[:1024]
+            })
+        fields.append({
+            'name': f"{EMOJIS['time']} Scheduler (by priority)",
+            'value': self.bot.request_scheduler.format_stats()[:1024]
+        })
+
+        view = create_info_message(
+            f"{EMOJIS['info']} Discord Rate Limits",
+            "REST requests, rate limit bucket waits and 429 responses, by calling module and route",
+            fields=fields,
+            footer=f"Requested by {message.author}"
+        )
+
+        await self.reply_with_tracking(message, view)
+
     async def handle_sql_command(self, message: discord.Message, args: str):
         """
         Handle d.sql command - Execute SQL query
@@ -15,6 +15,7 @@ from config import COLORS
 from utils.components_v2 import create_error_message, create_success_message, create_info_message, create_warning_message, EMOJIS
 from utils.staff_logger import staff_logger
 from staff.base import StaffCommandsCog
+from modules.interserver import delete_relayed_messages
 
 logger = logging.getLogger('moddy.moderator_commands')
 
@@ -175,28 +176,8 @@ class ModeratorCommands(StaffCommandsCog):
             await message.reply(view=view, mention_author=False)
             return
 
-        # Delete all relayed messages
-        deleted_count = 0
-        relayed_messages = msg_data.get('relayed_messages', [])
-        for relayed in relayed_messages:
-            try:
-                guild = self.bot.get_guild(relayed['guild_id'])
-                if not guild:
-                    continue
-
-                channel = guild.get_channel(relayed['channel_id'])
-                if not channel:
-                    continue
-
-                # Delete the message
-                msg = await channel.fetch_message(relayed['message_id'])
-                await msg.delete()
-                deleted_count += 1
-            except discord.NotFound:
-                # Message already deleted
-                pass
-            except Exception as e:
-                logger.error(f"Error deleting relayed message {relayed['message_id']}: {e}")
+        # Delete all relayed messages (through the channel webhooks, whatever the cluster of their server)
+        deleted_count = await delete_relayed_messages(self.bot, msg_data.get('relayed_messages', []))
 
         # Delete original message if possible
         try:
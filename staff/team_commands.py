@@ -501,9 +501,16 @@ class TeamCommands(StaffCommandsCog):
                 'value': f"*...and {len(mutual_guilds) - 10} more servers*"
             })
 
+        description = f"Found **{len(mutual_guilds)}** mutual server(s) with **{user}**"
+
+        # Without startup chunking, only the cached members are known
+        profile = getattr(self.bot, 'memory_profile', None)
+        if profile and not profile.chunk_guilds_at_startup:
+            description += f"\n-# Partial member cache (memory profile `{profile.name}`): some servers may be missing"
+
         view = create_info_message(
             f"Mutual Servers - {user}",
-            f"Found **{len(mutual_guilds)}** mutual server(s) with **{user}**",
+            description,
             fields=fields
         )
 
@@ -0,0 +1,5 @@
+import os
+
+# config.validate_config() quitte le process sans token : les modules importés par
+# les tests l'appellent à l'import, un token factice suffit (aucune connexion Discord)
+os.environ.setdefault("DISCORD_TOKEN", "test-token")
@@ -0,0 +1,29 @@
+from utils.cluster import aggregate_health, elect_singleton_cluster, shard_ranges
+
+
+def test_shard_ranges_are_contiguous_and_complete():
+    ranges = shard_ranges(10, 3)
+    assert ranges == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    # Never more clusters than shards
+    assert shard_ranges(2, 4) == [[0], [1]]
+
+
+def test_singleton_follows_main_guild_shard():
+    ranges = shard_ranges(8, 4)
+    guild_id = (5 << 22) | 7  # shard 5 on 8 shards
+    assert elect_singleton_cluster(ranges, 8, guild_id) == 2
+    assert elect_singleton_cluster(ranges, 8, None) == 0
+
+
+def test_aggregate_health():
+    health = aggregate_health({
+        'cluster-0': {'ready': True, 'shard_ids': [0, 1], 'guilds': 10, 'max_latency_ms': 40.0, 'singleton': True},
+        'cluster-1': {'ready': False, 'shard_ids': [2, 3], 'guilds': 3, 'max_latency_ms': 90.0},
+        'cluster-2': None,
+    })
+    assert health['ready'] == 1
+    assert health['down'] == ['cluster-2']
+    assert health['shards'] == 4
+    assert health['guilds'] == 13
+    assert health['max_latency_ms'] == 90.0
+    assert health['singleton'] == 'cluster-0'
@@ -0,0 +1,80 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cogs.youtube_websub as youtube_websub
+from cogs.reminder import Reminder
+from cogs.youtube_websub import YouTubeWebSubHandler
+
+FEED = """<feed xmlns="http://www.w3.org/2005/Atom" xmlns:yt="http://www.youtube.com/xml/schemas/2015">
+<entry><yt:videoId>abc</yt:videoId><yt:channelId>UC123</yt:channelId></entry></feed>"""
+
+
+class FakeBus:
+    """Stands for the shared cache pub/sub: delivers to the other cluster only"""
+
+    def __init__(self):
+        self.handlers = {}
+        self.published = []
+
+    async def subscribe(self, topic, handler):
+        self.handlers[topic] = handler
+
+    async def publish(self, topic, data):
+        self.published.append((topic, data))
+        return True
+
+
+def test_youtube_notifications_reach_every_cluster(monkeypatch):
+    bus = FakeBus()
+    monkeypatch.setattr(youtube_websub, 'shared_cache', bus)
+    monkeypatch.setattr(youtube_websub, 'CLUSTER_COUNT', 2)
+    notified = []
+
+    def cluster(name, singleton):
+        bot = SimpleNamespace(runs_singleton_tasks=singleton, is_ready=lambda: True)
+        handler = YouTubeWebSubHandler(bot)
+
+        async def notify(channel_id, feed_xml):
+            notified.append((name, channel_id))
+
+        async def start_webhook_server():
+            pass
+
+        handler.notify_subscribed_guilds = notify
+        handler.start_webhook_server = start_webhook_server
+        return handler
+
+    singleton, other = cluster('singleton', True), cluster('other', False)
+
+    async def run():
+        await singleton.cog_load()
+        await other.cog_load()
+        await singleton.process_notification(FEED)
+        # Redis delivers the message to the other cluster
+        for topic, data in bus.published:
+            await bus.handlers[topic](data)
+
+    asyncio.run(run())
+
+    assert notified == [('singleton', 'UC123'), ('other', 'UC123')]
+
+
+def test_reminders_are_sent_by_the_process_that_owns_them():
+    # This process owns the guilds of shards 0 and 1 out of 4, and is not the singleton
+    bot = SimpleNamespace(runs_singleton_tasks=False, owns_guild_id=lambda guild_id: (guild_id >> 22) % 4 in (0, 1))
+    cog = SimpleNamespace(bot=bot)
+
+    def owns(**reminder):
+        return Reminder.owns_reminder(cog, reminder)
+
+    assert owns(send_in_channel=True, channel_id=10, guild_id=5 << 22)
+    assert not owns(send_in_channel=True, channel_id=10, guild_id=6 << 22)
+    # DM reminders (or without a channel) belong to the singleton
+    assert not owns(send_in_channel=False, channel_id=None, guild_id=5 << 22)
+    bot.runs_singleton_tasks = True
+    assert owns(send_in_channel=False, channel_id=None, guild_id=None)
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+from utils.gateway_metrics import GatewayMetrics, RateWindow
+
+
+def _bot(shard_count=4):
+    return SimpleNamespace(shard_count=shard_count, guilds=[], latency=0.05)
+
+
+def test_rate_window_expires_old_buckets():
+    window = RateWindow(window=10)
+    window.add(20, now=100)
+    assert window.rate(now=105) == 2.0
+    assert window.rate(now=111) == 0.0
+
+
+def test_shard_for_uses_guild_id():
+    metrics = GatewayMetrics(_bot())
+    guild_id = (123 << 22) | 42
+    assert metrics.shard_for({'guild_id': str(guild_id)}) == 123 % 4
+    assert metrics.shard_for({'id': guild_id, 'unavailable': False}) == 123 % 4
+    # Events without guild go to shard 0
+    assert metrics.shard_for({'user': {}}) == 0
+
+
+def test_record_counts_per_shard():
+    metrics = GatewayMetrics(_bot())
+    metrics.record('MESSAGE_CREATE', {'guild_id': 1 << 22})
+    metrics.record('MESSAGE_CREATE', {'guild_id': 1 << 22})
+    metrics.record('TYPING_START', None)
+    assert metrics.totals[1]['MESSAGE_CREATE'] == 2
+    assert metrics.events_by_type() == {'MESSAGE_CREATE': 2, 'TYPING_START': 1}
+    assert metrics.shard_summary()[0]['shard_id'] == 0
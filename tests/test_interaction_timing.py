@@ -0,0 +1,95 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.interaction_timing import (
+    FIRST_RESPONSE_KEY, InteractionTimings, _wrap_response, custom_id_prefix, start_timing, timed_stage
+)
+from utils.metrics import metrics
+
+
+class FakeInteraction:
+    def __init__(self, client=None):
+        self.extras = {}
+        self.client = client
+        self.id = 1
+        self.user = SimpleNamespace(id=42)
+        self.data = {}
+
+
+def test_custom_id_prefix_strips_ids():
+    assert custom_id_prefix("save_perms_1234") == "save_perms"
+    assert custom_id_prefix("reminder:delete:987:654") == "reminder:delete"
+    assert custom_id_prefix("0123456789abcdef0123456789abcdef") == "*"
+    assert custom_id_prefix("settings_toggle") == "settings_toggle"
+    assert custom_id_prefix(None) == "*"
+
+
+def test_record_tracks_first_response_stages_and_p99():
+    timings = InteractionTimings(bot=None)
+
+    async def fake_send(response, content):
+        await asyncio.sleep(0.01)
+
+    send_message = _wrap_response(fake_send)
+
+    async def handle(interaction, delay):
+        start_timing(interaction)
+        async with timed_stage(interaction, 'blacklist_check'):
+            pass
+        await send_message(SimpleNamespace(_parent=interaction), "loading")
+        async with timed_stage(interaction, 'deepl_translate'):
+            await asyncio.sleep(delay)
+        timings.record(interaction, 'command', 'weather' if delay else 'ping')
+        # Recorded once, even if completion and error both fire
+        timings.record(interaction, 'command', 'weather' if delay else 'ping', 'error')
+
+    async def run():
+        for _ in range(3):
+            await handle(FakeInteraction(), 0)
+        await handle(FakeInteraction(), 0.05)
+
+    asyncio.run(run())
+
+    worst = timings.worst()
+    assert [row['name'] for row in worst] == ['weather', 'ping']
+    assert worst[1]['count'] == 3 and worst[1]['errors'] == 0
+    assert worst[0]['p99'] >= 0.05
+    assert 0.01 <= worst[0]['ttfr_p99'] < worst[0]['p99']
+
+    [slowest] = timings.slowest_recent(1)
+    assert [name for name, _ in slowest['stages']] == ['blacklist_check', 'deepl_translate']
+    assert "deepl_translate" in timings.format_slowest()
+    assert metrics.interaction_seconds.labels('command', 'weather', 'first_response').count == 1
+
+
+def test_component_callbacks_are_timed_by_view_and_prefix():
+    InteractionTimings.install()
+    assert getattr(discord.InteractionResponse.send_message, '_moddy_timed', False)
+
+    client = SimpleNamespace(interaction_timings=InteractionTimings(bot=None))
+
+    class ConfirmView(discord.ui.View):
+        @discord.ui.button(label="Confirm", custom_id="confirm_delete_1234")
+        async def confirm(self, interaction, button):
+            interaction.extras[FIRST_RESPONSE_KEY] = 0.0
+            await asyncio.sleep(0.01)
+
+    async def run():
+        view = ConfirmView()
+        interaction = FakeInteraction(client)
+        await view._scheduled_task(view.confirm, interaction)
+        return interaction
+
+    interaction = asyncio.run(run())
+
+    [row] = client.interaction_timings.worst()
+    assert (row['kind'], row['name']) == ('component', 'ConfirmView:confirm_delete')
+    assert row['p99'] >= 0.01
+    assert 'timing_started' in interaction.extras
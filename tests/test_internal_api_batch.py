@@ -0,0 +1,192 @@
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+import httpx
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from internal_api.middleware import auth
+from internal_api.server import app, set_bot
+
+SECRET = "batch-test-secret"
+GUILD_ID = 1394001780148535387
+PREMIUM_ROLE_ID = 1424149819185827954
+MISSING_USER_ID = 999
+
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+
+    async def send(self, message):
+        await asyncio.sleep(0.01)
+
+
+class FakeMember:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.roles = set()
+
+    async def add_roles(self, role, reason=None):
+        self.roles.add(role.id)
+
+    async def remove_roles(self, role, reason=None):
+        self.roles.discard(role.id)
+
+
+class FakeGuild:
+    def __init__(self, cached, remote):
+        self.id = GUILD_ID
+        self.cached = {user_id: FakeMember(user_id) for user_id in cached}
+        self.remote = {user_id: FakeMember(user_id) for user_id in remote}
+        self.queries = []
+        self.fetches = 0
+
+    def get_member(self, user_id):
+        return self.cached.get(user_id)
+
+    def get_role(self, role_id):
+        return SimpleNamespace(id=role_id, name=f"role-{role_id}") if role_id == PREMIUM_ROLE_ID else None
+
+    async def query_members(self, user_ids, limit, cache):
+        self.queries.append(list(user_ids))
+        return [self.remote[user_id] for user_id in user_ids if user_id in self.remote]
+
+    async def fetch_member(self, user_id):
+        self.fetches += 1
+        raise AssertionError("fetch_member should not be needed")
+
+
+class FakeBot:
+    def __init__(self, guild=None):
+        self.guild = guild
+        self.fetches = []
+        self.writes = 0
+        self.db = SimpleNamespace(set_attribute=self._set_attribute)
+
+    async def _set_attribute(self, *args):
+        self.writes += 1
+
+    def get_user(self, user_id):
+        return None
+
+    def get_guild(self, guild_id):
+        return self.guild if guild_id == GUILD_ID else None
+
+    async def fetch_user(self, user_id):
+        self.fetches.append(user_id)
+        await asyncio.sleep(0.01)
+        if user_id == MISSING_USER_ID:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown User")
+        return FakeUser(user_id)
+
+
+def _post(path, json, key=None):
+    headers = {'Authorization': f"Bearer {SECRET}"}
+    if key:
+        headers['Idempotency-Key'] = key
+
+    async def request(client):
+        return await client.post(path, json=json, headers=headers)
+    return request
+
+
+async def _run(*requests):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bot") as client:
+        return await asyncio.gather(*(request(client) for request in requests))
+
+
+def _notify(discord_id):
+    return {'discord_id': str(discord_id), 'action': 'subscription_created', 'plan': 'moddy_max'}
+
+
+def test_notify_batch_reports_each_item(monkeypatch):
+    monkeypatch.setattr(auth, "INTERNAL_API_SECRET", SECRET)
+    bot = FakeBot()
+    set_bot(bot)
+
+    [response] = asyncio.run(_run(_post("/internal/notify/batch", {
+        'items': [_notify(1), _notify(MISSING_USER_ID), _notify(3)]
+    })))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['success'] is False
+    assert (body['processed'], body['failed']) == (3, 1)
+    assert [result['discord_id'] for result in body['results']] == ['1', str(MISSING_USER_ID), '3']
+    assert [result['notification_sent'] for result in body['results']] == [True, False, True]
+    assert bot.writes == 2
+
+
+def test_idempotency_key_replays_first_response(monkeypatch):
+    monkeypatch.setattr(auth, "INTERNAL_API_SECRET", SECRET)
+    bot = FakeBot()
+    set_bot(bot)
+    key = str(uuid.uuid4())
+
+    # Two concurrent retries, then a late one: a single notification is processed
+    first, second = asyncio.run(_run(
+        _post("/internal/notify", _notify(42), key),
+        _post("/internal/notify", _notify(42), key),
+    ))
+    [third] = asyncio.run(_run(_post("/internal/notify", _notify(42), key)))
+
+    assert bot.fetches == [42]
+    assert bot.writes == 1
+    assert first.json() == second.json() == third.json()
+    assert first.json()['notification_sent'] is True
+
+    # Without a key, every call is processed
+    asyncio.run(_run(_post("/internal/notify", _notify(42)), _post("/internal/notify", _notify(42))))
+    assert bot.fetches == [42, 42, 42]
+
+
+def test_idempotency_key_rejects_a_different_payload(monkeypatch):
+    monkeypatch.setattr(auth, "INTERNAL_API_SECRET", SECRET)
+    bot = FakeBot()
+    set_bot(bot)
+    key = str(uuid.uuid4())
+
+    # Concurrent then late reuse of the key for another user: never replayed
+    first, concurrent = asyncio.run(_run(
+        _post("/internal/notify", _notify(42), key),
+        _post("/internal/notify", _notify(43), key),
+    ))
+    [late] = asyncio.run(_run(_post("/internal/notify", _notify(43), key)))
+
+    assert first.status_code == 200
+    assert concurrent.status_code == late.status_code == 422
+    assert bot.fetches == [42]
+
+
+def test_roles_batch_uses_cache_then_one_member_query(monkeypatch):
+    monkeypatch.setattr(auth, "INTERNAL_API_SECRET", SECRET)
+    monkeypatch.setenv("MODDY_GUILD_ID", str(GUILD_ID))
+    guild = FakeGuild(cached=[1, 2], remote=list(range(10, 160)))
+    set_bot(FakeBot(guild))
+
+    user_ids = [1, 2] + list(range(10, 160)) + [MISSING_USER_ID]
+    [response] = asyncio.run(_run(_post("/internal/roles/update/batch", {
+        'items': [
+            {'discord_id': str(user_id), 'plan': 'moddy_max', 'add_roles': [str(PREMIUM_ROLE_ID)]}
+            for user_id in user_ids
+        ]
+    })))
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body['processed'], body['failed']) == (len(user_ids), 1)
+    assert body['results'][-1]['message'] == f"Member {MISSING_USER_ID} not in guild"
+
+    # Cached members are not queried, the others are resolved 100 IDs at a time
+    assert [len(query) for query in guild.queries] == [100, 51]
+    assert 1 not in guild.queries[0]
+    assert guild.fetches == 0
+    assert PREMIUM_ROLE_ID in guild.cached[1].roles
+    assert PREMIUM_ROLE_ID in guild.remote[159].roles
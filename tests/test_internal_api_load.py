@@ -0,0 +1,112 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from internal_api.middleware import auth
+from internal_api.server import create_server, set_bot
+from utils.loop_watchdog import percentile
+
+SECRET = "load-test-secret"
+
+
+class FakeUser:
+    def __init__(self, bot, user_id):
+        self.bot = bot
+        self.id = user_id
+
+    async def send(self, message):
+        self.bot.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(0.02)
+        self.bot.sent.append(self.id)
+
+
+class FakeDatabase:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def set_attribute(self, *args):
+        self.bot.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(0.005)
+
+
+class FakeBot:
+    """Bot whose Discord/database calls record the loop they run on"""
+
+    def __init__(self):
+        self.loops = set()
+        self.sent = []
+        self.db = FakeDatabase(self)
+
+    def is_ready(self):
+        return True
+
+    def get_user(self, user_id):
+        return None
+
+    async def fetch_user(self, user_id):
+        self.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(0.01)
+        return FakeUser(self, user_id)
+
+
+def test_notify_load_runs_on_bot_loop_with_stable_latency(monkeypatch):
+    monkeypatch.setattr(auth, "INTERNAL_API_SECRET", SECRET)
+    bot = FakeBot()
+    set_bot(bot)
+
+    async def run():
+        server = create_server(0, host="127.0.0.1")
+        task = asyncio.create_task(server.serve())
+        while not server.started:
+            assert not task.done()
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/internal/notify"
+
+        latencies = []
+
+        async def notify(session, index):
+            start = time.perf_counter()
+            async with session.post(url, json={
+                'discord_id': str(100000 + index),
+                'action': 'subscription_created',
+                'plan': 'moddy_max'
+            }, headers={'Authorization': f"Bearer {SECRET}"}) as response:
+                body = await response.json()
+            latencies.append(time.perf_counter() - start)
+            return response.status, body
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                # Warm-up, then 4 waves of 100 concurrent notifications
+                await notify(session, -1)
+                latencies.clear()
+                waves = []
+                for wave in range(4):
+                    results = await asyncio.gather(*(notify(session, wave * 100 + i) for i in range(100)))
+                    assert all(status == 200 and body['notification_sent'] for status, body in results)
+                    waves.append(sorted(latencies[-100:]))
+        finally:
+            server.should_exit = True
+            await asyncio.wait_for(task, 5)
+
+        return asyncio.get_running_loop(), waves
+
+    loop, waves = asyncio.run(run())
+
+    # Every Discord / database call ran on the loop serving the API
+    assert bot.loops == {loop}
+    assert len(bot.sent) == 401
+
+    p99s = [percentile(wave, 99) for wave in waves]
+    # 100 concurrent requests of ~35ms each are served concurrently, not one by one
+    assert max(p99s) < 1.0
+    # Latency does not grow from one wave to the next
+    assert p99s[-1] < p99s[0] * 3 + 0.1
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import modules.interserver as interserver
+from modules.interserver import InterServerBanCache, InterServerModule, InterServerTarget
+
+GUILD_ID = 1 << 22
+BANNED_ID = 1373916203814490194
+
+
+class FakeGuild:
+    """Stands for the REST side of a guild: its ban list"""
+
+    def __init__(self, banned, forbidden=False):
+        self.id = GUILD_ID
+        self.name = "Guild"
+        self.banned = list(banned)
+        self.forbidden = forbidden
+        self.ban_loads = 0
+        self.fetch_bans = 0
+
+    def get_member(self, user_id):
+        return None
+
+    async def bans(self, limit=1000):
+        self.ban_loads += 1
+        if self.forbidden:
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Permissions")
+        for user_id in self.banned[:limit]:
+            await asyncio.sleep(0)
+            yield SimpleNamespace(user=SimpleNamespace(id=user_id))
+
+    async def fetch_ban(self, user):
+        self.fetch_bans += 1
+        if user.id not in self.banned:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Ban")
+        return SimpleNamespace(user=user)
+
+
+def test_bans_are_loaded_once_and_follow_ban_events():
+    guild = FakeGuild([BANNED_ID, 2, 3])
+    cache = InterServerBanCache(limit=100)
+
+    async def run():
+        # Concurrent relays share one load; a ban received meanwhile is kept
+        first = asyncio.create_task(cache.is_banned(guild, BANNED_ID))
+        second = asyncio.create_task(cache.is_banned(guild, 4))
+        await asyncio.sleep(0)
+        cache.on_ban(GUILD_ID, 5, True)
+        assert await first is True and await second is False
+        assert await cache.is_banned(guild, 5) is True
+
+        cache.on_ban(GUILD_ID, BANNED_ID, False)
+        assert await cache.is_banned(guild, BANNED_ID) is False
+
+        # Events may have been missed during an outage: reloaded on the next relay
+        cache.forget(GUILD_ID)
+        assert await cache.is_banned(guild, BANNED_ID) is True
+
+    asyncio.run(run())
+
+    assert guild.ban_loads == 2 and guild.fetch_bans == 0
+
+
+def test_truncated_or_forbidden_ban_lists():
+    cache = InterServerBanCache(limit=2)
+    large = FakeGuild([1, 2, 3])
+
+    async def run():
+        # More bans than the limit: users outside the cache are unknown
+        assert await cache.is_banned(large, 1) is True
+        assert await cache.is_banned(large, 3) is None
+
+        # Without ban_members, the empty cache is reloaded once the bot's permissions change
+        forbidden = FakeGuild([1], forbidden=True)
+        other = InterServerBanCache()
+        assert await other.is_banned(forbidden, 1) is False
+        other.on_permissions_changed(GUILD_ID)
+        forbidden.forbidden = False
+        assert await other.is_banned(forbidden, 1) is True
+
+    asyncio.run(run())
+
+
+def test_relay_skips_banned_authors_without_rest_checks(monkeypatch):
+    monkeypatch.setattr(interserver, 'interserver_bans', InterServerBanCache())
+    guild = FakeGuild([BANNED_ID])
+    sent = []
+
+    async def get_webhook(self, channel):
+        async def send(**kwargs):
+            sent.append(kwargs['content'])
+            return SimpleNamespace(id=len(sent))
+        return SimpleNamespace(id=1, send=send)
+
+    monkeypatch.setattr(InterServerModule, '_get_or_create_webhook', get_webhook)
+
+    module = InterServerModule(SimpleNamespace(db=None, member_chunker=None), 2 << 22)
+    target = InterServerTarget(GUILD_ID, SimpleNamespace(id=GUILD_ID + 10, guild=guild), 'english', True, True, False)
+
+    async def run():
+        for author_id, content in ((BANNED_ID, "banned"), (4, "allowed"), (BANNED_ID, "banned again")):
+            await module._send_to_target(SimpleNamespace(author_id=author_id), target, content, {}, False)
+
+    asyncio.run(run())
+
+    assert sent == ["allowed"]
+    assert guild.ban_loads == 1 and guild.fetch_bans == 0
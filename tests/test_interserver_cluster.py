@@ -0,0 +1,150 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import modules.interserver as interserver
+from modules.interserver import InterServerClusterRelay, InterServerModule, InterServerTarget, RelaySource
+from utils import json_codec as json
+from utils.metrics import BotMetrics
+
+ORIGIN_ID = 1 << 22
+REMOTE_ID = 2 << 22
+
+
+class FakeBus:
+    """Stands for the shared cache pub/sub between two clusters"""
+
+    def __init__(self, is_shared=True):
+        self.is_shared = is_shared
+        self.handlers = {}
+
+    async def subscribe(self, topic, handler):
+        self.handlers[topic] = handler
+
+    async def publish(self, topic, data):
+        # Through JSON, like Redis
+        await self.handlers[topic](json.loads(json.dumps(data)))
+        return True
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.relayed = []
+        self.webhooks = {}
+
+    async def get_interserver_message_by_original(self, message_id):
+        return None
+
+    async def add_relayed_message(self, moddy_id, guild_id, channel_id, message_id):
+        self.relayed.append((moddy_id, guild_id))
+
+    async def get_interserver_webhook(self, channel_id):
+        return self.webhooks.get(channel_id)
+
+
+async def _no_bans(limit=None):
+    return
+    yield
+
+
+def _source():
+    return RelaySource(
+        guild_id=ORIGIN_ID, guild_name="Origin", channel_id=ORIGIN_ID + 10,
+        author_id=1, author_name="Alice", author_avatar_url="https://cdn/alice.png",
+        attachments=(("cat.png", "https://cdn/cat.png"),), embeds=(discord.Embed(title="Hi"),), reply_to=42,
+    )
+
+
+def test_relay_source_survives_the_bus():
+    source = _source()
+    assert RelaySource.from_payload(json.loads(json.dumps(source.to_payload()))).embeds[0].title == "Hi"
+    assert RelaySource.from_payload(source.to_payload()).attachments == source.attachments
+
+
+def test_other_clusters_relay_to_their_own_servers(monkeypatch):
+    bus = FakeBus()
+    monkeypatch.setattr(interserver, 'shared_cache', bus)
+    monkeypatch.setattr(interserver, 'interserver_bans', interserver.InterServerBanCache())
+    monkeypatch.setattr(interserver, 'metrics', BotMetrics())
+
+    # The remote cluster only knows its own guild
+    guild = SimpleNamespace(id=REMOTE_ID, name="Remote", get_member=lambda user_id: None, bans=_no_bans)
+    target = InterServerTarget(REMOTE_ID, SimpleNamespace(id=REMOTE_ID + 10, guild=guild), 'english', True, True, False)
+
+    async def prime(bot):
+        pass
+
+    monkeypatch.setattr(interserver, 'interserver_registry',
+                        SimpleNamespace(prime=prime, targets=lambda interserver_type: (target,) if interserver_type == 'english' else ()))
+    sent = []
+
+    async def get_webhook(self, channel):
+        async def send(**kwargs):
+            sent.append((channel.id, kwargs))
+            return SimpleNamespace(id=len(sent))
+        return SimpleNamespace(id=1, send=send)
+
+    monkeypatch.setattr(InterServerModule, '_get_or_create_webhook', get_webhook)
+
+    remote_bot = SimpleNamespace(db=FakeDatabase(), member_chunker=None, is_ready=lambda: True)
+    origin, remote = InterServerClusterRelay(cluster_count=2), InterServerClusterRelay(cluster_count=2)
+
+    async def run():
+        await remote.start(remote_bot)
+        await origin.publish(_source(), 'english', "ABCDEF", "hello", False)
+        await origin.publish(_source(), 'french', "GHIJKL", "bonjour", False)
+
+    asyncio.run(run())
+
+    assert [channel_id for channel_id, _ in sent] == [REMOTE_ID + 10]
+    kwargs = sent[0][1]
+    assert kwargs['username'] == "Alice — Origin" and kwargs['embeds'][0].title == "Hi"
+    assert kwargs["content"] == "hello\n\n**Attachments:** [cat.png](https://cdn/cat.png)\n-# ID: `ABCDEF`"
+    assert remote_bot.db.relayed == [("ABCDEF", REMOTE_ID)]
+
+
+def test_cluster_mode_without_redis_refuses_interserver(monkeypatch):
+    monkeypatch.setattr(interserver, 'shared_cache', FakeBus(is_shared=False))
+    assert InterServerClusterRelay(cluster_count=1).available
+    assert not InterServerClusterRelay(cluster_count=3).available
+
+
+def test_relayed_copies_are_deleted_through_stored_webhooks(monkeypatch):
+    monkeypatch.setattr(interserver, 'interserver_webhooks', interserver.InterServerWebhookCache())
+    db = FakeDatabase()
+    # Channel 30 is on another cluster; channel 40's copy was sent by a replaced webhook
+    db.webhooks = {30: (300, "token-30"), 40: (400, "token-40")}
+    deleted = []
+
+    async def delete_message(webhook, message_id):
+        if webhook.id == 400:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+        deleted.append(('webhook', message_id))
+
+    monkeypatch.setattr(discord.Webhook, 'delete_message', delete_message)
+
+    async def fetch_message(message_id):
+        async def delete():
+            deleted.append(('channel', message_id))
+        return SimpleNamespace(delete=delete)
+
+    local_channel = SimpleNamespace(id=40, fetch_message=fetch_message)
+    bot = SimpleNamespace(db=db, _connection=None, http=SimpleNamespace(_HTTPClient__session=object()),
+                          get_channel={40: local_channel}.get)
+    relayed = [
+        {'guild_id': 3, 'channel_id': 30, 'message_id': 31},
+        {'guild_id': 4, 'channel_id': 40, 'message_id': 41},
+        # Unknown channel on another cluster: nothing to do
+        {'guild_id': 5, 'channel_id': 50, 'message_id': 51},
+    ]
+
+    count = asyncio.run(interserver.delete_relayed_messages(bot, relayed))
+
+    assert count == 2
+    assert deleted == [('webhook', 31), ('channel', 41)]
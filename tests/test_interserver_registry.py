@@ -0,0 +1,159 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import modules.interserver as interserver
+from modules.interserver import InterServerModule, InterServerRegistry
+from modules.module_manager import ModuleManager
+
+BOT_ID = 1373916203814490194
+BOT_PERMISSIONS = discord.Permissions(view_channel=True, send_messages=True, manage_webhooks=True)
+
+
+def _guild(state, guild_id):
+    role = {'id': guild_id + 1, 'name': 'Moddy', 'permissions': str(BOT_PERMISSIONS.value), 'position': 1,
+            'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}
+    everyone = dict(role, id=guild_id, name='@everyone', permissions='0', position=0)
+    return discord.Guild(data={
+        'id': guild_id, 'name': f"Guild {guild_id}", 'owner_id': 1, 'member_count': 1,
+        'roles': [everyone, role],
+        'channels': [{'id': guild_id + 10, 'type': 0, 'name': 'interserver', 'position': 0, 'permission_overwrites': []}],
+        'members': [{'user': {'id': BOT_ID, 'username': 'Moddy', 'discriminator': '0', 'avatar': None, 'bot': True},
+                     'roles': [str(guild_id + 1)], 'joined_at': None, 'deaf': False, 'mute': False, 'flags': 0}],
+    }, state=state)
+
+
+class FakeDatabase:
+    def __init__(self, guild_ids):
+        self.guild_ids = guild_ids
+        self.queries = 0
+
+    async def get_guilds_with_module(self, module_id):
+        self.queries += 1
+        return self.guild_ids
+
+    async def delete_interserver_webhook(self, channel_id, webhook_id=None):
+        pass
+
+
+def test_registry_follows_modules_channels_and_bot_permissions(monkeypatch):
+    registry = InterServerRegistry()
+    monkeypatch.setattr(interserver, 'interserver_registry', registry)
+
+    client = discord.Client(intents=discord.Intents.default())
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data={'id': BOT_ID, 'username': 'Moddy', 'discriminator': '0', 'avatar': None})
+    guilds = {guild_id: _guild(state, guild_id) for guild_id in (1 << 22, 2 << 22, 3 << 22)}
+    bot = SimpleNamespace(db=FakeDatabase(list(guilds)), member_chunker=None, get_guild=guilds.get)
+    manager = bot.module_manager = ModuleManager(bot)
+
+    async def load(guild_id, interserver_type):
+        module = InterServerModule(bot, guild_id)
+        await module.load_config({'channel_id': guild_id + 10, 'interserver_type': interserver_type})
+        manager.active_modules.setdefault(guild_id, {})['interserver'] = module
+        await module.enable()
+        return module
+
+    async def run():
+        first, second, third = [
+            await load(guild_id, interserver_type)
+            for guild_id, interserver_type in zip(guilds, ('english', 'english', 'french'))
+        ]
+        targets = await first._get_interserver_targets()
+        assert [target.guild_id for target in targets] == [1 << 22, 2 << 22]
+        # Built once: the next relay reuses the same tuple
+        assert await second._get_interserver_targets() is targets
+        assert registry.targets('french')[0].channel is guilds[3 << 22].get_channel((3 << 22) + 10)
+
+        # The bot loses manage_webhooks through its role
+        guild = guilds[2 << 22]
+        role = guild.get_role((2 << 22) + 1)
+        role._permissions = discord.Permissions(view_channel=True, send_messages=True).value
+        await second.on_guild_role_update(role, role)
+        assert [target.guild_id for target in registry.targets('english')] == [1 << 22]
+
+        # A reloaded instance switches type; disabling the old instance keeps the new one
+        replacement = InterServerModule(bot, 3 << 22)
+        await replacement.load_config({'channel_id': (3 << 22) + 10, 'interserver_type': 'english', 'show_avatar': False})
+        manager.active_modules[3 << 22]['interserver'] = replacement
+        await replacement.enable()
+        await third.disable()
+        assert registry.targets('french') == ()
+        assert registry.get(3 << 22).show_avatar is False
+
+        # Channel deleted, then guild left
+        channel = guilds[1 << 22].get_channel((1 << 22) + 10)
+        guilds[1 << 22]._remove_channel(channel)
+        await first.on_guild_channel_delete(channel)
+        await replacement.on_guild_remove(guilds[3 << 22])
+        assert registry.targets('english') == ()
+
+    asyncio.run(run())
+
+    assert bot.db.queries == 1
+
+
+class LazyDatabase(FakeDatabase):
+    """guild_modules rows of the interserver module, changed by another process"""
+
+    def __init__(self, configs):
+        super().__init__(list(configs))
+        self.configs = configs
+
+    async def iter_guild_modules(self, guild_ids, batch_size=500, with_config=True):
+        yield [(guild_id, {'interserver': {}}) for guild_id in guild_ids if guild_id in self.configs]
+
+    async def get_guilds_with_module(self, module_id):
+        self.queries += 1
+        return list(self.configs)
+
+    async def get_guild_modules(self, guild_id):
+        return {'interserver': {'enabled': True, 'config': self.configs[guild_id], 'version': 1}} if guild_id in self.configs else {}
+
+    async def get_guild_module(self, guild_id, module_id):
+        return await self.get_guild_modules(guild_id) or None
+
+
+def test_registry_follows_remote_changes_in_lazy_mode(monkeypatch):
+    registry = InterServerRegistry()
+    monkeypatch.setattr(interserver, 'interserver_registry', registry)
+
+    client = discord.Client(intents=discord.Intents.default())
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data={'id': BOT_ID, 'username': 'Moddy', 'discriminator': '0', 'avatar': None})
+    guilds = {guild_id: _guild(state, guild_id) for guild_id in (1 << 22, 2 << 22, 3 << 22)}
+    configs = {guild_id: {'channel_id': guild_id + 10, 'interserver_type': 'english'} for guild_id in (1 << 22, 2 << 22)}
+    bot = SimpleNamespace(db=LazyDatabase(configs), member_chunker=None, get_guild=guilds.get, guilds=list(guilds.values()))
+    manager = bot.module_manager = ModuleManager(bot, lazy=True, idle_ttl=60)
+    manager.register_module(InterServerModule)
+
+    def english():
+        return [target.guild_id for target in registry.targets('english')]
+
+    async def run():
+        await manager.load_all_modules()
+        await registry.prime(bot)
+        assert english() == [1 << 22, 2 << 22]
+
+        # Idle interserver guilds stay instantiated: their registry entries keep following the config
+        assert await manager.evict_idle(now=time.monotonic() + 61) == 0
+
+        # Deleted by another process
+        del configs[2 << 22]
+        assert await manager.reload_module(2 << 22, 'interserver', 2, deleted=True)
+        assert english() == [1 << 22]
+
+        # Configured by another process on a guild without instance
+        configs[3 << 22] = {'channel_id': (3 << 22) + 10, 'interserver_type': 'english'}
+        assert await manager.reload_module(3 << 22, 'interserver', 3)
+        assert english() == [1 << 22, 3 << 22]
+        manager.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,241 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import modules.interserver as interserver
+from modules.interserver import InterServerModule, InterServerTarget, RelayReport, RelaySource
+
+ORIGIN_ID = 1 << 22
+AUTHOR_ID = 1373916203814490194
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.relayed = []
+        self.reply_lookups = 0
+
+    async def get_interserver_message_by_original(self, message_id):
+        self.reply_lookups += 1
+        return {'relayed_messages': [{'guild_id': 3 << 22, 'channel_id': 30, 'message_id': 300}]}
+
+    async def add_relayed_message(self, moddy_id, guild_id, channel_id, message_id):
+        self.relayed.append(guild_id)
+
+
+class FakeWebhook:
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, **kwargs):
+        FakeWebhook.in_flight += 1
+        FakeWebhook.peak = max(FakeWebhook.peak, FakeWebhook.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            FakeWebhook.in_flight -= 1
+        self.sent.append(kwargs)
+        return SimpleNamespace(id=len(self.sent))
+
+
+async def _no_bans(limit=None):
+    return
+    yield
+
+
+def _target(guild_id, show_avatar=True, allowed_mentions=False):
+    guild = SimpleNamespace(id=guild_id, name=f"Guild {guild_id}", get_member=lambda user_id: None, bans=_no_bans)
+    channel = SimpleNamespace(id=guild_id + 10, guild=guild)
+    return InterServerTarget(guild_id, channel, 'english', True, show_avatar, allowed_mentions)
+
+
+def test_fanout_is_concurrent_bounded_and_reports_latencies(monkeypatch):
+    monkeypatch.setattr(interserver, 'INTERSERVER_RELAY_CONCURRENCY', 3)
+    monkeypatch.setattr(interserver, 'INTERSERVER_RELAY_TIMEOUT', 0.2)
+    monkeypatch.setattr(interserver, 'interserver_bans', interserver.InterServerBanCache())
+    variants = []
+    build_kwargs = InterServerModule._webhook_kwargs
+
+    def counting_kwargs(self, source, target, is_moddy_team):
+        variants.append((target.show_avatar, target.allowed_mentions))
+        return build_kwargs(self, source, target, is_moddy_team)
+
+    monkeypatch.setattr(InterServerModule, '_webhook_kwargs', counting_kwargs)
+
+    # 12 partner servers with two display-option combinations, one of them too slow to answer
+    targets = (_target(ORIGIN_ID),) + tuple(
+        _target(guild_id << 22, show_avatar=guild_id % 2 == 0) for guild_id in range(2, 14)
+    )
+    webhooks = {target.channel.id: FakeWebhook(0.05) for target in targets}
+    webhooks[(13 << 22) + 10] = FakeWebhook(1)
+
+    async def get_webhook(self, channel):
+        return webhooks[channel.id]
+
+    monkeypatch.setattr(InterServerModule, '_get_or_create_webhook', get_webhook)
+
+    bot = SimpleNamespace(db=FakeDatabase(), member_chunker=None)
+    module = InterServerModule(bot, ORIGIN_ID)
+    source = RelaySource(
+        guild_id=ORIGIN_ID, guild_name="Origin", channel_id=ORIGIN_ID + 10,
+        author_id=AUTHOR_ID, author_name="Alice", author_avatar_url="https://cdn/alice.png",
+        attachments=(("cat.png", "https://cdn/cat.png"),), reply_to=42,
+    )
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        report = await module._relay_message(source, targets, "ABCDEF", "hello", False)
+        return report, loop.time() - started
+
+    report, elapsed = asyncio.run(run())
+
+    # 11 sends of 50 ms, 3 at a time, plus one 200 ms timeout: far from the sequential 0.75 s
+    assert elapsed < 0.5
+    assert FakeWebhook.peak == 3
+    assert report.delivered == 11 and report.timed_out == 1
+    assert sorted(bot.db.relayed) == [guild_id << 22 for guild_id in range(2, 13)]
+    assert len(report.latencies) == 11 and 0.05 <= report.percentile(0.5) <= report.percentile(0.95) <= max(report.latencies)
+
+    # One kwargs variant per display-option combination, one reply lookup per message
+    assert sorted(variants) == [(False, False), (True, False)]
+    assert bot.db.reply_lookups == 1
+    assert webhooks[ORIGIN_ID + 10].sent == []
+
+    sent = webhooks[(3 << 22) + 10].sent[0]
+    assert sent['content'].startswith("-# <:reply:1444821779444138146> [Reply to message](https://discord.com/channels/12582912/30/300)")
+    assert "**Attachments:** [cat.png](https://cdn/cat.png)" in sent['content'] and sent['content'].endswith("-# ID: `ABCDEF`")
+    assert sent['username'] == "Alice — Origin" and 'avatar_url' not in sent
+    assert webhooks[(2 << 22) + 10].sent[0]['avatar_url'] == "https://cdn/alice.png"
+    assert "/channels/4194304/4194314/42" in webhooks[(2 << 22) + 10].sent[0]['content']
+
+
+def test_report_percentiles():
+    report = RelayReport(delivered=4, latencies=[0.4, 0.1, 0.3, 0.2])
+    assert report.percentile(0.5) == 0.2 and report.percentile(0.95) == 0.4
+    assert report.format_latency() == "p50 200 ms • p95 400 ms • max 400 ms"
+    assert RelayReport().format_latency() == "n/a"
+
+
+def test_relay_does_not_wait_for_the_loading_reaction_and_welcome_dm(monkeypatch):
+    from utils.metrics import BotMetrics
+
+    monkeypatch.setattr(interserver, 'metrics', BotMetrics())
+    events = []
+
+    async def publish(*args):
+        events.append('publish')
+
+    monkeypatch.setattr(interserver, 'interserver_clusters', SimpleNamespace(available=True, publish=publish))
+    monkeypatch.setattr(interserver, 'interserver_registry', SimpleNamespace(get=lambda guild_id: None))
+
+    class Database:
+        async def has_active_sanction(self, *args):
+            return False
+
+        async def has_attribute(self, *args):
+            return False
+
+        async def create_interserver_message(self, **kwargs):
+            pass
+
+    async def run():
+        # Reactions and DMs are BACKGROUND calls: they may be held by the scheduler for a while
+        backlog = asyncio.Event()
+
+        async def add_reaction(self, message, emoji):
+            await backlog.wait()
+            events.append(('add', emoji))
+
+        async def remove_reaction(self, message, emoji):
+            events.append(('remove', emoji))
+
+        async def send_welcome_dm(self, user):
+            await backlog.wait()
+            events.append('welcome')
+
+        async def get_targets(self):
+            return (_target(2 << 22),)
+
+        async def relay(self, source, targets, moddy_id, content, is_moddy_team):
+            events.append('relay')
+            backlog.set()
+            return RelayReport(delivered=1, latencies=[0.01])
+
+        async def staff_log(self, *args):
+            pass
+
+        monkeypatch.setattr(InterServerModule, '_add_reaction', add_reaction)
+        monkeypatch.setattr(InterServerModule, '_remove_reaction', remove_reaction)
+        monkeypatch.setattr(InterServerModule, '_send_welcome_dm', send_welcome_dm)
+        monkeypatch.setattr(InterServerModule, '_get_interserver_targets', get_targets)
+        monkeypatch.setattr(InterServerModule, '_relay_message', relay)
+        monkeypatch.setattr(InterServerModule, '_send_staff_log', staff_log)
+
+        module = InterServerModule(SimpleNamespace(db=Database(), member_chunker=None), ORIGIN_ID)
+        module.enabled, module.channel_id = True, ORIGIN_ID + 10
+        author = SimpleNamespace(id=AUTHOR_ID, bot=False, display_name="Alice",
+                                 display_avatar=SimpleNamespace(url="https://cdn/alice.png"))
+        message = SimpleNamespace(id=1, content="hello", attachments=[], embeds=[], reference=None, author=author,
+                                  guild=SimpleNamespace(id=ORIGIN_ID, name="Origin"),
+                                  channel=SimpleNamespace(id=ORIGIN_ID + 10))
+        await asyncio.wait_for(module.on_message(message), 1)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    loading = "<a:loading:1395047662092550194>"
+    assert events.index('relay') < events.index(('add', loading)) < events.index(('remove', loading))
+    assert 'welcome' in events
+
+
+def test_refusal_warnings_do_not_wait_for_the_reaction(monkeypatch):
+    monkeypatch.setattr(interserver, 'interserver_clusters', SimpleNamespace(available=True))
+    events = []
+
+    class Database:
+        def __init__(self, blacklisted):
+            self.blacklisted = blacklisted
+
+        async def has_active_sanction(self, *args):
+            return self.blacklisted
+
+        async def has_attribute(self, *args):
+            return False
+
+    async def run(blacklisted):
+        backlog = asyncio.Event()
+
+        async def add_reaction(self, message, emoji):
+            await backlog.wait()
+            events.append(('add', emoji))
+
+        async def send(content, delete_after=None):
+            events.append('warning')
+            backlog.set()
+
+        monkeypatch.setattr(InterServerModule, '_add_reaction', add_reaction)
+
+        module = InterServerModule(SimpleNamespace(db=Database(blacklisted), member_chunker=None), ORIGIN_ID)
+        module.enabled, module.channel_id = True, ORIGIN_ID + 10
+        author = SimpleNamespace(id=AUTHOR_ID, bot=False, mention=f"<@{AUTHOR_ID}>")
+        message = SimpleNamespace(id=1, content="hello", attachments=[], embeds=[], reference=None, author=author,
+                                  guild=SimpleNamespace(id=ORIGIN_ID, name="Origin"),
+                                  channel=SimpleNamespace(id=ORIGIN_ID + 10, send=send))
+        if not blacklisted:
+            module._check_cooldown(AUTHOR_ID)
+        # The reaction is held by the scheduler: the warning is sent without waiting for it
+        await asyncio.wait_for(module.on_message(message), 1)
+        await asyncio.sleep(0)
+
+    for blacklisted in (True, False):
+        events.clear()
+        asyncio.run(run(blacklisted))
+        assert events == ['warning', ('add', "<:undone:1398729502028333218>")]
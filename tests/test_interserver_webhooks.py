@@ -0,0 +1,133 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import modules.interserver as interserver
+from modules.interserver import InterServerModule, InterServerTarget, InterServerWebhookCache
+
+BOT_ID = 1373916203814490194
+GUILD_ID = 1 << 22
+CHANNEL_ID = GUILD_ID + 10
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.webhooks = {}
+
+    async def get_interserver_webhook(self, channel_id):
+        return self.webhooks.get(channel_id)
+
+    async def set_interserver_webhook(self, channel_id, guild_id, webhook_id, webhook_token):
+        self.webhooks[channel_id] = (webhook_id, webhook_token)
+
+    async def delete_interserver_webhook(self, channel_id, webhook_id=None):
+        if webhook_id is None or self.webhooks.get(channel_id, (None,))[0] == webhook_id:
+            self.webhooks.pop(channel_id, None)
+
+
+class FakeChannel:
+    """Stands for the REST side of a text channel: its webhooks"""
+
+    def __init__(self):
+        self.id = CHANNEL_ID
+        self.guild = SimpleNamespace(id=GUILD_ID, name="Guild")
+        self.existing = []
+        self.created = 0
+        self.rest_calls = 0
+
+    async def webhooks(self):
+        self.rest_calls += 1
+        await asyncio.sleep(0.01)
+        return list(self.existing)
+
+    async def create_webhook(self, name, reason=None):
+        self.rest_calls += 1
+        webhook = SimpleNamespace(id=100 + self.created, token=f"token-{self.created}", name=name,
+                                  user=SimpleNamespace(id=BOT_ID))
+        self.created += 1
+        self.existing.append(webhook)
+        return webhook
+
+
+def _bot(db):
+    # Webhook.partial(client=bot) takes the state and the HTTP session of the bot
+    return SimpleNamespace(db=db, member_chunker=None, user=SimpleNamespace(id=BOT_ID), _connection=None,
+                           http=SimpleNamespace(_HTTPClient__session=object()))
+
+
+def _not_found():
+    return discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Webhook")
+
+
+def test_webhooks_are_resolved_once_and_persisted():
+    db = FakeDatabase()
+    bot = _bot(db)
+    channel = FakeChannel()
+    cache = InterServerWebhookCache()
+
+    async def run():
+        # Concurrent relays share one resolution
+        first, second = await asyncio.gather(cache.get(bot, channel), cache.get(bot, channel))
+        assert first is second and (first.id, first.token) == (100, "token-0")
+        assert await cache.get(bot, channel) is first
+
+        # After a restart the stored webhook is used without REST calls
+        restarted = await InterServerWebhookCache().get(bot, channel)
+        assert restarted.id == 100
+
+    asyncio.run(run())
+
+    assert channel.rest_calls == 2 and cache.fetches == 1
+    assert db.webhooks == {CHANNEL_ID: (100, "token-0")}
+
+
+def test_deleted_webhook_is_replaced_on_404_and_on_webhooks_update(monkeypatch):
+    cache = InterServerWebhookCache()
+    monkeypatch.setattr(interserver, 'interserver_webhooks', cache)
+    db = FakeDatabase()
+    bot = _bot(db)
+    channel = FakeChannel()
+    sent = []
+
+    async def send(webhook, **kwargs):
+        if webhook.id not in {existing.id for existing in channel.existing}:
+            raise _not_found()
+        sent.append((webhook.id, kwargs['content']))
+        return SimpleNamespace(id=len(sent))
+
+    monkeypatch.setattr(discord.Webhook, 'send', send)
+
+    module = InterServerModule(bot, GUILD_ID)
+    module.channel_id = CHANNEL_ID
+    target = InterServerTarget(GUILD_ID, channel, 'english', True, True, False)
+    source = SimpleNamespace(author_id=1)
+
+    async def run():
+        assert await module._send_to_target(source, target, "first", {}, True)
+
+        # Someone deletes the webhook: the next send gets a 404, resolves a new one and retries once
+        channel.existing.clear()
+        assert await module._send_to_target(source, target, "second", {}, True)
+        assert db.webhooks == {CHANNEL_ID: (101, "token-1")}
+
+        # webhooks_update for a change that keeps our webhook: nothing is dropped
+        calls = channel.rest_calls
+        await module.on_webhooks_update(channel)
+        assert channel.rest_calls == calls + 1 and CHANNEL_ID in db.webhooks
+
+        # webhooks_update after a deletion: the entry is dropped and resolved again on the next relay
+        channel.existing.clear()
+        await module.on_webhooks_update(channel)
+        assert db.webhooks == {}
+        assert await module._send_to_target(source, target, "third", {}, True)
+
+    asyncio.run(run())
+
+    assert sent == [(100, "first"), (101, "second"), (102, "third")]
+    assert db.webhooks == {CHANNEL_ID: (102, "token-2")}
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils import json_codec
+from utils.performance import apply_performance_profile
+
+
+@pytest.fixture(autouse=True)
+def stdlib_backend():
+    yield
+    json_codec.configure('stdlib')
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+def test_backends_round_trip_bot_documents(backend):
+    if json_codec.configure(backend) != backend:
+        pytest.skip(f"{backend} not installed")
+
+    document = {
+        'config': {'prefix': '!', 'lang': 'fr'},
+        'roles': [1424149819185827954, 1394001780148535387],
+        'message': "Bienvenue sur le serveur ✨",
+        'enabled': True,
+        'note': None,
+    }
+    encoded = json_codec.dumps(document)
+    assert isinstance(encoded, str)
+    assert json_codec.loads(encoded) == document
+    assert json_codec.loads(encoded.encode('utf-8')) == document
+
+    # Integer keys and out-of-range integers behave like the stdlib
+    assert json_codec.loads(json_codec.dumps({1: 'a'})) == {'1': 'a'}
+    assert json_codec.loads(json_codec.dumps([2 ** 70])) == [2 ** 70]
+
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads("{not json")
+
+
+def test_stdlib_options_are_honoured_with_orjson():
+    json_codec.configure('orjson')
+    assert json_codec.dumps({'a': 'é'}, ensure_ascii=False) == '{"a": "é"}'
+
+
+def test_default_profile_keeps_stdlib():
+    result = apply_performance_profile('unknown')
+    assert result['profile'] == 'default'
+    assert result['json'] == 'stdlib'
+    assert json_codec.BACKEND == 'stdlib'
@@ -0,0 +1,38 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.loop_watchdog import LoopWatchdog, percentile
+
+
+def test_percentile_nearest_rank():
+    values = sorted(float(i) for i in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_blocking_call_is_captured_with_its_stack():
+    bot = SimpleNamespace(get_cog=lambda name: None, is_ready=lambda: False)
+
+    def blocking_sync_work():
+        time.sleep(0.3)
+
+    async def main():
+        watchdog = LoopWatchdog(bot, interval=0.02, threshold=0.1)
+        watchdog.start()
+        await asyncio.sleep(0.1)
+        blocking_sync_work()
+        await asyncio.sleep(0.1)
+        watchdog.stop()
+        return watchdog
+
+    watchdog = asyncio.run(main())
+    assert watchdog.stall_count == 1
+    assert "blocking_sync_work" in watchdog.stalls[-1]['stack']
+    assert watchdog.percentiles()['max'] >= 250
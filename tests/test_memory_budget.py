@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.memory_budget import PROFILES, get_memory_profile, measure_profile
+
+
+def test_profile_overrides():
+    profile = get_memory_profile('minimal', max_messages=0, chunk_guilds_at_startup=True)
+    assert profile.max_messages is None  # 0 disables the message cache
+    assert profile.chunk_guilds_at_startup is True
+    # Members received from the gateway stay cached, so bot.get_user() keeps working
+    assert profile.member_cache_flags().joined
+    assert not profile.member_cache_flags().voice
+    # Unknown names keep the historical behaviour
+    assert get_memory_profile('huge').name == 'full'
+
+
+def test_minimal_profile_caches_fewer_members():
+    full = measure_profile(PROFILES['full'], 40, 300, messages_per_guild=2)
+    minimal = measure_profile(PROFILES['minimal'], 40, 300, messages_per_guild=2)
+    assert full['members_cached'] == 40 * 300
+    # Only the guilds chunked on demand (1 in 20) keep their members, the others the one member of GUILD_CREATE
+    assert minimal['members_cached'] == 2 * 300 + 38
+    assert minimal['mb'] < full['mb']
+
+
+def test_module_instances_are_slotted_and_share_config_values():
+    import asyncio
+    import json
+    from utils.memory_budget import measure_modules
+    from modules.module_manager import freeze_config
+    from modules.welcome_channel import WelcomeChannelModule
+
+    async def load(guild_id):
+        module = WelcomeChannelModule(None, guild_id)
+        # Decoded separately, like two guild_modules rows
+        config = {**module.get_default_config(), 'channel_id': guild_id + 1, 'roles': [1, 2]}
+        await module.load_config(json.loads(json.dumps(config)))
+        return module
+
+    first, second = asyncio.run(load(1)), asyncio.run(load(2))
+    assert not hasattr(first, '__dict__')
+    assert first.message_template is second.message_template
+    assert first.config['roles'] == (1, 2)
+    with pytest.raises(TypeError):
+        first.config['channel_id'] = 3
+
+    assert freeze_config({'a': {}, 'b': []}) == {'a': {}, 'b': ()}
+    rows = measure_modules(200)
+    assert {row['module'] for row in rows} >= {'interserver', 'starboard', 'welcome_channel'}
+    assert all(row['bytes_per_instance'] < 1000 for row in rows)
+
+
+def test_chunker_rechunks_guilds_rebuilt_after_reconnect():
+    import asyncio
+    from types import SimpleNamespace
+    from utils.memory_budget import MemberChunker
+
+    async def run():
+        guild = SimpleNamespace(id=1, name='guild', chunked=False, members=[1, 2])
+        chunks = []
+
+        async def chunk(cache):
+            chunks.append(cache)
+            guild.chunked = True
+
+        async def wait_until_ready():
+            return None
+
+        guild.chunk = chunk
+        bot = SimpleNamespace(get_guild=lambda guild_id: guild, wait_until_ready=wait_until_ready)
+        chunker = MemberChunker(bot, delay=0)
+        module = SimpleNamespace(enabled=True, REQUIRES_MEMBERS=True)
+
+        chunker.request_for_modules(1, [module])
+        await chunker._worker
+        chunker.request(1)
+        assert chunker._worker.done() and len(chunks) == 1
+
+        # Reconnect: the guild comes back from its GUILD_CREATE without members
+        guild.chunked = False
+        chunker.request_for_modules(1, [SimpleNamespace(enabled=True, REQUIRES_MEMBERS=False)])
+        assert not chunker.pending
+        chunker.request_for_modules(1, [module])
+        await chunker._worker
+        assert len(chunks) == 2
+
+    asyncio.run(run())
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from internal_api.middleware import auth
+from internal_api.server import app, set_bot
+from utils.metrics import Histogram, metrics, render_metrics
+
+SECRET = "metrics-test-secret"
+
+
+class FakeBot:
+    guilds = [object(), object()]
+    db = None
+
+    def __init__(self):
+        self.gateway_metrics = SimpleNamespace(
+            latencies=lambda: [(0, 0.042), (1, float('inf'))],
+            totals={0: {'MESSAGE_CREATE': 12, 'GUILD_CREATE': 2}}
+        )
+        self.loop_watchdog = SimpleNamespace(percentiles=lambda: {
+            'p50': 1.0, 'p95': 4.0, 'p99': 12.0, 'max': 80.0, 'samples': 10, 'stalls': 3
+        })
+        self.cogs = {
+            'Reminder': SimpleNamespace(queue_depth=4),
+            'ConsoleLogger': SimpleNamespace(log_queue=asyncio.Queue()),
+        }
+
+    def is_ready(self):
+        return True
+
+    def get_cog(self, name):
+        return self.cogs.get(name)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert abs(histogram.sum - 3.65) < 1e-9
+
+
+def test_render_metrics_exposes_every_section():
+    metrics.record_query(SimpleNamespace(query="  select * from users", elapsed=0.003, exception=None))
+    metrics.record_query(SimpleNamespace(query="VACUUM", elapsed=0.2, exception=RuntimeError()))
+    metrics.interaction_seconds.observe(0.3, 'command', 'translate', 'total')
+    metrics.record_interserver_relay(0.8, 3, 4)
+
+    text = render_metrics(FakeBot())
+    lines = text.splitlines()
+
+    assert 'moddy_up 1' in lines
+    assert 'moddy_gateway_latency_seconds{shard="0"} 0.042' in lines
+    assert not any(line.startswith('moddy_gateway_latency_seconds{shard="1"}') for line in lines)
+    assert 'moddy_gateway_events_total{shard="0",event="MESSAGE_CREATE"} 12' in lines
+    assert 'moddy_interaction_duration_seconds_bucket{kind="command",name="translate",stage="total",le="0.5"} 1' in lines
+    assert 'moddy_db_query_duration_seconds_count{operation="SELECT"} 1' in lines
+    assert 'moddy_db_query_errors_total{operation="OTHER"} 1' in lines
+    assert 'moddy_interserver_success_ratio 0.75' in lines
+    assert 'moddy_reminder_queue_depth 4' in lines
+    assert 'moddy_console_log_queue_depth 0' in lines
+    assert 'moddy_event_loop_lag_seconds{quantile="0.99"} 0.012' in lines
+
+    # Every metric family is announced once, before its samples
+    types = [line.split()[2] for line in lines if line.startswith('# TYPE')]
+    assert len(types) == len(set(types))
+    assert text.endswith("\n")
+
+
+def test_metrics_endpoint_requires_the_internal_secret(monkeypatch):
+    monkeypatch.setattr(auth, "INTERNAL_API_SECRET", SECRET)
+    set_bot(FakeBot())
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bot") as client:
+            anonymous = await client.get("/metrics")
+            scraped = await client.get("/metrics", headers={'Authorization': f"Bearer {SECRET}"})
+        return anonymous, scraped
+
+    anonymous, scraped = asyncio.run(run())
+    assert anonymous.status_code == 401
+    assert scraped.status_code == 200
+    assert scraped.headers['content-type'].startswith("text/plain; version=0.0.4")
+    assert "# TYPE moddy_up gauge" in scraped.text
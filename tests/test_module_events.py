@@ -0,0 +1,153 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cogs.module_events import ModuleEvents
+from modules.module_manager import ModuleBase, ModuleManager
+from utils.metrics import metrics
+
+GUILD_ID = 1394001780148535387
+OTHER_GUILD_ID = 1394001780148535388
+
+
+class FakeModule(ModuleBase):
+    MODULE_ID = "fake_welcome"
+    EVENTS = {'member_join': 'on_member_join'}
+
+    def __init__(self, bot, guild_id):
+        super().__init__(bot, guild_id)
+        self.joined = []
+
+    async def load_config(self, config_data):
+        self.enabled = bool(config_data.get('enabled'))
+        return True
+
+    async def validate_config(self, config_data):
+        return True, None
+
+    def get_default_config(self):
+        return {}
+
+    async def on_member_join(self, member):
+        await asyncio.sleep(0.01)
+        self.joined.append(member)
+
+
+class BrokenModule(FakeModule):
+    MODULE_ID = "fake_broken"
+
+    async def on_member_join(self, member):
+        raise RuntimeError("boom")
+
+
+def _bot():
+    bot = SimpleNamespace(db=None, member_chunker=None)
+    bot.module_manager = ModuleManager(bot)
+    return bot
+
+
+def test_index_follows_enable_and_disable():
+    bot = _bot()
+    manager = bot.module_manager
+
+    async def run():
+        module = FakeModule(bot, GUILD_ID)
+        await module.enable()
+        assert list(manager.get_event_handlers('member_join', GUILD_ID)) == ['fake_welcome']
+        assert manager.get_event_handlers('member_join', OTHER_GUILD_ID) is None
+        assert manager.get_event_handlers('message', GUILD_ID) is None
+
+        # A reloaded instance replaces the old one; disabling the old one keeps it
+        replacement = FakeModule(bot, GUILD_ID)
+        await replacement.enable()
+        await module.disable()
+        assert manager.get_event_handlers('member_join', GUILD_ID)['fake_welcome'].__self__ is replacement
+
+        await replacement.disable()
+        assert manager.event_handlers == {}
+
+    asyncio.run(run())
+
+
+def test_dispatch_isolates_errors_and_runs_handlers_concurrently():
+    bot = _bot()
+    cog = ModuleEvents(bot)
+    errors_before = metrics.module_event_errors[('member_join', 'fake_broken')]
+
+    async def run():
+        first, second = FakeModule(bot, GUILD_ID), FakeModule(bot, GUILD_ID)
+        second.MODULE_ID = "fake_auto_role"
+        broken = BrokenModule(bot, GUILD_ID)
+        for module in (first, second, broken):
+            await module.enable()
+
+        member = SimpleNamespace(guild=SimpleNamespace(id=GUILD_ID))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await cog.on_member_join(member)
+        elapsed = loop.time() - started
+
+        # Another guild: no handler, nothing runs
+        await cog.on_member_join(SimpleNamespace(guild=SimpleNamespace(id=OTHER_GUILD_ID)))
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(run())
+
+    assert len(first.joined) == 1 and len(second.joined) == 1
+    assert elapsed < 0.02
+    assert metrics.module_event_errors[('member_join', 'fake_broken')] == errors_before + 1
+    assert metrics.module_event_seconds.labels('member_join', 'fake_welcome').count >= 1
+
+
+def test_every_module_declares_existing_handlers():
+    manager = ModuleManager(SimpleNamespace(db=None))
+    manager.discover_modules()
+
+    declared = {module_id: set(cls.EVENTS) for module_id, cls in manager.registered_modules.items()}
+    assert {'welcome_channel', 'welcome_dm', 'auto_role', 'auto_restore_roles'} <= {
+        module_id for module_id, events in declared.items() if 'member_join' in events
+    }
+    assert 'message' in declared['interserver']
+    assert 'raw_reaction_add' in declared['starboard']
+
+
+def test_interserver_copies_are_retracted_without_the_module(monkeypatch):
+    import modules.interserver as interserver
+
+    retracted = []
+
+    async def delete_relayed_messages(bot, relayed):
+        retracted.extend(relayed)
+        return len(relayed)
+
+    monkeypatch.setattr(interserver, 'delete_relayed_messages', delete_relayed_messages)
+
+    class Database:
+        def __init__(self):
+            self.deleted = []
+
+        async def get_interserver_message_by_original(self, message_id):
+            if message_id == 1:
+                return {'moddy_id': "ABCDEF", 'relayed_messages': [{'guild_id': 3, 'channel_id': 30, 'message_id': 31}]}
+            return None
+
+        async def delete_interserver_message(self, moddy_id):
+            self.deleted.append(moddy_id)
+
+    # The origin guild has disabled the interserver module since: no module instance at all
+    bot = SimpleNamespace(db=Database(), member_chunker=None)
+    bot.module_manager = ModuleManager(bot)
+    cog = ModuleEvents(bot)
+
+    def message(message_id):
+        return SimpleNamespace(id=message_id, author=SimpleNamespace(bot=False), guild=SimpleNamespace(id=GUILD_ID))
+
+    asyncio.run(cog.on_message_delete(message(1)))
+    asyncio.run(cog.on_message_delete(message(2)))
+
+    assert retracted == [{'guild_id': 3, 'channel_id': 30, 'message_id': 31}]
+    assert bot.db.deleted == ["ABCDEF"]
@@ -0,0 +1,234 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.module_manager import ModuleBase, ModuleManager
+
+
+class FakeDatabase:
+    """Stands for the guild_modules table: only guilds with modules are returned"""
+
+    def __init__(self, modules_by_guild):
+        # guild_id -> {module_id: config}; migrated rows are stored as enabled
+        self.rows = {
+            guild_id: {module_id: {'enabled': True, 'config': config, 'version': 1} for module_id, config in modules.items()}
+            for guild_id, modules in modules_by_guild.items()
+        }
+        self.queries = []
+        self.loads = []
+        self.enabled_updates = []
+
+    async def iter_guild_modules(self, guild_ids, batch_size=500, with_config=True):
+        self.queries.append((list(guild_ids), with_config))
+        rows = [(guild_id, self.rows[guild_id]) for guild_id in guild_ids if guild_id in self.rows]
+        for index in range(0, len(rows), batch_size):
+            yield rows[index:index + batch_size]
+
+    async def get_guild_modules(self, guild_id):
+        self.loads.append(guild_id)
+        return self.rows.get(guild_id, {})
+
+    async def set_module_enabled(self, guild_id, module_id, enabled):
+        self.rows[guild_id][module_id]['enabled'] = enabled
+        self.enabled_updates.append((guild_id, module_id, enabled))
+
+    async def get_guild(self, guild_id):
+        raise AssertionError("load_all_modules must not query guilds one by one")
+
+
+class ChannelModule(ModuleBase):
+    MODULE_ID = "fake_channel"
+    EVENTS = {'message': 'on_message'}
+    hooks = []
+
+    async def load_config(self, config_data):
+        self.enabled = config_data.get('channel_id') is not None
+        return True
+
+    async def validate_config(self, config_data):
+        return True, None
+
+    def get_default_config(self):
+        return {}
+
+    async def on_enable(self):
+        # Stands for a Discord call (slowmode, channel topic)
+        await asyncio.sleep(0)
+        ChannelModule.hooks.append(self.guild_id)
+
+    async def on_message(self, message):
+        pass
+
+
+def test_bulk_load_uses_one_query_and_defers_enable_hooks():
+    guilds = [SimpleNamespace(id=guild_id) for guild_id in range(1, 1201)]
+    db = FakeDatabase({guild_id: {'fake_channel': {'channel_id': 42}} for guild_id in range(1, 1201, 3)})
+    # Migrated row whose config does not enable the module
+    db.rows[4]['fake_channel']['config'] = {'channel_id': None}
+    bot = SimpleNamespace(db=db, guilds=guilds, member_chunker=None)
+    manager = bot.module_manager = ModuleManager(bot)
+    manager.register_module(ChannelModule)
+    ChannelModule.hooks = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await manager.load_all_modules()
+        load_time = loop.time() - started
+
+        # Modules work before their hooks have all run
+        hooks_at_load = len(ChannelModule.hooks)
+        assert manager.get_event_handlers('message', 1) is not None
+
+        # A module disabled meanwhile does not run its hook
+        await manager.active_modules[1198]['fake_channel'].disable()
+        await manager._hooks_task
+        return load_time, hooks_at_load
+
+    load_time, hooks_at_load = asyncio.run(run())
+
+    assert len(db.queries) == 1 and len(db.queries[0][0]) == 1200
+    assert len(manager.active_modules) == 400
+    assert load_time < 1 and hooks_at_load < 399
+    assert len(ChannelModule.hooks) == 398 and 1198 not in ChannelModule.hooks
+    assert db.enabled_updates == [(4, 'fake_channel', False)]
+
+
+def test_lazy_mode_activates_on_first_event_and_evicts_idle_guilds():
+    from cogs.module_events import ModuleEvents
+
+    guilds = [SimpleNamespace(id=guild_id) for guild_id in range(1, 1001)]
+    db = FakeDatabase({guild_id: {'fake_channel': {'channel_id': 42}} for guild_id in range(1, 1001, 2)})
+    bot = SimpleNamespace(db=db, guilds=guilds, member_chunker=None)
+    manager = bot.module_manager = ModuleManager(bot, lazy=True, idle_ttl=60)
+    received = []
+
+    class RelayModule(ChannelModule):
+        async def on_message(self, message):
+            received.append((self.guild_id, message))
+
+    manager.register_module(RelayModule)
+    cog = ModuleEvents(bot)
+
+    async def run():
+        await manager.load_all_modules()
+        # Only the "configured" bitmap is kept at startup
+        assert manager.active_modules == {} and len(manager._pending) == 500
+        assert db.queries[0][1] is False
+
+        # Concurrent first events share one activation
+        await asyncio.gather(cog.dispatch_to_modules('message', 1, 'a'), cog.dispatch_to_modules('message', 1, 'b'))
+        # Guild without modules: no activation, no query
+        await cog.dispatch_to_modules('message', 2, 'c')
+        assert db.loads == [1] and list(manager.active_modules) == [1]
+
+        # Idle guilds are evicted and come back on their next event
+        assert await manager.evict_idle(now=time.monotonic() + 61) == 1
+        assert manager.active_modules == {} and manager.get_event_handlers('message', 1) is None
+        await cog.dispatch_to_modules('message', 1, 'd')
+        manager.stop()
+
+    asyncio.run(run())
+
+    assert sorted(message for _, message in received) == ['a', 'b', 'd']
+    assert db.loads == [1, 1]
+
+
+def test_lazy_eviction_keeps_guilds_with_in_memory_state():
+    from cogs.module_events import ModuleEvents
+    from modules.starboard import StarboardModule
+
+    db = FakeDatabase({
+        1: {'fake_channel': {'channel_id': 42}, 'starboard': {'channel_id': 43}},
+        2: {'fake_channel': {'channel_id': 42}},
+    })
+    bot = SimpleNamespace(db=db, guilds=[SimpleNamespace(id=1), SimpleNamespace(id=2)], member_chunker=None)
+    manager = bot.module_manager = ModuleManager(bot, lazy=True, idle_ttl=60)
+    manager.register_module(ChannelModule)
+    manager.register_module(StarboardModule)
+    cog = ModuleEvents(bot)
+
+    async def run():
+        await manager.load_all_modules()
+        await cog.dispatch_to_modules('message', 1, 'a')
+        await cog.dispatch_to_modules('message', 2, 'b')
+        starboard = manager.active_modules[1]['starboard']
+        starboard.starboard_messages = {100: 200}
+
+        # Guild 2 is evicted and re-activated from the DB on its next event; guild 1 keeps its starboard map
+        assert await manager.evict_idle(now=time.monotonic() + 61) == 1
+        assert list(manager.active_modules) == [1]
+        await cog.dispatch_to_modules('message', 2, 'c')
+        assert manager.active_modules[2]['fake_channel'].enabled
+        assert manager.active_modules[1]['starboard'] is starboard and starboard.starboard_messages == {100: 200}
+
+        # Once the starboard is disabled, the guild can be evicted again
+        starboard.enabled = False
+        assert await manager.evict_idle(now=time.monotonic() + 61) == 2
+        await cog.dispatch_to_modules('message', 1, 'd')
+        assert manager.active_modules[1]['starboard'] is not starboard
+        manager.stop()
+
+    asyncio.run(run())
+
+    assert db.loads == [1, 2, 2, 1]
+
+
+def test_legacy_configs_are_migrated_with_their_enabled_state():
+    class LegacyDatabase(FakeDatabase):
+        async def migrate_legacy_module_configs(self, resolve_enabled):
+            legacy = {7: {'fake_channel': {'channel_id': 42}, 'removed_module': {'x': 1}}, 8: {'fake_channel': {'channel_id': None}}}
+            for guild_id, modules in legacy.items():
+                for module_id, config in modules.items():
+                    self.rows.setdefault(guild_id, {})[module_id] = {
+                        'enabled': await resolve_enabled(module_id, config), 'config': config, 'version': 1
+                    }
+            return 3
+
+    db = LegacyDatabase({})
+    manager = ModuleManager(SimpleNamespace(db=db, member_chunker=None))
+    manager.register_module(ChannelModule)
+
+    assert asyncio.run(manager.migrate_legacy_configs()) == 3
+    assert db.rows[7]['fake_channel']['enabled'] is True
+    assert db.rows[7]['removed_module']['enabled'] is False
+    assert db.rows[8]['fake_channel']['enabled'] is False
+
+
+def test_evicted_and_replaced_instances_are_torn_down():
+    from cogs.module_events import ModuleEvents
+
+    db = FakeDatabase({1: {'fake_channel': {'channel_id': 42}}})
+    bot = SimpleNamespace(db=db, guilds=[SimpleNamespace(id=1)], member_chunker=None)
+    manager = bot.module_manager = ModuleManager(bot, lazy=True, idle_ttl=60)
+    torn_down = []
+
+    class TrackedModule(ChannelModule):
+        async def on_disable(self):
+            torn_down.append(self)
+
+    manager.register_module(TrackedModule)
+    cog = ModuleEvents(bot)
+
+    async def run():
+        await manager.load_all_modules()
+        await cog.dispatch_to_modules('message', 1, 'a')
+        first = manager.active_modules[1]['fake_channel']
+
+        # Reloaded from the DB: the replaced instance is disabled
+        await manager._load_modules_config(1, db.rows[1])
+        second = manager.active_modules[1]['fake_channel']
+        assert torn_down == [first] and not first.enabled and second.enabled
+
+        # Evicted: teardown hook, but the module stays enabled in the DB
+        assert await manager.evict_idle(now=time.monotonic() + 61) == 1
+        assert torn_down == [first, second]
+        assert db.enabled_updates == []
+        manager.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,201 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.module_manager import ModuleBase, ModuleManager
+
+GUILD_ID = 1394001780148535387
+OTHER_CLUSTER_GUILD_ID = 1394001780148535388
+
+
+class FakeDatabase:
+    """guild_modules rows shared by two processes, versions from one sequence"""
+
+    def __init__(self):
+        self.rows = {}
+        self.sequence = 0
+        self.notifications = []
+        self.reads = 0
+
+    async def save_module_config(self, guild_id, module_id, config, enabled):
+        self.sequence += 1
+        self.rows[(guild_id, module_id)] = {'enabled': enabled, 'config': config, 'version': self.sequence}
+        self.notifications.append({'guild_id': guild_id, 'module_id': module_id, 'version': self.sequence, 'deleted': False})
+        return self.sequence
+
+    async def delete_module_config(self, guild_id, module_id):
+        self.sequence += 1
+        self.rows.pop((guild_id, module_id), None)
+        self.notifications.append({'guild_id': guild_id, 'module_id': module_id, 'version': self.sequence, 'deleted': True})
+        return self.sequence
+
+    async def get_guild_module(self, guild_id, module_id):
+        self.reads += 1
+        return self.rows.get((guild_id, module_id))
+
+    async def get_module_versions(self, guild_ids):
+        return {key: row['version'] for key, row in self.rows.items() if key[0] in guild_ids}
+
+
+class ThresholdModule(ModuleBase):
+    MODULE_ID = "fake_starboard"
+
+    async def load_config(self, config_data):
+        self.config = config_data
+        self.enabled = config_data.get('threshold') is not None
+        return True
+
+    async def validate_config(self, config_data):
+        return True, None
+
+    def get_default_config(self):
+        return {}
+
+
+def _process(db, lazy=False):
+    bot = SimpleNamespace(db=db, member_chunker=None, guilds=[SimpleNamespace(id=GUILD_ID)],
+                          get_guild=lambda guild_id: guild_id if guild_id == GUILD_ID else None)
+    manager = bot.module_manager = ModuleManager(bot, lazy=lazy)
+    manager.register_module(ThresholdModule)
+    return manager
+
+
+def test_notifications_reload_only_newer_versions():
+    db = FakeDatabase()
+    # "dashboard" writes, "bot" applies the notifications
+    dashboard, bot = _process(db), _process(db)
+
+    async def run():
+        await dashboard.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 3})
+        await dashboard.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 5})
+        first, second = db.notifications
+
+        # The writer ignores its own notification
+        dashboard.on_config_notification(second)
+        assert dashboard._reloads_task is None
+
+        bot.on_config_notification(second)
+        await bot._reloads_task
+        assert bot.active_modules[GUILD_ID]['fake_starboard'].config == {'threshold': 5}
+
+        # Late notification of an older version: ignored, no DB read
+        reads = db.reads
+        bot.on_config_notification(first)
+        assert not bot._reloads and db.reads == reads
+
+        # A guild of another cluster is not loaded here
+        assert not await bot.reload_module(OTHER_CLUSTER_GUILD_ID, 'fake_starboard', 99)
+        assert OTHER_CLUSTER_GUILD_ID not in bot.active_modules
+
+        # Deleted then configured again: the new version is still higher
+        await dashboard.delete_module_config(GUILD_ID, 'fake_starboard')
+        await dashboard.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 2})
+        for payload in db.notifications[2:]:
+            bot.on_config_notification(payload)
+        await bot._reloads_task
+        assert bot.active_modules[GUILD_ID]['fake_starboard'].config == {'threshold': 2}
+
+        await dashboard.delete_module_config(GUILD_ID, 'fake_starboard')
+        bot.on_config_notification(db.notifications[-1])
+        await bot._reloads_task
+
+    asyncio.run(run())
+
+    assert 'fake_starboard' not in bot.active_modules[GUILD_ID]
+    assert bot.get_event_handlers('message', GUILD_ID) is None
+
+
+def test_resync_catches_up_missed_notifications():
+    db = FakeDatabase()
+    dashboard, bot = _process(db), _process(db)
+
+    async def run():
+        await dashboard.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 3})
+        bot.on_config_notification(db.notifications[0])
+        await bot._reloads_task
+
+        # Changes made while the LISTEN connection was down
+        await dashboard.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 8})
+        await bot.resync_configs()
+        await bot._reloads_task
+        assert bot.active_modules[GUILD_ID]['fake_starboard'].config == {'threshold': 8}
+
+        await dashboard.delete_module_config(GUILD_ID, 'fake_starboard')
+        await bot.resync_configs()
+        await bot._reloads_task
+
+    asyncio.run(run())
+
+    assert bot.active_modules[GUILD_ID] == {}
+
+
+def test_resync_loads_configs_created_for_guilds_without_instances():
+    db = FakeDatabase()
+    dashboard, bot, lazy = _process(db), _process(db), _process(db, lazy=True)
+
+    async def run():
+        # Configured while both processes were not listening: no instance, nothing pending
+        await dashboard.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 3})
+        await bot.resync_configs()
+        await lazy.resync_configs()
+        await bot._reloads_task
+        await lazy._reloads_task
+        assert bot.active_modules[GUILD_ID]['fake_starboard'].config == {'threshold': 3}
+        assert lazy._pending == {GUILD_ID: lazy._module_bits['fake_starboard']}
+
+        # Deleted during another outage: the pending bit is cleared
+        await dashboard.delete_module_config(GUILD_ID, 'fake_starboard')
+        await lazy.resync_configs()
+        await lazy._reloads_task
+        assert lazy._pending == {}
+
+    asyncio.run(run())
+
+
+def test_notifications_received_during_a_local_save_are_held():
+    class NotifyingDatabase(FakeDatabase):
+        """The writer handles NOTIFY before save_module_config returns (post-commit awaits)"""
+
+        def __init__(self):
+            super().__init__()
+            self.concurrent = None  # Config written by another process right after the next save
+
+        async def save_module_config(self, guild_id, module_id, config, enabled):
+            version = await super().save_module_config(guild_id, module_id, config, enabled)
+            if self.concurrent is not None:
+                await super().save_module_config(guild_id, module_id, self.concurrent, True)
+                self.concurrent = None
+                writer.on_config_notification(self.notifications[-2])
+            writer.on_config_notification(self.notifications[-1])
+            for _ in range(5):
+                await asyncio.sleep(0)
+            return version
+
+    enabled = []
+
+    class CountingModule(ThresholdModule):
+        async def on_enable(self):
+            enabled.append(self.config['threshold'])
+
+    db = NotifyingDatabase()
+    writer = _process(db)
+    writer.registered_modules['fake_starboard'] = CountingModule
+
+    async def run():
+        # Its own notification is ignored once the save has recorded its version
+        assert await writer.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 3}) == (True, None)
+        assert enabled == [3] and writer._reloads_task is None
+
+        # A newer change from another process is replayed after the save
+        db.concurrent = {'threshold': 6}
+        assert await writer.save_module_config(GUILD_ID, 'fake_starboard', {'threshold': 5}) == (True, None)
+        await writer._reloads_task
+
+    asyncio.run(run())
+
+    assert enabled == [3, 5, 6]
+    assert writer.active_modules[GUILD_ID]['fake_starboard'].config == {'threshold': 6}
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from discord.http import HTTPClient, Route
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.ratelimit_telemetry import RateLimitTelemetry, route_from_url
+
+CHANNEL_ID = 1394001780148535387
+
+
+def _json(data, status=200, headers=None):
+    # discord.py only decodes an exact "application/json" content type
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={'Content-Type': 'application/json', **(headers or {})})
+
+
+def _discord_stub():
+    """Answers like Discord: one route 429, then an exhausted bucket"""
+    calls = {'messages': 0}
+
+    async def messages(request):
+        calls['messages'] += 1
+        if calls['messages'] == 1:
+            return _json(
+                {'message': "You are being rate limited.", 'retry_after': 0.05, 'global': False},
+                status=429,
+                headers={'Via': '1.1 google', 'Retry-After': '0.05', 'X-RateLimit-Scope': 'user'}
+            )
+        return _json({'id': '1'}, headers={
+            'X-RateLimit-Bucket': 'abc',
+            'X-RateLimit-Limit': '1',
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset-After': '0.05',
+        })
+
+    async def me(request):
+        return _json({'id': '1373916203814490194', 'username': 'Moddy'})
+
+    async def cloudflare(request):
+        return web.Response(text="error code: 1015", status=429)
+
+    app = web.Application()
+    app.router.add_get('/api/v10/users/@me', me)
+    app.router.add_post('/api/v10/channels/{channel_id}/messages', messages)
+    app.router.add_get('/api/v10/interactions/{id}/{token}/callback', cloudflare)
+    return app
+
+
+async def relay_messages(http, count):
+    """Stands for a module sending messages (attributed by module name)"""
+    for _ in range(count):
+        await http.request(Route('POST', '/channels/{channel_id}/messages', channel_id=CHANNEL_ID), json={})
+
+
+def test_waits_and_429s_are_attributed_to_route_and_module(monkeypatch):
+    telemetry = RateLimitTelemetry()
+    telemetry.install()
+
+    async def run():
+        runner = web.AppRunner(_discord_stub())
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(Route, 'BASE', f"http://127.0.0.1:{port}/api/v10")
+
+        http = HTTPClient(asyncio.get_running_loop(), http_trace=telemetry.trace_config())
+        await http.static_login("token")
+        session = http._HTTPClient__session
+        try:
+            await relay_messages(http, 3)
+            # Interaction callbacks use the same session without HTTPClient.request
+            async with session.get(f"http://127.0.0.1:{port}/api/v10/interactions/{CHANNEL_ID}/{'t' * 80}/callback"):
+                pass
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+    stats = telemetry.routes[('POST /channels/{channel_id}/messages', __name__)]
+    assert stats.requests == 3
+    assert stats.hits == {'user': 1}
+    # The exhausted bucket makes discord.py sleep ~0.05s around the next requests
+    assert stats.waits >= 1 and stats.wait_seconds >= 0.04
+
+    [route_hit, cloudflare_hit] = telemetry.recent_hits
+    assert (route_hit['subsystem'], route_hit['retry_after']) == (__name__, 0.05)
+    assert cloudflare_hit['scope'] == 'cloudflare'
+    assert cloudflare_hit['route'] == 'GET /interactions/{id}/{token}/callback'
+
+    [by_module] = [row for row in telemetry.summary_by('subsystem') if row['subsystem'] == __name__]
+    assert by_module['hits'] == 2
+    assert "429" in telemetry.format_summary('route')
+    assert telemetry.totals()['hits'] == {'user': 1, 'cloudflare': 1}
+
+
+def test_route_from_url_hides_ids_and_tokens():
+    assert route_from_url('POST', f"/api/v10/webhooks/{CHANNEL_ID}/{'a' * 68}") == "POST /webhooks/{id}/{token}"
+    assert route_from_url('GET', f"/api/v10/guilds/{CHANNEL_ID}/members") == "GET /guilds/{id}/members"
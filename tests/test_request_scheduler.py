@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.request_scheduler import Priority, RequestScheduler, _priority, request_priority, with_priority
+
+
+class FakeHTTPClient:
+    def __init__(self):
+        self.sent = []
+
+    async def request(self, route, **kwargs):
+        self.sent.append((route, _priority.get()))
+        return {}
+
+
+def test_background_yields_the_budget_to_higher_priorities():
+    scheduler = RequestScheduler(rate=20)
+    http = FakeHTTPClient()
+    request = scheduler._wrap_request(FakeHTTPClient.request)
+
+    @with_priority(Priority.BACKGROUND)
+    async def send_log(index):
+        await request(http, f"log {index}")
+
+    async def relay(index):
+        await request(http, f"relay {index}")
+
+    async def run():
+        # A flood of logs and relays on an empty budget
+        scheduler.tokens = 0
+        tasks = [asyncio.create_task(send_log(index)) for index in range(6)]
+        tasks += [asyncio.create_task(relay(index)) for index in range(6)]
+        await asyncio.sleep(0)
+
+        # An interaction response is never delayed
+        started = time.perf_counter()
+        with request_priority(Priority.INTERACTION):
+            await request(http, "interaction")
+        interaction_wait = time.perf_counter() - started
+
+        await asyncio.gather(*tasks)
+        return interaction_wait
+
+    interaction_wait = asyncio.run(run())
+
+    order = [route for route, _ in http.sent]
+    assert order[0] == "interaction"
+    assert interaction_wait < 0.01
+    # Every relay goes out before the first deferred log
+    assert max(order.index(f"relay {index}") for index in range(6)) < min(order.index(f"log {index}") for index in range(6))
+    assert all(priority == Priority.BACKGROUND for route, priority in http.sent if route.startswith("log"))
+    assert scheduler.deferred[Priority.BACKGROUND] == 6
+    assert scheduler.sent == {Priority.INTERACTION: 1, Priority.RELAY: 6, Priority.BACKGROUND: 6}
+
+
+def test_background_keeps_a_reserve_for_interactions():
+    scheduler = RequestScheduler(rate=20)
+
+    async def run():
+        for _ in range(20):
+            await scheduler.acquire(Priority.BACKGROUND)
+        return scheduler.tokens
+
+    tokens = asyncio.run(run())
+    # 30% of the budget stays available for interactions and relays
+    assert tokens >= 0.3 * 20 - 0.1
+    assert scheduler.deferred[Priority.BACKGROUND] > 0
+
+
+def test_coalesce_runs_the_last_call_once_per_burst():
+    scheduler = RequestScheduler()
+    runs = []
+
+    async def refresh(value):
+        runs.append((value, _priority.get()))
+        await asyncio.sleep(0.02)
+
+    async def run():
+        for value in range(5):
+            task = scheduler.coalesce(('starboard', 1), lambda value=value: refresh(value), delay=0.02)
+        await asyncio.sleep(0.03)
+        # Called while the refresh runs: scheduled after it
+        late = scheduler.coalesce(('starboard', 1), lambda: refresh('late'), delay=0)
+        await asyncio.gather(task, late)
+
+    asyncio.run(run())
+
+    assert runs == [(4, Priority.BACKGROUND), ('late', Priority.BACKGROUND)]
+    assert scheduler.coalesced == 4
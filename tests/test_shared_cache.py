@@ -0,0 +1,112 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.shared_cache import SharedCache
+
+
+def test_local_only_mode_loads_once_and_invalidates():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return "!"
+
+    async def main():
+        cache = SharedCache()
+        assert await cache.connect(None) is False
+        assert await cache.get_or_load('prefix', 42, loader) == "!"
+        assert await cache.get_or_load('prefix', "42", loader) == "!"
+        await cache.invalidate('prefix', 42)
+        assert await cache.get('prefix', 42) is None
+        return cache
+
+    cache = asyncio.run(main())
+    assert len(calls) == 1
+    assert cache.stats['prefix']['l1_hits'] == 1
+    assert 0 < cache.hit_rates()['prefix'] < 1
+
+
+def test_redis_invalidation_reaches_other_instances():
+    """Needs a local redis-server (REDIS_URL, default redis://localhost:6379/15)"""
+    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/15")
+
+    async def main():
+        first, second = SharedCache(prefix='moddy-test'), SharedCache(prefix='moddy-test')
+        if not await first.connect(redis_url):
+            pytest.skip("redis-server not available")
+        await second.connect(redis_url)
+        try:
+            await first.set('guild_data', 1, {'config': {'prefix': '?'}})
+            # L2 hit for the second process, then cached in its L1
+            assert await second.get('guild_data', 1) == {'config': {'prefix': '?'}}
+
+            await first.invalidate('guild_data', 1)
+            await asyncio.sleep(0.2)
+            assert await second.get('guild_data', 1) is None
+        finally:
+            await first.close()
+            await second.close()
+
+    asyncio.run(main())
+
+
+def test_redis_messages_reach_other_instances_only():
+    """Needs a local redis-server (REDIS_URL, default redis://localhost:6379/15)"""
+    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/15")
+    received = []
+
+    async def main():
+        first, second = SharedCache(prefix='moddy-test'), SharedCache(prefix='moddy-test')
+
+        async def handler(data):
+            received.append(data)
+
+        # Subscribed before connect(): subscribed once connected
+        await second.subscribe('relay', handler)
+        await first.subscribe('relay', handler)
+        if not await first.connect(redis_url):
+            pytest.skip("redis-server not available")
+        await second.connect(redis_url)
+        try:
+            assert await first.publish('relay', {'moddy_id': 'ABCDEF'})
+            await asyncio.sleep(0.2)
+        finally:
+            await first.close()
+            await second.close()
+
+    asyncio.run(main())
+    assert received == [{'moddy_id': 'ABCDEF'}]
+
+
+def test_invalidation_during_load_skips_the_write_back():
+    async def main():
+        cache = SharedCache()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return "old"
+
+        load = asyncio.create_task(cache.get_or_load('prefix', 42, slow_loader))
+        await started.wait()
+        # The prefix changes while the old one is being read
+        await cache.invalidate('prefix', 42)
+        release.set()
+        assert await load == "old"
+
+        async def loader():
+            return "new"
+
+        assert await cache.get_or_load('prefix', 42, loader) == "new"
+        return cache
+
+    cache = asyncio.run(main())
+    assert cache.stats['prefix']['stale_loads'] == 1
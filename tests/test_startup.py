@@ -0,0 +1,70 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.startup import StartupPipeline
+
+
+def test_dependencies_run_after_their_parents():
+    order = []
+
+    async def step(name, delay=0.0):
+        await asyncio.sleep(delay)
+        order.append(name)
+
+    async def main():
+        pipeline = StartupPipeline()
+        pipeline.add_phase("db", lambda: step("db", 0.02))
+        pipeline.add_phase("i18n", lambda: step("i18n"))
+        pipeline.add_phase("extensions", lambda: step("extensions"), depends_on=["db", "i18n"])
+        await pipeline.run()
+        return pipeline
+
+    pipeline = asyncio.run(main())
+    assert order.index("extensions") > order.index("db")
+    assert all(row["status"] == "done" for row in pipeline.breakdown())
+
+
+def test_background_phase_is_off_the_critical_path():
+    async def main():
+        pipeline = StartupPipeline()
+        release = asyncio.Event()
+
+        async def slow_probe():
+            await release.wait()
+
+        async def fast():
+            pass
+
+        pipeline.add_phase("version", slow_probe, background=True)
+        pipeline.add_phase("database", fast)
+        await pipeline.run()
+        status = pipeline.phases["version"].status
+        release.set()
+        return status
+
+    assert asyncio.run(main()) == "running"
+
+
+def test_failed_phase_does_not_abort_dependents():
+    ran = []
+
+    async def boom():
+        raise RuntimeError("boom")
+
+    async def after():
+        ran.append(True)
+
+    async def main():
+        pipeline = StartupPipeline()
+        pipeline.add_phase("database", boom)
+        pipeline.add_phase("extensions", after, depends_on=["database"])
+        await pipeline.run()
+        return pipeline
+
+    pipeline = asyncio.run(main())
+    assert ran == [True]
+    assert pipeline.phases["database"].status == "failed"
@@ -0,0 +1,121 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path for direct imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.tracing import (
+    JsonlExporter, OtlpExporter, _wrap_discord_request, format_waterfall, instrument_methods, load_traces, tracer
+)
+
+
+class FakeDatabase:
+    async def get_user(self, user_id):
+        await asyncio.sleep(0.01)
+        return {'id': user_id}
+
+    async def _private(self):
+        return None
+
+
+instrument_methods(FakeDatabase, 'db')
+
+
+class FakeHTTPClient:
+    async def request(self, route, **kwargs):
+        await asyncio.sleep(0.005)
+        return {}
+
+
+FakeHTTPClient.request = _wrap_discord_request(FakeHTTPClient.request)
+
+
+def _enable(monkeypatch, path, sample_rate, slow_ms=10_000):
+    monkeypatch.setattr(tracer, 'exporter', JsonlExporter(str(path)))
+    monkeypatch.setattr(tracer, 'sample_rate', sample_rate)
+    monkeypatch.setattr(tracer, 'slow_ms', slow_ms)
+
+
+async def _command(name, db, http):
+    async with tracer.span(name, 'interaction', root=True):
+        await db.get_user(1)
+        route = SimpleNamespace(method='POST', path='/channels/{channel_id}/messages')
+        await http.request(route)
+        async with tracer.span('deepl_translate', 'stage'):
+            await asyncio.sleep(0.01)
+
+
+def test_spans_nest_per_task_and_are_exported(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    _enable(monkeypatch, path, sample_rate=1.0)
+
+    async def run():
+        db, http = FakeDatabase(), FakeHTTPClient()
+        # Outside a trace, instrumented methods open no span
+        await db.get_user(1)
+        await asyncio.gather(_command('/translate', db, http), _command('/config', db, http))
+        await tracer.close()
+
+    asyncio.run(run())
+
+    traces = load_traces(str(path))
+    assert len(traces) == 2
+    for spans in traces.values():
+        by_name = {span['name']: span for span in spans}
+        assert set(by_name) - {'/translate', '/config'} == {
+            'db.get_user', 'discord POST /channels/{channel_id}/messages', 'deepl_translate'
+        }
+        [root] = [span for span in spans if span['parent_id'] is None]
+        assert all(span['parent_id'] == root['span_id'] for span in spans if span is not root)
+        assert root['duration_ms'] >= by_name['db.get_user']['duration_ms'] >= 10
+
+    waterfall = format_waterfall(next(iter(traces.values())))
+    assert "  db.get_user" in waterfall
+    assert "█" in waterfall
+
+
+def test_unsampled_traces_are_kept_only_when_slow(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    _enable(monkeypatch, path, sample_rate=0.0, slow_ms=15)
+
+    async def run():
+        async with tracer.span('/ping', 'interaction', root=True):
+            pass
+        async with tracer.span('/subscription', 'interaction', root=True):
+            await FakeDatabase().get_user(1)
+            await asyncio.sleep(0.01)
+        await tracer.close()
+
+    asyncio.run(run())
+
+    traces = load_traces(str(path))
+    assert [span['name'] for spans in traces.values() for span in spans if span['parent_id'] is None] == ['/subscription']
+
+
+def test_errors_are_recorded_and_otlp_payload_is_valid(monkeypatch, tmp_path):
+    _enable(monkeypatch, tmp_path / "traces.jsonl", sample_rate=1.0)
+    exported = []
+
+    async def run():
+        root = tracer.start_trace('/config', guild_id=123)
+        try:
+            async with tracer.span('backend.get_subscription_info', 'backend'):
+                raise RuntimeError("backend down")
+        except RuntimeError:
+            pass
+        tracer.end_trace(root, 'error')
+        exported.extend(root._spans)
+        await tracer.close()
+
+    asyncio.run(run())
+
+    payload = OtlpExporter("http://collector:4318/").payload(exported)
+    spans = payload['resourceSpans'][0]['scopeSpans'][0]['spans']
+    child, root = spans
+    assert child['status'] == {'code': 2, 'message': "RuntimeError: backend down"}
+    assert child['parentSpanId'] == root['spanId'] and root['parentSpanId'] == ''
+    assert root['kind'] == 2 and child['kind'] == 3
+    assert root['attributes'] == [{'key': 'guild_id', 'value': {'intValue': '123'}}]
+    assert len(root['traceId']) == 32 and len(root['spanId']) == 16
@@ -0,0 +1,153 @@
+"""
+Shard clusters
+Splits the shards into contiguous ranges (one bot process per range), elects the
+cluster running the singleton work and serves/aggregates per-cluster health
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger('moddy.cluster')
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """
+    Splits shard_count shards into cluster_count contiguous ranges
+
+    The first clusters get one extra shard when the division is not exact,
+    e.g. 10 shards on 3 clusters -> [0..3], [4..6], [7..9].
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count must be >= 1")
+    cluster_count = max(1, min(cluster_count, shard_count))
+
+    base, extra = divmod(shard_count, cluster_count)
+    ranges = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        size = base + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Discord's sharding formula"""
+    return (guild_id >> 22) % shard_count
+
+
+def elect_singleton_cluster(ranges: List[List[int]], shard_count: int,
+                            guild_id: Optional[int] = None) -> int:
+    """
+    Returns the cluster that runs the cluster-wide singleton work
+
+    The internal API works on the main Moddy guild through the gateway cache,
+    so the cluster owning that guild's shard is elected. Without a main guild,
+    the cluster owning shard 0 is elected.
+    """
+    shard_id = shard_for_guild(guild_id, shard_count) if guild_id else 0
+    for cluster_id, shards in enumerate(ranges):
+        if shard_id in shards:
+            return cluster_id
+    return 0
+
+
+def aggregate_health(reports: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Merges the health reports of every cluster
+
+    Args:
+        reports: {cluster name: health JSON or None if unreachable}
+
+    Returns:
+        Dict (clusters, ready, down, shards, guilds, max_latency_ms, singleton)
+    """
+    summary = {
+        'clusters': len(reports),
+        'ready': 0,
+        'down': [],
+        'shards': 0,
+        'guilds': 0,
+        'max_latency_ms': None,
+        'singleton': None
+    }
+
+    for name, report in sorted(reports.items()):
+        if not report:
+            summary['down'].append(name)
+            continue
+
+        if report.get('ready'):
+            summary['ready'] += 1
+        summary['shards'] += len(report.get('shard_ids') or [])
+        summary['guilds'] += report.get('guilds', 0)
+
+        latency = report.get('max_latency_ms')
+        if latency is not None and (summary['max_latency_ms'] is None or latency > summary['max_latency_ms']):
+            summary['max_latency_ms'] = latency
+
+        if report.get('singleton'):
+            summary['singleton'] = name
+
+    return summary
+
+
+class ClusterHealthServer:
+    """
+    Small HTTP health endpoint of a cluster process
+
+    GET /health answers 503 until the cluster is ready, then 200, with the
+    cluster's shards, guild count and latency as JSON. The supervisor uses it
+    both as the start-up health check and for the aggregated cluster status.
+    GET /metrics serves the cluster's Prometheus metrics (localhost only).
+    """
+
+    def __init__(self, bot, cluster_id: int, port: int):
+        self.bot = bot
+        self.cluster_id = cluster_id
+        self.port = port
+        self.started_at = time.time()
+        self.runner = None
+
+    def report(self) -> Dict[str, Any]:
+        """Health report of this cluster"""
+        latencies = [
+            latency for _, latency in self.bot.gateway_metrics.latencies()
+            if latency == latency and latency != float('inf')
+        ]
+        return {
+            'cluster_id': self.cluster_id,
+            'shard_ids': list(self.bot.shard_ids or []),
+            'ready': self.bot.is_ready(),
+            'guilds': len(self.bot.guilds),
+            'max_latency_ms': round(max(latencies) * 1000, 1) if latencies else None,
+            'singleton': self.bot.runs_singleton_tasks,
+            'loop_lag_p99_ms': round(self.bot.loop_watchdog.percentiles()['p99'], 1),
+            'uptime': round(time.time() - self.started_at)
+        }
+
+    async def start(self):
+        from aiohttp import web
+
+        async def handle_health(request):
+            report = self.report()
+            return web.json_response(report, status=200 if report['ready'] else 503)
+
+        async def handle_metrics(request):
+            from utils.metrics import render_metrics
+            return web.Response(text=render_metrics(self.bot), content_type='text/plain', charset='utf-8')
+
+        app = web.Application()
+        app.router.add_get('/health', handle_health)
+        app.router.add_get('/metrics', handle_metrics)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, '127.0.0.1', self.port).start()
+        logger.info(f"✅ Cluster {self.cluster_id} health endpoint on port {self.port}")
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
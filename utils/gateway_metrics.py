@@ -0,0 +1,161 @@
+"""
+Gateway Metrics
+Counts gateway events per shard and per type, and exposes per-shard latency and event rates
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('moddy.gateway_metrics')
+
+
+class RateWindow:
+    """Sliding window counter (one bucket per second)"""
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        second = int(now if now is not None else time.monotonic())
+        self._buckets[second] = self._buckets.get(second, 0) + count
+        if len(self._buckets) > self.window * 2:
+            self._prune(second)
+
+    def _prune(self, second: int):
+        limit = second - self.window
+        for key in [key for key in self._buckets if key <= limit]:
+            del self._buckets[key]
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Average events per second over the window"""
+        second = int(now if now is not None else time.monotonic())
+        self._prune(second)
+        return sum(self._buckets.values()) / self.window
+
+
+class GatewayMetrics:
+    """
+    Per-shard gateway event accounting
+
+    Hooks the parsers of the connection state so every dispatched gateway
+    event is counted against the shard that received it. The shard is derived
+    from the event's guild ID with Discord's sharding formula; events without
+    a guild (DMs, USER_UPDATE...) are delivered to shard 0.
+    """
+
+    def __init__(self, bot, window: int = 60):
+        self.bot = bot
+        self.window = window
+        self.started_at = time.monotonic()
+        self.totals: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._rates: Dict[int, RateWindow] = {}
+        self._installed = False
+
+    def install(self):
+        """Wraps the connection state parsers (the dict is shared with every shard websocket)"""
+        if self._installed:
+            return
+
+        parsers = self.bot._connection.parsers
+        for event, parser in list(parsers.items()):
+            parsers[event] = self._wrap(event, parser)
+
+        self._installed = True
+        logger.info(f"✅ Gateway metrics installed ({len(parsers)} event types)")
+
+    def _wrap(self, event: str, parser: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        record = self.record
+
+        def wrapped(data):
+            record(event, data)
+            return parser(data)
+
+        return wrapped
+
+    def shard_for(self, data: Any) -> int:
+        """Returns the shard ID handling an event payload"""
+        shard_count = self.bot.shard_count or 1
+        if shard_count == 1 or not isinstance(data, dict):
+            return 0
+
+        guild_id = data.get('guild_id')
+        if guild_id is None and 'id' in data and 'unavailable' in data:
+            # GUILD_CREATE / GUILD_DELETE carry the guild ID as 'id'
+            guild_id = data['id']
+        if guild_id is None:
+            return 0
+
+        return (int(guild_id) >> 22) % shard_count
+
+    def record(self, event: str, data: Any):
+        """Counts one gateway event"""
+        try:
+            shard_id = self.shard_for(data)
+            self.totals[shard_id][event] += 1
+
+            window = self._rates.get(shard_id)
+            if window is None:
+                window = self._rates[shard_id] = RateWindow(self.window)
+            window.add()
+        except Exception as e:
+            # Metrics must never break event dispatch
+            logger.debug(f"Gateway metrics error for {event}: {e}")
+
+    def latencies(self) -> List[Tuple[int, float]]:
+        """Gateway latency (seconds) per shard"""
+        latencies = getattr(self.bot, 'latencies', None)
+        if latencies is not None:
+            return list(latencies)
+        return [(0, self.bot.latency)]
+
+    def event_rate(self, shard_id: int) -> float:
+        """Events per second received by a shard over the sliding window"""
+        window = self._rates.get(shard_id)
+        return window.rate() if window else 0.0
+
+    def events_by_type(self) -> Dict[str, int]:
+        """Total events per type, all shards combined"""
+        combined: Dict[str, int] = defaultdict(int)
+        for events in self.totals.values():
+            for event, count in events.items():
+                combined[event] += count
+        return dict(combined)
+
+    def shard_summary(self) -> List[Dict[str, Any]]:
+        """
+        Per-shard summary
+
+        Returns:
+            List of dicts (shard_id, latency_ms, events_per_second, total_events, guilds)
+        """
+        guild_counts: Dict[int, int] = defaultdict(int)
+        for guild in self.bot.guilds:
+            guild_counts[guild.shard_id or 0] += 1
+
+        summary = []
+        for shard_id, latency in self.latencies():
+            latency_ms = latency * 1000 if latency == latency and latency != float('inf') else None
+            summary.append({
+                'shard_id': shard_id,
+                'latency_ms': latency_ms,
+                'events_per_second': self.event_rate(shard_id),
+                'total_events': sum(self.totals[shard_id].values()) if shard_id in self.totals else 0,
+                'guilds': guild_counts.get(shard_id, 0)
+            })
+        return summary
+
+    def format_summary(self, limit: int = 10) -> str:
+        """Human-readable per-shard summary (one line per shard)"""
+        rows = self.shard_summary()
+        lines = []
+        for row in rows[:limit]:
+            latency = f"{row['latency_ms']:.0f}ms" if row['latency_ms'] is not None else "n/a"
+            lines.append(
+                f"**#{row['shard_id']}** {latency} • {row['events_per_second']:.1f} ev/s • {row['guilds']:,} guilds"
+            )
+        if len(rows) > limit:
+            lines.append(f"*...and {len(rows) - limit} more shards*")
+        return "\n".join(lines)
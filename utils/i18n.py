@@ -3,7 +3,7 @@ Système i18n (internationalisation) pour Moddy
 Gère automatiquement les traductions basées sur interaction.locale
 """
 
-import json
+from utils import json_codec as json
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
@@ -0,0 +1,184 @@
+"""
+Import-time profiler
+Runs `python -X importtime` on the bot's extensions in a fresh interpreter
+and saves a report sorted by cumulative import time.
+
+Usage:
+    python -m utils.import_profiler                 # cogs + staff extensions
+    python -m utils.import_profiler cogs.config     # specific modules
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger('moddy.import_profiler')
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+REPORTS_DIR = ROOT_DIR / 'logs'
+
+# Printed by the child interpreter once every import is done
+_RSS_MARKER = "MODDY_IMPORT_RSS_KB="
+
+
+def discover_extensions() -> Dict[str, List[str]]:
+    """
+    Lists the extensions loaded by ModdyBot, split by loading stage
+
+    Returns:
+        {'cogs': [...], 'staff': [...]} with dotted module names
+    """
+    cogs = sorted(
+        f"cogs.{file.stem}" for file in (ROOT_DIR / 'cogs').glob('*.py')
+        if not file.name.startswith('_')
+    )
+    staff = sorted(
+        f"staff.{file.stem}" for file in (ROOT_DIR / 'staff').glob('*.py')
+        if not file.name.startswith('_') and file.name != 'base.py'
+    )
+    return {'cogs': cogs, 'staff': staff}
+
+
+def _child_script(modules: List[str]) -> str:
+    """Builds the code executed by the profiled interpreter"""
+    imports = "\n".join(
+        f"try:\n    importlib.import_module({name!r})\nexcept Exception as e:\n    print('IMPORT FAILED {name}:', e)"
+        for name in modules
+    )
+    return (
+        "import importlib, resource, sys\n"
+        f"sys.path.insert(0, {str(ROOT_DIR)!r})\n"
+        f"{imports}\n"
+        f"print({_RSS_MARKER!r} + str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))\n"
+    )
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parses the `-X importtime` output
+
+    Returns:
+        List of {'module', 'self_us', 'cumulative_us', 'depth'} dicts
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            parts = line[len("import time:"):].split("|")
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+            raw_name = parts[2]
+            name = raw_name.strip()
+            depth = (len(raw_name) - len(raw_name.lstrip(' ')) - 1) // 2
+        except (ValueError, IndexError):
+            continue
+        rows.append({
+            'module': name,
+            'self_us': self_us,
+            'cumulative_us': cumulative_us,
+            'depth': depth
+        })
+    return rows
+
+
+def profile_imports(modules: List[str]) -> Dict:
+    """
+    Imports the given modules in a fresh interpreter with -X importtime
+
+    Returns:
+        {'rows', 'total_us', 'wall_s', 'rss_kb', 'errors'}
+    """
+    # config.py exits at import time without a token
+    env = dict(os.environ)
+    env.setdefault("DISCORD_TOKEN", "import-profiler")
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _child_script(modules)],
+        capture_output=True,
+        text=True,
+        cwd=ROOT_DIR,
+        env=env
+    )
+    wall = time.perf_counter() - start
+
+    rss_kb = None
+    errors = []
+    for line in result.stdout.splitlines():
+        if line.startswith(_RSS_MARKER):
+            rss_kb = int(line[len(_RSS_MARKER):])
+        elif line.startswith("IMPORT FAILED"):
+            errors.append(line)
+
+    rows = parse_importtime(result.stderr)
+    total_us = sum(row['cumulative_us'] for row in rows if row['depth'] == 0)
+
+    return {
+        'rows': rows,
+        'total_us': total_us,
+        'wall_s': wall,
+        'rss_kb': rss_kb,
+        'errors': errors
+    }
+
+
+def format_report(label: str, modules: List[str], profile: Dict, top: int = 40) -> str:
+    """Formats a profile as a plain-text report"""
+    lines = [
+        f"# Import profile: {label}",
+        f"# Modules: {len(modules)}",
+        f"# Total import time: {profile['total_us'] / 1000:.1f}ms",
+        f"# Interpreter wall time: {profile['wall_s'] * 1000:.0f}ms",
+        f"# Peak RSS: {profile['rss_kb'] / 1024:.1f} MB" if profile['rss_kb'] else "# Peak RSS: n/a",
+    ]
+    for error in profile['errors']:
+        lines.append(f"# {error}")
+
+    lines.append("")
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    heaviest = sorted(profile['rows'], key=lambda r: r['cumulative_us'], reverse=True)[:top]
+    for row in heaviest:
+        lines.append(f"{row['cumulative_us'] / 1000:>14.1f} {row['self_us'] / 1000:>9.1f}  {row['module']}")
+    return "\n".join(lines) + "\n"
+
+
+def save_report(content: str, output: Optional[Path] = None) -> Path:
+    """Writes the report into logs/ (or the given path)"""
+    if output is None:
+        REPORTS_DIR.mkdir(exist_ok=True)
+        output = REPORTS_DIR / f"importtime_{time.strftime('%Y%m%d_%H%M%S')}.txt"
+    output.write_text(content, encoding='utf-8')
+    logger.info(f"📝 Import profile saved to {output}")
+    return output
+
+
+def main(argv: List[str]) -> int:
+    if argv:
+        stages = {'custom': argv}
+    else:
+        extensions = discover_extensions()
+        # Critical path (cogs) first, then the whole bot
+        stages = {
+            'cogs (critical path)': extensions['cogs'],
+            'cogs + staff': extensions['cogs'] + extensions['staff'],
+        }
+
+    report = []
+    for label, modules in stages.items():
+        profile = profile_imports(modules)
+        report.append(format_report(label, modules, profile))
+        rss = f"{profile['rss_kb'] / 1024:.1f} MB" if profile['rss_kb'] else "n/a"
+        print(f"{label}: {profile['total_us'] / 1000:.1f}ms imports, RSS {rss}")
+
+    path = save_report("\n".join(report))
+    print(f"Report saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
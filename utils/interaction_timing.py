@@ -0,0 +1,253 @@
+"""
+Interaction Timing
+Time-to-first-response and total handler time of app commands, component
+callbacks and modals, per command / custom_id prefix, with the slowest recent
+invocations and their stage breakdown (shown by d.slow, exported on /metrics)
+"""
+
+import functools
+import logging
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import discord
+from discord.ui.modal import Modal
+from discord.ui.view import BaseView
+
+from utils.loop_watchdog import percentile
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+logger = logging.getLogger('moddy.interaction_timing')
+
+# Keys stored in Interaction.extras
+STARTED_KEY = 'timing_started'
+FIRST_RESPONSE_KEY = 'timing_first_response'
+STAGES_KEY = 'timing_stages'
+RECORDED_KEY = 'timing_recorded'
+
+# InteractionResponse methods that acknowledge an interaction
+RESPONSE_METHODS = ('defer', 'pong', 'send_message', 'edit_message', 'send_modal', 'autocomplete', 'launch_activity')
+
+_TRAILING_ID = re.compile(r'[_:\-.]?\d+$')
+_GENERATED_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def custom_id_prefix(custom_id: Optional[str]) -> str:
+    """
+    Groups custom_ids by their static part
+
+    Trailing numeric IDs are removed ("save_perms_1234" -> "save_perms") and
+    the random custom_ids discord.py generates become "*".
+    """
+    if not custom_id:
+        return "*"
+    if _GENERATED_ID.match(custom_id):
+        return "*"
+    previous = None
+    while previous != custom_id:
+        previous = custom_id
+        custom_id = _TRAILING_ID.sub('', custom_id)
+    return custom_id or "*"
+
+
+@asynccontextmanager
+async def timed_stage(interaction: Optional[discord.Interaction], name: str):
+    """
+    Measures one stage of an interaction handler (shown in the d.slow breakdown,
+    and as a span when the interaction is traced)
+
+    Usage:
+        async with timed_stage(interaction, 'deepl_translate'):
+            translated = await self.translate_text(...)
+    """
+    start = time.perf_counter()
+    try:
+        async with tracer.span(name, 'stage'):
+            yield
+    finally:
+        if interaction is not None:
+            interaction.extras.setdefault(STAGES_KEY, []).append((name, time.perf_counter() - start))
+
+
+def start_timing(interaction: discord.Interaction):
+    """Marks the start of the handling of an interaction (first call wins)"""
+    interaction.extras.setdefault(STARTED_KEY, time.perf_counter())
+
+
+class InteractionTimings:
+    """
+    Per-command interaction timings
+
+    install() wraps, once per process:
+    - the InteractionResponse methods, to stamp the first response (TTFR)
+    - the view and modal dispatch tasks, to time component callbacks
+    App commands are timed by the bot (tree.interaction_check ->
+    on_app_command_completion / on_app_command_error).
+    """
+
+    def __init__(self, bot, samples: int = 500, recent: int = 200):
+        self.bot = bot
+        self.samples = samples
+        # (kind, name) -> {'total': deque, 'first_response': deque, 'count', 'errors'}
+        self.stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=recent)
+
+    # ================ HOOKS ================
+
+    @staticmethod
+    def install():
+        """Wraps the discord.py response and dispatch methods (idempotent)"""
+        for method_name in RESPONSE_METHODS:
+            method = getattr(discord.InteractionResponse, method_name, None)
+            if method is None or getattr(method, '_moddy_timed', False):
+                continue
+            setattr(discord.InteractionResponse, method_name, _wrap_response(method))
+
+        if not getattr(BaseView._scheduled_task, '_moddy_timed', False):
+            BaseView._scheduled_task = _wrap_view_task(BaseView._scheduled_task)
+        if not getattr(Modal._scheduled_task, '_moddy_timed', False):
+            Modal._scheduled_task = _wrap_modal_task(Modal._scheduled_task)
+
+    def record(self, interaction: discord.Interaction, kind: str, name: str, status: str = 'ok'):
+        """Records a finished interaction (once per interaction)"""
+        extras = interaction.extras
+        started = extras.get(STARTED_KEY)
+        if started is None or extras.get(RECORDED_KEY):
+            return
+        extras[RECORDED_KEY] = True
+
+        total = time.perf_counter() - started
+        first_response = extras.get(FIRST_RESPONSE_KEY)
+        ttfr = first_response - started if first_response is not None else None
+
+        entry = self.stats.get((kind, name))
+        if entry is None:
+            entry = self.stats[(kind, name)] = {
+                'total': deque(maxlen=self.samples),
+                'first_response': deque(maxlen=self.samples),
+                'count': 0,
+                'errors': 0,
+            }
+        entry['total'].append(total)
+        entry['count'] += 1
+        if status != 'ok':
+            entry['errors'] += 1
+        if ttfr is not None:
+            entry['first_response'].append(ttfr)
+
+        metrics.interaction_seconds.observe(total, kind, name, 'total')
+        if ttfr is not None:
+            metrics.interaction_seconds.observe(ttfr, kind, name, 'first_response')
+
+        self.recent.append({
+            'at': datetime.now(timezone.utc),
+            'kind': kind,
+            'name': name,
+            'status': status,
+            'total': total,
+            'first_response': ttfr,
+            'stages': list(extras.get(STAGES_KEY, [])),
+            'user_id': interaction.user.id if interaction.user else None,
+        })
+
+    # ================ REPORTS ================
+
+    def worst(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Commands / callbacks sorted by p99 handler time (seconds)"""
+        rows = []
+        for (kind, name), entry in self.stats.items():
+            totals = sorted(entry['total'])
+            ttfrs = sorted(entry['first_response'])
+            rows.append({
+                'kind': kind,
+                'name': name,
+                'count': entry['count'],
+                'errors': entry['errors'],
+                'p50': percentile(totals, 50),
+                'p99': percentile(totals, 99),
+                'ttfr_p99': percentile(ttfrs, 99) if ttfrs else None,
+            })
+        rows.sort(key=lambda row: row['p99'], reverse=True)
+        return rows[:limit]
+
+    def slowest_recent(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Slowest invocations among the recent ones"""
+        return sorted(self.recent, key=lambda record: record['total'], reverse=True)[:limit]
+
+    def format_worst(self, limit: int = 10) -> str:
+        lines = []
+        for row in self.worst(limit):
+            ttfr = f"{row['ttfr_p99'] * 1000:.0f}ms" if row['ttfr_p99'] is not None else "n/a"
+            errors = f" • {row['errors']} err" if row['errors'] else ""
+            lines.append(
+                f"`{row['kind'][:4]}` **{row['name']}** p99 `{row['p99'] * 1000:.0f}ms` "
+                f"(p50 `{row['p50'] * 1000:.0f}ms`, TTFR p99 `{ttfr}`) • {row['count']:,} calls{errors}"
+            )
+        return "\n".join(lines)
+
+    def format_slowest(self, limit: int = 5) -> str:
+        lines = []
+        for record in self.slowest_recent(limit):
+            ttfr = f"{record['first_response'] * 1000:.0f}ms" if record['first_response'] is not None else "none"
+            stages = " → ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in record['stages'])
+            lines.append(
+                f"**{record['name']}** `{record['total'] * 1000:.0f}ms` (TTFR {ttfr}, {record['status']}) "
+                f"<t:{int(record['at'].timestamp())}:R>"
+                + (f"\n-# {stages}" if stages else "")
+            )
+        return "\n".join(lines)
+
+
+def _wrap_response(method):
+    @functools.wraps(method)
+    async def wrapped(self, *args, **kwargs):
+        result = await method(self, *args, **kwargs)
+        extras = self._parent.extras
+        if FIRST_RESPONSE_KEY not in extras:
+            extras[FIRST_RESPONSE_KEY] = time.perf_counter()
+        return result
+
+    wrapped._moddy_timed = True
+    return wrapped
+
+
+def _get_timings(interaction: discord.Interaction) -> Optional[InteractionTimings]:
+    return getattr(interaction.client, 'interaction_timings', None)
+
+
+def _wrap_view_task(task):
+    @functools.wraps(task)
+    async def wrapped(self, item, interaction):
+        start_timing(interaction)
+        name = f"{type(self).__name__}:{custom_id_prefix(getattr(item, 'custom_id', None))}"
+        try:
+            async with tracer.span(name, 'interaction', root=True, interaction_id=interaction.id):
+                return await task(self, item, interaction)
+        finally:
+            timings = _get_timings(interaction)
+            if timings:
+                timings.record(interaction, 'component', name)
+
+    wrapped._moddy_timed = True
+    return wrapped
+
+
+def _wrap_modal_task(task):
+    @functools.wraps(task)
+    async def wrapped(self, interaction, components):
+        start_timing(interaction)
+        try:
+            async with tracer.span(type(self).__name__, 'interaction', root=True, interaction_id=interaction.id):
+                return await task(self, interaction, components)
+        finally:
+            timings = _get_timings(interaction)
+            if timings:
+                timings.record(interaction, 'modal', type(self).__name__)
+
+    wrapped._moddy_timed = True
+    return wrapped
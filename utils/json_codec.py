@@ -0,0 +1,78 @@
+"""
+JSON Codec
+Single entry point for the bot's own JSON encoding and decoding.
+
+The backend is the stdlib `json` module by default; `configure('orjson')`
+switches to orjson when it is installed (see utils.performance). Both
+backends return `str` from dumps() and accept `str`/`bytes` in loads(), so
+callers do not depend on the active backend.
+"""
+
+import json as _stdlib_json
+import logging
+from typing import Any
+
+logger = logging.getLogger('moddy.json_codec')
+
+# orjson.JSONDecodeError is a subclass of this one
+JSONDecodeError = _stdlib_json.JSONDecodeError
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+BACKEND = 'stdlib'
+
+
+def configure(backend: str) -> str:
+    """
+    Selects the JSON backend ('stdlib' or 'orjson')
+
+    Falls back to stdlib when orjson is not installed.
+
+    Returns:
+        The backend actually in use
+    """
+    global BACKEND
+
+    if backend == 'orjson' and _orjson is None:
+        logger.warning("⚠️ orjson not installed, using the stdlib json backend")
+        backend = 'stdlib'
+    elif backend not in ('stdlib', 'orjson'):
+        logger.warning(f"⚠️ Unknown JSON backend {backend}, using stdlib")
+        backend = 'stdlib'
+
+    BACKEND = backend
+    return BACKEND
+
+
+def dumps(obj: Any, indent: int = None, **kwargs) -> str:
+    """
+    Serializes obj to a JSON string
+
+    Extra keyword arguments (ensure_ascii, default...) are stdlib options: when
+    they are given, the stdlib backend is used for that call.
+    """
+    if BACKEND == 'orjson' and not kwargs:
+        option = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        try:
+            return _orjson.dumps(obj, option=option).decode('utf-8')
+        except TypeError:
+            # Integers above 64 bits and other types orjson refuses
+            pass
+    return _stdlib_json.dumps(obj, indent=indent, **kwargs)
+
+
+def loads(data: Any) -> Any:
+    """Parses a JSON document (str or bytes)"""
+    if BACKEND == 'orjson':
+        return _orjson.loads(data)
+    return _stdlib_json.loads(data)
+
+
+def load(fp) -> Any:
+    """Parses a JSON document from a file object"""
+    return loads(fp.read())
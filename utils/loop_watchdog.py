@@ -0,0 +1,187 @@
+"""
+Event Loop Watchdog
+Measures the scheduling lag of the asyncio event loop and, when the loop is
+blocked, captures the stack of the loop thread from a helper thread
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+
+import discord
+
+logger = logging.getLogger('moddy.loop_watchdog')
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class LoopWatchdog:
+    """
+    Event loop lag watchdog
+
+    A probe task sleeps for `interval` seconds in a loop and records how late
+    it wakes up: that delay is the time other callbacks kept the loop busy.
+
+    A helper thread watches the probe heartbeat. When the loop has not run the
+    probe for longer than `threshold`, the loop is blocked right now: the
+    helper thread captures the stack of the loop thread (sys._current_frames)
+    while it is still stuck in the blocking code. Once the loop resumes, the
+    stall is logged and reported to the error channel, at most once every
+    `report_cooldown` seconds.
+    """
+
+    def __init__(self, bot, interval: float = 0.25, threshold: float = 0.5,
+                 report_cooldown: float = 300, history: int = 2400):
+        self.bot = bot
+        self.interval = interval
+        self.threshold = threshold
+        self.report_cooldown = report_cooldown
+
+        # Lag samples in seconds (history * interval = 10 minutes by default)
+        self.samples: Deque[float] = deque(maxlen=history)
+        self.stalls: Deque[Dict] = deque(maxlen=20)
+        self.stall_count = 0
+        self.suppressed_reports = 0
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._captured_stack: Optional[str] = None
+        self._last_report = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Starts the probe task and the helper thread (must be called from the loop thread)"""
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+
+        self._task = asyncio.create_task(self._probe(), name="loop_watchdog:probe")
+        self._thread = threading.Thread(target=self._monitor, daemon=True, name="LoopWatchdog")
+        self._thread.start()
+        logger.info(f"✅ Loop watchdog started (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _probe(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+
+            self._heartbeat = time.monotonic()
+            self.samples.append(lag)
+
+            if lag >= self.threshold:
+                self._on_stall(lag)
+
+    def _monitor(self):
+        """Helper thread: captures the loop thread stack while the loop is blocked"""
+        check_every = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(check_every):
+            blocked_for = time.monotonic() - self._heartbeat - self.interval
+            if blocked_for < self.threshold or self._captured_stack is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._captured_stack = "".join(traceback.format_stack(frame))
+
+    def _on_stall(self, lag: float):
+        """Called from the loop once it resumes after a stall"""
+        stack = self._captured_stack or "(stack not captured: the loop resumed before the watchdog thread ran)"
+        self._captured_stack = None
+        self.stall_count += 1
+
+        stall = {
+            'at': datetime.now(timezone.utc),
+            'lag_ms': lag * 1000,
+            'stack': stack
+        }
+        self.stalls.append(stall)
+        logger.warning(f"⚠️ Event loop blocked for {lag * 1000:.0f}ms ⮐ {stack.strip()}")
+
+        now = time.monotonic()
+        if now - self._last_report < self.report_cooldown:
+            self.suppressed_reports += 1
+            return
+        self._last_report = now
+        asyncio.create_task(self._report(stall), name="loop_watchdog:report")
+
+    async def _report(self, stall: Dict):
+        """Sends a stall report to the error channel"""
+        error_tracker = self.bot.get_cog("ErrorTracker")
+        if not error_tracker or not self.bot.is_ready():
+            return
+
+        try:
+            channel = await error_tracker.get_error_channel()
+            if not channel:
+                return
+
+            stats = self.percentiles()
+            embed = discord.Embed(
+                title="Event Loop Blocked",
+                description=f"The event loop was blocked for **{stall['lag_ms']:.0f}ms**",
+                color=discord.Color.orange(),
+                timestamp=stall['at']
+            )
+            embed.add_field(
+                name="Lag (last 10 min)",
+                value=f"p50 `{stats['p50']:.1f}ms` • p95 `{stats['p95']:.1f}ms` • p99 `{stats['p99']:.1f}ms` • max `{stats['max']:.0f}ms`",
+                inline=False
+            )
+            # Innermost frames are the most useful
+            embed.add_field(name="Stack", value=f"```py\n{stall['stack'][-1000:]}```", inline=False)
+            if self.suppressed_reports:
+                embed.set_footer(text=f"{self.suppressed_reports} stall(s) not reported (rate limit)")
+                self.suppressed_reports = 0
+
+            await channel.send(embed=embed)
+        except Exception as e:
+            logger.error(f"❌ Error sending loop stall report: {e}")
+
+    def percentiles(self) -> Dict[str, float]:
+        """Lag percentiles in milliseconds over the sample history"""
+        values = sorted(self.samples)
+        return {
+            'p50': percentile(values, 50) * 1000,
+            'p95': percentile(values, 95) * 1000,
+            'p99': percentile(values, 99) * 1000,
+            'max': (values[-1] if values else 0.0) * 1000,
+            'samples': len(values),
+            'stalls': self.stall_count,
+        }
+
+    def format_summary(self) -> str:
+        """Human-readable lag summary"""
+        stats = self.percentiles()
+        lines = [
+            f"**p50:** {stats['p50']:.1f}ms • **p95:** {stats['p95']:.1f}ms • **p99:** {stats['p99']:.1f}ms",
+            f"**Max:** {stats['max']:.0f}ms • **Stalls:** {stats['stalls']} (>{self.threshold * 1000:.0f}ms)",
+        ]
+        if self.stalls:
+            last = self.stalls[-1]
+            lines.append(f"**Last stall:** {last['lag_ms']:.0f}ms <t:{int(last['at'].timestamp())}:R>")
+        return "\n".join(lines)
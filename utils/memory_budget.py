@@ -0,0 +1,367 @@
+"""
+Memory Budget
+Memory profiles for the member and message caches, on-demand member chunking
+and memory reports per guild count.
+
+Usage (synthetic report, no Discord connection):
+    python -m utils.memory_budget                      # 100 and 1000 guilds
+    python -m utils.memory_budget 500 5000 --members 200
+    python -m utils.memory_budget 10000 --modules      # bytes per (guild, module)
+"""
+
+import asyncio
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+import discord
+
+logger = logging.getLogger('moddy.memory_budget')
+
+
+@dataclass(frozen=True)
+class MemoryProfile:
+    """Cache settings applied to the discord.py client"""
+    name: str
+    chunk_guilds_at_startup: bool
+    member_cache: str  # 'all', 'joined' or 'none' (see member_cache_flags)
+    max_messages: Optional[int]
+    description: str
+
+    def member_cache_flags(self) -> discord.MemberCacheFlags:
+        if self.member_cache == 'all':
+            return discord.MemberCacheFlags.all()
+        if self.member_cache == 'joined':
+            return discord.MemberCacheFlags(joined=True, voice=False)
+        return discord.MemberCacheFlags.none()
+
+
+PROFILES: Dict[str, MemoryProfile] = {
+    # Current behaviour: every member of every guild, large message cache
+    'full': MemoryProfile(
+        'full', True, 'all', 10000,
+        "Chunks every guild at startup, caches every member"
+    ),
+    # Members seen through events + guilds chunked on demand
+    'balanced': MemoryProfile(
+        'balanced', False, 'all', 2000,
+        "No startup chunking, caches members as they are seen, chunks guilds on demand"
+    ),
+    # Only the guilds whose modules need members are chunked. Members received
+    # from the gateway stay cached: with an empty cache bot.get_user() would
+    # return None for almost everyone
+    'minimal': MemoryProfile(
+        'minimal', False, 'joined', 500,
+        "Caches the members received from the gateway, chunks only the guilds whose modules need members"
+    ),
+}
+
+
+def get_memory_profile(name: str, max_messages: Optional[int] = None,
+                       chunk_guilds_at_startup: Optional[bool] = None) -> MemoryProfile:
+    """
+    Returns a profile with the optional overrides (MAX_MESSAGES, CHUNK_GUILDS_AT_STARTUP)
+
+    Unknown names fall back to 'full', the historical behaviour.
+    """
+    profile = PROFILES.get(name)
+    if profile is None:
+        logger.warning(f"⚠️ Unknown memory profile {name}, using 'full'")
+        profile = PROFILES['full']
+
+    return MemoryProfile(
+        profile.name,
+        profile.chunk_guilds_at_startup if chunk_guilds_at_startup is None else chunk_guilds_at_startup,
+        profile.member_cache,
+        profile.max_messages if max_messages is None else (max_messages or None),
+        profile.description
+    )
+
+
+class MemberChunker:
+    """
+    On-demand member chunking
+
+    When startup chunking is off, modules that need the member list of their
+    guild (REQUIRES_MEMBERS) ask for it here. Requests are queued and sent one
+    at a time so the gateway command rate limit is never hit in bursts.
+    """
+
+    def __init__(self, bot, delay: float = 0.5):
+        self.bot = bot
+        self.delay = delay
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.pending: Set[int] = set()
+        self._worker: Optional[asyncio.Task] = None
+
+    def request(self, guild_id: int):
+        """
+        Queues a guild for chunking (no-op if already chunked or queued)
+
+        guild.chunked is checked rather than remembered: after a reconnect the
+        guild is rebuilt from its GUILD_CREATE and has to be chunked again.
+        """
+        if guild_id in self.pending:
+            return
+
+        guild = self.bot.get_guild(guild_id)
+        if guild is not None and guild.chunked:
+            return
+
+        self.pending.add(guild_id)
+        self.queue.put_nowait(guild_id)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name="memory_budget:chunker")
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while not self.queue.empty():
+            guild_id = await self.queue.get()
+            self.pending.discard(guild_id)
+
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or guild.chunked:
+                continue
+
+            start = time.perf_counter()
+            try:
+                await guild.chunk(cache=True)
+                logger.info(
+                    f"👥 Chunked {guild.name} ({guild_id}): {len(guild.members):,} members "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+                )
+            except Exception as e:
+                logger.error(f"❌ Error chunking guild {guild_id}: {e}")
+
+            await asyncio.sleep(self.delay)
+
+    def request_for_modules(self, guild_id: int, modules):
+        """Re-requests chunking when an enabled module of the guild needs its members"""
+        if any(module.enabled and module.REQUIRES_MEMBERS for module in modules):
+            self.request(guild_id)
+
+    def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+
+
+def memory_report(bot) -> Dict:
+    """
+    Live memory report of the bot caches
+
+    Returns:
+        Dict (profile, guilds, chunked_guilds, cached_members, cached_messages,
+        rss_mb, rss_per_guild_kb)
+    """
+    try:
+        import psutil
+        rss = psutil.Process().memory_info().rss
+    except Exception:
+        rss = None
+
+    guilds = bot.guilds
+    profile = getattr(bot, 'memory_profile', None)
+    return {
+        'profile': profile.name if profile else 'n/a',
+        'guilds': len(guilds),
+        'chunked_guilds': sum(1 for guild in guilds if guild.chunked),
+        'cached_members': sum(len(guild.members) for guild in guilds),
+        'cached_messages': len(bot.cached_messages),
+        'max_messages': profile.max_messages if profile else None,
+        'rss_mb': rss / 1024 / 1024 if rss else None,
+        'rss_per_guild_kb': rss / 1024 / len(guilds) if rss and guilds else None,
+    }
+
+
+def format_memory_report(report: Dict) -> str:
+    """Human-readable memory report"""
+    lines = [
+        f"**Profile:** {report['profile']} (messages: {report['max_messages'] or 'disabled'})",
+        f"**Guilds:** {report['guilds']:,} ({report['chunked_guilds']:,} chunked)",
+        f"**Members cached:** {report['cached_members']:,}",
+        f"**Messages cached:** {report['cached_messages']:,}",
+    ]
+    if report['rss_mb'] is not None:
+        lines.append(f"**RSS:** {report['rss_mb']:.1f} MB")
+    if report['rss_per_guild_kb'] is not None:
+        lines.append(f"**RSS / guild:** {report['rss_per_guild_kb']:.1f} KB")
+    return "\n".join(lines)
+
+
+# ================ SYNTHETIC REPORT ================
+
+def _guild_payload(guild_id: int, members: int) -> Dict:
+    """Minimal GUILD_CREATE payload with text channels, roles and members"""
+    return {
+        'id': guild_id,
+        'name': f"Guild {guild_id}",
+        'owner_id': guild_id + 1,
+        'member_count': members,
+        'large': members > 250,
+        'roles': [{'id': guild_id, 'name': '@everyone', 'permissions': '0', 'position': 0,
+                   'color': 0, 'hoist': False, 'managed': False, 'mentionable': False}],
+        'channels': [{'id': guild_id + 10 + i, 'type': 0, 'name': f"channel-{i}", 'position': i,
+                      'permission_overwrites': []} for i in range(10)],
+        'members': [
+            {'user': {'id': guild_id * 1000 + i, 'username': f"user{i}", 'discriminator': '0',
+                      'avatar': None}, 'roles': [], 'joined_at': None, 'deaf': False, 'mute': False,
+             'flags': 0}
+            for i in range(members)
+        ],
+    }
+
+
+def measure_profile(profile: MemoryProfile, guild_count: int, members_per_guild: int,
+                    messages_per_guild: int = 20) -> Dict:
+    """
+    Builds guild_count synthetic guilds in a client configured with the profile
+    and measures the memory they use (tracemalloc)
+
+    Guilds chunked on demand are approximated as 5% of the guilds when the
+    profile does not chunk at startup.
+    """
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+
+    client = discord.Client(
+        intents=intents,
+        member_cache_flags=profile.member_cache_flags(),
+        chunk_guilds_at_startup=profile.chunk_guilds_at_startup,
+        max_messages=profile.max_messages
+    )
+    state = client._connection
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    on_demand_every = 20  # 5% of the guilds
+    for index in range(guild_count):
+        guild_id = (index + 1) << 22
+        chunk_on_demand = not profile.chunk_guilds_at_startup and index % on_demand_every == 0
+        # Without startup chunking, GUILD_CREATE of large guilds only carries the bot itself
+        members = members_per_guild if (profile.chunk_guilds_at_startup or members_per_guild <= 250) else 1
+        guild = discord.Guild(data=_guild_payload(guild_id, members), state=state)
+        state._add_guild(guild)
+
+        if chunk_on_demand:
+            for member_data in _guild_payload(guild_id, members_per_guild)['members']:
+                guild._add_member(discord.Member(data=member_data, guild=guild, state=state))
+
+        if state._messages is not None:
+            channel = guild.text_channels[0]
+            for i in range(messages_per_guild):
+                data = {
+                    'id': guild_id + 100 + i, 'channel_id': channel.id, 'type': 0,
+                    'content': "x" * 80, 'author': {'id': 2, 'username': 'author', 'discriminator': '0', 'avatar': None},
+                    'attachments': [], 'embeds': [], 'mentions': [], 'mention_roles': [], 'pinned': False,
+                    'mention_everyone': False, 'tts': False, 'timestamp': '2024-01-01T00:00:00+00:00',
+                    'edited_timestamp': None
+                }
+                state._messages.append(discord.Message(state=state, channel=channel, data=data))
+
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return {
+        'profile': profile.name,
+        'guilds': guild_count,
+        'members_cached': sum(len(g.members) for g in state.guilds),
+        'messages_cached': len(state._messages) if state._messages is not None else 0,
+        'mb': used / 1024 / 1024,
+        'kb_per_guild': used / 1024 / guild_count,
+    }
+
+
+# Per-guild values filled in the default config of each module, as /config stores them
+_MODULE_SAMPLES = {
+    'auto_restore_roles': lambda guild_id: {'mode': 'except', 'excluded_roles': [guild_id + 1, guild_id + 2], 'log_channel_id': guild_id + 10},
+    'auto_role': lambda guild_id: {'member_roles': [guild_id + 1], 'bot_roles': [guild_id + 2]},
+    'interserver': lambda guild_id: {'channel_id': guild_id + 10},
+    'starboard': lambda guild_id: {'channel_id': guild_id + 10},
+    'welcome_channel': lambda guild_id: {'channel_id': guild_id + 10},
+    'youtube_notifications': lambda guild_id: {'subscriptions': [{
+        'channel_id': 'UC_x5XG1OV2P6uZZ5FSM9Ttw', 'channel_username': 'GoogleDevelopers',
+        'discord_channel_id': guild_id + 10, 'message': "New video! [video_link]", 'roles': [guild_id + 1]
+    }]},
+}
+
+
+def measure_modules(guild_count: int) -> List[Dict]:
+    """
+    Instantiates every module for guild_count synthetic guilds from configs
+    decoded like guild_modules rows and measures the memory they keep (tracemalloc)
+
+    Returns:
+        One dict per module (module, guilds, bytes_per_instance)
+    """
+    from types import SimpleNamespace
+    from modules.module_manager import ModuleManager
+    from utils import json_codec as json
+
+    manager = ModuleManager(SimpleNamespace(db=None))
+    manager.discover_modules()
+
+    async def load(module_class, guild_ids):
+        instances = []
+        for guild_id in guild_ids:
+            instance = module_class(None, guild_id)
+            config = {**instance.get_default_config(), **_MODULE_SAMPLES.get(module_class.MODULE_ID, lambda _: {})(guild_id)}
+            await instance.load_config(json.loads(json.dumps(config)))
+            instances.append(instance)
+        return instances
+
+    rows = []
+    for module_id, module_class in sorted(manager.registered_modules.items()):
+        guild_ids = [(index + 1) << 22 for index in range(guild_count)]
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        instances = asyncio.run(load(module_class, guild_ids))
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        del instances
+        rows.append({'module': module_id, 'guilds': guild_count, 'bytes_per_instance': used / guild_count})
+    return rows
+
+
+def main(argv: List[str]) -> int:
+    if "--modules" in argv:
+        argv = [arg for arg in argv if arg != "--modules"]
+        for guild_count in [int(arg) for arg in argv] or [10000]:
+            print(f"Module instances ({guild_count:,} guilds, bytes per (guild, module))")
+            rows = measure_modules(guild_count)
+            for row in rows:
+                print(f"{row['module']:<24} {row['bytes_per_instance']:>9,.0f}")
+            print(f"{'average':<24} {sum(row['bytes_per_instance'] for row in rows) / len(rows):>9,.0f}")
+        return 0
+
+    members = 100
+    if "--members" in argv:
+        index = argv.index("--members")
+        members = int(argv[index + 1])
+        argv = argv[:index] + argv[index + 2:]
+    guild_counts = [int(arg) for arg in argv] or [100, 1000]
+
+    print(f"Synthetic memory report ({members} members per guild, 5% chunked on demand)")
+    print(f"{'profile':<10} {'guilds':>8} {'members':>10} {'messages':>9} {'MB':>9} {'KB/guild':>9}")
+    for guild_count in guild_counts:
+        for profile in PROFILES.values():
+            row = measure_profile(profile, guild_count, members)
+            print(
+                f"{row['profile']:<10} {row['guilds']:>8,} {row['members_cached']:>10,} "
+                f"{row['messages_cached']:>9,} {row['mb']:>9.1f} {row['kb_per_guild']:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,306 @@
+"""
+Metrics
+In-process histograms and counters fed by the bot, and a Prometheus text
+exposition of every metric the bot already tracks (gateway, caches, event
+loop...). No client library: the text format is written by hand.
+
+Served on GET /metrics by the internal API (Bearer auth) and by the cluster
+health endpoint (127.0.0.1 only).
+"""
+
+import bisect
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('moddy.metrics')
+
+# Latency buckets in seconds (upper bounds, +Inf is implicit)
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with +Inf"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format_value(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class LabeledHistogram:
+    """One histogram per label set"""
+
+    def __init__(self, label_names: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self.children: Dict[Tuple[str, ...], Histogram] = {}
+
+    def labels(self, *values) -> Histogram:
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = Histogram(self.buckets)
+        return child
+
+    def observe(self, value: float, *label_values):
+        self.labels(*label_values).observe(value)
+
+    def items(self) -> Iterable[Tuple[Dict[str, str], Histogram]]:
+        for key, histogram in self.children.items():
+            yield dict(zip(self.label_names, key)), histogram
+
+
+class BotMetrics:
+    """Metrics recorded by the bot code paths that have no other store"""
+
+    def __init__(self):
+        # Interaction time (utils.interaction_timing): stage is 'first_response' or 'total'
+        self.interaction_seconds = LabeledHistogram(('kind', 'name', 'stage'))
+        # Gateway events dispatched to server modules (cogs.module_events)
+        self.module_event_seconds = LabeledHistogram(('event', 'module'))
+        self.module_event_errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        # Database queries (asyncpg query logger), by SQL verb
+        self.db_query_seconds = LabeledHistogram(('operation',))
+        self.db_query_errors: Dict[str, int] = defaultdict(int)
+        # Interserver relay: time to deliver one message to every target channel
+        self.interserver_fanout_seconds = Histogram()
+        self.interserver_deliveries: Dict[str, int] = defaultdict(int)
+
+    def record_query(self, record):
+        """asyncpg query logger callback (Connection.add_query_logger)"""
+        try:
+            operation = record.query.lstrip().split(None, 1)[0].upper() if record.query.strip() else 'OTHER'
+            if operation not in ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH'):
+                operation = 'OTHER'
+            self.db_query_seconds.observe(record.elapsed, operation)
+            if record.exception is not None:
+                self.db_query_errors[operation] += 1
+        except Exception as e:
+            # Metrics must never break a query
+            logger.debug(f"Query metrics error: {e}")
+
+    def record_interserver_relay(self, seconds: float, delivered: int, targets: int):
+        self.interserver_fanout_seconds.observe(seconds)
+        self.interserver_deliveries['success'] += delivered
+        self.interserver_deliveries['failure'] += targets - delivered
+
+
+metrics = BotMetrics()
+
+
+# ================ PROMETHEUS TEXT FORMAT ================
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Optional[Dict[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusWriter:
+    """Builds a Prometheus text exposition (format 0.0.4)"""
+
+    def __init__(self, prefix: str = 'moddy_'):
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def _header(self, name: str, kind: str, help_text: str) -> str:
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        return name
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict[str, str]], float]]):
+        self._samples(name, 'gauge', help_text, samples)
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Optional[Dict[str, str]], float]]):
+        self._samples(name, 'counter', help_text, samples)
+
+    def _samples(self, name: str, kind: str, help_text: str, samples):
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        name = self._header(name, kind, help_text)
+        for labels, value in samples:
+            self.lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(self, name: str, help_text: str, histograms: Iterable[Tuple[Optional[Dict[str, str]], Histogram]]):
+        histograms = list(histograms)
+        if not histograms:
+            return
+        name = self._header(name, 'histogram', help_text)
+        for labels, histogram in histograms:
+            labels = labels or {}
+            for le, count in histogram.cumulative():
+                self.lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {count}")
+            self.lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            self.lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_metrics(bot) -> str:
+    """
+    Prometheus exposition of the bot metrics
+
+    Every section is optional: a missing component (no DB pool, cog not loaded,
+    watchdog not started) simply produces no samples.
+    """
+    writer = PrometheusWriter()
+
+    # Gateway
+    writer.gauge('up', "1 when the bot is connected and ready", [(None, 1 if bot.is_ready() else 0)])
+    writer.gauge('guilds', "Guilds in the gateway cache", [(None, len(bot.guilds))])
+    gateway = getattr(bot, 'gateway_metrics', None)
+    if gateway:
+        writer.gauge('gateway_latency_seconds', "Heartbeat latency per shard", [
+            ({'shard': str(shard_id)}, latency)
+            for shard_id, latency in gateway.latencies()
+            if latency == latency and latency != math.inf
+        ])
+        writer.counter('gateway_events_total', "Gateway events received, by shard and type", [
+            ({'shard': str(shard_id), 'event': event}, count)
+            for shard_id, events in sorted(gateway.totals.items())
+            for event, count in sorted(events.items())
+        ])
+
+    # Interactions (app commands, components, modals)
+    writer.histogram('interaction_duration_seconds',
+                     "Interaction time to first response and total handler time, by command / custom_id prefix",
+                     metrics.interaction_seconds.items())
+
+    # Server modules
+    manager = getattr(bot, 'module_manager', None)
+    if manager:
+        writer.gauge('module_guilds', "Guilds with module instances (active) or only configured, not instantiated yet (pending)", [
+            ({'state': 'active'}, len(manager.active_modules)),
+            ({'state': 'pending'}, len(manager._pending)),
+        ])
+    writer.histogram('module_event_duration_seconds', "Server module event handler time, by event and module",
+                     metrics.module_event_seconds.items())
+    writer.counter('module_event_errors_total', "Server module event handlers that raised, by event and module", [
+        ({'event': event, 'module': module}, count) for (event, module), count in sorted(metrics.module_event_errors.items())
+    ])
+
+    # Discord REST rate limits
+    ratelimits = getattr(bot, 'ratelimit_telemetry', None)
+    if ratelimits:
+        routes = sorted(ratelimits.routes.items())
+        writer.counter('discord_rest_requests_total', "Discord REST requests, by route and calling module", [
+            ({'route': route, 'subsystem': subsystem}, stats.requests) for (route, subsystem), stats in routes
+            if stats.requests
+        ])
+        writer.counter('discord_ratelimit_wait_seconds_total', "Time spent waiting on Discord rate limit buckets", [
+            ({'route': route, 'subsystem': subsystem}, stats.wait_seconds) for (route, subsystem), stats in routes
+            if stats.waits
+        ])
+        writer.counter('discord_ratelimit_hits_total', "Discord 429 responses, by route, calling module and scope", [
+            ({'route': route, 'subsystem': subsystem, 'scope': scope}, count)
+            for (route, subsystem), stats in routes
+            for scope, count in sorted(stats.hits.items())
+        ])
+
+    scheduler = getattr(bot, 'request_scheduler', None)
+    if scheduler:
+        writer.counter('discord_scheduler_requests_total', "Discord requests sent, by scheduler priority", [
+            ({'priority': priority.name.lower()}, count) for priority, count in scheduler.sent.items()
+        ])
+        writer.counter('discord_scheduler_deferred_total', "Discord requests deferred by the scheduler, by priority", [
+            ({'priority': priority.name.lower()}, count) for priority, count in scheduler.deferred.items()
+        ])
+        writer.counter('discord_scheduler_wait_seconds_total', "Time requests waited in the scheduler, by priority", [
+            ({'priority': priority.name.lower()}, seconds) for priority, seconds in scheduler.wait_seconds.items()
+        ])
+
+    # Database
+    pool = getattr(getattr(bot, 'db', None), 'pool', None)
+    if pool is not None:
+        writer.gauge('db_pool_connections', "Database pool connections", [
+            ({'state': 'open'}, pool.get_size()),
+            ({'state': 'idle'}, pool.get_idle_size()),
+            ({'state': 'max'}, pool.get_max_size()),
+        ])
+    writer.histogram('db_query_duration_seconds', "Database query time, by SQL verb",
+                     metrics.db_query_seconds.items())
+    writer.counter('db_query_errors_total', "Failed database queries, by SQL verb", [
+        ({'operation': operation}, count) for operation, count in sorted(metrics.db_query_errors.items())
+    ])
+
+    # Shared cache
+    from utils.shared_cache import shared_cache
+    writer.counter('cache_requests_total', "Shared cache lookups, by namespace and result", [
+        ({'namespace': namespace, 'result': result}, stats.get(result, 0))
+        for namespace, stats in sorted(shared_cache.stats.items())
+        for result in ('l1_hits', 'l2_hits', 'misses')
+    ])
+    writer.gauge('cache_hit_ratio', "Shared cache hit ratio (L1 + L2), by namespace", [
+        ({'namespace': namespace}, ratio) for namespace, ratio in sorted(shared_cache.hit_rates().items())
+    ])
+
+    # Interserver
+    writer.histogram('interserver_fanout_seconds', "Time to relay one interserver message to every target",
+                     [(None, metrics.interserver_fanout_seconds)] if metrics.interserver_fanout_seconds.count else [])
+    writer.counter('interserver_deliveries_total', "Interserver relay deliveries, by result", [
+        ({'result': result}, count) for result, count in sorted(metrics.interserver_deliveries.items())
+    ])
+    delivered = metrics.interserver_deliveries.get('success', 0)
+    total = delivered + metrics.interserver_deliveries.get('failure', 0)
+    writer.gauge('interserver_success_ratio', "Share of interserver deliveries that succeeded",
+                 [(None, delivered / total)] if total else [])
+
+    # Queues
+    reminder_cog = bot.get_cog("Reminder")
+    if reminder_cog is not None:
+        writer.gauge('reminder_queue_depth', "Due reminders not sent yet", [(None, reminder_cog.queue_depth)])
+    console_cog = bot.get_cog("ConsoleLogger")
+    if console_cog is not None:
+        writer.gauge('console_log_queue_depth', "Log lines waiting to be sent to the console channel",
+                     [(None, console_cog.log_queue.qsize())])
+
+    # Event loop
+    watchdog = getattr(bot, 'loop_watchdog', None)
+    if watchdog:
+        stats = watchdog.percentiles()
+        writer.gauge('event_loop_lag_seconds', "Event loop lag percentiles over the last 10 minutes", [
+            ({'quantile': quantile}, stats[key] / 1000)
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99'), ('1', 'max'))
+        ])
+        writer.counter('event_loop_stalls_total', "Event loop stalls above the threshold", [(None, stats['stalls'])])
+
+    return writer.render()
@@ -0,0 +1,168 @@
+"""
+Performance profile
+Opt-in runtime tuning: uvloop event loop and orjson JSON backend.
+
+PERFORMANCE_PROFILE=fast installs uvloop (when available) before the event
+loop is created and switches utils.json_codec to orjson (when installed).
+The default profile keeps the stdlib asyncio loop and json module.
+
+Benchmark:
+    python -m utils.performance
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from utils import json_codec
+
+logger = logging.getLogger('moddy.performance')
+
+PROFILES = ('default', 'fast')
+
+# Profile applied to this process (see apply_performance_profile)
+ACTIVE: Dict[str, str] = {'profile': 'default', 'loop': 'asyncio', 'json': 'stdlib'}
+
+
+def install_uvloop() -> bool:
+    """Sets the uvloop event loop policy, returns False if uvloop is missing"""
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("⚠️ uvloop not installed, using the default asyncio loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def apply_performance_profile(profile: str) -> Dict[str, str]:
+    """
+    Applies a performance profile (must run before the event loop is created)
+
+    Returns:
+        {'profile', 'loop', 'json'} actually in use
+    """
+    if profile not in PROFILES:
+        logger.warning(f"⚠️ Unknown performance profile {profile}, using 'default'")
+        profile = 'default'
+
+    loop = 'asyncio'
+    if profile == 'fast':
+        if install_uvloop():
+            loop = 'uvloop'
+        json_codec.configure('orjson')
+    else:
+        json_codec.configure('stdlib')
+
+    ACTIVE.update(profile=profile, loop=loop, json=json_codec.BACKEND)
+    return dict(ACTIVE)
+
+
+# ================ BENCHMARK ================
+
+async def _loop_throughput(duration: float = 1.0) -> Dict[str, float]:
+    """Measures task switches (sleep(0)) and future round trips per second"""
+    switches = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        for _ in range(1000):
+            await asyncio.sleep(0)
+        switches += 1000
+
+    loop = asyncio.get_running_loop()
+    round_trips = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        futures = [loop.create_future() for _ in range(1000)]
+        for future in futures:
+            loop.call_soon(future.set_result, None)
+        await asyncio.gather(*futures)
+        round_trips += 1000
+
+    return {'switches_per_s': switches / duration, 'futures_per_s': round_trips / duration}
+
+
+def _loop_benchmark(use_uvloop: bool) -> Dict[str, float]:
+    if use_uvloop:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    else:
+        loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_loop_throughput())
+    finally:
+        loop.close()
+
+
+def _sample_documents() -> Dict[str, object]:
+    """Representative payloads: a guild data document and the translation files"""
+    guild_data = {
+        'config': {'prefix': '!', 'lang': 'fr'},
+        'modules': {
+            f"module_{i}": {
+                'channel_id': 1394001780148535387 + i,
+                'message': "Bienvenue {user} sur {server} ! " * 4,
+                'roles': [1424149819185827954 + j for j in range(10)],
+                'enabled': True,
+            } for i in range(20)
+        },
+    }
+    documents = {'guild_data': guild_data}
+
+    locales_dir = Path(__file__).resolve().parent.parent / 'locales'
+    for locale_file in sorted(locales_dir.glob('*.json'))[:1]:
+        documents[f"locale:{locale_file.stem}"] = json_codec.loads(locale_file.read_text(encoding='utf-8'))
+    return documents
+
+
+def _time_per_call(func: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1_000_000
+
+
+def _json_benchmark(backend: str, documents: Dict[str, object], number: int = 2000) -> Dict[str, Dict[str, float]]:
+    json_codec.configure(backend)
+    results = {}
+    for name, document in documents.items():
+        encoded = json_codec.dumps(document)
+        results[name] = {
+            'dumps_us': _time_per_call(lambda: json_codec.dumps(document), number),
+            'loads_us': _time_per_call(lambda: json_codec.loads(encoded), number),
+            'size_kb': len(encoded) / 1024,
+        }
+    return results
+
+
+def main(argv: List[str]) -> int:
+    print("Event loop throughput (higher is better)")
+    for name, use_uvloop in (('asyncio', False), ('uvloop', True)):
+        try:
+            result = _loop_benchmark(use_uvloop)
+        except ImportError:
+            print(f"  {name:<8} not installed")
+            continue
+        print(f"  {name:<8} {result['switches_per_s']:>12,.0f} switches/s {result['futures_per_s']:>12,.0f} futures/s")
+
+    documents = _sample_documents()
+    print("\nJSON cost per call (lower is better)")
+    for backend in ('stdlib', 'orjson'):
+        if json_codec.configure(backend) != backend:
+            print(f"  {backend:<8} not installed")
+            continue
+        for name, result in _json_benchmark(backend, documents).items():
+            print(
+                f"  {backend:<8} {name:<16} {result['size_kb']:>7.1f} KB "
+                f"dumps {result['dumps_us']:>8.1f}us  loads {result['loads_us']:>8.1f}us"
+            )
+    json_codec.configure('stdlib')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
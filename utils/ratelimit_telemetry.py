@@ -0,0 +1,257 @@
+"""
+Rate Limit Telemetry
+Records, per Discord REST route and per calling subsystem (cog / module),
+the requests sent, the time spent waiting on rate limit buckets and the 429
+responses (route, shared, global, Cloudflare), with the request that
+triggered each 429. Shown by d.ratelimits and exported on /metrics.
+"""
+
+import contextvars
+import functools
+import logging
+import re
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+from discord.http import HTTPClient, Ratelimit
+
+logger = logging.getLogger('moddy.ratelimit_telemetry')
+
+# Waits shorter than this are lock hand-offs, not rate limiting
+WAIT_THRESHOLD = 0.005
+
+# The code that sent a request is the first bot module in the call chain,
+# skipping libraries and the instrumentation wrappers
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[1])
+_INSTRUMENTATION = (
+    'utils.ratelimit_telemetry', 'utils.request_scheduler', 'utils.tracing', 'utils.interaction_timing'
+)
+
+_SNOWFLAKE = re.compile(r'/\d{15,21}(?=/|$)')
+_TOKEN = re.compile(r'/[A-Za-z0-9_\-.]{60,}(?=/|$)')
+
+
+class RestRequest:
+    """The REST request being sent by the current task"""
+
+    __slots__ = ('route', 'subsystem')
+
+    def __init__(self, route: str, subsystem: str):
+        self.route = route
+        self.subsystem = subsystem
+
+
+_current_request: contextvars.ContextVar[Optional[RestRequest]] = contextvars.ContextVar(
+    'moddy_rest_request', default=None
+)
+
+
+class RouteStats:
+    __slots__ = ('requests', 'waits', 'wait_seconds', 'max_wait', 'hits')
+
+    def __init__(self):
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        # 429 count per scope: user (route bucket), shared, global, cloudflare
+        self.hits: Dict[str, int] = {}
+
+    @property
+    def total_hits(self) -> int:
+        return sum(self.hits.values())
+
+
+def caller_subsystem(frame=None) -> str:
+    """Name of the first bot module (cog, module, utils...) in the call chain"""
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PROJECT_ROOT) and 'site-packages' not in filename:
+            name = frame.f_globals.get('__name__', '')
+            if name not in _INSTRUMENTATION:
+                return name
+        frame = frame.f_back
+    return 'unknown'
+
+
+def route_from_url(method: str, path: str) -> str:
+    """Route template of a request sent outside HTTPClient.request (interaction callbacks, webhooks)"""
+    path = path.split('/api/v', 1)[-1]
+    path = path.split('/', 1)[1] if '/' in path else path
+    path = _TOKEN.sub('/{token}', _SNOWFLAKE.sub('/{id}', '/' + path))
+    return f"{method} {path}"
+
+
+class RateLimitTelemetry:
+    """
+    Discord REST rate limit accounting
+
+    - HTTPClient.request is wrapped to know the route and the calling module
+      of every request (contextvar, read by the two hooks below)
+    - Ratelimit.acquire / __aexit__ are wrapped to time bucket waits
+      (discord.py sleeps there when a bucket is exhausted)
+    - an aiohttp TraceConfig (Client(http_trace=...)) sees every response on
+      the bot session, including interaction callbacks, and records the 429s
+    """
+
+    def __init__(self, recent: int = 50):
+        self.started_at = time.monotonic()
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.recent_hits: Deque[Dict[str, Any]] = deque(maxlen=recent)
+        self._installed = False
+
+    def _stats(self, route: str, subsystem: str) -> RouteStats:
+        stats = self.routes.get((route, subsystem))
+        if stats is None:
+            stats = self.routes[(route, subsystem)] = RouteStats()
+        return stats
+
+    # ================ HOOKS ================
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp trace config to pass as http_trace to the discord.py client"""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_end.append(self._on_request_end)
+        return trace_config
+
+    def install(self):
+        """Wraps the discord.py HTTP client and rate limit buckets (once per process)"""
+        if self._installed or getattr(HTTPClient.request, '_moddy_ratelimits', False):
+            return
+
+        HTTPClient.request = self._wrap_request(HTTPClient.request)
+        Ratelimit.acquire = self._wrap_wait(Ratelimit.acquire)
+        Ratelimit.__aexit__ = self._wrap_wait(Ratelimit.__aexit__)
+
+        self._installed = True
+        logger.info("✅ Rate limit telemetry installed")
+
+    def _wrap_request(self, request):
+        @functools.wraps(request)
+        async def wrapped(http, route, **kwargs):
+            current = RestRequest(f"{route.method} {route.path}", caller_subsystem(sys._getframe(1)))
+            self._stats(current.route, current.subsystem).requests += 1
+            token = _current_request.set(current)
+            try:
+                return await request(http, route, **kwargs)
+            finally:
+                _current_request.reset(token)
+
+        wrapped._moddy_ratelimits = True
+        return wrapped
+
+    def _wrap_wait(self, method):
+        @functools.wraps(method)
+        async def wrapped(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                waited = time.perf_counter() - start
+                if waited >= WAIT_THRESHOLD:
+                    self.record_wait(waited)
+
+        return wrapped
+
+    async def _on_request_end(self, session, context, params: aiohttp.TraceRequestEndParams):
+        response = params.response
+        if response.status != 429:
+            return
+
+        headers = response.headers
+        current = _current_request.get()
+        if current is None:
+            current = RestRequest(route_from_url(params.method, params.url.path), caller_subsystem(sys._getframe(1)))
+
+        if not headers.get('Via'):
+            scope = 'cloudflare'
+        elif headers.get('X-RateLimit-Global', '').lower() == 'true':
+            scope = 'global'
+        else:
+            scope = headers.get('X-RateLimit-Scope', 'user')
+
+        try:
+            retry_after = float(headers.get('Retry-After', 0))
+        except ValueError:
+            retry_after = 0.0
+
+        self.record_hit(current.route, current.subsystem, scope, retry_after, headers.get('X-RateLimit-Bucket'))
+
+    # ================ RECORDING ================
+
+    def record_wait(self, seconds: float):
+        current = _current_request.get()
+        if current is None:
+            return
+        stats = self._stats(current.route, current.subsystem)
+        stats.waits += 1
+        stats.wait_seconds += seconds
+        stats.max_wait = max(stats.max_wait, seconds)
+
+    def record_hit(self, route: str, subsystem: str, scope: str, retry_after: float, bucket: Optional[str] = None):
+        stats = self._stats(route, subsystem)
+        stats.hits[scope] = stats.hits.get(scope, 0) + 1
+        self.recent_hits.append({
+            'at': datetime.now(timezone.utc),
+            'route': route,
+            'subsystem': subsystem,
+            'scope': scope,
+            'retry_after': retry_after,
+            'bucket': bucket,
+        })
+        logger.warning(f"⏳ 429 ({scope}) on {route} from {subsystem}, retry after {retry_after:.2f}s")
+
+    # ================ REPORTS ================
+
+    def totals(self) -> Dict[str, Any]:
+        hits: Dict[str, int] = {}
+        for stats in self.routes.values():
+            for scope, count in stats.hits.items():
+                hits[scope] = hits.get(scope, 0) + count
+        return {
+            'requests': sum(stats.requests for stats in self.routes.values()),
+            'waits': sum(stats.waits for stats in self.routes.values()),
+            'wait_seconds': sum(stats.wait_seconds for stats in self.routes.values()),
+            'hits': hits,
+        }
+
+    def summary_by(self, key: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Stats grouped by 'route' or 'subsystem', the most rate limited first"""
+        index = 0 if key == 'route' else 1
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for names, stats in self.routes.items():
+            row = grouped.setdefault(names[index], {
+                key: names[index], 'requests': 0, 'waits': 0, 'wait_seconds': 0.0, 'max_wait': 0.0, 'hits': 0
+            })
+            row['requests'] += stats.requests
+            row['waits'] += stats.waits
+            row['wait_seconds'] += stats.wait_seconds
+            row['max_wait'] = max(row['max_wait'], stats.max_wait)
+            row['hits'] += stats.total_hits
+        rows = sorted(grouped.values(), key=lambda row: (row['hits'], row['wait_seconds'], row['requests']), reverse=True)
+        return rows[:limit]
+
+    def format_summary(self, key: str, limit: int = 8) -> str:
+        lines = []
+        for row in self.summary_by(key, limit):
+            hits = f" • **{row['hits']}×429**" if row['hits'] else ""
+            lines.append(
+                f"`{row[key]}` {row['requests']:,} req • {row['waits']:,} waits "
+                f"({row['wait_seconds']:.1f}s, max {row['max_wait']:.1f}s){hits}"
+            )
+        return "\n".join(lines)
+
+    def format_recent_hits(self, limit: int = 5) -> str:
+        lines = []
+        for hit in list(self.recent_hits)[-limit:][::-1]:
+            lines.append(
+                f"<t:{int(hit['at'].timestamp())}:R> **{hit['scope']}** `{hit['route']}` "
+                f"from `{hit['subsystem']}` (retry {hit['retry_after']:.2f}s)"
+            )
+        return "\n".join(lines)
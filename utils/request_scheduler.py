@@ -0,0 +1,244 @@
+"""
+Request Scheduler
+Priority classes for outbound Discord REST requests, so background traffic
+(logs, reactions, starboard edits, welcome DMs) never delays a user's
+interaction response.
+
+Every request takes a token from a per-process budget that stays under
+Discord's global rate limit (50 requests/s per bot, shared by the clusters):
+- INTERACTION: interaction responses and followups, never wait
+- RELAY: user-visible relays and untagged requests, wait only when the
+  budget is empty
+- BACKGROUND: wait while the budget is below a reserve kept for the classes
+  above or while a higher priority request is waiting, with a small
+  concurrency cap
+
+Code tags its requests with @with_priority / request_priority(); tasks
+created inside inherit the priority. coalesce() merges repeated background
+work on the same key (only the last call runs).
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import aiohttp
+from discord.http import HTTPClient
+
+logger = logging.getLogger('moddy.request_scheduler')
+
+# Share of the budget BACKGROUND requests cannot use
+BACKGROUND_RESERVE = 0.3
+
+
+class Priority(IntEnum):
+    INTERACTION = 0
+    RELAY = 1
+    BACKGROUND = 2
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar('moddy_request_priority', default=Priority.RELAY)
+# Set while a request scheduled by HTTPClient.request is being sent (its token is already taken)
+_scheduled: contextvars.ContextVar[bool] = contextvars.ContextVar('moddy_request_scheduled', default=False)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Tags the Discord requests sent inside the block"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def set_request_priority(priority: Priority):
+    """Tags the Discord requests sent by the rest of the current task (and the tasks it creates)"""
+    _priority.set(priority)
+
+
+def with_priority(priority: Priority):
+    """Decorator: tags the Discord requests sent by a coroutine function"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapped(*args, **kwargs):
+            with request_priority(priority):
+                return await func(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
+class RequestScheduler:
+    """Token budget shared by every outbound Discord request of the process"""
+
+    def __init__(self, rate: float = 45.0, background_concurrency: int = 2):
+        self.rate = rate
+        self.tokens = rate
+        self.background_concurrency = background_concurrency
+        self._updated = time.monotonic()
+        self._waiting: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._background = asyncio.Semaphore(background_concurrency)
+        self._coalesced: Dict[Hashable, Dict[str, Any]] = {}
+        self._installed = False
+        # Stats per priority (d.ratelimits, /metrics)
+        self.sent: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.deferred: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.wait_seconds: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        self.coalesced = 0
+
+    def configure(self, rate: float, background_concurrency: Optional[int] = None):
+        self.rate = max(1.0, rate)
+        self.tokens = min(self.tokens, self.rate)
+        if background_concurrency is not None and background_concurrency != self.background_concurrency:
+            self.background_concurrency = background_concurrency
+            self._background = asyncio.Semaphore(background_concurrency)
+
+    # ================ BUDGET ================
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _threshold(self, priority: Priority) -> float:
+        return 1 + BACKGROUND_RESERVE * self.rate if priority == Priority.BACKGROUND else 1
+
+    def _higher_waiting(self, priority: Priority) -> bool:
+        return any(self._waiting[other] for other in Priority if other < priority)
+
+    def consume(self, priority: Priority = Priority.INTERACTION):
+        """Takes a token without waiting (the budget may go negative: lower classes wait longer)"""
+        self._refill()
+        self.tokens = max(-self.rate, self.tokens - 1)
+        self.sent[priority] += 1
+
+    async def acquire(self, priority: Priority):
+        if priority == Priority.INTERACTION:
+            self.consume(priority)
+            return
+
+        threshold = self._threshold(priority)
+        self._refill()
+        if self.tokens >= threshold and not self._higher_waiting(priority):
+            self.tokens -= 1
+            self.sent[priority] += 1
+            return
+
+        self.deferred[priority] += 1
+        self._waiting[priority] += 1
+        started = time.monotonic()
+        try:
+            while True:
+                delay = max(threshold - self.tokens, 1) / self.rate
+                await asyncio.sleep(delay)
+                self._refill()
+                if self.tokens >= threshold and not self._higher_waiting(priority):
+                    self.tokens -= 1
+                    self.sent[priority] += 1
+                    return
+        finally:
+            self._waiting[priority] -= 1
+            self.wait_seconds[priority] += time.monotonic() - started
+
+    # ================ HOOKS ================
+
+    def install(self, trace_config: aiohttp.TraceConfig):
+        """
+        Schedules the requests of the discord.py HTTP client and counts the
+        others sent on its session (interaction callbacks, webhooks) against the budget
+        """
+        if self._installed or getattr(HTTPClient.request, '_moddy_scheduled', False):
+            return
+
+        HTTPClient.request = self._wrap_request(HTTPClient.request)
+        trace_config.on_request_start.append(self._on_request_start)
+        self._installed = True
+        logger.info(f"✅ Request scheduler installed ({self.rate:.0f} requests/s budget)")
+
+    def _wrap_request(self, request):
+        scheduler = self
+
+        @functools.wraps(request)
+        async def wrapped(http, route, **kwargs):
+            priority = _priority.get()
+            token = _scheduled.set(True)
+            try:
+                if priority == Priority.BACKGROUND:
+                    async with scheduler._background:
+                        await scheduler.acquire(priority)
+                        return await request(http, route, **kwargs)
+                await scheduler.acquire(priority)
+                return await request(http, route, **kwargs)
+            finally:
+                _scheduled.reset(token)
+
+        wrapped._moddy_scheduled = True
+        return wrapped
+
+    async def _on_request_start(self, session, context, params: aiohttp.TraceRequestStartParams):
+        # Webhook adapter requests (interaction callbacks, followups, relays) are counted, never delayed
+        if not _scheduled.get():
+            priority = Priority.INTERACTION if '/interactions/' in params.url.path else _priority.get()
+            self.consume(priority)
+
+    # ================ COALESCING ================
+
+    def coalesce(self, key: Hashable, factory: Callable[[], Awaitable[Any]], delay: float = 2.0) -> asyncio.Task:
+        """
+        Runs factory() after `delay` seconds, once per burst of calls with the same key
+
+        Calls made while a run is pending replace it (the last one wins); a
+        call made while it runs is scheduled after it. The work runs with
+        BACKGROUND priority.
+        """
+        entry = self._coalesced.get(key)
+        if entry and not entry['started']:
+            entry['factory'] = factory
+            self.coalesced += 1
+            return entry['task']
+
+        previous = entry['task'] if entry else None
+        entry = {'factory': factory, 'started': False}
+        self._coalesced[key] = entry
+
+        async def run():
+            try:
+                await asyncio.sleep(delay)
+                if previous is not None:
+                    await asyncio.gather(previous, return_exceptions=True)
+                entry['started'] = True
+                with request_priority(Priority.BACKGROUND):
+                    return await entry['factory']()
+            finally:
+                if self._coalesced.get(key) is entry:
+                    del self._coalesced[key]
+
+        entry['task'] = asyncio.create_task(run())
+        entry['task'].add_done_callback(_log_task_error)
+        return entry['task']
+
+    # ================ REPORTS ================
+
+    def format_stats(self) -> str:
+        self._refill()
+        lines = [f"**Budget:** {max(self.tokens, 0):.0f}/{self.rate:.0f} requests/s"]
+        for priority in Priority:
+            waited = f" • {self.deferred[priority]:,} deferred ({self.wait_seconds[priority]:.1f}s)" \
+                if self.deferred[priority] else ""
+            lines.append(f"**{priority.name.title()}:** {self.sent[priority]:,} sent{waited}")
+        if self.coalesced:
+            lines.append(f"**Coalesced:** {self.coalesced:,}")
+        return "\n".join(lines)
+
+
+def _log_task_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Coalesced task failed: {task.exception()}", exc_info=task.exception())
+
+
+request_scheduler = RequestScheduler()
@@ -0,0 +1,416 @@
+"""
+Shared Cache
+Two-tier cache shared by every bot process: a local in-memory L1 backed by an
+optional Redis L2, kept coherent with pub/sub invalidation messages.
+Without Redis (no REDIS_URL, package missing or server down) it runs local-only.
+
+The same pub/sub connection carries small messages between processes
+(publish() / subscribe()), e.g. interserver relays across clusters.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from utils import json_codec as json
+
+logger = logging.getLogger('moddy.shared_cache')
+
+# Namespaces used by the bot, with their L1 TTL (seconds)
+NAMESPACE_TTLS: Dict[str, int] = {
+    'prefix': 600,
+    'blacklist': 300,
+    'user_blacklisted': 300,
+    'guild_data': 300,
+    'module_guilds': 60,
+    'staff_permissions': 300,
+    'idempotency': 600,
+}
+
+DEFAULT_TTL = 300
+# Per-namespace L1 size limit (oldest entries are dropped first)
+L1_MAX_ENTRIES = 10000
+# Redis keeps values a little longer: it is the tier shared by all processes.
+# Invalidations delete the Redis copy, so this only bounds a missed one.
+L2_TTL_FACTOR = 2
+
+# Writes a loaded value only if no invalidation of its key or namespace happened since the load started
+_SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[3] and (redis.call('GET', KEYS[3]) or '0') == ARGV[4] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+_MISSING = object()
+
+
+class SharedCache:
+    """
+    L1 (process memory) + L2 (Redis) cache with cross-process invalidation
+
+    Values stored in Redis are JSON-encoded, so only JSON-serialisable values
+    (dicts, lists, strings, numbers, booleans, None) may be cached. Keys are
+    converted to strings, so `123` and `"123"` are the same key.
+
+    Every write (invalidate / invalidate_namespace) drops the entry from the
+    local L1 and from Redis, then publishes a message so the other processes
+    drop it from their own L1.
+
+    A value loaded by get_or_load() is not cached if its key is invalidated
+    while the loader runs: locally (in-flight loads are marked stale) and
+    across processes (invalidations bump a generation key in Redis, and the
+    write-back only happens if the generations are unchanged).
+    """
+
+    def __init__(self, prefix: str = 'moddy'):
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidate"
+        self.instance_id = uuid.uuid4().hex[:12]
+
+        self.redis = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        # Pub/sub channel -> handler of the messages published by the other processes
+        self._handlers: Dict[str, Callable[[Any], Awaitable[None]]] = {}
+        self._handler_tasks: Set[asyncio.Task] = set()
+
+        self._local: Dict[str, Dict[str, Tuple[float, Any]]] = defaultdict(dict)
+        # (namespace, key) -> number of get_or_load() calls in flight; invalidated meanwhile -> stale
+        self._loading: Dict[Tuple[str, str], int] = {}
+        self._stale: Set[Tuple[str, str]] = set()
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    @property
+    def is_shared(self) -> bool:
+        """True when Redis is connected"""
+        return self.redis is not None
+
+    # ================ CONNECTION ================
+
+    async def connect(self, redis_url: Optional[str]) -> bool:
+        """
+        Connects the Redis tier and starts the invalidation listener
+
+        Returns:
+            True if Redis is used, False when running local-only
+        """
+        if not redis_url:
+            logger.info("📦 Shared cache in local-only mode (REDIS_URL not set)")
+            return False
+
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("⚠️ redis package not installed, shared cache in local-only mode")
+            return False
+
+        try:
+            client = aioredis.from_url(redis_url, decode_responses=True)
+            await client.ping()
+
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self.channel, *self._handlers)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis unavailable ({e}), shared cache in local-only mode")
+            return False
+
+        self.redis = client
+        self._pubsub = pubsub
+        self._listener = asyncio.create_task(self._listen(), name="shared_cache:invalidation")
+        logger.info("✅ Shared cache connected to Redis")
+        return True
+
+    async def close(self):
+        """Stops the listener and closes the Redis connection"""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+        if self._pubsub:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+
+        if self.redis:
+            try:
+                await self.redis.aclose()
+            except Exception:
+                pass
+            self.redis = None
+
+    async def _listen(self):
+        """Applies the invalidation messages published by the other processes"""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    try:
+                        payload = json.loads(message['data'])
+                    except (TypeError, ValueError):
+                        continue
+                    if payload.get('origin') == self.instance_id:
+                        continue
+                    if message.get('channel') != self.channel:
+                        self._dispatch(message.get('channel'), payload.get('data'))
+                        continue
+                    self._drop_local(payload.get('ns'), payload.get('key'))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Connection lost: the local L1 may be stale until its TTL expires
+                logger.error(f"❌ Shared cache listener error: {e}")
+                self._local.clear()
+                await asyncio.sleep(5)
+
+    def _dispatch(self, channel: str, data: Any):
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        # Handlers run as tasks: a slow one does not hold up the invalidations
+        task = asyncio.create_task(handler(data))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_done)
+
+    def _handler_done(self, task: asyncio.Task):
+        self._handler_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Shared cache message handler error: {task.exception()}", exc_info=task.exception())
+
+    # ================ HELPERS ================
+
+    def _redis_key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def _ttl(self, namespace: str) -> int:
+        return NAMESPACE_TTLS.get(namespace, DEFAULT_TTL)
+
+    def _generation_keys(self, namespace: str, key: str) -> Tuple[str, str]:
+        return f"{self.prefix}:gen:{namespace}:{key}", f"{self.prefix}:gen:{namespace}"
+
+    def _drop_local(self, namespace: Optional[str], key: Optional[str]):
+        if namespace is None:
+            return
+        if key is None:
+            self._local.pop(namespace, None)
+            self._stale.update(loading for loading in self._loading if loading[0] == namespace)
+        else:
+            self._local[namespace].pop(key, None)
+            if (namespace, key) in self._loading:
+                self._stale.add((namespace, key))
+
+    async def _publish(self, namespace: str, key: Optional[str]):
+        if not self.redis:
+            return
+        try:
+            await self.redis.publish(self.channel, json.dumps({
+                'ns': namespace,
+                'key': key,
+                'origin': self.instance_id
+            }))
+        except Exception as e:
+            logger.error(f"❌ Shared cache publish error: {e}")
+
+    # ================ API ================
+
+    async def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        """Returns a cached value (L1, then L2) or default"""
+        key = str(key)
+        stats = self.stats[namespace]
+
+        entry = self._local[namespace].get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                stats['l1_hits'] += 1
+                return value
+            del self._local[namespace][key]
+
+        if self.redis:
+            try:
+                raw = await self.redis.get(self._redis_key(namespace, key))
+            except Exception as e:
+                logger.error(f"❌ Shared cache read error: {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._local[namespace][key] = (time.monotonic() + self._ttl(namespace), value)
+                if len(self._local[namespace]) > L1_MAX_ENTRIES:
+                    del self._local[namespace][next(iter(self._local[namespace]))]
+                stats['l2_hits'] += 1
+                return value
+
+        stats['misses'] += 1
+        return default
+
+    async def set(self, namespace: str, key: Hashable, value: Any):
+        """Stores a value in L1 and L2"""
+        key = str(key)
+        ttl = self._ttl(namespace)
+        local = self._local[namespace]
+        local.pop(key, None)
+        local[key] = (time.monotonic() + ttl, value)
+        if len(local) > L1_MAX_ENTRIES:
+            # Dicts keep insertion order: the first key is the oldest write
+            del local[next(iter(local))]
+
+        if self.redis:
+            try:
+                await self.redis.set(self._redis_key(namespace, key), json.dumps(value), ex=ttl * L2_TTL_FACTOR)
+            except Exception as e:
+                logger.error(f"❌ Shared cache write error: {e}")
+
+    async def get_or_load(self, namespace: str, key: Hashable,
+                          loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached value, or calls loader() and caches its result
+
+        Exceptions raised by the loader are propagated and nothing is cached.
+        """
+        key = str(key)
+        value = await self.get(namespace, key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        token = (namespace, key)
+        generations = await self._read_generations(namespace, key)
+        self._loading[token] = self._loading.get(token, 0) + 1
+        try:
+            value = await loader()
+        finally:
+            stale = token in self._stale
+            self._loading[token] -= 1
+            if not self._loading[token]:
+                del self._loading[token]
+                self._stale.discard(token)
+
+        if stale:
+            # Invalidated while loading: the value may predate the write
+            self.stats[namespace]['stale_loads'] += 1
+            return value
+        await self._set_if_current(namespace, key, value, generations)
+        return value
+
+    async def _read_generations(self, namespace: str, key: str) -> Optional[Tuple[str, str]]:
+        if not self.redis:
+            return None
+        try:
+            key_generation, namespace_generation = await self.redis.mget(*self._generation_keys(namespace, key))
+        except Exception as e:
+            logger.error(f"❌ Shared cache read error: {e}")
+            return None
+        return key_generation or '0', namespace_generation or '0'
+
+    async def _set_if_current(self, namespace: str, key: str, value: Any, generations: Optional[Tuple[str, str]]):
+        """set(), but the Redis write only happens if no process invalidated the key since `generations` was read"""
+        ttl = self._ttl(namespace)
+        local = self._local[namespace]
+        local.pop(key, None)
+        local[key] = (time.monotonic() + ttl, value)
+        if len(local) > L1_MAX_ENTRIES:
+            del local[next(iter(local))]
+
+        if self.redis and generations is not None:
+            try:
+                written = await self.redis.eval(
+                    _SET_IF_CURRENT, 3, self._redis_key(namespace, key), *self._generation_keys(namespace, key),
+                    json.dumps(value), ttl * L2_TTL_FACTOR, *generations
+                )
+            except Exception as e:
+                logger.error(f"❌ Shared cache write error: {e}")
+                return
+            if not written:
+                # Another process invalidated it meanwhile (its message may not have arrived yet)
+                self.stats[namespace]['stale_loads'] += 1
+                local.pop(key, None)
+
+    async def invalidate(self, namespace: str, key: Hashable):
+        """Drops a key in every process"""
+        key = str(key)
+        self._drop_local(namespace, key)
+
+        if self.redis:
+            key_generation, _ = self._generation_keys(namespace, key)
+            try:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.incr(key_generation)
+                    pipe.expire(key_generation, self._ttl(namespace) * L2_TTL_FACTOR)
+                    pipe.delete(self._redis_key(namespace, key))
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"❌ Shared cache delete error: {e}")
+        await self._publish(namespace, key)
+
+    async def invalidate_namespace(self, namespace: str):
+        """Drops a whole namespace in every process"""
+        self._drop_local(namespace, None)
+
+        if self.redis:
+            try:
+                await self.redis.incr(f"{self.prefix}:gen:{namespace}")
+                keys = [key async for key in self.redis.scan_iter(match=f"{self.prefix}:{namespace}:*", count=500)]
+                if keys:
+                    await self.redis.delete(*keys)
+            except Exception as e:
+                logger.error(f"❌ Shared cache namespace delete error: {e}")
+        await self._publish(namespace, None)
+
+    # ================ MESSAGES ================
+
+    def _topic_channel(self, topic: str) -> str:
+        return f"{self.prefix}:bus:{topic}"
+
+    async def subscribe(self, topic: str, handler: Callable[[Any], Awaitable[None]]):
+        """
+        Calls handler(data) for each message published on a topic by the other processes
+
+        Without Redis there is no other process to hear from: the handler is
+        kept and subscribed if connect() succeeds later.
+        """
+        channel = self._topic_channel(topic)
+        self._handlers[channel] = handler
+        if self._pubsub:
+            await self._pubsub.subscribe(channel)
+
+    async def publish(self, topic: str, data: Any) -> bool:
+        """
+        Sends a JSON-serialisable message to the other processes subscribed to a topic
+
+        Returns:
+            False when it could not be sent (local-only mode or Redis error)
+        """
+        if not self.redis:
+            return False
+        try:
+            await self.redis.publish(self._topic_channel(topic), json.dumps({
+                'data': data,
+                'origin': self.instance_id
+            }))
+            return True
+        except Exception as e:
+            logger.error(f"❌ Shared cache publish error: {e}")
+            return False
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Hit rate (L1 + L2) per namespace"""
+        rates = {}
+        for namespace, stats in self.stats.items():
+            hits = stats['l1_hits'] + stats['l2_hits']
+            total = hits + stats['misses']
+            rates[namespace] = hits / total if total else 0.0
+        return rates
+
+
+# Instance globale (local-only tant que connect() n'a pas été appelé)
+shared_cache = SharedCache()
@@ -90,6 +90,8 @@ COMMAND_CATEGORIES = {
             ("d.reload [extension]", "Reload bot extensions"),
             ("d.shutdown", "Shutdown the bot"),
             ("d.stats", "Show detailed bot statistics"),
+            ("d.slow", "Show the slowest commands and interactions"),
+            ("d.ratelimits", "Show Discord rate limit waits and 429s"),
             ("d.sql [query]", "Execute SQL query on the database"),
             ("d.jsk [code]", "Execute Python code (Jishaku)"),
             ("d.error [error_code]", "Get detailed error information"),
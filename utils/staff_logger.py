@@ -9,6 +9,8 @@ from typing import Optional, Dict, Any
 import logging
 from datetime import datetime, timezone
 
+from utils.request_scheduler import Priority, with_priority
+
 logger = logging.getLogger('moddy.staff_logger')
 
 
@@ -39,6 +41,7 @@ class StaffLogger:
             logger.error(f"Error getting staff log channel: {e}")
             return None
 
+    @with_priority(Priority.BACKGROUND)
     async def log_command(
         self,
         command_type: str,
@@ -156,6 +159,7 @@ class StaffLogger:
         except Exception as e:
             logger.error(f"Error logging staff command: {e}")
 
+    @with_priority(Priority.BACKGROUND)
     async def log_action(
         self,
         action: str,
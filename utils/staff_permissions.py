@@ -6,6 +6,7 @@ Handles role hierarchy, permissions, and command access control
 from enum import Enum
 from typing import List, Optional, Set
 from database import db
+from utils.shared_cache import shared_cache
 import logging
 
 logger = logging.getLogger('moddy.staff_permissions')
@@ -97,6 +98,14 @@ class StaffPermissionManager:
     def __init__(self, bot):
         self.bot = bot
 
+    async def _get_permissions(self, user_id: int) -> dict:
+        """Roles and denied commands of a user, through the shared cache"""
+        async def load():
+            perms = await db.get_staff_permissions(user_id)
+            return {'roles': perms['roles'], 'denied_commands': perms['denied_commands']}
+
+        return await shared_cache.get_or_load('staff_permissions', user_id, load)
+
     async def get_user_roles(self, user_id: int) -> List[StaffRole]:
         """Get all roles for a user"""
         # Super admin has all roles
@@ -110,8 +119,8 @@ class StaffPermissionManager:
         if self.bot.is_developer(user_id):
             return [StaffRole.MANAGER, StaffRole.DEV]
 
-        # Get from database
-        perms = await db.get_staff_permissions(user_id)
+        # Get from database (cached)
+        perms = await self._get_permissions(user_id)
         roles = []
 
         for role_str in perms['roles']:
@@ -134,8 +143,8 @@ class StaffPermissionManager:
         if not db:
             return []
 
-        perms = await db.get_staff_permissions(user_id)
-        return perms['denied_commands']
+        perms = await self._get_permissions(user_id)
+        return list(perms['denied_commands'])
 
     async def is_command_denied(self, user_id: int, command_name: str) -> bool:
         """Check if a specific command is denied for the user"""
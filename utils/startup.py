@@ -0,0 +1,195 @@
+"""
+Startup Pipeline
+Runs the bot's startup phases as a small dependency graph and records their timings
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger('moddy.startup')
+
+
+class StartupPhase:
+    """A single startup step with its dependencies and timing"""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable], depends_on: Iterable[str] = (),
+                 background: bool = False):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.background = background
+
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration of the phase in seconds (None while not finished)"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "failed"
+        if self.finished_at is not None:
+            return "done"
+        if self.started_at is not None:
+            return "running"
+        return "pending"
+
+
+class StartupPipeline:
+    """
+    Startup dependency graph
+
+    Each phase starts as soon as all of its dependencies are finished, so
+    independent phases run concurrently. Background phases (network-only
+    probes such as the GitHub version fetch) are not awaited by run(): they
+    are kept off the critical path and their timing is recorded whenever
+    they complete.
+
+    A failing phase is logged and recorded, it never aborts the pipeline:
+    phases depending on it still run, exactly like the previous sequential
+    setup_hook did.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, StartupPhase] = {}
+        self.created_at = time.perf_counter()
+        self.critical_path_done_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.first_interaction_at: Optional[float] = None
+        self.ready_rss: Optional[int] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def add_phase(self, name: str, func: Callable[[], Awaitable], depends_on: Iterable[str] = (),
+                  background: bool = False):
+        """
+        Registers a phase
+
+        Args:
+            name: Unique phase name (shown in the startup breakdown)
+            func: Coroutine function to run, without arguments
+            depends_on: Names of the phases that must finish first
+            background: If True, run() does not wait for this phase
+        """
+        if name in self.phases:
+            raise ValueError(f"Startup phase {name} already registered")
+        self.phases[name] = StartupPhase(name, func, depends_on, background)
+
+    async def _run_phase(self, phase: StartupPhase):
+        """Waits for the dependencies of a phase, then runs it"""
+        if phase.depends_on:
+            await asyncio.gather(*(self._tasks[dep] for dep in phase.depends_on), return_exceptions=True)
+
+        phase.started_at = time.perf_counter()
+        try:
+            await phase.func()
+        except Exception as e:
+            phase.error = e
+            logger.error(f"❌ Startup phase {phase.name} failed: {e}", exc_info=True)
+        finally:
+            phase.finished_at = time.perf_counter()
+            logger.info(f"⏱️ Startup phase {phase.name}: {phase.duration * 1000:.0f}ms")
+
+    async def run(self):
+        """Runs every phase and waits for the critical (non-background) ones"""
+        for name, phase in self.phases.items():
+            for dep in phase.depends_on:
+                if dep not in self.phases:
+                    raise ValueError(f"Startup phase {name} depends on unknown phase {dep}")
+                if self.phases[dep].background and not phase.background:
+                    raise ValueError(f"Critical phase {name} cannot depend on background phase {dep}")
+
+        # Tasks are created in registration order; dependencies are awaited inside each task
+        for name, phase in self.phases.items():
+            self._tasks[name] = asyncio.create_task(self._run_phase(phase), name=f"startup:{name}")
+
+        critical = [task for name, task in self._tasks.items() if not self.phases[name].background]
+        await asyncio.gather(*critical)
+        self.critical_path_done_at = time.perf_counter()
+
+    def mark_ready(self):
+        """Records the moment the bot became ready (first on_ready)"""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+            try:
+                import psutil
+                self.ready_rss = psutil.Process().memory_info().rss
+            except Exception:
+                self.ready_rss = None
+
+    def mark_first_interaction(self):
+        """Records the moment the first interaction was received"""
+        if self.first_interaction_at is None:
+            self.first_interaction_at = time.perf_counter()
+
+    @property
+    def setup_duration(self) -> Optional[float]:
+        """Time spent in the critical path of setup_hook"""
+        if self.critical_path_done_at is None:
+            return None
+        return self.critical_path_done_at - self.created_at
+
+    @property
+    def time_to_ready(self) -> Optional[float]:
+        """Time between the pipeline creation and the first on_ready"""
+        if self.ready_at is None:
+            return None
+        return self.ready_at - self.created_at
+
+    @property
+    def time_to_first_interaction(self) -> Optional[float]:
+        """Time between the pipeline creation and the first interaction received"""
+        if self.first_interaction_at is None:
+            return None
+        return self.first_interaction_at - self.created_at
+
+    def breakdown(self) -> List[Dict]:
+        """
+        Returns the per-phase timings, ordered by start time
+
+        Returns:
+            List of dicts (name, status, duration, offset, background)
+        """
+        rows = []
+        for phase in sorted(self.phases.values(), key=lambda p: p.started_at or float('inf')):
+            rows.append({
+                'name': phase.name,
+                'status': phase.status,
+                'duration': phase.duration,
+                'offset': (phase.started_at - self.created_at) if phase.started_at else None,
+                'background': phase.background,
+            })
+        return rows
+
+    def format_breakdown(self) -> str:
+        """Human-readable breakdown, one line per phase"""
+        lines = []
+        for row in self.breakdown():
+            duration = f"{row['duration'] * 1000:.0f}ms" if row['duration'] is not None else row['status']
+            offset = f"+{row['offset'] * 1000:.0f}ms" if row['offset'] is not None else "-"
+            flag = " (bg)" if row['background'] else ""
+            failed = " ❌" if row['status'] == "failed" else ""
+            lines.append(f"`{row['name']}`{flag}: {duration} @ {offset}{failed}")
+
+        if self.setup_duration is not None:
+            lines.append(f"**setup_hook:** {self.setup_duration * 1000:.0f}ms")
+        if self.time_to_ready is not None:
+            lines.append(f"**Time to ready:** {self.time_to_ready:.2f}s")
+        if self.ready_rss is not None:
+            lines.append(f"**RSS at ready:** {self.ready_rss / 1024 / 1024:.1f} MB")
+        if self.time_to_first_interaction is not None:
+            lines.append(f"**Time to first interaction:** {self.time_to_first_interaction:.2f}s")
+        return "\n".join(lines)
+
+    def log_breakdown(self):
+        """Logs the startup breakdown"""
+        logger.info("⏱️ Startup breakdown:")
+        for line in self.format_breakdown().replace('`', '').replace('**', '').splitlines():
+            logger.info(f"   {line}")
@@ -0,0 +1,445 @@
+"""
+Tracing
+Minimal in-process tracing: spans propagated through contextvars, opened
+automatically around database methods, Discord REST routes, backend calls and
+outbound aiohttp requests, and exported per trace to a JSONL file or an OTLP
+(HTTP/JSON) collector.
+
+Every interaction opens a root span. Child spans are only created inside a
+trace, so code running outside an interaction (tasks, startup) costs a single
+contextvar lookup. A finished trace is exported when it was sampled
+(TRACING_SAMPLE_RATE) or when it was slower than TRACING_SLOW_MS.
+
+Waterfall of a trace from the JSONL file:
+    python -m utils.tracing traces.jsonl [trace_id]
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set
+
+from utils import json_codec as json
+
+logger = logging.getLogger('moddy.tracing')
+
+EXPORTERS = ('off', 'jsonl', 'otlp')
+
+# A runaway trace (loop of queries) is truncated, not kept in memory
+MAX_SPANS_PER_TRACE = 500
+
+# OTLP span kinds
+_OTLP_KINDS = {'interaction': 2, 'db': 3, 'discord': 3, 'backend': 3, 'http': 3}
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('moddy_span', default=None)
+
+
+def current_span() -> Optional['Span']:
+    return _current_span.get()
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'kind', 'attributes',
+                 'start_ns', 'end_ns', 'status', 'error', 'sampled', '_spans', '_start', '_token')
+
+    def __init__(self, name: str, kind: str, parent: Optional['Span'] = None,
+                 sampled: bool = False, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = 'ok'
+        self.error: Optional[str] = None
+        self.sampled = parent.sampled if parent else sampled
+        # Finished spans of the trace, shared by every span (kept on the root)
+        self._spans: List['Span'] = parent._spans if parent else []
+        self._start = time.perf_counter()
+        self._token = None
+
+    @property
+    def is_root(self) -> bool:
+        return self.parent_id is None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns else 0.0
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None, status: Optional[str] = None):
+        # Monotonic duration, wall clock start (for the waterfall alignment)
+        self.end_ns = self.start_ns + int((time.perf_counter() - self._start) * 1e9)
+        if error is not None:
+            self.status = 'error'
+            self.error = f"{type(error).__name__}: {error}"[:300]
+        elif status is not None:
+            self.status = status
+        if len(self._spans) < MAX_SPANS_PER_TRACE:
+            self._spans.append(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start_ns': self.start_ns,
+            'duration_ms': round(self.duration_ms, 3),
+            'status': self.status,
+            'error': self.error,
+            'attributes': self.attributes,
+        }
+
+
+# ================ EXPORTERS ================
+
+class JsonlExporter:
+    """Appends one JSON line per span to a local file (written off the event loop)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _write(self, lines: List[str]):
+        with self._lock, open(self.path, 'a', encoding='utf-8') as file:
+            file.write("".join(lines))
+
+    async def export(self, spans: List[Span]):
+        lines = [json.dumps(span.to_dict()) + "\n" for span in spans]
+        await asyncio.to_thread(self._write, lines)
+
+    async def close(self):
+        pass
+
+
+class OtlpExporter:
+    """Posts traces to an OTLP/HTTP collector (JSON encoding, POST {endpoint}/v1/traces)"""
+
+    def __init__(self, endpoint: str, service_name: str = 'moddy'):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.service_name = service_name
+        self._session = None
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'moddy.tracing'},
+                    'spans': [{
+                        'traceId': span.trace_id,
+                        'spanId': span.span_id,
+                        'parentSpanId': span.parent_id or '',
+                        'name': span.name,
+                        'kind': _OTLP_KINDS.get(span.kind, 1),
+                        'startTimeUnixNano': str(span.start_ns),
+                        'endTimeUnixNano': str(span.end_ns),
+                        'attributes': [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+                        'status': {'code': 2, 'message': span.error or ''} if span.status == 'error' else {'code': 1},
+                    } for span in spans]
+                }]
+            }]
+        }
+
+    async def export(self, spans: List[Span]):
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        async with self._session.post(self.url, data=json.dumps(self.payload(spans)),
+                                      headers={'Content-Type': 'application/json'}) as response:
+            if response.status >= 400:
+                logger.debug(f"OTLP collector returned HTTP {response.status}")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+# ================ TRACER ================
+
+class Tracer:
+    """Creates spans and exports finished traces"""
+
+    def __init__(self):
+        self.exporter = None
+        self.sample_rate = 0.0
+        self.slow_ms = 0.0
+        self.exported = 0
+        self.dropped = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._installed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(self, exporter: str = 'off', sample_rate: float = 0.01, slow_ms: float = 1000,
+                  jsonl_path: str = 'traces.jsonl', otlp_endpoint: Optional[str] = None):
+        """Selects the exporter; 'off' (or an incomplete config) disables tracing"""
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.slow_ms = slow_ms
+
+        if exporter == 'jsonl':
+            self.exporter = JsonlExporter(jsonl_path)
+        elif exporter == 'otlp' and otlp_endpoint:
+            self.exporter = OtlpExporter(otlp_endpoint)
+        else:
+            if exporter not in EXPORTERS or (exporter == 'otlp' and not otlp_endpoint):
+                logger.warning(f"⚠️ Tracing disabled (exporter={exporter!r}, endpoint={otlp_endpoint!r})")
+            self.exporter = None
+            return
+
+        self.install()
+        logger.info(
+            f"✅ Tracing enabled ({exporter}, sample rate {self.sample_rate:.0%}, slow traces > {self.slow_ms:.0f}ms)"
+        )
+
+    # ================ SPANS ================
+
+    def start_trace(self, name: str, kind: str = 'interaction', **attributes) -> Optional[Span]:
+        """
+        Opens a root span and makes it current for the running task
+
+        For hooks that start and end in different callbacks (interaction_check
+        -> on_app_command_completion); end it with end_trace().
+        """
+        if not self.enabled:
+            return None
+        span = Span(name, kind, sampled=random.random() < self.sample_rate, attributes=attributes)
+        _current_span.set(span)
+        return span
+
+    def end_trace(self, span: Optional[Span], status: str = 'ok', error: Optional[BaseException] = None):
+        if span is None or span.end_ns is not None:
+            return
+        span.finish(error=error, status=status)
+        self._on_root_finished(span)
+
+    @asynccontextmanager
+    async def span(self, name: str, kind: str = 'internal', root: bool = False, **attributes):
+        """
+        Times a block as a child of the current span
+
+        Without a current span, nothing is recorded unless root=True, which
+        starts a new trace.
+        """
+        parent = _current_span.get()
+        if not self.enabled or (parent is None and not root):
+            yield None
+            return
+
+        if parent is None:
+            span = Span(name, kind, sampled=random.random() < self.sample_rate, attributes=attributes)
+        else:
+            span = Span(name, kind, parent=parent, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.finish(error=e)
+            raise
+        else:
+            span.finish()
+        finally:
+            _current_span.reset(token)
+            if span.is_root:
+                self._on_root_finished(span)
+
+    def _on_root_finished(self, root: Span):
+        if not (root.sampled or root.duration_ms >= self.slow_ms):
+            self.dropped += 1
+            return
+        spans = sorted(root._spans, key=lambda span: span.start_ns)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # The export itself must not be traced into the finished trace
+        task = loop.create_task(self._export(spans), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _export(self, spans: List[Span]):
+        try:
+            await self.exporter.export(spans)
+            self.exported += 1
+        except Exception as e:
+            logger.debug(f"Trace export failed: {e}")
+
+    async def close(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.exporter:
+            await self.exporter.close()
+
+    # ================ AUTO-INSTRUMENTATION ================
+
+    def install(self):
+        """Opens spans around the database, Discord REST, backend and aiohttp calls (once per process)"""
+        if self._installed:
+            return
+        self._installed = True
+
+        import aiohttp
+        from discord.http import HTTPClient
+        from database import ModdyDatabase
+        from services.backend_client import BackendClient
+
+        instrument_methods(ModdyDatabase, 'db')
+        instrument_methods(BackendClient, 'backend')
+        HTTPClient.request = _wrap_discord_request(HTTPClient.request)
+        aiohttp.ClientSession._request = _wrap_aiohttp_request(aiohttp.ClientSession._request)
+
+
+tracer = Tracer()
+
+
+def traced(name: str, kind: str = 'internal'):
+    """Decorator: runs a coroutine function in a child span of the current trace"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapped(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            async with tracer.span(name, kind):
+                return await func(*args, **kwargs)
+
+        wrapped._moddy_traced = True
+        return wrapped
+    return decorator
+
+
+def instrument_methods(cls, kind: str):
+    """Wraps every public coroutine method defined on a class in a span named '<kind>.<method>'"""
+    for name, member in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.iscoroutinefunction(member) or getattr(member, '_moddy_traced', False):
+            continue
+        setattr(cls, name, traced(f"{kind}.{name}", kind)(member))
+
+
+def _wrap_discord_request(request):
+    @functools.wraps(request)
+    async def wrapped(self, route, **kwargs):
+        if _current_span.get() is None:
+            return await request(self, route, **kwargs)
+        # route.path is the template (/channels/{channel_id}/messages): no IDs in span names
+        async with tracer.span(f"discord {route.method} {route.path}", 'discord') as span:
+            try:
+                return await request(self, route, **kwargs)
+            except Exception as e:
+                status = getattr(e, 'status', None)
+                if span is not None and status is not None:
+                    span.set_attribute('http.status_code', status)
+                raise
+
+    return wrapped
+
+
+def _wrap_aiohttp_request(request):
+    @functools.wraps(request)
+    async def wrapped(self, method, str_or_url, **kwargs):
+        if _current_span.get() is None:
+            return await request(self, method, str_or_url, **kwargs)
+        # Host only: webhook URLs and query strings carry secrets
+        host = getattr(str_or_url, 'host', None) or str(str_or_url).split('//', 1)[-1].split('/', 1)[0].split('?', 1)[0]
+        async with tracer.span(f"http {method} {host}", 'http') as span:
+            response = await request(self, method, str_or_url, **kwargs)
+            if span is not None:
+                span.set_attribute('http.status_code', response.status)
+            return response
+
+    return wrapped
+
+
+# ================ WATERFALL ================
+
+def format_waterfall(spans: List[Dict[str, Any]], width: int = 40) -> str:
+    """Text waterfall of one trace (span dicts as written by JsonlExporter)"""
+    if not spans:
+        return ""
+    spans = sorted(spans, key=lambda span: span['start_ns'])
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        children.setdefault(span['parent_id'], []).append(span)
+
+    start = spans[0]['start_ns']
+    end = max(span['start_ns'] + span['duration_ms'] * 1e6 for span in spans)
+    total = max(end - start, 1)
+
+    lines = []
+
+    def walk(span, depth):
+        offset = int((span['start_ns'] - start) / total * width)
+        length = max(1, int(span['duration_ms'] * 1e6 / total * width))
+        bar = " " * offset + "█" * min(length, width - offset)
+        flag = " ✗" if span['status'] == 'error' else ""
+        lines.append(f"{bar:<{width}} {span['duration_ms']:>9.1f}ms  {'  ' * depth}{span['name']}{flag}")
+        for child in children.get(span['span_id'], []):
+            walk(child, depth + 1)
+
+    known = {span['span_id'] for span in spans}
+    for span in spans:
+        if span['parent_id'] is None or span['parent_id'] not in known:
+            walk(span, 0)
+    return "\n".join(lines)
+
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span['trace_id'], []).append(span)
+    return traces
+
+
+def main(argv: List[str]) -> int:
+    if not argv:
+        print("Usage: python -m utils.tracing <traces.jsonl> [trace_id]")
+        return 1
+
+    traces = load_traces(argv[0])
+    if len(argv) > 1:
+        print(format_waterfall(traces.get(argv[1], [])) or f"Trace {argv[1]} not found")
+        return 0
+
+    # Slowest traces first
+    roots = [
+        span for spans in traces.values() for span in spans if span['parent_id'] is None
+    ]
+    for root in sorted(roots, key=lambda span: span['duration_ms'], reverse=True)[:20]:
+        print(f"{root['trace_id']}  {root['duration_ms']:>9.1f}ms  {root['name']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))